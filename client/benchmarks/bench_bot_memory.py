@@ -0,0 +1,145 @@
+"""Benchmark: bộ nhớ mỗi bot và tốc độ xử lý packet của BotSwarm (không cần server).
+
+Mỗi bot dùng AsyncWerewolfNetworkClient thật, nhưng transport là loopback: frame server được
+đưa thẳng vào protocol (data_received -> FrameDecoder -> Bot.pump), frame bot gửi chỉ được
+đếm. Kịch bản mỗi phòng: JOIN -> GAME_START (vai) -> --nights x (PHASE_NIGHT, SEER_RESULT,
+PHASE_GUARD_START, PHASE_WOLF_START, PHASE_DAY, VOTE_RESULT) -> GAME_OVER.
+
+In ra: bộ nhớ Python (tracemalloc) mỗi bot sau khi kết nối và sau khi chơi xong, thời gian xử
+lý mỗi packet, số hành động đã gửi; và receive buffer ban đầu của WerewolfNetworkClient
+(transport "ctypes") bản GUI so với bản bot.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_bot_memory.py [--bots 500] [--nights 3]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import protocol
+from async_network_client import AsyncWerewolfNetworkClient, _WerewolfProtocol
+from bot import BotConfig, BotSwarm
+from bot import swarm as bot_swarm
+from network_client import WerewolfNetworkClient
+
+
+class LoopbackTransport:
+    """Thay asyncio transport: chỉ đếm byte bot gửi"""
+
+    def __init__(self):
+        self.sent = 0
+
+    def write(self, data):
+        self.sent += len(data)
+
+    def is_closing(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def connect_loopback(swarm, bot):
+    client = AsyncWerewolfNetworkClient(swarm.loop)
+    proto = _WerewolfProtocol(client)
+    proto.connection_made(LoopbackTransport())
+    client.client = client._transport
+    bot.attach(client)
+    return proto
+
+
+def frame(header, payload):
+    return protocol.encode_packet(header, payload)
+
+
+def room_script(usernames, room_id, nights):
+    """list[(username | None, bytes)]: None = broadcast cho cả phòng"""
+    roles = [protocol.ROLE_WEREWOLF, protocol.ROLE_WEREWOLF, protocol.ROLE_SEER, protocol.ROLE_GUARD]
+    roles += [protocol.ROLE_VILLAGER] * (len(usernames) - len(roles))
+    wolves = [u for u, r in zip(usernames, roles) if r == protocol.ROLE_WEREWOLF]
+    seer = usernames[roles.index(protocol.ROLE_SEER)]
+    players = [{"username": u, "is_alive": 1} for u in usernames]
+
+    script = [(None, frame(protocol.REGISTER_RES, {"status": "success"})),
+              (None, frame(protocol.LOGIN_RES, {"status": "success"})),
+              (None, frame(protocol.JOIN_ROOM_RES, {"status": "success", "room_id": room_id,
+                                                   "players": [{"username": u} for u in usernames]}))]
+    for u, role in zip(usernames, roles):
+        payload = {"status": "success", "role": role}
+        if role == protocol.ROLE_WEREWOLF:
+            payload["werewolf_team"] = wolves
+        script.append((u, frame(protocol.GAME_START_RES_AND_ROLE, payload)))
+    for night in range(nights):
+        victim = usernames[len(usernames) - 1 - night]
+        script.append((None, frame(protocol.PHASE_NIGHT, {"type": "phase_night", "players": players})))
+        script.append((seer, frame(protocol.SEER_RESULT, {"status": "success", "target_username": wolves[0],
+                                                          "is_werewolf": True, "players": players})))
+        script.append((None, frame(protocol.PHASE_GUARD_START, {"type": "phase_guard_start"})))
+        script.append((None, frame(protocol.PHASE_WOLF_START, {"type": "phase_wolf_start"})))
+        script.append((None, frame(protocol.PHASE_DAY, {"type": "phase_day", "result": "killed", "targetId": victim})))
+        script.append((None, frame(protocol.VOTE_RESULT, {"type": "player_executed", "playerId": wolves[-1]})))
+        players = [p if p["username"] != victim else {"username": victim, "is_alive": 0} for p in players]
+    script.append((None, frame(protocol.GAME_OVER, {"type": "game_over", "winner": "villagers", "players": players})))
+    return script
+
+
+async def run(args):
+    config = BotConfig(room_size=args.room_size, room_id=1, games=1, think_time=(0, 0), seed=1)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    swarm = BotSwarm(args.bots, config)
+    swarm.loop = asyncio.get_running_loop()
+    protos = {bot.username: connect_loopback(swarm, bot) for bot in swarm.bots}
+    connected = tracemalloc.get_traced_memory()[0]
+
+    by_room = [swarm.bots[i:i + args.room_size] for i in range(0, len(swarm.bots), args.room_size)]
+    packets_before = swarm.stats["packets"]
+    handle_s = 0.0
+    for room_id, bots in enumerate(by_room, start=1):
+        names = [bot.username for bot in bots]
+        if len(names) < 4:
+            continue
+        for target, data in room_script(names, room_id, args.nights):
+            t0 = time.perf_counter()
+            for name in ([target] if target else names):
+                protos[name].data_received(data)
+            handle_s += time.perf_counter() - t0
+            # Hành động (think time 0) chạy ở vòng lặp kế tiếp của event loop
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+    played = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    packets = swarm.stats["packets"] - packets_before
+    actions = {k: swarm.stats[k] for k in ("seer_check", "guard_protect", "wolf_kill", "day_vote")}
+    sent = sum(bot.client._transport.sent for bot in swarm.bots if bot.client is not None)
+    print(f"{args.bots} bots, rooms of {args.room_size}, {args.nights} nights")
+    print(f"python bytes/bot connected   {(connected - base) / args.bots:>10.0f}")
+    print(f"python bytes/bot after game  {(played - base) / args.bots:>10.0f}")
+    print(f"packets handled              {packets:>10}")
+    print(f"us per packet (decode+bot)   {handle_s / max(packets, 1) * 1e6:>10.1f}")
+    print(f"bytes sent by bots           {sent:>10}")
+    print(f"actions                      {actions}")
+    print(f"phases                       {dict(swarm.phases())}")
+    print(f"ctypes recv buffer/conn      {WerewolfNetworkClient.INITIAL_RECV_BUFFER_SIZE:>10} (GUI)"
+          f" -> {bot_swarm.BOT_RECV_BUFFER_SIZE} (bot)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=500)
+    parser.add_argument("--room-size", type=int, default=8)
+    parser.add_argument("--nights", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
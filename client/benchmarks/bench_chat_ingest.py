@@ -0,0 +1,153 @@
+"""Benchmark: chi phí render chat khi bị flood CHAT_BROADCAST, gom theo frame và không gom.
+
+Mô phỏng dispatcher đẩy tin nhắn vào ChatLogView theo từng burst (mỗi tick event loop
+một burst) rồi đọc bộ đếm của ChatIngestBuffer:
+- per-message: frame_ms=0, mỗi tin một lần insert + layout + scroll (như append cũ)
+- frame:       frame_ms=16, gom các tin đến trong một frame thành một lô
+
+Phần relayout: lịch sử --history tin, rồi thêm một burst / đổi độ rộng / đổi chiều cao và
+đo số lần gọi sizeHint, khối event loop dài nhất (GUI bị chặn bao lâu) và thời điểm layout
+xong, với layout mode SinglePass (mọi dòng trong một lượt) và Batched (mặc định của ChatLogView).
+
+Chạy offscreen nên không cần màn hình; chỉ cần PyQt5.
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_chat_ingest.py [--messages 2000] [--burst 8]
+    python3 benchmarks/bench_chat_ingest.py --history 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from PyQt5 import QtWidgets
+
+from components.chat_log import ChatBubbleDelegate, ChatLogView, ChatMessage
+
+PLAYERS = [f"player{i}" for i in range(12)]
+
+
+class CountingDelegate(ChatBubbleDelegate):
+    """Đếm sizeHint và ghi thời điểm lần gọi cuối (layout xong)"""
+
+    def __init__(self, style, parent=None):
+        super().__init__(style, parent)
+        self.calls = 0
+        self.last_call = 0.0
+
+    def sizeHint(self, option, index):
+        self.calls += 1
+        self.last_call = time.perf_counter()
+        return super().sizeHint(option, index)
+
+
+def message(i):
+    username = PLAYERS[i % len(PLAYERS)]
+    return ChatMessage(username, f"message {i} " + "blah " * (i % 15), username == PLAYERS[0])
+
+
+def run(app, frame_ms, messages, burst):
+    view = ChatLogView(frame_ms=frame_ms)
+    view.resize(760, 320)
+    view.show()
+    app.processEvents()
+    ingest = view.ingest
+    ingest.reset_stats()
+
+    sent = 0
+    start = time.perf_counter()
+    while sent < messages:
+        # Một burst = các packet dispatcher drain được trong một tick
+        for _ in range(min(burst, messages - sent)):
+            username = PLAYERS[sent % len(PLAYERS)]
+            view.append_message(username, f"message {sent} " + "blah " * (sent % 15), username == PLAYERS[0])
+            sent += 1
+        app.processEvents()
+        time.sleep(0.001)
+    while ingest.pending_count():
+        app.processEvents()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    stats = ingest.stats()
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return elapsed, stats
+
+
+def settle(app, seconds):
+    """Chạy event loop `seconds` giây; trả về khối processEvents dài nhất (giây)"""
+    longest = 0.0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - start)
+    return longest
+
+
+def relayout(app, layout_mode, history, burst):
+    """[(thao tác, sizeHint calls, longest block ms, layout done ms, ở cuối)] trên lịch sử dài"""
+    view = ChatLogView(max_messages=history + burst)
+    view.setLayoutMode(layout_mode)
+    delegate = CountingDelegate(view.itemDelegate().bubble_style, view)
+    view.setItemDelegate(delegate)
+    view.resize(760, 320)
+    view.show()
+    view.chat_model.append_messages([message(i) for i in range(history)])
+    view.scrollToBottom()
+    settle(app, 0.5)
+
+    def append():
+        for i in range(burst):
+            view.append_message(*PLAYERS[:2], i % 2 == 0)
+        view.ingest.flush()
+
+    rows = []
+    for name, action in (("append burst", append),
+                         ("resize width", lambda: view.resize(640, 320)),
+                         ("resize height", lambda: view.resize(640, 480))):
+        delegate.calls = 0
+        start = delegate.last_call = time.perf_counter()
+        action()
+        # flush() (scrollToBottom) có thể layout ngay trong lời gọi: tính như một khối
+        longest = max(time.perf_counter() - start, settle(app, 0.4))
+        scroll_bar = view.verticalScrollBar()
+        rows.append((name, delegate.calls, longest * 1000, (delegate.last_call - start) * 1000,
+                     scroll_bar.value() == scroll_bar.maximum()))
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=8)
+    parser.add_argument("--history", type=int, default=2000, help="số tin có sẵn cho phần relayout")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    print(f"{args.messages} messages, burst {args.burst}/tick")
+    print(f"{'mode':<12} {'wall ms':>9} {'msg/s':>9} {'frames':>7} {'render ms':>10} {'max batch':>10}")
+    for name, frame_ms in (("per-message", 0), ("frame", 16)):
+        elapsed, stats = run(app, frame_ms, args.messages, args.burst)
+        print(f"{name:<12} {elapsed * 1000:>9.0f} {stats['messages_per_second']:>9.0f} "
+              f"{stats['frames_rendered']:>7} {stats['render_time_ms']:>10.1f} {stats['largest_batch']:>10}")
+
+    print(f"\nrelayout with {args.history} messages of history")
+    print(f"{'layout':<12} {'action':<14} {'sizeHint':>9} {'block ms':>9} {'done ms':>8} {'bottom':>7}")
+    for name, mode in (("single-pass", QtWidgets.QListView.SinglePass), ("batched", QtWidgets.QListView.Batched)):
+        for action, calls, longest_ms, done_ms, bottom in relayout(app, mode, args.history, args.burst):
+            print(f"{name:<12} {action:<14} {calls:>9} {longest_ms:>9.1f} {done_ms:>8.1f} {str(bottom):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: chi phí một lần refresh danh sách phòng (GET_ROOMS_RES) theo số phòng.
+
+So sánh:
+- rebuild:     xóa và tạo lại toàn bộ room card mỗi lần (cách cũ)
+- unchanged:   diff theo room id, không phòng nào đổi (trường hợp phổ biến của auto refresh 3s)
+- 10% changed: diff theo room id, 10% phòng đổi số người chơi/trạng thái
+
+Mỗi lần đo gồm cả `processEvents()` để tính polish QSS, layout và paint.
+Chạy offscreen nên không cần màn hình; cần PyQt5 và lib đã build (cd lib && make).
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_lobby_refresh.py [--rooms 10 50 200] [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from PyQt5 import QtWidgets
+
+import protocol
+from components.toast_notification import ToastManager
+from components.window_manager import WindowManager
+from network_client import WerewolfNetworkClient
+from packet_dispatcher import PacketDispatcher
+from windows.lobby_window import LobbyWindow
+
+
+def make_rooms(count, round_no=0, changed_fraction=0.0):
+    rooms = []
+    step = int(1 / changed_fraction) if changed_fraction else 0
+    for i in range(count):
+        bump = round_no if step and i % step == 0 else 0
+        current = (i + bump) % 12 + 1
+        rooms.append({
+            "id": i + 1,
+            "name": f"Room {i + 1}",
+            "current": current,
+            "max": 12,
+            "status": protocol.ROOM_PLAYING if current == 12 else protocol.ROOM_WAITING,
+        })
+    return rooms
+
+
+def clear_cards(lobby):
+    """Đưa lobby về trạng thái chưa có card -> update_room_table tạo lại tất cả"""
+    for card in lobby._room_cards.values():
+        lobby.room_grid_layout.removeWidget(card)
+        card.setParent(None)
+        card.deleteLater()
+    lobby._room_cards.clear()
+    lobby._room_order = []
+
+
+def measure(app, lobby, count, mode, rounds):
+    clear_cards(lobby)
+    lobby.update_room_table(make_rooms(count))
+    app.processEvents()
+
+    samples = []
+    for r in range(1, rounds + 1):
+        if mode == "rebuild":
+            rooms = make_rooms(count)
+        elif mode == "unchanged":
+            rooms = make_rooms(count)
+        else:
+            rooms = make_rooms(count, r, changed_fraction=0.1)
+        start = time.perf_counter()
+        if mode == "rebuild":
+            clear_cards(lobby)
+        lobby.update_room_table(rooms)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    qss_path = Path(__file__).parent.parent / "assets" / "werewolf_theme.qss"
+    if qss_path.exists():
+        app.setStyleSheet(qss_path.read_text(encoding="utf-8"))
+
+    # Client chưa kết nối: GET_ROOMS_REQ của showEvent chỉ báo lỗi qua toast
+    network_client = WerewolfNetworkClient()
+    window_manager = WindowManager(app)
+    window_manager.set_shared_data("network_client", network_client)
+    window_manager.set_shared_data("packet_dispatcher", PacketDispatcher(network_client))
+    lobby = LobbyWindow(None, window_manager)
+    lobby.toast_manager = ToastManager(lobby)
+    lobby.show()
+    lobby.auto_refresh_timer.stop()
+    if lobby.connection_monitor:
+        lobby.connection_monitor.stop()
+
+    modes = ("rebuild", "unchanged", "10% changed")
+    print(f"median ms per refresh ({args.rounds} rounds)")
+    print(f"{'rooms':>6} " + " ".join(f"{m:>12}" for m in modes))
+    for count in args.rooms:
+        results = [measure(app, lobby, count, mode, args.rounds) for mode in modes]
+        print(f"{count:>6} " + " ".join(f"{ms:>12.2f}" for ms in results))
+
+
+if __name__ == "__main__":
+    main()
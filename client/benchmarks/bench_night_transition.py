@@ -0,0 +1,116 @@
+"""Benchmark: độ trễ PHASE_* packet -> màn hình phase được vẽ (PhaseLatencyProbe).
+
+So sánh:
+- construct: mỗi phase tạo window mới rồi register + navigate (cách cũ của NightPhaseController)
+- reset:     dùng lại window đã đăng ký sẵn, chỉ gọi reset(...) (cách hiện tại)
+
+Đo cho màn chọn của guard (PHASE_GUARD_START) và của sói (PHASE_WOLF_START, gồm cả wolf chat).
+Chạy offscreen nên không cần màn hình; chỉ cần PyQt5.
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_night_transition.py [--players 12] [--rounds 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from PyQt5 import QtWidgets
+
+from components.window_manager import WindowManager
+from room_state import RoomState
+from utils.phase_latency import PhaseLatencyProbe
+from windows.night_phase_controller import NightPhaseController
+from windows.roles.guard.guard_select_window import GuardSelectWindow
+from windows.roles.guard.guard_wait_window import GuardWaitWindow
+from windows.roles.wolf.wolf_chat_window import WolfChatWindow
+from windows.roles.wolf.wolf_select_window import WolfSelectWindow
+from windows.roles.wolf.wolf_wait_window import WolfWaitWindow
+
+
+def register_screens(window_manager):
+    """Như main.py: tạo sẵn các màn hình ban đêm một lần"""
+    window_manager.register_window("guard_select", GuardSelectWindow([], "", 30, window_manager=window_manager))
+    window_manager.register_window("guard_wait", GuardWaitWindow(30, window_manager=window_manager))
+    window_manager.register_window("wolf_select", WolfSelectWindow([], [], "", 60, window_manager=window_manager))
+    window_manager.register_window("wolf_wait", WolfWaitWindow(60, window_manager=window_manager))
+    window_manager.register_window("wolf_chat", WolfChatWindow("", [], duration_seconds=60, window_manager=window_manager))
+
+
+def always_construct(window_manager):
+    """_screen() kiểu cũ: luôn tạo window mới, thay thế (và hủy) window đang đăng ký"""
+    def screen(name, factory):
+        old = window_manager.windows.get(name)
+        window = factory()
+        window_manager.register_window(name, window)
+        if old is not None:
+            old.hide()
+            old.deleteLater()
+        return window
+    return screen
+
+
+def measure(app, window_manager, probe, players, mode, rounds):
+    my_username = players[0]["username"]
+    wolves = [players[0]["username"], players[1]["username"]]
+    probe.reset_stats()
+    for _ in range(rounds):
+        now = time.time()
+        for phase, is_guard, is_wolf in (("PHASE_GUARD_START", True, False), ("PHASE_WOLF_START", False, True)):
+            ctrl = NightPhaseController(
+                window_manager, None, players, my_username, 1,
+                False, is_guard, is_wolf, wolves,
+                guard_deadline=now + 30, wolf_deadline=now + 60,
+            )
+            if mode == "construct":
+                ctrl._screen = always_construct(window_manager)
+            before = sum(len(v) for v in probe.samples.values())
+            probe.mark(phase)
+            if phase == "PHASE_GUARD_START":
+                ctrl.start_guard_phase()
+            else:
+                ctrl.start_wolf_phase()
+            while sum(len(v) for v in probe.samples.values()) == before:
+                app.processEvents()
+        window_manager.navigate_to("idle")
+        app.processEvents()
+    return probe.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    qss_path = Path(__file__).parent.parent / "assets" / "werewolf_theme.qss"
+    if qss_path.exists():
+        app.setStyleSheet(qss_path.read_text(encoding="utf-8"))
+
+    window_manager = WindowManager(app)
+    window_manager.set_shared_data("room_state", RoomState())
+    window_manager.register_window("idle", QtWidgets.QWidget())
+    register_screens(window_manager)
+    probe = PhaseLatencyProbe(window_manager, log=False)
+    players = [{"username": f"player{i}", "is_alive": 1} for i in range(args.players)]
+
+    print(f"{args.players} players, median/max ms PHASE_* -> first paint ({args.rounds} rounds)")
+    print(f"{'mode':<10} {'phase':<18} {'median':>8} {'max':>8}")
+    for mode in ("construct", "reset"):
+        # Controller/window in log [DEBUG] rất nhiều; không tính vào kết quả
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = measure(app, window_manager, probe, players, mode, args.rounds)
+        for phase, s in stats.items():
+            print(f"{mode:<10} {phase:<18} {s['median_ms']:>8.2f} {s['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
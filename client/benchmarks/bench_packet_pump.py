@@ -0,0 +1,115 @@
+"""Benchmark: độ trễ backlog của receive loop dưới traffic dạng burst.
+
+So sánh vòng nhận cũ (1 packet mỗi tick 100ms) với PacketPump (drain tất cả frame
+mỗi tick, giới hạn bởi time budget). Dùng đồng hồ ảo nên kết quả ổn định và không cần
+server hay PyQt5.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_packet_pump.py [--bursts 30] [--handler-ms 0.3]
+"""
+
+import argparse
+import random
+import sys
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from utils.packet_pump import PacketPump
+
+TICK_MS = 100
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedClient:
+    """Giả lập receive buffer: frame chỉ đọc được khi thời gian ảo >= thời điểm đến."""
+
+    def __init__(self, clock, arrivals):
+        self.clock = clock
+        self.pending = deque(sorted(arrivals))
+
+    def receive_packet(self):
+        if self.pending and self.pending[0][0] <= self.clock.now:
+            arrival, header = self.pending.popleft()
+            return header, {"arrival": arrival}
+        return None, None
+
+
+def bursty_traffic(bursts, seed):
+    """PHASE_NIGHT + CHAT_BROADCAST x20 + PING, lặp lại với khoảng cách ngẫu nhiên."""
+    rng = random.Random(seed)
+    arrivals = []
+    t = 0.0
+    for _ in range(bursts):
+        t += rng.uniform(0.5, 3.0)
+        arrivals.append((t, 303))
+        for i in range(20):
+            arrivals.append((t + i * 0.002, 402))
+        arrivals.append((t + 0.05, 501))
+    return arrivals
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run(mode, arrivals, handler_ms, budget_ms):
+    clock = VirtualClock()
+    client = ScriptedClient(clock, arrivals)
+    latencies = []
+    max_backlog = 0
+
+    def handler(header, payload):
+        clock.now += handler_ms / 1000.0
+        latencies.append(clock.now - payload["arrival"])
+
+    pump = PacketPump(handler, budget_ms=budget_ms, clock=clock)
+    end = arrivals[-1][0] + 60.0
+    next_tick = 0.0
+    while client.pending and clock.now < end:
+        clock.now = max(clock.now, next_tick)
+        max_backlog = max(max_backlog, sum(1 for a, _ in client.pending if a <= clock.now))
+        if mode == "single":
+            header, payload = client.receive_packet()
+            if header is not None:
+                handler(header, payload)
+        else:
+            pump.drain(client)
+            # Budget hết -> reschedule ngay (QTimer.singleShot(0)), không đợi tick kế tiếp
+            while pump.backlogged:
+                pump.drain(client)
+        next_tick += TICK_MS / 1000.0
+    return latencies, max_backlog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=30)
+    parser.add_argument("--handler-ms", type=float, default=0.3, help="chi phí xử lý mỗi packet (ms)")
+    parser.add_argument("--budget-ms", type=float, default=PacketPump.DEFAULT_BUDGET_MS)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    arrivals = bursty_traffic(args.bursts, args.seed)
+    print(f"{len(arrivals)} packets in {args.bursts} bursts, tick={TICK_MS}ms, "
+          f"handler={args.handler_ms}ms, budget={args.budget_ms}ms")
+    print(f"{'mode':<8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} {'max backlog':>12}")
+    for mode in ("single", "drain"):
+        latencies, max_backlog = run(mode, arrivals, args.handler_ms, args.budget_ms)
+        ms = [v * 1000 for v in latencies]
+        print(f"{mode:<8} {percentile(ms, 50):>10.1f} {percentile(ms, 95):>10.1f} "
+              f"{percentile(ms, 99):>10.1f} {max(ms):>10.1f} {max_backlog:>12}")
+
+
+if __name__ == "__main__":
+    main()
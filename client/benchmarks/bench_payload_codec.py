@@ -0,0 +1,135 @@
+"""Benchmark: kích thước và thời gian encode/decode payload - JSON vs compact1 (payload_codec.py).
+
+Mỗi dòng là một loại payload nóng (CHAT_BROADCAST, VOTE_RESULT, PHASE_*, PING/PONG) với dạng
+giống server gửi (PHASE_NIGHT kèm danh sách --players người chơi). Có MessagePack
+(`pip install msgpack`) thì in thêm cột msgpack để so sánh; không bắt buộc.
+
+Với --capture, payload lấy từ các packet IN của file capture (packet_capture.py) thay cho bộ
+mẫu dựng sẵn: mỗi header nóng một dòng, số liệu là trung bình trên các packet của header đó.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_payload_codec.py [--players 12] [--number 20000]
+    python3 benchmarks/bench_payload_codec.py --capture session.wwcap
+"""
+
+import argparse
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import payload_codec
+import protocol
+from packet_capture import DIRECTION_IN, read_capture
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def sample_payloads(players):
+    deadline = time.time()
+    names = [f"player{i:02d}" for i in range(players)]
+    return [
+        (protocol.CHAT_BROADCAST, {"username": names[0], "message": "I think player03 is a wolf, vote him",
+                                   "room_id": 3, "chat_type": "day"}),
+        (protocol.PHASE_NIGHT, {
+            "type": "phase_night", "duration": 120, "seer_duration": 30, "guard_duration": 30,
+            "wolf_duration": 60, "seer_deadline": deadline + 30, "guard_deadline": deadline + 60,
+            "wolf_deadline": deadline + 120,
+            "players": [{"username": name, "is_alive": int(i % 4 != 3)} for i, name in enumerate(names)],
+        }),
+        (protocol.PHASE_GUARD_START, {"type": "phase_guard_start", "guard_duration": 30,
+                                      "guard_deadline": deadline + 30, "wolf_deadline": deadline + 90}),
+        (protocol.PHASE_WOLF_START, {"type": "phase_wolf_start", "wolf_duration": 60,
+                                     "wolf_deadline": deadline + 60}),
+        (protocol.PHASE_DAY, {"type": "phase_day", "result": "killed", "targetId": names[3],
+                              "day_duration": 120, "day_deadline": deadline + 120}),
+        (protocol.VOTE_RESULT, {"type": "tie_break_start", "candidates": names[:3], "timer": 30,
+                                "deadline": deadline + 30}),
+        (protocol.VOTE_RESULT, {"type": "player_executed", "playerId": names[5]}),
+        (protocol.PING, {"type": "ping", "t0": deadline}),
+        (protocol.PONG, {"type": "pong", "t0": deadline, "t1": deadline + 0.01, "t2": deadline + 0.011}),
+    ]
+
+
+def capture_payloads(path):
+    """{header: [payload]} cho các header nóng trong capture"""
+    by_header = {}
+    for record in read_capture(path):
+        if record.direction == DIRECTION_IN and record.header in payload_codec.COMPACT_HEADERS:
+            by_header.setdefault(record.header, []).append(payload_codec.decode_payload(record.payload))
+    return sorted(by_header.items())
+
+
+def per_call_us(func, payloads, number):
+    """µs trung bình cho một payload (chạy `number` lượt qua cả danh sách)"""
+    loops = max(1, number // len(payloads))
+    elapsed = timeit.timeit(lambda: [func(p) for p in payloads], number=loops)
+    return elapsed / (loops * len(payloads)) * 1e6
+
+
+def measure(header, payloads, number):
+    codecs = {
+        "json": (lambda p: json.dumps(p).encode("utf-8"), protocol.decode_payload),
+        "compact1": (lambda p: payload_codec.encode_payload(header, p, compact=True),
+                     payload_codec.decode_payload),
+    }
+    if msgpack is not None:
+        codecs["msgpack"] = (msgpack.packb, msgpack.unpackb)
+
+    result = {}
+    for name, (encode, decode) in codecs.items():
+        encoded = [encode(p) for p in payloads]
+        if name == "compact1":
+            fallback = sum(1 for data in encoded if data[:1] != bytes((payload_codec.COMPACT_MARK,)))
+            if fallback:
+                print(f"[WARNING] {protocol.packet_name(header)}: {fallback} payload(s) fell back to JSON")
+        assert [decode(data) for data in encoded] == payloads, f"{name} round trip failed"
+        result[name] = (
+            sum(len(data) for data in encoded) / len(encoded),
+            per_call_us(encode, payloads, number),
+            per_call_us(decode, encoded, number),
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--number", type=int, default=20000, help="số lần encode/decode mỗi dòng")
+    parser.add_argument("--capture", help="lấy payload từ file capture")
+    args = parser.parse_args()
+
+    if args.capture:
+        rows = [(header, payloads) for header, payloads in capture_payloads(args.capture)]
+    else:
+        rows = [(header, [payload]) for header, payload in sample_payloads(args.players)]
+
+    names = ["json", "compact1"] + (["msgpack"] if msgpack is not None else [])
+    print("bytes / encode µs / decode µs per payload")
+    print(f"{'packet':<20} {'type':<18}" + "".join(f" {name:>24}" for name in names) + f" {'size':>6}")
+    totals = {name: [0.0, 0.0, 0.0] for name in names}
+    for header, payloads in rows:
+        result = measure(header, payloads, args.number)
+        kind = payloads[0].get("type", "") if len(payloads) == 1 else f"{len(payloads)} packets"
+        cells = "".join(f" {result[name][0]:>8.0f} {result[name][1]:>7.2f} {result[name][2]:>7.2f}"
+                        for name in names)
+        ratio = result["compact1"][0] / result["json"][0]
+        print(f"{protocol.packet_name(header):<20} {kind:<18}{cells} {ratio:>5.0%}")
+        for name in names:
+            for i in range(3):
+                totals[name][i] += result[name][i] * len(payloads)
+
+    count = sum(len(payloads) for _, payloads in rows)
+    cells = "".join(f" {totals[name][0] / count:>8.0f} {totals[name][1] / count:>7.2f} {totals[name][2] / count:>7.2f}"
+                    for name in names)
+    print(f"{'mean':<20} {'':<18}{cells} {totals['compact1'][0] / totals['json'][0]:>5.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: chi phí tạo label ảnh (logo, ảnh seer result) mỗi lần gọi.
+
+So sánh:
+- uncached: QPixmapCache tắt (cache limit 0) -> mỗi lần gọi decode PNG + SmoothTransformation
+            như trước khi có cache
+- cached:   pixmap đã scale lấy từ QPixmapCache (sau warm_image_cache)
+
+Chạy offscreen nên không cần màn hình; chỉ cần PyQt5.
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_pixmap_cache.py [--rounds 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from PyQt5 import QtGui, QtWidgets
+
+from utils import image_utils
+
+
+CASES = (
+    ("logo 120 (welcome)", lambda: image_utils.create_logo_label(size=120)),
+    ("logo 100 (login)", lambda: image_utils.create_logo_label(size=100)),
+    ("seer result (2 images)", lambda: (image_utils.create_image_icon_label("is_werewolf.png", size=180),
+                                        image_utils.create_image_icon_label("is_not_werewolf.png", size=180))),
+)
+
+
+def measure(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    default_limit = QtGui.QPixmapCache.cacheLimit()
+
+    QtGui.QPixmapCache.setCacheLimit(0)
+    uncached = [measure(fn, args.rounds) for _, fn in CASES]
+
+    QtGui.QPixmapCache.setCacheLimit(default_limit)
+    start = time.perf_counter()
+    warmed = image_utils.warm_image_cache()
+    warm_ms = (time.perf_counter() - start) * 1000
+    cached = [measure(fn, args.rounds) for _, fn in CASES]
+
+    print(f"warm_image_cache: {warmed} variants in {warm_ms:.1f} ms (dpr {app.devicePixelRatio()})")
+    print(f"{'case':<24} {'uncached ms':>12} {'cached ms':>10} {'speedup':>8}")
+    for (name, _), before, after in zip(CASES, uncached, cached):
+        print(f"{name:<24} {before:>12.3f} {after:>10.3f} {before / after if after else 0:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
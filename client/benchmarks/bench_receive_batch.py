@@ -0,0 +1,108 @@
+"""Benchmark: frames/giây của receive_packet một frame mỗi lần gọi C và batch.
+
+Server giả (thread Python) gửi sẵn N frame qua loopback, client đọc hết bằng:
+- single: ww_client_receive_into (mỗi frame một lần crossing ctypes + một recv())
+- batch:  ww_client_receive_many (đọc hết socket, tối đa RECV_BATCH_SIZE frame mỗi lần gọi)
+
+"C calls" đếm số lần gọi hàm C nhận (kể cả lần trả về 0 khi socket chưa có dữ liệu),
+"frames/call" = số frame lấy được trên mỗi lần crossing ctypes.
+
+Cần build lib trước (cd lib && make), không cần PyQt5 hay server thật.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_receive_batch.py [--frames 50000] [--payload-bytes 80]
+"""
+
+import argparse
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import protocol
+from network_client import WerewolfNetworkClient
+
+
+def serve_frames(listener, blob):
+    conn, _ = listener.accept()
+    try:
+        conn.sendall(blob)
+        # Giữ kết nối cho đến khi client đọc xong
+        conn.recv(1)
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+class CountingCall:
+    """Bọc hàm ctypes để đếm số lần gọi"""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.func(*args)
+
+
+def run(mode, frames, payload_bytes):
+    payload = {"type": "chat", "username": "bench", "message": "x" * payload_bytes}
+    blob = protocol.encode_packet(protocol.CHAT_BROADCAST, payload) * frames
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    server = threading.Thread(target=serve_frames, args=(listener, blob), daemon=True)
+    server.start()
+
+    client = WerewolfNetworkClient().create()
+    client.connect("127.0.0.1", listener.getsockname()[1])
+    receive = client._receive_single if mode == "single" else client.receive_packet
+    c_name = "ww_client_receive_into" if mode == "single" else "ww_client_receive_many"
+    c_func = getattr(client.lib, c_name)
+    counter = CountingCall(c_func)
+    setattr(client.lib, c_name, counter)
+
+    received = 0
+    try:
+        start = time.perf_counter()
+        while received < frames:
+            header, _ = receive()
+            if header is not None:
+                received += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        setattr(client.lib, c_name, c_func)
+
+    client.disconnect()
+    client.destroy()
+    listener.close()
+    server.join(1.0)
+    return received / elapsed, counter.calls, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=50000)
+    parser.add_argument("--payload-bytes", type=int, default=80)
+    args = parser.parse_args()
+
+    probe = WerewolfNetworkClient()
+    if not hasattr(probe.lib, "ww_client_receive_many"):
+        sys.exit("libwerewolf_client.so chưa có ww_client_receive_many - hãy build lại (cd lib && make)")
+
+    print(f"{args.frames} frames, payload ~{args.payload_bytes} bytes, "
+          f"batch={WerewolfNetworkClient.RECV_BATCH_SIZE}")
+    print(f"{'mode':<8} {'frames/s':>12} {'C calls':>10} {'frames/call':>12}")
+    for mode in ("single", "batch"):
+        rate, calls, received = run(mode, args.frames, args.payload_bytes)
+        print(f"{mode:<8} {rate:>12.0f} {calls:>10} {received / max(calls, 1):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
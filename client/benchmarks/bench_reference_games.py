@@ -0,0 +1,84 @@
+"""Benchmark: chơi nhiều ván tăng tốc giữa BotSwarm và reference server trong cùng process.
+
+Không cần server C / MySQL: ReferenceServer (client/src/reference_server) chạy trên cùng event
+loop với bot, thời lượng phase nhân --time-scale, think time của bot = 0. Mọi đường nóng
+phía client đều chạy thật: FrameDecoder, AsyncWerewolfNetworkClient (hoặc
+WerewolfNetworkClient với --transport ctypes), Bot.pump và chiến lược của từng vai.
+
+In ra: số ván / giây, packet / giây hai chiều, thời gian mỗi ván, kết quả thắng thua; với
+--profile in thêm các hàm tốn thời gian nhất (cProfile) để tìm hot path phía client. Mặc định
+bot và server thống nhất codec compact1 (payload_codec.py); --json giữ mọi payload là JSON.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_reference_games.py [--bots 48] [--room-size 8] [--games 50]
+    python3 benchmarks/bench_reference_games.py --games 200 --time-scale 0.0005 --profile
+    python3 benchmarks/bench_reference_games.py --json    # không HELLO, mọi payload JSON (so sánh)
+"""
+
+import argparse
+import asyncio
+import cProfile
+import pstats
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import payload_codec
+from bot import BotConfig, BotSwarm
+from reference_server import ReferenceServer, ServerConfig
+
+
+async def run(args):
+    rooms = -(-args.bots // args.room_size)
+    codecs = (payload_codec.CODEC_JSON,) if args.json else payload_codec.SUPPORTED_CODECS
+    server_config = ServerConfig(port=0, max_rooms=rooms, max_sessions=args.bots, codecs=codecs, seed=args.seed)
+    async with ReferenceServer(server_config.scaled(args.time_scale)) as server:
+        config = BotConfig(port=server.port, transport=args.transport, room_size=args.room_size,
+                           games=args.games, think_time=(0, 0), codecs=codecs, seed=args.seed)
+        swarm = BotSwarm(args.bots, config)
+        t0 = time.perf_counter()
+        await swarm.run()
+        elapsed = time.perf_counter() - t0
+        swarm.close()
+
+    games = server.stats["games_finished"]
+    print(f"{args.bots} bots, rooms of {args.room_size}, {args.games} games/bot, "
+          f"time scale {args.time_scale}, transport {args.transport}, codec {codecs[0]}")
+    print(f"games finished               {games:>10}")
+    print(f"wall time s                  {elapsed:>10.2f}")
+    print(f"games per s                  {games / elapsed:>10.1f}")
+    print(f"ms per game (per room)       {elapsed * 1000 / max(games, 1) * rooms:>10.1f}")
+    print(f"packets to clients per s     {server.stats['packets_out'] / elapsed:>10.0f}")
+    print(f"packets to server per s      {server.stats['packets_in'] / elapsed:>10.0f}")
+    print(f"bytes per packet to clients  {server.stats['bytes_out'] / max(server.stats['packets_out'], 1):>10.1f}")
+    print(f"bot packets handled          {swarm.stats['packets']:>10}")
+    print(f"winners                      {dict(server.winners)}")
+    print(f"bot errors                   {swarm.stats['errors']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=48)
+    parser.add_argument("--room-size", type=int, default=8)
+    parser.add_argument("--games", type=int, default=50, help="số ván mỗi bot")
+    parser.add_argument("--time-scale", type=float, default=0.001)
+    parser.add_argument("--transport", choices=("async", "ctypes"), default="async")
+    parser.add_argument("--json", action="store_true", help="bot và server chỉ dùng JSON (không HELLO)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", action="store_true", help="in top 25 hàm theo tottime")
+    args = parser.parse_args()
+
+    if not args.profile:
+        asyncio.run(run(args))
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    asyncio.run(run(args))
+    profiler.disable()
+    pstats.Stats(profiler).sort_stats("tottime").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
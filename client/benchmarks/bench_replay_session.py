@@ -0,0 +1,142 @@
+"""Benchmark: phát lại một phiên đã capture qua toàn bộ GUI (dispatcher -> window handler).
+
+Capture (WEREWOLF_CAPTURE=<file> python3 main.py, hoặc tự sinh) được phát lại vào
+WerewolfApplication thật với ReplayNetworkClient thay cho socket: LOGIN_RES đưa app từ màn
+login sang lobby, CREATE/JOIN_ROOM_RES vào RoomWindow, rồi role card, ban đêm, ban ngày,
+game result... đúng như khi chơi. Với --speed 0 (mặc định) packet được đẩy nhanh nhất có thể
+(mỗi lượt event loop một packet) nên đây là benchmark throughput của handler trong các
+window (RoomWindow và các màn hình nó mở ra).
+
+Không truyền file: tự sinh capture bằng cách chạy --bots bot (transport ctypes, cần
+lib/libwerewolf_client.so) với reference server trong cùng process và capture connection
+của bot đầu tiên.
+
+In ra: packet/s, thời gian dispatch (handler đồng bộ) theo header, window cuối cùng và các
+header OUT lệch so với capture.
+
+Chạy:
+    cd client
+    python3 benchmarks/bench_replay_session.py [capture.wwcap] [--speed 0] [--repeat 3]
+    python3 benchmarks/bench_replay_session.py --games 3 --keep session.wwcap
+    QT_QPA_PLATFORM=xcb python3 benchmarks/bench_replay_session.py session.wwcap --speed 1 --max-gap 2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("WEREWOLF_PREWARM", "0")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from PyQt5 import QtCore
+
+import protocol
+from packet_capture import read_capture, summarize
+from utils.packet_replay import PacketReplayer, ReplayNetworkClient
+
+
+def generate_capture(path, args):
+    """Chơi args.games ván giữa args.bots bot và reference server, capture bot đầu tiên"""
+    from bot import BotConfig, BotSwarm
+    from reference_server import ReferenceServer, ServerConfig
+
+    class CapturingSwarm(BotSwarm):
+        async def open_client(self):
+            client = await super().open_client()
+            if self.captured is None:
+                client.start_capture(path)
+                self.captured = client
+            return client
+
+    async def run():
+        server_config = ServerConfig(port=0, seed=args.seed).scaled(args.time_scale)
+        async with ReferenceServer(server_config) as server:
+            config = BotConfig(port=server.port, transport="ctypes", room_size=args.bots,
+                               games=args.games, think_time=(0, 0.002), seed=args.seed)
+            swarm = CapturingSwarm(args.bots, config)
+            swarm.captured = None
+            await swarm.run()
+            swarm.captured.stop_capture()
+            swarm.close()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run())
+
+
+def replay(application, records, args):
+    """Một lượt phát lại từ màn login; trả về PacketReplayer đã chạy xong"""
+    window_manager = application.window_manager
+    window_manager.set_shared_data("connected", True)
+    window_manager.navigate_to("login")
+    application.app.processEvents()
+
+    # QEventLoop riêng: app.quit() sẽ kích hoạt cleanup() (destroy network client) của main.py
+    loop = QtCore.QEventLoop()
+    replayer = PacketReplayer(application.network_client, records, speed=args.speed, max_gap=args.max_gap)
+    replayer.finished.connect(loop.quit)
+    replayer.start()
+    loop.exec_()
+    return replayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", nargs="?", help="file capture (bỏ trống: tự sinh)")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = nhanh nhất; 1 = nhịp gốc")
+    parser.add_argument("--max-gap", type=float, default=None, help="giây, cắt khoảng lặng dài hơn")
+    parser.add_argument("--repeat", type=int, default=3, help="số lượt phát lại (lấy lượt nhanh nhất)")
+    parser.add_argument("--bots", type=int, default=8, help="khi tự sinh capture")
+    parser.add_argument("--games", type=int, default=1, help="khi tự sinh capture")
+    parser.add_argument("--time-scale", type=float, default=0.001, help="khi tự sinh capture")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", help="lưu capture tự sinh vào file này")
+    args = parser.parse_args()
+
+    path = args.capture
+    if path is None:
+        path = args.keep or os.path.join(tempfile.mkdtemp(prefix="wwcap-"), "session.wwcap")
+        generate_capture(path, args)
+    records = list(read_capture(path))
+    counts, duration = summarize(records)
+    inbound = sum(count for (direction, _), count in counts.items() if direction == 0)
+    print(f"{path}: {len(records)} packets ({inbound} in), captured over {duration:.3f} s")
+
+    from main import WerewolfApplication
+    best = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        application = WerewolfApplication(ReplayNetworkClient())
+    for _ in range(args.repeat):
+        application.network_client.sent.clear()
+        # Window in log [DEBUG] rất nhiều; không tính vào kết quả
+        with contextlib.redirect_stdout(io.StringIO()):
+            replayer = replay(application, records, args)
+        if best is None or replayer.elapsed < best.elapsed:
+            best = replayer
+        final_window = application.window_manager.current_window
+
+    packets = len(best.inbound)
+    print(f"replay speed {args.speed or 'max'}, best of {args.repeat}")
+    print(f"packets replayed             {packets:>10}")
+    print(f"wall time ms                 {best.elapsed * 1000:>10.1f}")
+    print(f"packets per s                {packets / best.elapsed:>10.0f}")
+    print(f"final window                 {final_window!s:>10}")
+    print(f"{'header':<26} {'count':>6} {'median ms':>10} {'max ms':>8} {'total ms':>9}")
+    by_total = sorted(best.handler_ms.items(), key=lambda item: -sum(item[1]))
+    for header, samples in by_total:
+        print(f"{protocol.packet_name(header):<26} {len(samples):>6} {statistics.median(samples):>10.3f} "
+              f"{max(samples):>8.2f} {sum(samples):>9.1f}")
+    diff = best.outbound_diff()
+    if diff:
+        print("OUT headers differing from capture (capture, replay): "
+              + ", ".join(f"{protocol.packet_name(h)}={v}" for h, v in diff.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: thời gian từ lúc khởi động process tới frame đầu tiên của welcome window.
+
+Mỗi lần đo chạy một process Python mới (gồm cả import PyQt5, load QSS, lib C):
+- eager: tạo tất cả cửa sổ trước khi hiện welcome (như init_windows cũ)
+- lazy:  chỉ tạo welcome, các cửa sổ khác là factory; sau frame đầu prewarm() tạo dần
+         trong event loop (cột "prewarm ms" = thời gian tới khi tạo xong tất cả)
+
+Chạy offscreen nên không cần màn hình; cần PyQt5 và lib đã build (cd lib && make).
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CLIENT_DIR = Path(__file__).parent.parent
+
+
+def child(mode):
+    t0 = float(os.environ["BENCH_T0"])
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(CLIENT_DIR))
+    import main
+    from PyQt5 import QtCore
+
+    application = main.WerewolfApplication()
+    window_manager = application.window_manager
+    if mode == "eager":
+        for name in window_manager.windows.pending():
+            window_manager.ensure_window(name)
+    result = {"mode": mode, "windows_built": len(window_manager.windows)}
+
+    class FirstPaint(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint and "first_paint_ms" not in result:
+                result["first_paint_ms"] = (time.time() - t0) * 1000
+                QtCore.QTimer.singleShot(0, after_paint)
+            return False
+
+    def after_paint():
+        start = time.perf_counter()
+        application.prewarm()
+
+        def poll():
+            if window_manager.windows.pending():
+                QtCore.QTimer.singleShot(1, poll)
+                return
+            result["prewarm_ms"] = (time.perf_counter() - start) * 1000
+            application.app.quit()
+        poll()
+
+    hook = FirstPaint()
+    application.welcome_window.installEventFilter(hook)
+    window_manager.navigate_to("welcome")
+    application.app.exec_()
+    print("BENCH " + json.dumps(result), flush=True)
+
+
+def run_once(mode):
+    env = dict(os.environ, BENCH_T0=repr(time.time()), QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    out = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", mode],
+        cwd=str(CLIENT_DIR), env=env, capture_output=True, text=True, timeout=120,
+    ).stdout
+    for line in reversed(out.splitlines()):
+        if line.startswith("BENCH "):
+            return json.loads(line[6:])
+    raise RuntimeError(f"child {mode} produced no result:\n{out[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=("eager", "lazy"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    print(f"median of {args.runs} runs")
+    print(f"{'mode':<6} {'first paint ms':>15} {'built at paint':>15} {'prewarm ms':>11}")
+    for mode in ("eager", "lazy"):
+        results = sorted((run_once(mode) for _ in range(args.runs)), key=lambda r: r["first_paint_ms"])
+        mid = results[len(results) // 2]
+        print(f"{mode:<6} {mid['first_paint_ms']:>15.0f} {mid['windows_built']:>15} {mid['prewarm_ms']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
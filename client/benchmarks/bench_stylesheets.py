@@ -0,0 +1,202 @@
+"""Benchmark: số lần parse stylesheet (setStyleSheet) trong một ván chơi giả lập.
+
+Mỗi lần gọi QWidget.setStyleSheet Qt phải parse lại CSS và re-polish widget (cùng các
+widget con). Script đếm số lần gọi / số ký tự CSS / thời gian nằm trong setStyleSheet
+theo từng giai đoạn, cùng số lần re-polish qua utils.style_utils (đổi dynamic property):
+- startup: tạo tất cả cửa sổ (như prewarm)
+- lobby:   refresh danh sách phòng nhiều lần, trạng thái phòng đổi
+- room:    người chơi vào phòng (toast), game start, role card
+- night N / day N: PHASE_NIGHT -> seer/guard/wolf -> PHASE_DAY, chat, vote
+- result:  GAME_OVER -> game_result
+
+Chạy offscreen nên không cần màn hình; cần PyQt5 và lib đã build (cd lib && make).
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_stylesheets.py [--nights 3] [--players 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+CLIENT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_DIR))
+sys.path.insert(0, str(CLIENT_DIR / "src"))
+
+from PyQt5 import QtWidgets
+
+
+class StyleSheetCounter:
+    """Bọc QWidget.setStyleSheet để đếm số lần gọi, số ký tự và thời gian"""
+
+    def __init__(self):
+        self.calls = 0
+        self.chars = 0
+        self.seconds = 0.0
+        self._original = QtWidgets.QWidget.setStyleSheet
+        counter = self
+
+        def counted(widget, sheet):
+            counter.calls += 1
+            counter.chars += len(sheet or "")
+            start = time.perf_counter()
+            try:
+                return counter._original(widget, sheet)
+            finally:
+                counter.seconds += time.perf_counter() - start
+
+        QtWidgets.QWidget.setStyleSheet = counted
+
+        # style_utils.set_style_property gọi repolish qua global của module nên bọc được
+        from utils import style_utils
+        self.repolishes = 0
+        original_repolish = style_utils.repolish
+
+        def counted_repolish(widget):
+            counter.repolishes += 1
+            start = time.perf_counter()
+            try:
+                return original_repolish(widget)
+            finally:
+                counter.seconds += time.perf_counter() - start
+
+        style_utils.repolish = counted_repolish
+
+    def snapshot(self):
+        return (self.calls, self.chars, self.seconds, self.repolishes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--chat", type=int, default=20, help="tin nhắn day chat mỗi ngày")
+    args = parser.parse_args()
+
+    counter = StyleSheetCounter()
+    import main as app_main
+
+    rows = []
+
+    def stage(name, fn):
+        before = counter.snapshot()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+            pump()
+        wall = time.perf_counter() - start
+        after = counter.snapshot()
+        rows.append((name, after[0] - before[0], after[1] - before[1], after[3] - before[3],
+                     (after[2] - before[2]) * 1000, wall * 1000))
+
+    application = None
+
+    def pump():
+        if application is not None:
+            for _ in range(3):
+                application.app.processEvents()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        application = app_main.WerewolfApplication()
+    window_manager = application.window_manager
+    # Không có server: mọi lệnh gửi thành no-op (tránh dialog "Connection lost" chặn script)
+    for name in dir(application.network_client):
+        if name.startswith("send_"):
+            setattr(application.network_client, name, lambda *a, **k: None)
+    room_state = window_manager.get_shared_data("room_state")
+    usernames = [f"player{i}" for i in range(args.players)]
+    wolves = usernames[:2]
+    window_manager.set_shared_data("username", usernames[0])
+    window_manager.set_shared_data("current_room_id", 1)
+
+    def startup():
+        window_manager.navigate_to("welcome")
+        for name in window_manager.windows.pending():
+            window_manager.ensure_window(name)
+
+    def lobby():
+        window_manager.navigate_to("lobby")
+        lobby_window = window_manager.windows["lobby"]
+        for refresh in range(10):
+            lobby_window.update_room_table([
+                {"id": i, "name": f"Room {i}", "current": (i + refresh) % 8, "max": 8, "status": (i + refresh) % 2}
+                for i in range(1, 9)
+            ])
+
+    room = window_manager.windows["room"] if "room" in window_manager.windows else None
+
+    def enter_room():
+        nonlocal room
+        room = window_manager.windows["room"]
+        room_state.set_players([{"username": usernames[0]}])
+        for index, username in enumerate(usernames[1:], start=2):
+            room._handle_room_status_update({"type": "player_joined", "username": username, "current_players": index})
+        room_state.set_role_info({"role": 1, "werewolf_team": wolves})
+        window_manager.navigate_to("role_card")
+
+    players = [{"username": u, "is_alive": 1, "role": 1 if u in wolves else 0} for u in usernames]
+
+    def night(number):
+        def run():
+            now = time.time()
+            room._handle_phase_night({"players": players, "seer_deadline": now + 30,
+                                      "guard_deadline": now + 60, "wolf_deadline": now + 90})
+            room.start_night_phase(90)
+            room._handle_phase_guard_start({"guard_deadline": now + 60, "wolf_deadline": now + 90})
+            room._handle_phase_wolf_start({"wolf_deadline": now + 90})
+            wolf_chat = window_manager.windows["wolf_chat"]
+            for i in range(5):
+                wolf_chat.append_message(wolves[i % 2], f"wolf message {i}")
+        return run
+
+    def day(number):
+        def run():
+            victim = usernames[-number]
+            for p in players:
+                if p["username"] == victim:
+                    p["is_alive"] = 0
+            room._handle_phase_day({"result": "killed", "targetId": victim, "day_deadline": time.time() + 60})
+            window_manager.navigate_to("day_chat")
+            day_chat = window_manager.windows["day_chat"]
+            for i in range(args.chat):
+                day_chat.append_message(usernames[i % len(usernames)], f"day message {i}")
+            pump()
+            window_manager.navigate_to("day_vote")
+            vote = window_manager.windows["day_vote"]
+            alive = [u for u in usernames if room_state.is_alive(u) and u != usernames[0]]
+            vote._on_card_clicked(alive[0])
+            vote._on_card_clicked(alive[1])
+            room._handle_vote_result({"type": "tie_break_start", "candidates": alive[:2], "deadline": time.time() + 30})
+            application.toast_manager.info("Vote recorded")
+        return run
+
+    def result():
+        room._handle_game_over({"winner": "villagers", "players": players})
+
+    stage("startup", startup)
+    stage("lobby", lobby)
+    stage("room", enter_room)
+    for n in range(1, args.nights + 1):
+        stage(f"night {n}", night(n))
+        stage(f"day {n}", day(n))
+    stage("result", result)
+
+    print(f"{args.players} players, {args.nights} nights, {args.chat} chat messages/day")
+    # ms: thời gian nằm trong setStyleSheet/repolish; stage ms: cả giai đoạn (gồm polish
+    # trễ lúc show và xử lý event)
+    print(f"{'stage':<10} {'setStyleSheet':>14} {'css chars':>10} {'repolish':>9} {'ms':>8} {'stage ms':>9}")
+    for name, calls, chars, repolishes, ms, wall in rows:
+        print(f"{name:<10} {calls:>14} {chars:>10} {repolishes:>9} {ms:>8.1f} {wall:>9.1f}")
+    for label, subset in (("game", rows[1:]), ("total", rows)):
+        print(f"{label:<10} {sum(r[1] for r in subset):>14} {sum(r[2] for r in subset):>10} "
+              f"{sum(r[3] for r in subset):>9} {sum(r[4] for r in subset):>8.1f} {sum(r[5] for r in subset):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
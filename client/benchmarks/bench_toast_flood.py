@@ -0,0 +1,111 @@
+"""Benchmark: một loạt toast dồn dập (như ROOM_STATUS_UPDATE join/leave liên tục).
+
+Gửi --messages thông báo, mỗi --interval ms một cái, xen kẽ:
+- join/leave của --players người chơi (nội dung lặp lại theo vòng)
+- thông báo trùng hệt nhau ("Vote recorded")
+rồi để event loop chạy thêm --settle ms (animation, timer ẩn toast).
+
+In ra: số ToastNotification đã tạo, số toast hiện cùng lúc nhiều nhất, thời gian nằm trong
+show_toast, và độ trễ lớn nhất của một timer 16 ms (GUI thread có bị nghẽn không).
+
+Chạy offscreen nên không cần màn hình; chỉ cần PyQt5.
+
+Chạy:
+    cd client
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_toast_flood.py [--messages 300] [--interval 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+CLIENT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_DIR / "src"))
+from PyQt5 import QtCore, QtWidgets
+
+from components import toast_notification
+from components.toast_notification import ToastManager, ToastNotification
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--interval", type=int, default=5, help="ms giữa hai thông báo")
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--settle", type=int, default=1500, help="ms chạy event loop sau loạt thông báo")
+    args = parser.parse_args()
+
+    # Bỏ cảnh báo "This plugin does not support raise()" của platform offscreen
+    QtCore.qInstallMessageHandler(lambda mode, context, message: None)
+    app = QtWidgets.QApplication(sys.argv)
+    qss = CLIENT_DIR / "assets" / "werewolf_theme.qss"
+    app.setStyleSheet(qss.read_text(encoding="utf-8"))
+    window = QtWidgets.QWidget()
+    window.resize(1000, 750)
+    window.show()
+    manager = ToastManager(window)
+
+    created = 0
+    original_init = ToastNotification.__init__
+
+    def counted_init(self, *a, **k):
+        nonlocal created
+        created += 1
+        original_init(self, *a, **k)
+
+    toast_notification.ToastNotification.__init__ = counted_init
+
+    # Độ trễ event loop: timer 16 ms, ghi lại khoảng cách lớn nhất giữa hai lần chạy
+    lag = {"last": None, "max": 0.0}
+
+    def tick():
+        now = time.perf_counter()
+        if lag["last"] is not None:
+            lag["max"] = max(lag["max"], (now - lag["last"]) * 1000 - 16)
+        lag["last"] = now
+
+    frame_timer = QtCore.QTimer()
+    frame_timer.timeout.connect(tick)
+    frame_timer.start(16)
+
+    def visible_toasts():
+        return sum(1 for t in window.findChildren(ToastNotification) if t.isVisible())
+
+    in_show = 0.0
+    max_visible = 0
+    start = time.perf_counter()
+    for i in range(args.messages):
+        if i % 3 == 2:
+            message = "Vote recorded"
+        else:
+            player = (i // 3) % args.players
+            action = "joined" if (i // (3 * args.players)) % 2 == 0 else "left"
+            message = f"👤 player{player} {action} the room"
+        t0 = time.perf_counter()
+        manager.show_toast(message, "info")
+        in_show += time.perf_counter() - t0
+        deadline = time.perf_counter() + args.interval / 1000
+        while time.perf_counter() < deadline:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 1)
+        max_visible = max(max_visible, visible_toasts())
+    flood_ms = (time.perf_counter() - start) * 1000
+
+    deadline = time.perf_counter() + args.settle / 1000
+    while time.perf_counter() < deadline:
+        app.processEvents(QtCore.QEventLoop.AllEvents, 5)
+        max_visible = max(max_visible, visible_toasts())
+
+    print(f"{args.messages} messages every {args.interval} ms ({flood_ms:.0f} ms), settle {args.settle} ms")
+    print(f"toast widgets created   {created:>8}")
+    print(f"toast widgets alive     {len(window.findChildren(ToastNotification)):>8}")
+    print(f"max visible at once     {max_visible:>8}")
+    print(f"visible after settle    {visible_toasts():>8}")
+    print(f"ms inside show_toast    {in_show * 1000:>8.1f}")
+    print(f"max event loop lag ms   {lag['max']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,8 @@ WerewolfClient* ww_client_create() {
     c->rbuf = NULL;
     c->rbuf_len = 0;
     c->rbuf_cap = 0;
+    memset(&c->wq, 0, sizeof(c->wq));
+    memset(&c->hq, 0, sizeof(c->hq));
     memset(c->last_error, 0, sizeof(c->last_error));
     return c;
 }
@@ -60,51 +62,152 @@ int ww_client_connect(WerewolfClient* c, const char* host, int port) {
     return 0;
 }
 
-// Hàm gửi dữ liệu
-int ww_client_send(WerewolfClient* c, unsigned short header, const char* json) {
-    if (!c || !c->is_connected) return -1;
+#ifdef MSG_NOSIGNAL
+#define WW_SEND_FLAGS MSG_NOSIGNAL
+#else
+#define WW_SEND_FLAGS 0
+#endif
+
+static size_t outq_pending(const WWOutQueue* q) {
+    return q->len - q->off;
+}
+
+static void outq_clear(WWOutQueue* q) {
+    q->off = q->len = q->frame_start = 0;
+}
+
+static size_t outq_frame_end(const WWOutQueue* q) {
+    const unsigned char* p = q->buf + q->frame_start;
+    uint32_t length = (uint32_t)((p[2] << 24) | (p[3] << 16) | (p[4] << 8) | p[5]);
+    return q->frame_start + 6 + length;
+}
+
+// Thêm một frame vào cuối hàng đợi (buffer dùng lại giữa các lần gửi, không malloc mỗi packet)
+static int outq_push(WerewolfClient* c, WWOutQueue* q, unsigned short header,
+                     const char* payload, size_t plen) {
+    size_t tlen = 6 + plen;
+    if (outq_pending(&c->wq) + outq_pending(&c->hq) + tlen > WW_SEND_QUEUE_MAX) {
+        set_error(c, "Send queue full");
+        return -1;
+    }
 
-    int plen = json ? strlen(json) : 0;
-    int tlen = 6 + plen;
-    unsigned char* buf = malloc(tlen);
+    if (q->len + tlen > q->cap) {
+        // Dồn phần chưa gửi về đầu buffer trước khi nới (giữ từ frame_start: cần header
+        // của frame đang gửi dở để biết ranh giới)
+        if (q->frame_start > 0) {
+            size_t keep = q->len - q->frame_start;
+            memmove(q->buf, q->buf + q->frame_start, keep);
+            q->off -= q->frame_start;
+            q->len = keep;
+            q->frame_start = 0;
+        }
+        if (q->len + tlen > q->cap) {
+            size_t new_cap = q->cap ? q->cap : 4096;
+            while (new_cap < q->len + tlen) new_cap *= 2;
+            unsigned char* nb = realloc(q->buf, new_cap);
+            if (!nb) {
+                set_error(c, "Buffer alloc failed");
+                return -1;
+            }
+            q->buf = nb;
+            q->cap = new_cap;
+        }
+    }
 
+    unsigned char* buf = q->buf + q->len;
     buf[0] = header >> 8;
     buf[1] = header & 0xFF;
     buf[2] = (plen >> 24) & 0xFF;
     buf[3] = (plen >> 16) & 0xFF;
     buf[4] = (plen >> 8) & 0xFF;
     buf[5] = plen & 0xFF;
+    if (plen > 0) memcpy(buf + 6, payload, plen);
+    q->len += tlen;
+    return (int)tlen;
+}
 
-    if (plen > 0) memcpy(buf + 6, json, plen);
+// Gửi tối đa `limit` byte từ q. Returns 1 nếu gửi được, 0 nếu EAGAIN, -1 nếu lỗi
+static int outq_send(WerewolfClient* c, WWOutQueue* q, size_t limit) {
+    int sent = send(c->sock, q->buf + q->off, limit - q->off, WW_SEND_FLAGS);
+    if (sent < 0) {
+        if (errno == EWOULDBLOCK || errno == EAGAIN || errno == EINTR) return 0;
+        set_error(c, "Send failed");
+        return -1;
+    }
+    q->off += (size_t)sent;
+    // Tiến frame_start qua các frame đã gửi trọn
+    while (q->frame_start < q->len && outq_frame_end(q) <= q->off) {
+        q->frame_start = outq_frame_end(q);
+    }
+    if (q->off == q->len) outq_clear(q);
+    return 1;
+}
 
-    // Gửi tất cả dữ liệu ngay cả khi ở chế độ non-blocking
-    int total_sent = 0;
-    while (total_sent < tlen) {
-        int sent = send(c->sock, buf + total_sent, tlen - total_sent, 0);
-        if (sent < 0) {
-            if (errno == EWOULDBLOCK || errno == EAGAIN) {
-                // Đợi rồi thử lại
-                continue;
-            }
-            set_error(c, "Send failed");
-            free(buf);
-            return -1;
+int ww_client_flush(WerewolfClient* c) {
+    if (!c || !c->is_connected) return -1;
+
+    for (;;) {
+        WWOutQueue* q;
+        size_t limit;
+        if (c->wq.frame_start != c->wq.off) {
+            // Đang gửi dở một frame thường: phải gửi hết frame đó trước
+            q = &c->wq;
+            limit = outq_pending(&c->hq) ? outq_frame_end(q) : q->len;
+        } else if (outq_pending(&c->hq)) {
+            q = &c->hq;
+            limit = q->len;
+        } else if (outq_pending(&c->wq)) {
+            q = &c->wq;
+            limit = q->len;
+        } else {
+            return 0;
         }
-        total_sent += sent;
+
+        int r = outq_send(c, q, limit);
+        if (r < 0) return -1;
+        if (r == 0) return 1; // socket đầy, đợi writable
     }
-    
-    free(buf);
-    return total_sent;
+}
+
+int ww_client_send_queue_bytes(WerewolfClient* c) {
+    if (!c) return 0;
+    return (int)(outq_pending(&c->wq) + outq_pending(&c->hq));
+}
+
+// Hàm gửi dữ liệu: xếp hàng rồi flush không chặn
+static int send_frame(WerewolfClient* c, WWOutQueue* q, unsigned short header,
+                      const char* payload, int len) {
+    if (!c || !c->is_connected || len < 0) return -1;
+    int queued = outq_push(c, q, header, payload, (size_t)len);
+    if (queued < 0) return -1;
+    if (ww_client_flush(c) < 0) return -1;
+    return queued;
+}
+
+int ww_client_send(WerewolfClient* c, unsigned short header, const char* json) {
+    return send_frame(c, c ? &c->wq : NULL, header, json, json ? (int)strlen(json) : 0);
+}
+
+int ww_client_send_priority(WerewolfClient* c, unsigned short header, const char* json) {
+    return send_frame(c, c ? &c->hq : NULL, header, json, json ? (int)strlen(json) : 0);
+}
+
+int ww_client_send_len(WerewolfClient* c, unsigned short header, const char* payload, int len) {
+    return send_frame(c, c ? &c->wq : NULL, header, payload, len);
+}
+
+int ww_client_send_priority_len(WerewolfClient* c, unsigned short header, const char* payload, int len) {
+    return send_frame(c, c ? &c->hq : NULL, header, payload, len);
 }
 
 int ww_client_ping_send(WerewolfClient* c) {
     // Client-initiated ping to keep connection active / detect dead links.
-    return ww_client_send(c, PING, "{\"type\":\"ping\"}");
+    return ww_client_send_priority(c, PING, "{\"type\":\"ping\"}");
 }
 
 int ww_client_pong_send(WerewolfClient* c) {
     // Reply to server PING.
-    return ww_client_send(c, PONG, "{\"type\":\"pong\"}");
+    return ww_client_send_priority(c, PONG, "{\"type\":\"pong\"}");
 }
 
 // Hàm nhận dữ liệu (non-blocking)
@@ -119,18 +222,16 @@ static int ensure_capacity(WerewolfClient* c, size_t need) {
     return 1;
 }
 
-int ww_client_receive(WerewolfClient* c, unsigned short* h, char* out, int max) {
-    if (!c || !c->is_connected) return -1;
-
-    // Đọc bất kỳ byte nào có sẵn
-    unsigned char tmp[4096];
-    int r = recv(c->sock, tmp, sizeof(tmp), 0);
+// Đọc bất kỳ byte nào có sẵn thẳng vào rbuf (không qua buffer tạm)
+// Trả về 0 nếu OK (kể cả EAGAIN), -1 nếu lỗi/server đóng
+#define WW_RECV_CHUNK 16384
+static int fill_rbuf(WerewolfClient* c) {
+    if (!ensure_capacity(c, c->rbuf_len + WW_RECV_CHUNK)) {
+        set_error(c, "Buffer alloc failed");
+        return -1;
+    }
+    int r = recv(c->sock, c->rbuf + c->rbuf_len, c->rbuf_cap - c->rbuf_len, 0);
     if (r > 0) {
-        if (!ensure_capacity(c, c->rbuf_len + r)) {
-            set_error(c, "Buffer alloc failed");
-            return -1;
-        }
-        memcpy(c->rbuf + c->rbuf_len, tmp, r);
         c->rbuf_len += r;
     } else if (r < 0) {
         if (errno != EWOULDBLOCK && errno != EAGAIN) {
@@ -142,13 +243,32 @@ int ww_client_receive(WerewolfClient* c, unsigned short* h, char* out, int max)
         c->is_connected = 0;
         return -1;
     }
+    return 0;
+}
 
+// Frame đầu tiên trong rbuf đã đủ chưa: 1 nếu đủ (điền header/length), 0 nếu chưa
+static int peek_frame(WerewolfClient* c, unsigned short* h, uint32_t* length) {
     // Cần ít nhất 6 byte (header + độ dài)
     if (c->rbuf_len < 6) return 0;
-    uint16_t header = (uint16_t)((c->rbuf[0] << 8) | c->rbuf[1]);
-    uint32_t length = (uint32_t)((c->rbuf[2] << 24) | (c->rbuf[3] << 16) | (c->rbuf[4] << 8) | c->rbuf[5]);
-    size_t frame_size = 6 + length;
-    if (c->rbuf_len < frame_size) return 0; // đợi thêm dữ liệu
+    *h = (uint16_t)((c->rbuf[0] << 8) | c->rbuf[1]);
+    *length = (uint32_t)((c->rbuf[2] << 24) | (c->rbuf[3] << 16) | (c->rbuf[4] << 8) | c->rbuf[5]);
+    return c->rbuf_len >= 6 + (size_t)*length; // chưa đủ thì đợi thêm dữ liệu
+}
+
+static void consume_frame(WerewolfClient* c, uint32_t length) {
+    size_t frame_size = 6 + (size_t)length;
+    size_t remaining = c->rbuf_len - frame_size;
+    if (remaining > 0) memmove(c->rbuf, c->rbuf + frame_size, remaining);
+    c->rbuf_len = remaining;
+}
+
+int ww_client_receive(WerewolfClient* c, unsigned short* h, char* out, int max) {
+    if (!c || !c->is_connected) return -1;
+    if (fill_rbuf(c) < 0) return -1;
+
+    unsigned short header;
+    uint32_t length;
+    if (!peek_frame(c, &header, &length)) return 0;
     if ((int)length >= max) {
         set_error(c, "Payload too large");
         return -1;
@@ -156,12 +276,82 @@ int ww_client_receive(WerewolfClient* c, unsigned short* h, char* out, int max)
     memcpy(out, c->rbuf + 6, length);
     out[length] = 0;
     *h = header;
-    size_t remaining = c->rbuf_len - frame_size;
-    if (remaining > 0) memmove(c->rbuf, c->rbuf + frame_size, remaining);
-    c->rbuf_len = remaining;
+    consume_frame(c, length);
     return header;
 }
 
+int ww_client_receive_into(WerewolfClient* c, unsigned short* h, char* out, int max, int* out_len) {
+    if (!c || !c->is_connected) return -1;
+    if (fill_rbuf(c) < 0) return -1;
+
+    unsigned short header;
+    uint32_t length;
+    if (!peek_frame(c, &header, &length)) return 0;
+    if (length > 0x7FFFFFFFu) {
+        set_error(c, "Payload too large");
+        return -1;
+    }
+    *out_len = (int)length;
+    if ((int)length > max) return WW_RECV_BUFFER_TOO_SMALL; // frame giữ nguyên trong rbuf
+    memcpy(out, c->rbuf + 6, length);
+    *h = header;
+    consume_frame(c, length);
+    return 1;
+}
+
+int ww_client_receive_many(WerewolfClient* c, WWFrameInfo* frames, int max_frames,
+                           char* out, int out_size, int* out_used) {
+    if (!c || !frames || max_frames <= 0) return -1;
+    *out_used = 0;
+
+    // Đọc hết dữ liệu đang có trong socket (dừng ở EAGAIN). Server đóng kết nối thì vẫn
+    // trả các frame đã đủ trước, lần gọi sau mới báo lỗi.
+    int failed = 0;
+    while (c->is_connected) {
+        size_t before = c->rbuf_len;
+        if (fill_rbuf(c) < 0) {
+            failed = 1;
+            break;
+        }
+        if (c->rbuf_len == before) break;                // EAGAIN
+        if (c->rbuf_len - before < WW_RECV_CHUNK) break; // đọc thiếu chunk = đã hết dữ liệu
+    }
+
+    size_t pos = 0;
+    int used = 0;
+    int n = 0;
+    while (n < max_frames && c->rbuf_len - pos >= 6) {
+        const unsigned char* p = c->rbuf + pos;
+        unsigned short header = (unsigned short)((p[0] << 8) | p[1]);
+        uint32_t length = (uint32_t)((p[2] << 24) | (p[3] << 16) | (p[4] << 8) | p[5]);
+        if (c->rbuf_len - pos - 6 < (size_t)length) break; // frame chưa đủ
+        if ((size_t)length > (size_t)(out_size - used)) {
+            if (n == 0) {
+                *out_used = (int)length;
+                return WW_RECV_BUFFER_TOO_SMALL;
+            }
+            break; // các frame còn lại để lần gọi sau
+        }
+        memcpy(out + used, p + 6, length);
+        frames[n].header = header;
+        frames[n].offset = (unsigned int)used;
+        frames[n].length = length;
+        used += (int)length;
+        pos += 6 + (size_t)length;
+        n++;
+    }
+
+    // Một lần memmove cho cả batch thay vì mỗi frame một lần
+    if (pos > 0) {
+        size_t remaining = c->rbuf_len - pos;
+        if (remaining > 0) memmove(c->rbuf, c->rbuf + pos, remaining);
+        c->rbuf_len = remaining;
+    }
+    *out_used = used;
+    if (n == 0 && (failed || !c->is_connected)) return -1;
+    return n;
+}
+
 int ww_client_seer_check_send(WerewolfClient* c, int room_id, const char* target_username) {
     if (!c || !c->is_connected || !target_username) return -1;
 
@@ -206,6 +396,12 @@ int ww_client_guard_protect_send(WerewolfClient* c, int room_id, const char* tar
 }
 
 
+// Lấy file descriptor của socket để event loop bên ngoài theo dõi readable/writable
+int ww_client_get_fd(WerewolfClient* c) {
+    if (!c || !c->is_connected) return -1;
+    return (int)c->sock;
+}
+
 // Khi client ngắt kết nối
 void ww_client_disconnect(WerewolfClient* c) {
     if (!c) return;
@@ -214,6 +410,9 @@ void ww_client_disconnect(WerewolfClient* c) {
         c->sock = INVALID_SOCKET_VALUE;
     }
     c->is_connected = 0;
+    // Frame chưa gửi thuộc về kết nối cũ
+    outq_clear(&c->wq);
+    outq_clear(&c->hq);
 }
 
 // Hàm hủy client
@@ -221,6 +420,8 @@ void ww_client_destroy(WerewolfClient* c) {
     if (!c) return;
     ww_client_disconnect(c);
     if (c->rbuf) free(c->rbuf);
+    free(c->wq.buf);
+    free(c->hq.buf);
     free(c);
 }
 
@@ -11,6 +11,16 @@ typedef int socket_t;
 #define SOCKET_ERROR_VALUE -1
 #define closesocket close
 
+// Hàng đợi gửi: các frame hoàn chỉnh nằm liền nhau trong buf[off, len).
+// frame_start = đầu frame đang gửi dở (== off khi đang ở ranh giới frame).
+typedef struct {
+    unsigned char *buf;
+    size_t off;
+    size_t len;
+    size_t cap;
+    size_t frame_start;
+} WWOutQueue;
+
 typedef struct {
     socket_t sock;
     int is_connected;
@@ -18,13 +28,48 @@ typedef struct {
     unsigned char *rbuf;   // receive buffer (dynamic)
     size_t rbuf_len;       // bytes currently stored
     size_t rbuf_cap;       // capacity
+    WWOutQueue wq;         // hàng đợi gửi thường (chat, action...)
+    WWOutQueue hq;         // hàng đợi ưu tiên (PING/PONG) - chen trước wq ở ranh giới frame
 } WerewolfClient;
 
+// Giới hạn tổng số byte chờ gửi; vượt quá thì ww_client_send trả -1 ("Send queue full")
+#define WW_SEND_QUEUE_MAX (4 * 1024 * 1024)
+
 WerewolfClient* ww_client_create();
 int ww_client_connect(WerewolfClient* client, const char* host, int port);
+// Xếp frame vào hàng đợi gửi và thử flush ngay (không chặn, không spin khi EAGAIN).
+// Returns số byte của frame đã nhận vào hàng đợi, -1 nếu lỗi.
 int ww_client_send(WerewolfClient* client, unsigned short header, const char* json);
+// Như ww_client_send nhưng vào hàng đợi ưu tiên (heartbeat không phải chờ sau chat bị nghẽn)
+int ww_client_send_priority(WerewolfClient* client, unsigned short header, const char* json);
+// Như hai hàm trên với payload nhị phân độ dài `len` (có thể chứa byte 0, vd. compact1)
+int ww_client_send_len(WerewolfClient* client, unsigned short header, const char* payload, int len);
+int ww_client_send_priority_len(WerewolfClient* client, unsigned short header, const char* payload, int len);
+// Gửi tiếp dữ liệu đang chờ; gọi khi socket writable.
+// Returns 0 nếu đã gửi hết, 1 nếu vẫn còn (chờ writable), -1 nếu lỗi
+int ww_client_flush(WerewolfClient* client);
+// Số byte đang chờ gửi (cả hai hàng đợi)
+int ww_client_send_queue_bytes(WerewolfClient* client);
 int ww_client_receive(WerewolfClient* client, unsigned short* out_header,
                       char* out_payload, int max_size);
+// Nhận một frame vào buffer của caller, không thêm NUL, độ dài chính xác qua out_len.
+// Returns 1 nếu đã copy frame, 0 nếu chưa đủ frame, -1 nếu lỗi,
+// WW_RECV_BUFFER_TOO_SMALL nếu payload > max_size (out_len = độ dài cần, frame vẫn giữ lại)
+#define WW_RECV_BUFFER_TOO_SMALL -2
+int ww_client_receive_into(WerewolfClient* client, unsigned short* out_header,
+                           char* out_payload, int max_size, int* out_len);
+// Một frame trong batch: payload nằm ở out_payload[offset .. offset+length)
+typedef struct {
+    unsigned short header;
+    unsigned int offset;
+    unsigned int length;
+} WWFrameInfo;
+// Đọc hết dữ liệu sẵn có và trả tối đa max_frames frame trong một lần gọi. Payload được
+// xếp liền nhau trong out_payload, out_used = số byte đã dùng.
+// Returns số frame (0 nếu chưa đủ frame nào), -1 nếu lỗi,
+// WW_RECV_BUFFER_TOO_SMALL nếu frame đầu tiên > out_size (out_used = độ dài cần)
+int ww_client_receive_many(WerewolfClient* client, WWFrameInfo* frames, int max_frames,
+                           char* out_payload, int out_size, int* out_used);
 // Convenience helpers for heartbeat
 int ww_client_ping_send(WerewolfClient* client);
 int ww_client_pong_send(WerewolfClient* client);
@@ -33,6 +78,8 @@ int ww_client_seer_check_send(WerewolfClient* client, int room_id, const char* t
 // Send Guard protect request: room_id và target_username. Returns bytes sent hoặc -1 nếu lỗi
 int ww_client_guard_protect_send(WerewolfClient* client, int room_id, const char* target_username);
 int ww_client_wolf_kill_send(WerewolfClient* client, int room_id, const char* target_username);
+// File descriptor của socket (để tích hợp event loop: QSocketNotifier/select), -1 nếu chưa kết nối
+int ww_client_get_fd(WerewolfClient* client);
 void ww_client_disconnect(WerewolfClient* client);
 void ww_client_destroy(WerewolfClient* client);
 const char* ww_client_get_error(WerewolfClient* client);
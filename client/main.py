@@ -1,4 +1,6 @@
 # Main file để chạy ứng dụng Werewolf
+import importlib
+import os
 import sys
 import signal
 from pathlib import Path
@@ -7,32 +9,25 @@ from PyQt5 import QtWidgets, QtCore
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
+import payload_codec
 from network_client import WerewolfNetworkClient
+from packet_dispatcher import PacketDispatcher
+from room_state import RoomState
 from components.toast_notification import ToastManager
 from components.window_manager import WindowManager
+from utils.deadline_clock import DeadlineClock
+from utils.image_utils import warm_image_cache
+from utils.phase_latency import PhaseLatencyProbe
 from windows.welcome_window import WelcomeWindow
-from windows.register_window import RegisterWindow
-from windows.login_window import LoginWindow
-from windows.lobby_window import LobbyWindow
-from windows.room_window import RoomWindow
-from windows.role_card_window import RoleCardWindow
-from windows.night_begin_window import NightBeginWindow
-from windows.death_announcement_window import DeathAnnouncementWindow
-from windows.day_chat_window import DayChatWindow
-from windows.day_vote_window import DayVoteWindow
-from windows.game_result_window import GameResultWindow
-from windows.roles.seer.seer_select_window import SeerSelectWindow
-from windows.roles.seer.seer_wait_window import SeerWaitWindow
-from windows.roles.seer.seer_result_window import SeerResultWindow
-from windows.roles.guard.guard_select_window import GuardSelectWindow
-from windows.roles.guard.guard_wait_window import GuardWaitWindow
-from windows.roles.wolf.wolf_select_window import WolfSelectWindow
-from windows.roles.wolf.wolf_wait_window import WolfWaitWindow
-from windows.roles.wolf.wolf_chat_window import WolfChatWindow
+# Các cửa sổ khác được import + tạo lần đầu dùng tới (xem init_windows)
 
 
 class WerewolfApplication:    
-    def __init__(self):
+    # Prewarm bắt đầu sau khoảng này để welcome window kịp vẽ frame đầu
+    PREWARM_DELAY_MS = 300
+
+    def __init__(self, network_client=None):
+        """network_client: thay cho WerewolfNetworkClient (vd. ReplayNetworkClient khi replay capture)"""
         self.app = QtWidgets.QApplication(sys.argv)
         self.app.setApplicationName("Werewolf Game")
         # Prevent the whole client from exiting when transient night-phase dialogs close.
@@ -48,13 +43,48 @@ class WerewolfApplication:
         self.load_stylesheet()
         
         # Khởi tạo client 
-        self.network_client = WerewolfNetworkClient()
+        # WEREWOLF_ASYNCIO=1: transport asyncio thuần Python (không cần compile lib/) thay cho bản C
+        if network_client is None and os.environ.get("WEREWOLF_ASYNCIO", "0") not in ("", "0", "false", "no"):
+            from utils.qt_asyncio import QtAsyncNetworkClient
+            network_client = QtAsyncNetworkClient()
+        self.network_client = network_client if network_client is not None else WerewolfNetworkClient()
+
+        # WEREWOLF_COMPACT=1: gửi HELLO_REQ sau connect để thương lượng compact1 (server C không
+        # hỗ trợ nên mặc định tắt, mọi payload là JSON)
+        if os.environ.get("WEREWOLF_COMPACT", "0") not in ("", "0", "false", "no"):
+            self.network_client.offer_codecs = payload_codec.SUPPORTED_CODECS
+
+        # WEREWOLF_CAPTURE=<file>: ghi mọi packet vào/ra để replay sau (utils/packet_replay.py)
+        capture_path = os.environ.get("WEREWOLF_CAPTURE")
+        if capture_path and hasattr(self.network_client, "start_capture"):
+            self.network_client.start_capture(capture_path)
+            print(f"[DEBUG] Capturing packets to {capture_path}")
         
         # Khởi tạo window manager
         self.window_manager = WindowManager(self.app)
         
         # Share network client với các cửa sổ
         self.window_manager.set_shared_data("network_client", self.network_client)
+
+        # Bộ đọc socket duy nhất, các cửa sổ subscribe handler theo header.
+        # WEREWOLF_IO_THREAD=1: đọc/parse/gửi trên thread riêng thay vì GUI thread.
+        # (chỉ cho WerewolfNetworkClient; transport asyncio đã tự đọc socket ngoài GUI thread)
+        use_io_thread = (os.environ.get("WEREWOLF_IO_THREAD", "0") not in ("", "0", "false", "no")
+                         and hasattr(self.network_client, "attach_io_thread"))
+        self.packet_dispatcher = PacketDispatcher(self.network_client, use_io_thread=use_io_thread)
+        self.window_manager.set_shared_data("packet_dispatcher", self.packet_dispatcher)
+
+        # Trạng thái phòng/game dùng chung (players, alive, role, vote); các cửa sổ subscribe signal
+        self.room_state = RoomState()
+        self.window_manager.set_shared_data("room_state", self.room_state)
+
+        # Một đồng hồ đếm ngược (monotonic) cho mọi màn hình có countdown
+        self.deadline_clock = DeadlineClock()
+        self.window_manager.set_shared_data("deadline_clock", self.deadline_clock)
+
+        # Đo độ trễ PHASE_* packet -> màn hình phase hiển thị (log [PERF])
+        self.phase_latency_probe = PhaseLatencyProbe(self.window_manager)
+        self.window_manager.set_shared_data("phase_latency_probe", self.phase_latency_probe)
         
         # Khởi tạo các cửa sổ
         self.init_windows()
@@ -70,8 +100,15 @@ class WerewolfApplication:
         else:
             print(f"Warning: Stylesheet not found at {qss_path}")
             
+    def _lazy_window(self, module_name, class_name, *args, **kwargs):
+        """Factory cho WindowManager: import module và tạo cửa sổ ở lần dùng đầu tiên"""
+        def build():
+            window_class = getattr(importlib.import_module(module_name), class_name)
+            return window_class(*args, **kwargs)
+        return build
+
     def init_windows(self):
-        """Khởi tạo tất cả các cửa sổ"""
+        """Khởi tạo welcome window; các cửa sổ khác đăng ký dạng factory (tạo khi cần)"""
         # Khởi tạo welcome window đầu tiên
         self.welcome_window = WelcomeWindow(
             self.network_client,
@@ -87,81 +124,40 @@ class WerewolfApplication:
         
         # Cập nhật toast manager cho welcome window
         self.welcome_window.toast_manager = self.toast_manager
-        
-        self.register_window = RegisterWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.login_window = LoginWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.lobby_window = LobbyWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.room_window = RoomWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.role_card_window = RoleCardWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-
-        self.night_begin_window = NightBeginWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.death_announcement_window = DeathAnnouncementWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-        
-        self.day_chat_window = DayChatWindow(
-            self.toast_manager,
-            self.window_manager
-        )
-
-        self.day_vote_window = DayVoteWindow(
-            self.toast_manager,
-            self.window_manager
-        )
+        self.window_manager.register_window("welcome", self.welcome_window)
 
-        self.game_result_window = GameResultWindow(
-            self.toast_manager,
-            self.window_manager
-        )
+        # Thứ tự đăng ký = thứ tự prewarm (màn hình cần sớm nhất trước)
+        for name, module_name, class_name in (
+            ("login", "windows.login_window", "LoginWindow"),
+            ("register", "windows.register_window", "RegisterWindow"),
+            ("lobby", "windows.lobby_window", "LobbyWindow"),
+            ("room", "windows.room_window", "RoomWindow"),
+            ("role_card", "windows.role_card_window", "RoleCardWindow"),
+            ("night_begin", "windows.night_begin_window", "NightBeginWindow"),
+            ("death_announcement", "windows.death_announcement_window", "DeathAnnouncementWindow"),
+            ("day_chat", "windows.day_chat_window", "DayChatWindow"),
+            ("day_vote", "windows.day_vote_window", "DayVoteWindow"),
+            ("game_result", "windows.game_result_window", "GameResultWindow"),
+        ):
+            self.window_manager.register_window(
+                name, self._lazy_window(module_name, class_name, self.toast_manager, self.window_manager)
+            )
+
+        # Night role screens: tạo một lần (lazy), NightPhaseController chỉ gọi reset(...) mỗi đêm
+        # nên chuyển phase không phải tạo widget.
+        managers = {"window_manager": self.window_manager, "toast_manager": self.toast_manager}
+        for name, module_name, class_name, args in (
+            ("seer_select", "windows.roles.seer.seer_select_window", "SeerSelectWindow", ([], "", 30, None, None)),
+            ("seer_wait", "windows.roles.seer.seer_wait_window", "SeerWaitWindow", (30,)),
+            ("seer_result", "windows.roles.seer.seer_result_window", "SeerResultWindow", ("", False)),
+            ("guard_select", "windows.roles.guard.guard_select_window", "GuardSelectWindow", ([], "", 30, None, None)),
+            ("guard_wait", "windows.roles.guard.guard_wait_window", "GuardWaitWindow", (30,)),
+            ("wolf_select", "windows.roles.wolf.wolf_select_window", "WolfSelectWindow", ([], [], "", 60, None, None)),
+            ("wolf_wait", "windows.roles.wolf.wolf_wait_window", "WolfWaitWindow", (60,)),
+            ("wolf_chat", "windows.roles.wolf.wolf_chat_window", "WolfChatWindow", ("", [])),
+        ):
+            self.window_manager.register_window(name, self._lazy_window(module_name, class_name, *args, **managers))
 
-        # Night role screens. These instances will be refreshed/overwritten by NightPhaseController as needed,
-        # but registering defaults here avoids "window not registered" when navigating.
-        self.window_manager.register_window("seer_select", SeerSelectWindow([], "", 30, None, None, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("seer_wait", SeerWaitWindow(30, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("seer_result", SeerResultWindow("", False, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("guard_select", GuardSelectWindow([], "", 30, None, None, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("guard_wait", GuardWaitWindow(30, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("wolf_select", WolfSelectWindow([], [], "", 60, None, None, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("wolf_wait", WolfWaitWindow(60, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        self.window_manager.register_window("wolf_chat", WolfChatWindow("", [], duration_seconds=60, window_manager=self.window_manager, toast_manager=self.toast_manager))
-        
-        # Đăng ký các cửa sổ
-        self.window_manager.register_window("welcome", self.welcome_window)
-        self.window_manager.register_window("register", self.register_window)
-        self.window_manager.register_window("login", self.login_window)
-        self.window_manager.register_window("lobby", self.lobby_window)
-        self.window_manager.register_window("room", self.room_window)
-        self.window_manager.register_window("role_card", self.role_card_window)
-        self.window_manager.register_window("night_begin", self.night_begin_window)
-        self.window_manager.register_window("death_announcement", self.death_announcement_window)
-        self.window_manager.register_window("day_chat", self.day_chat_window)
-        self.window_manager.register_window("day_vote", self.day_vote_window)
-        self.window_manager.register_window("game_result", self.game_result_window)
-        
         # Kết nối cleanup
         self.app.aboutToQuit.connect(self.cleanup)
         
@@ -169,10 +165,19 @@ class WerewolfApplication:
         """Chạy ứng dụng"""
         # Hiện cửa sổ welcome
         self.window_manager.navigate_to("welcome")
+
+        # Tạo trước các cửa sổ còn lại khi event loop rảnh (WEREWOLF_PREWARM=0 để tắt)
+        if os.environ.get("WEREWOLF_PREWARM", "1") not in ("", "0", "false", "no"):
+            QtCore.QTimer.singleShot(self.PREWARM_DELAY_MS, self.prewarm)
         
         # Bắt đầu vòng lặp sự kiện
         return self.app.exec_()
 
+    def prewarm(self):
+        """Scale trước ảnh dùng trên màn hình (pixmap cache) rồi tạo dần các cửa sổ"""
+        warm_image_cache()
+        self.window_manager.prewarm()
+
     def _install_signal_handlers(self):
         """Install SIGINT/SIGTERM handler so Ctrl+C in terminal closes the client cleanly."""
         # A small timer keeps the Python interpreter responsive to signals while Qt loop is running.
@@ -202,9 +207,12 @@ class WerewolfApplication:
     def cleanup(self):
         """Dọn dẹp tài nguyên"""
         try:
+            self.packet_dispatcher.stop()
             if self.network_client:
                 self.network_client.disconnect()
                 self.network_client.destroy()
+                if hasattr(self.network_client, "stop_capture"):
+                    self.network_client.stop_capture()
         except:
             pass
 
@@ -0,0 +1,295 @@
+"""
+Async Network Client - transport thuần Python (asyncio), không cần compile C library
+Cùng interface send_packet / receive_packet với WerewolfNetworkClient
+"""
+
+import asyncio
+import collections
+
+import payload_codec
+import protocol
+
+
+class _WerewolfProtocol(asyncio.Protocol):
+    """asyncio.Protocol: tách frame ngay trong data_received, không cần task đọc riêng.
+
+    Mỗi connection chỉ tốn một transport + decoder nên một process chạy được hàng nghìn
+    connection (bot, load test).
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.transport = None
+        self.decoder = protocol.FrameDecoder(decode=payload_codec.decode_payload)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.owner._transport = transport
+
+    def _close_with_error(self, error):
+        # Connection cũ đóng muộn sau khi owner đã connect lại: không báo lỗi cho connection mới
+        if self.owner._transport is self.transport:
+            self.owner._close_with_error(error)
+
+    def data_received(self, data):
+        try:
+            frames = self.decoder.feed(data)
+        except ValueError as e:
+            self._close_with_error(RuntimeError(f"Receive failed: {e}"))
+            return
+        if frames:
+            self.owner._deliver(frames)
+
+    def pause_writing(self):
+        self.owner._write_paused = True
+
+    def resume_writing(self):
+        self.owner._write_paused = False
+        self.owner._wake_drain()
+
+    def eof_received(self):
+        self._close_with_error(ConnectionError("Server connection lost: Server closed"))
+        return False
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            self._close_with_error(ConnectionError(f"Server connection lost: {exc}"))
+        else:
+            self._close_with_error(ConnectionError("Server connection lost: Server closed"))
+
+
+class AsyncWerewolfNetworkClient:
+    """Client asyncio tương thích với WerewolfNetworkClient.
+
+    - `await connect(host, port)` thay cho `create()` + `connect()`.
+    - `send_packet()` ghi vào write buffer của transport và trả về ngay (số byte);
+      dùng `await drain()` nếu cần chờ flush.
+    - `receive_packet()` không chặn: (header, payload) hoặc (None, None), ném ConnectionError
+      khi server đóng kết nối - PacketPump/PacketDispatcher dùng được trực tiếp.
+    - `await recv_packet()` chờ packet kế tiếp (cho bot/script).
+    - `set_packet_listener(cb)`: cb() được gọi mỗi khi có packet mới, thay cho việc poll.
+    - `offer_codecs = payload_codec.SUPPORTED_CODECS` (opt-in): sau connect gửi HELLO_REQ; nếu
+      server trả HELLO_RES chọn "compact1" thì các packet nóng được mã hóa nhị phân
+      (payload_codec.py), server cũ -> vẫn JSON.
+
+    Bot/script dùng trực tiếp trên event loop của mình; GUI dùng QtAsyncNetworkClient
+    (utils/qt_asyncio.py) - loop chạy trên thread riêng, `connect()` đồng bộ.
+    """
+
+    def __init__(self, loop=None):
+        self.client = None  # transport khi đã kết nối (giữ tên để tương thích các check `.client`)
+        self.loop = loop
+        self._transport = None
+        self._inbox = collections.deque()
+        self._waiter = None
+        self._error = None
+        self._last_error = ""
+        self._packet_listener = None
+        self._write_paused = False
+        self._drain_waiter = None
+        # Codec đề nghị khi connect (mặc định chỉ JSON = không handshake) và codec đã thống nhất
+        self.offer_codecs = (payload_codec.CODEC_JSON,)
+        self.codec = payload_codec.CODEC_JSON
+        self._compact = False
+        self._hello_pending = False
+
+    def create(self):
+        """Tương thích WerewolfNetworkClient.create() - không cần cấp phát gì"""
+        return self
+
+    async def connect(self, host, port, timeout=10.0):
+        """Kết nối đến server"""
+        loop = self.loop or asyncio.get_running_loop()
+        self.loop = loop
+        if self._transport is not None:
+            self._transport.close()
+        self._transport = None
+        self.client = None
+        self._inbox.clear()
+        self._error = None
+        try:
+            transport, _ = await asyncio.wait_for(
+                loop.create_connection(lambda: _WerewolfProtocol(self), host, port),
+                timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            self._last_error = "Connect failed"
+            raise ConnectionError(f"Connection failed: {e}") from e
+        self._transport = transport
+        self.client = transport
+        self._set_codec(payload_codec.CODEC_JSON)
+        if payload_codec.CODEC_COMPACT in self.offer_codecs:
+            self._hello_pending = True
+            self.send_packet(protocol.HELLO_REQ, {"codecs": list(self.offer_codecs)})
+        return True
+
+    def send_packet(self, header, payload_dict):
+        """Gửi gói tin đến server (không chặn)"""
+        if self._transport is None or self._transport.is_closing():
+            raise RuntimeError(f"Send failed: {self.get_error()}")
+        frame = payload_codec.encode_packet(header, payload_dict, self._compact)
+        self._write(frame)
+        return len(frame)
+
+    def _write(self, frame):
+        self._transport.write(frame)
+
+    async def drain(self):
+        """Chờ write buffer xuống dưới low-water mark (flow control của transport)"""
+        if not self._write_paused or self._transport is None:
+            return
+        self._drain_waiter = self.loop.create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+
+    def receive_packet(self):
+        """
+        Nhận gói tin đã parse (không chặn)
+        Trả về: (header, payload_dict) hoặc (None, None) nếu không có dữ liệu
+        Raises: ConnectionError nếu server disconnect
+        """
+        if self._inbox:
+            return self._inbox.popleft()
+        if self._error is not None:
+            raise self._error
+        if self.client is None:
+            raise RuntimeError("Client not created")
+        return None, None
+
+    async def recv_packet(self, timeout=None):
+        """Chờ packet kế tiếp. Raises asyncio.TimeoutError, ConnectionError"""
+        while True:
+            header, payload = self.receive_packet()
+            if header is not None:
+                return header, payload
+            self._waiter = (self.loop or asyncio.get_running_loop()).create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            finally:
+                self._waiter = None
+
+    def set_packet_listener(self, callback):
+        """callback() được gọi (trên event loop) khi inbox có packet mới hoặc khi mất kết nối"""
+        self._packet_listener = callback
+
+    def fileno(self):
+        """-1: socket do asyncio quản lý, caller dùng set_packet_listener thay vì QSocketNotifier"""
+        return -1
+
+    def disconnect(self):
+        """Ngắt kết nối từ server"""
+        if self._transport is not None:
+            self._transport.close()
+
+    def destroy(self):
+        """Hủy instance client"""
+        self.disconnect()
+        self._transport = None
+        self.client = None
+        self._inbox.clear()
+
+    def get_error(self):
+        """Lấy thông báo lỗi cuối cùng"""
+        if self.client is None:
+            return "Client not created"
+        return self._last_error or "Unknown error"
+
+    def _set_codec(self, codec):
+        self.codec = codec
+        self._compact = codec == payload_codec.CODEC_COMPACT
+
+    def _deliver(self, frames):
+        if self._hello_pending:
+            for header, payload in frames:
+                if header == protocol.HELLO_RES:
+                    self._hello_pending = False
+                    self._set_codec(payload_codec.accepted_codec(payload, self.offer_codecs))
+        self._inbox.extend(frames)
+        self._notify()
+
+    def _wake_drain(self):
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def _close_with_error(self, error):
+        if self._error is None:
+            self._error = error
+            self._last_error = str(error)
+        if self._transport is not None:
+            self._transport.close()
+        self._write_paused = False
+        self._wake_drain()
+        self._notify()
+
+    def _notify(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        if self._packet_listener is not None:
+            self._packet_listener()
+
+    # Các helper gửi giống WerewolfNetworkClient (JSON giống hệt bản C)
+
+    def send_role_card_done(self, room_id=None):
+        """Notify server that this client finished viewing role card."""
+        payload = {}
+        if room_id is not None:
+            payload["room_id"] = int(room_id)
+        return self.send_packet(protocol.ROLE_CARD_DONE_REQ, payload)
+
+    def send_wolf_kill(self, room_id, target_username):
+        """Gửi yêu cầu sói cắn (wolf kill)"""
+        if not isinstance(target_username, str):
+            raise ValueError("target_username must be a string")
+        return self.send_packet(protocol.WOLF_KILL_REQ, {
+            "room_id": int(room_id),
+            "target_username": target_username,
+        })
+
+    def send_seer_check(self, room_id, target_username):
+        """Gửi yêu cầu tiên tri (seer check)"""
+        if not isinstance(target_username, str):
+            raise ValueError("target_username must be a string")
+        return self.send_packet(protocol.SEER_CHECK_REQ, {
+            "room_id": int(room_id),
+            "target_username": target_username,
+        })
+
+    def send_guard_protect(self, room_id, target_username):
+        """Gửi yêu cầu bảo vệ (GUARD_PROTECT_REQ = 407)."""
+        if room_id is None:
+            raise ValueError("room_id is required")
+        if target_username is None:
+            target_username = ""
+        return self.send_packet(protocol.GUARD_PROTECT_REQ, {
+            "room_id": int(room_id),
+            "target_username": str(target_username),
+        })
+
+    def send_day_vote(self, room_id, target_username):
+        """Gửi vote ban ngày (VOTE_REQ = 409). target_username có thể là "" để skip."""
+        if room_id is None:
+            raise ValueError("room_id is required")
+        if target_username is None:
+            target_username = ""
+        return self.send_packet(protocol.VOTE_REQ, {
+            "room_id": int(room_id),
+            "target_username": str(target_username),
+        })
+
+    def send_ping(self, client_time=None):
+        """Client-initiated heartbeat ping (PING = 501).
+
+        `client_time` (epoch seconds) is sent as `t0`; the server echoes it in PONG with its
+        receive/send timestamps so ConnectionMonitor can estimate RTT and clock offset.
+        """
+        payload = {"type": "ping"}
+        if client_time is not None:
+            payload["t0"] = client_time
+        return self.send_packet(protocol.PING, payload)
+
+    def send_pong(self):
+        """Reply to server PING (PONG = 502)."""
+        return self.send_packet(protocol.PONG, {"type": "pong"})
+
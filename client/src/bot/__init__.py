@@ -0,0 +1,19 @@
+"""Bot - người chơi tự động không GUI (điền phòng, soak test server)
+
+Chỉ dùng protocol.py và network client (AsyncWerewolfNetworkClient hoặc WerewolfNetworkClient),
+không import PyQt5. Chạy từ dòng lệnh: `python3 -m bot --help` (trong client/src).
+"""
+
+from bot.bot import Bot
+from bot.state import BotGameState
+from bot.strategies import (
+    STRATEGIES,
+    GuardStrategy,
+    RoleStrategy,
+    SeerStrategy,
+    VillagerStrategy,
+    WerewolfStrategy,
+    get_strategy,
+    register_strategy,
+)
+from bot.swarm import BotConfig, BotSwarm
@@ -0,0 +1,75 @@
+"""Chạy swarm bot từ dòng lệnh
+
+Chạy:
+    cd client/src
+    python3 -m bot --count 16 --room-size 8 --games 3 [--host 127.0.0.1] [--port 5000]
+    python3 -m bot --count 5 --room-id 3        # điền phòng 3 (host là người thật)
+"""
+
+import argparse
+import asyncio
+import sys
+
+from bot.swarm import BotConfig, BotSwarm
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m bot", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--count", type=int, default=8, help="số bot")
+    parser.add_argument("--room-size", type=int, default=8, help="số bot mỗi phòng (6-12)")
+    parser.add_argument("--room-id", type=int, default=None, help="vào phòng có sẵn thay vì tự tạo")
+    parser.add_argument("--games", type=int, default=1, help="số ván mỗi bot (0 = chơi mãi)")
+    parser.add_argument("--prefix", default="bot", help="tiền tố username")
+    parser.add_argument("--password", default="botpass123")
+    parser.add_argument("--transport", choices=("async", "ctypes"), default="async")
+    parser.add_argument("--think", type=float, nargs=2, default=(0.2, 1.0), metavar=("MIN", "MAX"),
+                        help="giây chờ trước mỗi hành động")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--report", type=float, default=10.0, help="giây giữa hai lần in tiến độ (0 = tắt)")
+    parser.add_argument("--duration", type=float, default=0, help="dừng sau N giây (0 = tới khi chơi xong)")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    config = BotConfig(
+        host=args.host, port=args.port, transport=args.transport, prefix=args.prefix,
+        password=args.password, room_size=args.room_size, room_id=args.room_id,
+        games=args.games, think_time=tuple(args.think), seed=args.seed,
+    )
+    swarm = BotSwarm(args.count, config)
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.report)
+            phases = ", ".join(f"{k}={v}" for k, v in sorted(swarm.phases().items()))
+            print(f"{swarm.summary()} | {phases}")
+
+    reporter = asyncio.ensure_future(report()) if args.report > 0 else None
+    try:
+        if args.duration > 0:
+            await asyncio.wait_for(swarm.run(), args.duration)
+        else:
+            await swarm.run()
+    except asyncio.TimeoutError:
+        print(f"[BOT] Stopped after {args.duration:.0f}s")
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        swarm.close()
+    print(swarm.summary())
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""Bot - một người chơi tự động không GUI
+
+Xử lý cùng các packet mà LoginWindow / LobbyWindow / RoomWindow / NightPhaseController xử lý,
+nhưng chỉ cập nhật BotGameState và hỏi chiến lược của vai để gửi hành động. Mọi bot trong
+process chạy trên một asyncio event loop của BotSwarm; không có thread hay task riêng cho
+từng bot:
+
+- AsyncWerewolfNetworkClient: transport gọi `pump()` ngay khi parse xong frame
+  (set_packet_listener), giống PacketDispatcher.
+- WerewolfNetworkClient (ctypes): `loop.add_reader(fd, pump)`; hàng đợi gửi của C được
+  flush bằng `loop.add_writer` khi socket writable (giống SocketWriteFlusher).
+"""
+
+import time
+
+import protocol
+
+
+class Bot:
+    """Một bot = một connection + một BotGameState. Cấu hình/RNG/thống kê nằm ở BotSwarm."""
+
+    __slots__ = ("swarm", "username", "group", "client", "state", "phase", "games_played", "_fd")
+
+    # Trạng thái vòng đời (phase)
+    IDLE = "idle"              # chưa kết nối
+    AUTH = "auth"              # đang register/login
+    LOBBY = "lobby"            # đã login, chưa ở phòng nào
+    JOINING = "joining"        # đã gửi CREATE_ROOM_REQ / JOIN_ROOM_REQ
+    ROOM = "room"              # trong phòng, chờ bắt đầu
+    STARTING = "starting"      # host đã gửi START_GAME_REQ
+    PLAYING = "playing"
+    LEAVING = "leaving"        # đã gửi LEAVE_ROOM_REQ sau GAME_OVER
+    DONE = "done"              # đã chơi đủ số ván / mất kết nối
+
+    def __init__(self, swarm, username, group=None):
+        self.swarm = swarm
+        self.username = username
+        self.group = group  # index nhóm/phòng trong swarm (None: vào phòng có sẵn)
+        self.client = None
+        self.state = None
+        self.phase = Bot.IDLE
+        self.games_played = 0
+        self._fd = -1
+
+    @property
+    def rng(self):
+        return self.swarm.rng
+
+    @property
+    def strategy(self):
+        return self.swarm.strategy_for(self.state.role)
+
+    @property
+    def is_leader(self):
+        """Bot tạo phòng và bấm start cho nhóm của mình"""
+        return self.group is not None and self.swarm.leader_of(self.group) is self
+
+    # ----- Connection -----
+
+    def attach(self, client):
+        """Gắn network client đã kết nối và bắt đầu đăng ký/đăng nhập"""
+        self.client = client
+        self.state = self.swarm.new_state()
+        loop = self.swarm.loop
+        if hasattr(client, "set_packet_listener"):
+            client.set_packet_listener(self.pump)
+        else:
+            self._fd = client.fileno()
+            if self._fd >= 0:
+                loop.add_reader(self._fd, self.pump)
+                client.set_send_pending_listener(self._arm_writer)
+            else:
+                # Bản build C cũ không export ww_client_get_fd: polling như SocketReadTrigger
+                self._poll()
+        self.phase = Bot.AUTH
+        self.send(protocol.REGISTER_REQ, {"username": self.username, "password": self.swarm.config.password})
+
+    def close(self):
+        """Ngắt kết nối (không gửi LOGOUT_REQ: server xử lý như client disconnect)"""
+        client = self.client
+        if client is None:
+            return
+        self.client = None
+        self._detach(client)
+        try:
+            client.destroy()
+        except Exception:
+            pass
+        self.phase = Bot.DONE
+
+    def _detach(self, client):
+        if hasattr(client, "set_packet_listener"):
+            client.set_packet_listener(None)
+        elif self._fd >= 0:
+            self.swarm.loop.remove_reader(self._fd)
+            self.swarm.loop.remove_writer(self._fd)
+            self._fd = -1
+
+    def _poll(self):
+        if self.client is not None:
+            self.pump()
+            self.swarm.loop.call_later(self.swarm.config.poll_interval, self._poll)
+
+    def _arm_writer(self):
+        if self._fd >= 0:
+            self.swarm.loop.add_writer(self._fd, self._flush)
+
+    def _flush(self):
+        try:
+            if self.client is None or self.client.flush_send_queue():
+                self.swarm.loop.remove_writer(self._fd)
+        except RuntimeError as e:
+            self._fail(e)
+
+    def pump(self):
+        """Drain mọi packet đang có và xử lý từng packet"""
+        client = self.client
+        stats = self.swarm.stats
+        try:
+            while client is self.client:
+                header, payload = client.receive_packet()
+                if header is None:
+                    return
+                stats["packets"] += 1
+                if not isinstance(payload, dict):
+                    payload = {"data": payload}
+                recorder = self.swarm.recorder
+                if recorder is not None:
+                    recorder.received(self, header, payload)
+                handler = Bot.HANDLERS.get(header)
+                if handler is not None:
+                    handler(self, payload)
+        except (ConnectionError, RuntimeError) as e:
+            self._fail(e)
+
+    def send(self, header, payload):
+        """send_packet, lỗi gửi coi như mất kết nối. Trả về False nếu không gửi được."""
+        return self._call("send_packet", header, payload)
+
+    def _call(self, method, *args):
+        """Gọi send helper của network client (send_packet, send_wolf_kill...)"""
+        if self.client is None:
+            return False
+        recorder = self.swarm.recorder
+        if recorder is not None:
+            recorder.sent(self, args[0] if method == "send_packet" else Bot.SEND_HEADERS[method])
+        try:
+            getattr(self.client, method)(*args)
+            return True
+        except (ConnectionError, RuntimeError, ValueError) as e:
+            self._fail(e)
+            return False
+
+    def _fail(self, error):
+        if self.client is None:
+            return
+        self.swarm.stats["disconnects"] += 1
+        print(f"[WARNING] Bot {self.username}: {error}")
+        self.close()
+        self.swarm.bot_finished(self)
+
+    # ----- Auth -----
+
+    def _on_register_res(self, payload):
+        # "Username already exists" = bot đã đăng ký ở lần chạy trước -> login luôn
+        self.send(protocol.LOGIN_REQ, {"username": self.username, "password": self.swarm.config.password})
+
+    def _on_login_res(self, payload):
+        if payload.get("status") != "success":
+            print(f"[WARNING] Bot {self.username} login failed: {payload.get('message')}")
+            self.swarm.stats["errors"] += 1
+            self.close()
+            self.swarm.bot_finished(self)
+            return
+        self.swarm.stats["logged_in"] += 1
+        self.phase = Bot.LOBBY
+        if self.swarm.config.ping_interval > 0:
+            self.swarm.loop.call_later(self.swarm.config.ping_interval, self._ping)
+        self.enter_room()
+
+    # ----- Room -----
+
+    def enter_room(self):
+        """Ở lobby: leader tạo phòng cho nhóm, các bot khác vào phòng của nhóm khi đã có"""
+        if self.phase != Bot.LOBBY:
+            return
+        if self.group is None:
+            room_id = self.swarm.config.room_id
+        elif self.is_leader:
+            self.phase = Bot.JOINING
+            self.send(protocol.CREATE_ROOM_REQ, {"room_name": self.swarm.room_name(self.group)})
+            return
+        else:
+            room_id = self.swarm.room_of(self.group)
+        if room_id is not None:
+            self.phase = Bot.JOINING
+            self.send(protocol.JOIN_ROOM_REQ, {"room_id": int(room_id)})
+
+    def _on_create_room_res(self, payload):
+        if payload.get("status") != "success":
+            print(f"[WARNING] Bot {self.username} create room failed: {payload.get('message')}")
+            self.swarm.stats["errors"] += 1
+            self.phase = Bot.LOBBY
+            self.swarm.loop.call_later(self.swarm.config.retry_delay, self.enter_room)
+            return
+        state = self.state
+        state.room_id = payload.get("room_id")
+        state.is_host = True
+        state.player_count = 1
+        self.phase = Bot.ROOM
+        self.swarm.room_created(self.group, state.room_id)
+
+    def _on_join_room_res(self, payload):
+        if payload.get("status") != "success":
+            # Phòng đầy / đang chơi / đã bị xóa: thử lại sau (leader có thể đã tạo phòng mới)
+            self.swarm.stats["errors"] += 1
+            self.phase = Bot.LOBBY
+            self.swarm.loop.call_later(self.swarm.config.retry_delay, self.enter_room)
+            return
+        state = self.state
+        state.room_id = payload.get("room_id")
+        state.is_host = bool(payload.get("is_host"))
+        state.player_count = len(payload.get("players") or ())
+        self.phase = Bot.ROOM
+
+    def _on_room_status_update(self, payload):
+        state = self.state
+        kind = payload.get("type")
+        if "current_players" in payload:
+            state.player_count = payload.get("current_players") or 0
+        if payload.get("new_host") == self.username:
+            state.is_host = True
+        if kind == "player_eliminated" or (kind == "player_disconnected" and payload.get("game_started")):
+            state.mark_dead([payload.get("username")])
+        self._maybe_start_game()
+
+    def _maybe_start_game(self):
+        state = self.state
+        if self.phase != Bot.ROOM or not state.is_host or self.group is None:
+            return
+        if state.player_count >= self.swarm.config.room_size:
+            self.phase = Bot.STARTING
+            self.send(protocol.START_GAME_REQ, {"room_id": int(state.room_id)})
+
+    def _on_leave_room_res(self, payload):
+        # Phòng có thể đã bị xóa sau GAME_OVER ("You are not in any room") - coi như đã rời
+        if self.phase != Bot.LEAVING:
+            return
+        self.state.leave_room()
+        self._next_game()
+
+    def _next_game(self):
+        games = self.swarm.config.games
+        if games and self.games_played >= games:
+            self.close()
+            self.swarm.bot_finished(self)
+            return
+        self.phase = Bot.LOBBY
+        self.enter_room()
+
+    # ----- Game -----
+
+    def _on_game_start(self, payload):
+        state = self.state
+        if payload.get("status") != "success":
+            self.swarm.stats["errors"] += 1
+            if self.phase == Bot.STARTING:
+                self.phase = Bot.ROOM
+                self.swarm.loop.call_later(self.swarm.config.retry_delay, self._maybe_start_game)
+            return
+        state.reset_game()
+        state.role = payload.get("role")
+        state.wolf_team = tuple(payload.get("werewolf_team") or ())
+        self.phase = Bot.PLAYING
+        self.swarm.stats["games_started"] += 1
+        self.swarm.act_later(self, self._role_card_done)
+
+    def _role_card_done(self):
+        self._call("send_role_card_done", self.state.room_id)
+
+    def _on_phase_night(self, payload):
+        state = self.state
+        state.night += 1
+        state.candidates = None
+        if payload.get("players"):
+            state.set_players(payload.get("players"))
+        if state.role == protocol.ROLE_SEER:
+            self._act_if_alive("send_seer_check", "seer_check")
+
+    def _on_phase_guard_start(self, payload):
+        if self.state.role == protocol.ROLE_GUARD:
+            self._act_if_alive("send_guard_protect", "guard_protect")
+
+    def _on_phase_wolf_start(self, payload):
+        if self.state.role == protocol.ROLE_WEREWOLF:
+            self._act_if_alive("send_wolf_kill", "wolf_kill")
+
+    def _on_seer_result(self, payload):
+        if payload.get("status") == "success" and payload.get("target_username"):
+            self.strategy.on_seer_result(self, payload.get("target_username"), bool(payload.get("is_werewolf")))
+
+    def _on_phase_day(self, payload):
+        state = self.state
+        if payload.get("result") == "killed":
+            state.mark_dead([payload.get("targetId") or payload.get("target_username")])
+        else:
+            state.mark_dead(payload.get("dead_players") or ())
+        state.candidates = None
+        self._act_if_alive("send_day_vote", "day_vote")
+
+    def _on_vote_result(self, payload):
+        state = self.state
+        kind = payload.get("type")
+        if kind == "player_executed":
+            state.mark_dead([payload.get("playerId")])
+        elif kind == "tie_break_start":
+            candidates = payload.get("candidates")
+            state.candidates = tuple(candidates) if isinstance(candidates, list) else None
+            self._act_if_alive("send_day_vote", "day_vote")
+
+    def _on_game_over(self, payload):
+        if self.phase != Bot.PLAYING:
+            return
+        self.games_played += 1
+        self.swarm.game_over(self, payload.get("winner"))
+        # Giống RoomWindow: tự rời phòng khi game kết thúc
+        self.phase = Bot.LEAVING
+        self.send(protocol.LEAVE_ROOM_REQ, {})
+
+    def _on_error_msg(self, payload):
+        self.swarm.stats["errors"] += 1
+
+    def _on_ping(self, payload):
+        self._call("send_pong")
+
+    def _ping(self):
+        """PING định kỳ (config.ping_interval) - đo RTT khi chạy load test"""
+        if self.client is not None and self._call("send_ping", time.time()):
+            self.swarm.loop.call_later(self.swarm.config.ping_interval, self._ping)
+
+    def _act_if_alive(self, send_method, hook):
+        """Hỏi chiến lược của vai sau think time, rồi gửi hành động (nếu bot còn sống)"""
+        if self.state.is_alive(self.username):
+            self.swarm.act_later(self, self._act, send_method, hook, self.state.night)
+
+    def _act(self, send_method, hook, night):
+        state = self.state
+        if self.phase != Bot.PLAYING or state.night != night or not state.is_alive(self.username):
+            return  # Ván/đêm đã qua trong lúc "suy nghĩ"
+        target = getattr(self.strategy, hook)(self)
+        if self._call(send_method, state.room_id, target or ""):
+            self.swarm.stats[hook] += 1
+
+
+# header -> function(bot, payload): bảng dùng chung cho mọi bot (không có bound method/dict riêng)
+Bot.HANDLERS = {
+    protocol.REGISTER_RES: Bot._on_register_res,
+    protocol.LOGIN_RES: Bot._on_login_res,
+    protocol.CREATE_ROOM_RES: Bot._on_create_room_res,
+    protocol.JOIN_ROOM_RES: Bot._on_join_room_res,
+    protocol.ROOM_STATUS_UPDATE: Bot._on_room_status_update,
+    protocol.LEAVE_ROOM_RES: Bot._on_leave_room_res,
+    protocol.GAME_START_RES_AND_ROLE: Bot._on_game_start,
+    protocol.START_GAME_REQ: Bot._on_game_start,  # server C trả lỗi start game bằng header 301
+    protocol.PHASE_NIGHT: Bot._on_phase_night,
+    protocol.PHASE_GUARD_START: Bot._on_phase_guard_start,
+    protocol.PHASE_WOLF_START: Bot._on_phase_wolf_start,
+    protocol.SEER_RESULT: Bot._on_seer_result,
+    protocol.PHASE_DAY: Bot._on_phase_day,
+    protocol.VOTE_RESULT: Bot._on_vote_result,
+    protocol.GAME_OVER: Bot._on_game_over,
+    protocol.ERROR_MSG: Bot._on_error_msg,
+    protocol.PING: Bot._on_ping,
+}
+
+# send helper của network client -> header (cho LoadRecorder)
+Bot.SEND_HEADERS = {
+    "send_role_card_done": protocol.ROLE_CARD_DONE_REQ,
+    "send_seer_check": protocol.SEER_CHECK_REQ,
+    "send_guard_protect": protocol.GUARD_PROTECT_REQ,
+    "send_wolf_kill": protocol.WOLF_KILL_REQ,
+    "send_day_vote": protocol.VOTE_REQ,
+    "send_ping": protocol.PING,
+    "send_pong": protocol.PONG,
+}
@@ -0,0 +1,150 @@
+"""Load generator: N client giả lập chơi trọn vòng register -> login -> create/join room ->
+START_GAME_REQ -> các vòng đêm/ngày -> GAME_OVER, đo độ trễ từng loại packet.
+
+In bảng p50/p95/p99 theo loại request, độ lệch broadcast PHASE_* trong một phòng, throughput
+và tỉ lệ lỗi; `--json` ghi cùng kết quả ra file để so sánh giữa các lần chạy.
+
+Chạy:
+    cd client/src
+    python3 -m bot.loadgen --count 24 --room-size 8 --games 2 --json ../load_results.json
+    python3 -m bot.loadgen --count 30 --think 0 0 --ping-interval 1 --duration 120
+    python3 -m bot.loadgen --reference --time-scale 0.01 --count 96 --games 5   # không cần server C
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from bot.metrics import LoadRecorder
+from bot.swarm import BotConfig, BotSwarm
+from reference_server import ReferenceServer, ServerConfig
+
+# Giới hạn của server C (server/include/types.h)
+SERVER_MAX_SESSIONS = 30
+SERVER_MAX_ROOMS = 10
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m bot.loadgen", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--count", type=int, default=24, help="số client đồng thời")
+    parser.add_argument("--room-size", type=int, default=8, help="số client mỗi phòng (6-12)")
+    parser.add_argument("--games", type=int, default=1, help="số ván mỗi client (0 = chơi tới --duration)")
+    parser.add_argument("--prefix", default="load", help="tiền tố username")
+    parser.add_argument("--password", default="loadpass123")
+    parser.add_argument("--transport", choices=("async", "ctypes"), default="async")
+    parser.add_argument("--think", type=float, nargs=2, default=(0.05, 0.3), metavar=("MIN", "MAX"),
+                        help="giây chờ trước mỗi hành động")
+    parser.add_argument("--ping-interval", type=float, default=2.0, help="giây giữa hai PING mỗi client (0 = tắt)")
+    parser.add_argument("--connect-concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=0, help="dừng sau N giây (0 = tới khi chơi xong)")
+    parser.add_argument("--json", dest="json_path", default=None, help="ghi kết quả JSON ra file")
+    parser.add_argument("--reference", action="store_true",
+                        help="chạy reference server (Python) trong cùng process thay vì kết nối --host/--port")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="với --reference: nhân mọi thời lượng phase (0.01 = nhanh gấp 100 lần)")
+    return parser.parse_args(argv)
+
+
+def print_report(result):
+    print(f"\nduration {result['duration_s']:.1f}s | sent {result['throughput']['sent_per_s']}/s"
+          f" | received {result['throughput']['received_per_s']}/s"
+          f" | games {result['games_played']} ({result['games_per_min']}/min)")
+    print(f"\n{'request':<20} {'sent':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+          f" {'errors':>7} {'no res':>7} {'err %':>6}")
+    for name, entry in result["requests"].items():
+        if entry["count"]:
+            timings = f"{entry['p50_ms']:>8.2f} {entry['p95_ms']:>8.2f} {entry['p99_ms']:>8.2f} {entry['max_ms']:>8.2f}"
+        else:
+            timings = f"{'-':>8} {'-':>8} {'-':>8} {'-':>8}"
+        print(f"{name:<20} {entry['sent']:>6} {timings} {entry['errors']:>7} {entry['unanswered']:>7}"
+              f" {entry['error_rate'] * 100:>6.1f}")
+    if result["broadcast_spread"]:
+        print(f"\n{'broadcast spread':<20} {'rooms':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name, entry in result["broadcast_spread"].items():
+            print(f"{name:<20} {entry['count']:>6} {entry['p50_ms']:>8.2f} {entry['p95_ms']:>8.2f}"
+                  f" {entry['p99_ms']:>8.2f} {entry['max_ms']:>8.2f}")
+    stats = result["stats"]
+    print(f"\nconnected {stats.get('connected', 0)}/{result['config']['count']}"
+          f" | connect failed {stats.get('connect_failed', 0)} | disconnects {stats.get('disconnects', 0)}"
+          f" | ERROR_MSG {result['received'].get('ERROR_MSG', 0)}")
+
+
+async def run(args):
+    rooms = -(-args.count // args.room_size)
+    server = None
+    port = args.port
+    if args.reference:
+        # Giới hạn theo đúng số client/phòng của lần chạy
+        server_config = ServerConfig(host=args.host, port=0, max_rooms=rooms, max_sessions=args.count,
+                                     seed=args.seed)
+        server = await ReferenceServer(server_config.scaled(args.time_scale)).start()
+        port = server.port
+    else:
+        if args.count > SERVER_MAX_SESSIONS:
+            print(f"[WARNING] {args.count} clients > MAX_SESSIONS ({SERVER_MAX_SESSIONS}) của server C")
+        if rooms > SERVER_MAX_ROOMS:
+            print(f"[WARNING] {rooms} rooms > MAX_ROOMS ({SERVER_MAX_ROOMS}) của server C")
+
+    config = BotConfig(
+        host=args.host, port=port, transport=args.transport, prefix=args.prefix,
+        password=args.password, room_size=args.room_size, games=args.games,
+        think_time=tuple(args.think), connect_concurrency=args.connect_concurrency,
+        ping_interval=args.ping_interval, seed=args.seed,
+    )
+    recorder = LoadRecorder()
+    swarm = BotSwarm(args.count, config, recorder=recorder)
+    try:
+        if args.duration > 0:
+            await asyncio.wait_for(swarm.run(), args.duration)
+        else:
+            await swarm.run()
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        recorder.stop()
+        swarm.close()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    result = recorder.report()
+    duration = result["duration_s"]
+    games = sum(swarm.winners.values())  # leader mỗi phòng đếm một lần
+    result.update({
+        "config": {
+            "host": args.host, "port": port, "count": args.count, "room_size": args.room_size,
+            "games": args.games, "transport": args.transport, "think": list(args.think),
+            "ping_interval": args.ping_interval, "seed": args.seed,
+            "reference": args.reference, "time_scale": args.time_scale if args.reference else None,
+        },
+        "timestamp": time.time(),
+        "games_played": games,
+        "games_per_min": round(games / duration * 60, 2) if duration > 0 else 0,
+        "winners": dict(swarm.winners),
+        "stats": dict(swarm.stats),
+    })
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        result = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+    print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"[DEBUG] Results written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Load Recorder - đo độ trễ request -> response, lỗi và throughput của một BotSwarm
+
+Bot gọi `sent(bot, header)` trước mỗi lần gửi và `received(bot, header, payload)` cho mỗi
+packet nhận được (chỉ khi swarm có recorder; bình thường không tốn gì). Độ trễ tính từ lúc
+gửi request tới response tương ứng của cùng bot (bảng RESPONSES theo PACKET_PAYLOADS.md).
+"""
+
+import collections
+import math
+import time
+
+import protocol
+
+# request -> các header server có thể trả lời cho request đó
+RESPONSES = {
+    protocol.REGISTER_REQ: (protocol.REGISTER_RES,),
+    protocol.LOGIN_REQ: (protocol.LOGIN_RES,),
+    protocol.CREATE_ROOM_REQ: (protocol.CREATE_ROOM_RES,),
+    protocol.JOIN_ROOM_REQ: (protocol.JOIN_ROOM_RES,),
+    protocol.LEAVE_ROOM_REQ: (protocol.LEAVE_ROOM_RES,),
+    # Server C trả lỗi start game bằng chính header START_GAME_REQ
+    protocol.START_GAME_REQ: (protocol.GAME_START_RES_AND_ROLE, protocol.START_GAME_REQ),
+    protocol.SEER_CHECK_REQ: (protocol.SEER_RESULT,),
+    protocol.GUARD_PROTECT_REQ: (protocol.GUARD_PROTECT_RES,),
+    protocol.WOLF_KILL_REQ: (protocol.WOLF_KILL_RES,),
+    protocol.PING: (protocol.PONG,),
+}
+
+# Broadcast tới cả phòng: đo độ lệch giữa bot nhận đầu tiên và bot nhận cuối cùng
+BROADCASTS = (
+    protocol.PHASE_NIGHT,
+    protocol.PHASE_GUARD_START,
+    protocol.PHASE_WOLF_START,
+    protocol.PHASE_DAY,
+    protocol.GAME_OVER,
+)
+
+_REQUESTS_FOR = {}
+for _request, _responses in RESPONSES.items():
+    for _response in _responses:
+        _REQUESTS_FOR.setdefault(_response, []).append(_request)
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile của list đã sort (None nếu rỗng)"""
+    if not ordered:
+        return None
+    rank = math.ceil(pct / 100.0 * len(ordered))
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
+
+
+def summarize(values):
+    """{count, p50_ms, p95_ms, p99_ms, max_ms, mean_ms} (ms, làm tròn 3 chữ số)"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+class LoadRecorder:
+    """Thu thập mẫu độ trễ / lỗi / số packet cho báo cáo load test."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started_at = clock()
+        self.stopped_at = None
+        self.latencies = collections.defaultdict(list)  # request header -> [ms]
+        self.errors = collections.Counter()              # request header -> số response fail/error
+        self.sent_count = collections.Counter()          # header -> số packet đã gửi
+        self.received_count = collections.Counter()      # header -> số packet đã nhận
+        self._pending = {}  # (bot, request header) -> deque[t0]
+        self._spread = {}   # (room_id, game, night, header) -> [first, last, count]
+
+    def sent(self, bot, header):
+        self.sent_count[header] += 1
+        if header in RESPONSES:
+            key = (bot, header)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = collections.deque()
+            pending.append(self.clock())
+
+    def received(self, bot, header, payload):
+        now = self.clock()
+        self.received_count[header] += 1
+        for request in _REQUESTS_FOR.get(header, ()):
+            pending = self._pending.get((bot, request))
+            if not pending:
+                continue
+            self.latencies[request].append((now - pending.popleft()) * 1000)
+            if isinstance(payload, dict) and payload.get("status") in ("fail", "error"):
+                self.errors[request] += 1
+            break
+
+        if header in BROADCASTS and bot.state is not None:
+            state = bot.state
+            key = (state.room_id, bot.games_played, state.night, header)
+            spread = self._spread.get(key)
+            if spread is None:
+                self._spread[key] = [now, now, 1]
+            else:
+                spread[1] = now
+                spread[2] += 1
+
+    def stop(self):
+        self.stopped_at = self.clock()
+
+    def unanswered(self):
+        """request header -> số request chưa có response"""
+        counts = collections.Counter()
+        for (_, header), pending in self._pending.items():
+            counts[header] += len(pending)
+        return counts
+
+    def report(self):
+        """Kết quả dạng dict (JSON được) - các key dùng tên packet trong protocol.py"""
+        duration = (self.stopped_at or self.clock()) - self.started_at
+        unanswered = self.unanswered()
+        requests = {}
+        for header in sorted(set(self.sent_count) & set(RESPONSES)):
+            entry = summarize(self.latencies.get(header, ()))
+            entry["sent"] = self.sent_count[header]
+            entry["errors"] = self.errors[header]
+            entry["unanswered"] = unanswered[header]
+            entry["error_rate"] = round((entry["errors"] + entry["unanswered"]) / entry["sent"], 4)
+            requests[protocol.packet_name(header)] = entry
+
+        spreads = collections.defaultdict(list)
+        for (_, _, _, header), (first, last, count) in self._spread.items():
+            if count > 1:
+                spreads[header].append((last - first) * 1000)
+
+        sent = sum(self.sent_count.values())
+        received = sum(self.received_count.values())
+        return {
+            "duration_s": round(duration, 3),
+            "throughput": {
+                "sent_per_s": round(sent / duration, 1) if duration > 0 else 0,
+                "received_per_s": round(received / duration, 1) if duration > 0 else 0,
+            },
+            "requests": requests,
+            "broadcast_spread": {protocol.packet_name(h): summarize(v) for h, v in sorted(spreads.items())},
+            "sent": {protocol.packet_name(h): n for h, n in sorted(self.sent_count.items())},
+            "received": {protocol.packet_name(h): n for h, n in sorted(self.received_count.items())},
+        }
@@ -0,0 +1,88 @@
+"""Bot Game State - trạng thái ván chơi tối thiểu của một bot (không dùng Qt)
+
+RoomState của GUI là QObject có signal cho từng nhóm field; bot không vẽ gì nên chỉ giữ
+những gì chiến lược cần để chọn mục tiêu: danh sách người chơi, ai đã chết, vai trò của
+mình, đồng đội sói và candidates của vòng vote lại.
+"""
+
+
+class BotGameState:
+    """Trạng thái một ván của một bot. `__slots__` để hàng trăm bot/process vẫn nhẹ."""
+
+    __slots__ = ("room_id", "is_host", "player_count", "role", "wolf_team",
+                 "players", "dead", "candidates", "night", "memory")
+
+    def __init__(self):
+        self.room_id = None
+        self.is_host = False
+        self.player_count = 0
+        self.reset_game()
+
+    def reset_game(self):
+        """Xóa trạng thái ván (giữ room_id / is_host)"""
+        self.role = None
+        self.wolf_team = ()
+        self.players = ()   # tuple[str] theo thứ tự server gửi
+        self.dead = None    # set[str], tạo khi có người chết đầu tiên
+        self.candidates = None  # tuple[str] khi đang vote lại (tie_break_start)
+        self.night = 0
+        self.memory = None  # dict riêng của chiến lược (seer đã soi ai, guard đã bảo vệ ai...)
+
+    def leave_room(self):
+        self.room_id = None
+        self.is_host = False
+        self.player_count = 0
+        self.reset_game()
+
+    # ----- Players -----
+
+    def set_players(self, players):
+        """Thay danh sách người chơi từ payload server (list[dict] hoặc list[str])"""
+        names = []
+        dead = set()
+        for p in players or ():
+            if isinstance(p, dict):
+                username = p.get("username")
+                if username and not self._to_alive(p.get("is_alive", 1)):
+                    dead.add(username)
+            else:
+                username = str(p)
+            if username:
+                names.append(username)
+        self.players = tuple(names)
+        self.dead = dead or None
+
+    def mark_dead(self, usernames):
+        for username in usernames:
+            if username:
+                if self.dead is None:
+                    self.dead = set()
+                self.dead.add(username)
+
+    def is_alive(self, username):
+        return username in self.players and not (self.dead and username in self.dead)
+
+    def alive_players(self, exclude=()):
+        """Người chơi còn sống (theo thứ tự server), bỏ qua các username trong exclude"""
+        dead = self.dead or ()
+        return [u for u in self.players if u not in dead and u not in exclude]
+
+    def vote_targets(self, exclude=()):
+        """Mục tiêu vote hợp lệ: candidates khi đang vote lại, nếu không thì mọi người còn sống"""
+        alive = self.alive_players(exclude)
+        if self.candidates is not None:
+            return [u for u in alive if u in self.candidates]
+        return alive
+
+    def remember(self):
+        """dict memory của chiến lược (tạo khi cần lần đầu)"""
+        if self.memory is None:
+            self.memory = {}
+        return self.memory
+
+    @staticmethod
+    def _to_alive(value):
+        try:
+            return int(value) != 0
+        except (TypeError, ValueError):
+            return True
@@ -0,0 +1,115 @@
+"""Chiến lược theo vai trò cho bot
+
+Mỗi vai có một instance chiến lược dùng chung cho mọi bot cùng vai (không giữ state riêng;
+những gì cần nhớ qua các đêm nằm trong `bot.state.remember()`). Hook trả về username mục
+tiêu, hoặc "" để skip (server nhận skip ngay nên phase kết thúc sớm hơn là chờ hết giờ).
+
+Thay chiến lược cho một vai:
+
+    from bot import register_strategy
+    register_strategy(protocol.ROLE_SEER, MySeerStrategy())
+
+hoặc truyền `strategies={role: strategy}` cho BotSwarm để chỉ áp dụng cho swarm đó.
+"""
+
+import protocol
+
+
+class RoleStrategy:
+    """Chiến lược mặc định: chọn ngẫu nhiên trong các mục tiêu hợp lệ, không có hành động đêm."""
+
+    def seer_check(self, bot):
+        return ""
+
+    def guard_protect(self, bot):
+        return ""
+
+    def wolf_kill(self, bot):
+        return ""
+
+    def day_vote(self, bot):
+        """Vote một người còn sống khác mình (trong candidates nếu đang vote lại)"""
+        return self.pick(bot, bot.state.vote_targets(exclude=(bot.username,)))
+
+    def on_seer_result(self, bot, target, is_werewolf):
+        pass
+
+    @staticmethod
+    def pick(bot, choices):
+        """Chọn ngẫu nhiên bằng RNG dùng chung của swarm; "" nếu không còn ai"""
+        return bot.rng.choice(choices) if choices else ""
+
+
+class VillagerStrategy(RoleStrategy):
+    pass
+
+
+class WerewolfStrategy(RoleStrategy):
+    """Cắn và vote người ngoài đội sói"""
+
+    def wolf_kill(self, bot):
+        return self.pick(bot, bot.state.alive_players(exclude=bot.state.wolf_team + (bot.username,)))
+
+    def day_vote(self, bot):
+        state = bot.state
+        targets = state.vote_targets(exclude=state.wolf_team + (bot.username,))
+        if not targets:
+            # Vote lại chỉ còn sói trong candidates: skip thay vì vote đồng đội
+            return ""
+        return self.pick(bot, targets)
+
+
+class SeerStrategy(RoleStrategy):
+    """Soi người chưa soi; ban ngày vote sói đã biết, nếu không thì tránh người đã biết là dân"""
+
+    def seer_check(self, bot):
+        checked = bot.state.remember().get("checked", {})
+        targets = bot.state.alive_players(exclude=(bot.username,))
+        return self.pick(bot, [u for u in targets if u not in checked])
+
+    def on_seer_result(self, bot, target, is_werewolf):
+        bot.state.remember().setdefault("checked", {})[target] = is_werewolf
+
+    def day_vote(self, bot):
+        checked = bot.state.remember().get("checked", {})
+        targets = bot.state.vote_targets(exclude=(bot.username,))
+        wolves = [u for u in targets if checked.get(u)]
+        if wolves:
+            return wolves[0]
+        unknown = [u for u in targets if u not in checked]
+        return self.pick(bot, unknown or targets)
+
+
+class GuardStrategy(RoleStrategy):
+    """Bảo vệ ngẫu nhiên một người còn sống, không bảo vệ cùng một người hai đêm liền"""
+
+    def guard_protect(self, bot):
+        memory = bot.state.remember()
+        last = memory.get("last_protected")
+        targets = bot.state.alive_players(exclude=(last,) if last else ())
+        target = self.pick(bot, targets)
+        memory["last_protected"] = target
+        return target
+
+
+# role -> chiến lược mặc định (dùng chung cho mọi bot)
+STRATEGIES = {
+    protocol.ROLE_VILLAGER: VillagerStrategy(),
+    protocol.ROLE_WEREWOLF: WerewolfStrategy(),
+    protocol.ROLE_SEER: SeerStrategy(),
+    protocol.ROLE_GUARD: GuardStrategy(),
+}
+
+_FALLBACK = RoleStrategy()
+
+
+def register_strategy(role, strategy):
+    """Thay chiến lược mặc định của một vai cho cả process"""
+    STRATEGIES[int(role)] = strategy
+
+
+def get_strategy(role, overrides=None):
+    """Chiến lược cho vai `role` (overrides của swarm trước, rồi tới STRATEGIES)"""
+    if overrides and role in overrides:
+        return overrides[role]
+    return STRATEGIES.get(role, _FALLBACK)
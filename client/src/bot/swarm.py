@@ -0,0 +1,195 @@
+"""Bot Swarm - chạy nhiều bot trong một process trên một asyncio event loop"""
+
+import asyncio
+import collections
+import random
+
+import payload_codec
+from async_network_client import AsyncWerewolfNetworkClient
+from bot.bot import Bot
+from bot.state import BotGameState
+from bot import strategies
+
+
+class BotConfig:
+    """Cấu hình dùng chung cho mọi bot của một swarm (không lặp lại trên từng bot)."""
+
+    def __init__(self, host="127.0.0.1", port=5000, transport="async", prefix="bot",
+                 password="botpass123", room_size=8, room_id=None, games=1,
+                 think_time=(0.2, 1.0), connect_concurrency=50, retry_delay=1.0,
+                 poll_interval=0.1, ping_interval=0, codecs=(payload_codec.CODEC_JSON,), seed=None):
+        """
+        transport:   "async" (AsyncWerewolfNetworkClient) hoặc "ctypes" (WerewolfNetworkClient)
+        room_size:   số bot mỗi phòng; leader tạo phòng và bấm start khi đủ
+                     (server cần ít nhất MIN_PLAYERS_TO_START = 6, tối đa 12)
+        room_id:     vào phòng có sẵn thay vì tự tạo phòng (người thật là host)
+        games:       số ván mỗi bot chơi trước khi ngắt kết nối (0 = chơi mãi)
+        think_time:  (min, max) giây chờ trước mỗi hành động, tránh mọi bot gửi cùng lúc
+        ping_interval: giây giữa hai PING của mỗi bot (0 = không ping; server vẫn ping bot)
+        codecs:      codec đề nghị khi connect (payload_codec.SUPPORTED_CODECS = thương lượng compact1)
+        """
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.prefix = prefix
+        self.password = password
+        self.room_size = room_size
+        self.room_id = room_id
+        self.games = games
+        self.think_time = think_time
+        self.connect_concurrency = connect_concurrency
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.ping_interval = ping_interval
+        self.codecs = tuple(codecs)
+        self.seed = seed
+
+
+# WerewolfNetworkClient cho bot (tạo lần đầu cần: chỉ transport "ctypes" cần thư viện C)
+_ctypes_client_class = None
+
+# Bản GUI cấp sẵn 64 KB receive buffer cho một connection; với hàng trăm bot thì phần lớn
+# bộ nhớ là buffer này trong khi payload game thường dưới 2 KB (buffer tự lớn lên khi cần).
+BOT_RECV_BUFFER_SIZE = 4096
+
+
+def _create_ctypes_client():
+    global _ctypes_client_class
+    if _ctypes_client_class is None:
+        from network_client import WerewolfNetworkClient
+
+        class BotNetworkClient(WerewolfNetworkClient):
+            INITIAL_RECV_BUFFER_SIZE = BOT_RECV_BUFFER_SIZE
+
+        _ctypes_client_class = BotNetworkClient
+    return _ctypes_client_class().create()
+
+
+class BotSwarm:
+    """Quản lý N bot: kết nối (giới hạn số connect đồng thời), chia nhóm phòng, thống kê.
+
+    Bot chia thành nhóm `room_size` bot; bot đầu nhóm (leader) tạo phòng, các bot còn lại
+    vào phòng đó khi leader tạo xong, leader bấm start khi phòng đủ người. Với
+    `config.room_id` mọi bot vào phòng đó và chờ host bắt đầu.
+    """
+
+    def __init__(self, count, config=None, strategies_override=None, loop=None, recorder=None):
+        self.config = config or BotConfig()
+        self.loop = loop
+        self.recorder = recorder  # LoadRecorder (bot.metrics) khi chạy load test
+        self.rng = random.Random(self.config.seed)
+        self._strategies = strategies_override
+        self.stats = collections.Counter()
+        self.winners = collections.Counter()
+        self.bots = []
+        self._groups = []  # group -> list[Bot]
+        self._rooms = {}   # group -> room_id hiện tại của nhóm
+        self._round = {}   # group -> số phòng nhóm đã tạo (tên phòng không trùng)
+        self._finished = None
+
+        size = self.config.room_size
+        for i in range(count):
+            group = None
+            if self.config.room_id is None:
+                group = i // size
+                if group == len(self._groups):
+                    self._groups.append([])
+            bot = Bot(self, f"{self.config.prefix}{i:03d}", group)
+            if group is not None:
+                self._groups[group].append(bot)
+            self.bots.append(bot)
+
+    # ----- Dùng bởi Bot -----
+
+    def new_state(self):
+        return BotGameState()
+
+    def strategy_for(self, role):
+        return strategies.get_strategy(role, self._strategies)
+
+    def leader_of(self, group):
+        return self._groups[group][0]
+
+    def room_of(self, group):
+        return self._rooms.get(group)
+
+    def room_name(self, group):
+        self._round[group] = self._round.get(group, 0) + 1
+        return f"{self.config.prefix}-room-{group}-{self._round[group]}"
+
+    def room_created(self, group, room_id):
+        """Leader tạo phòng xong: các bot cùng nhóm đang ở lobby vào phòng"""
+        self._rooms[group] = room_id
+        self.stats["rooms_created"] += 1
+        for bot in self._groups[group][1:]:
+            bot.enter_room()
+
+    def game_over(self, bot, winner):
+        self.stats["games_played"] += 1
+        if bot.is_leader or (bot.group is None and bot.state.is_host):
+            self.winners[winner or "unknown"] += 1
+        if bot.group is not None and self._rooms.get(bot.group) == bot.state.room_id:
+            # Phòng cũ bị xóa khi mọi người rời; leader tạo phòng mới cho ván sau
+            del self._rooms[bot.group]
+
+    def act_later(self, bot, callback, *args):
+        """Gọi callback sau think time ngẫu nhiên (một TimerHandle, không tạo task)"""
+        low, high = self.config.think_time
+        delay = self.rng.uniform(low, high) if high > 0 else 0
+        self.loop.call_later(delay, callback, *args)
+
+    def bot_finished(self, bot):
+        self.stats["finished"] += 1
+        if self._finished is not None and self.stats["finished"] >= len(self.bots) and not self._finished.done():
+            self._finished.set_result(None)
+
+    # ----- Chạy -----
+
+    async def open_client(self):
+        """Network client đã kết nối theo config.transport"""
+        config = self.config
+        if config.transport == "ctypes":
+            client = _create_ctypes_client()
+            client.offer_codecs = config.codecs
+            # ww_client_connect chặn tới khi connect xong: chạy trên thread pool
+            await self.loop.run_in_executor(None, client.connect, config.host, config.port)
+            return client
+        client = AsyncWerewolfNetworkClient(self.loop)
+        client.offer_codecs = config.codecs
+        await client.connect(config.host, config.port)
+        return client
+
+    async def run(self):
+        """Kết nối mọi bot rồi chờ tới khi tất cả chơi xong (config.games) hoặc mất kết nối"""
+        self.loop = asyncio.get_running_loop()
+        self._finished = self.loop.create_future()
+        limit = asyncio.Semaphore(self.config.connect_concurrency)
+        await asyncio.gather(*(self._connect(bot, limit) for bot in self.bots))
+        if self.bots:
+            await self._finished
+
+    async def _connect(self, bot, limit):
+        async with limit:
+            try:
+                client = await self.open_client()
+            except (ConnectionError, OSError, RuntimeError) as e:
+                print(f"[WARNING] Bot {bot.username} connect failed: {e}")
+                self.stats["connect_failed"] += 1
+                bot.phase = Bot.DONE
+                self.bot_finished(bot)
+                return
+        self.stats["connected"] += 1
+        bot.attach(client)
+
+    def close(self):
+        for bot in self.bots:
+            bot.close()
+
+    def phases(self):
+        """Số bot theo phase (cho báo cáo tiến độ)"""
+        return collections.Counter(bot.phase for bot in self.bots)
+
+    def summary(self):
+        stats = ", ".join(f"{key}={value}" for key, value in sorted(self.stats.items()))
+        winners = ", ".join(f"{key}={value}" for key, value in sorted(self.winners.items()))
+        return f"[BOT] {len(self.bots)} bots | {stats} | winners: {winners or '-'}"
@@ -0,0 +1,353 @@
+import time
+
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+
+class ChatMessage:
+    """Một tin nhắn trong chat log. `_size_key/_size` cache kích thước theo độ rộng viewport."""
+
+    __slots__ = ("username", "text", "is_self", "_size_key", "_size")
+
+    def __init__(self, username, text, is_self=False):
+        self.username = username if username is not None else ""
+        self.text = text if text is not None else ""
+        self.is_self = is_self
+        self._size_key = None
+        self._size = None
+
+
+class ChatBubbleStyle:
+    """Style dùng chung cho mọi bubble của một loại chat (thay cho stylesheet inline mỗi tin nhắn).
+
+    Font/màu chỉ tạo một lần (lazy, sau khi có QApplication).
+    """
+
+    def __init__(self, other_bubble="#3498db", other_text="white", self_bubble="#2ecc71",
+                 self_text="#062b1a", name_color="rgba(255,255,255,0.75)", max_bubble_width=500,
+                 name_px=11, text_px=13):
+        self.other_bubble = other_bubble
+        self.other_text = other_text
+        self.self_bubble = self_bubble
+        self.self_text = self_text
+        self.name_color = name_color
+        self.max_bubble_width = max_bubble_width
+        self.name_px = name_px
+        self.text_px = text_px
+        # Khoảng cách (px)
+        self.margin_x = 12
+        self.margin_y = 5
+        self.name_spacing = 4
+        self.pad_x = 14
+        self.pad_y = 10
+        self.radius = 12
+        self._built = False
+
+    def _build(self):
+        self.name_font = QtGui.QFont()
+        self.name_font.setPixelSize(self.name_px)
+        self.text_font = QtGui.QFont()
+        self.text_font.setPixelSize(self.text_px)
+        self.name_metrics = QtGui.QFontMetrics(self.name_font)
+        self.text_metrics = QtGui.QFontMetrics(self.text_font)
+        self.colors = {
+            "name": self._color(self.name_color),
+            "other_bubble": self._color(self.other_bubble),
+            "other_text": self._color(self.other_text),
+            "self_bubble": self._color(self.self_bubble),
+            "self_text": self._color(self.self_text),
+        }
+        self._built = True
+
+    def ensure_built(self):
+        if not self._built:
+            self._build()
+        return self
+
+    @staticmethod
+    def _color(value):
+        """QColor từ "#rrggbb", tên màu hoặc "rgba(r,g,b,a)" (a: 0-1 như QSS)"""
+        value = value.strip()
+        if value.startswith("rgba("):
+            r, g, b, a = (part.strip() for part in value[5:-1].split(","))
+            color = QtGui.QColor(int(r), int(g), int(b))
+            color.setAlphaF(float(a))
+            return color
+        return QtGui.QColor(value)
+
+
+# Style dùng chung theo loại chat
+DAY_CHAT_STYLE = ChatBubbleStyle(other_bubble="#3498db", max_bubble_width=500)
+WOLF_CHAT_STYLE = ChatBubbleStyle(other_bubble="#e94560", max_bubble_width=360)
+
+
+class ChatLogModel(QtCore.QAbstractListModel):
+    """Danh sách tin nhắn, giữ tối đa `max_messages` tin gần nhất (xóa tin cũ nhất khi vượt)."""
+
+    MessageRole = QtCore.Qt.UserRole + 1
+
+    DEFAULT_MAX_MESSAGES = 500
+
+    def __init__(self, max_messages=DEFAULT_MAX_MESSAGES, parent=None):
+        super().__init__(parent)
+        self.max_messages = max_messages
+        self._messages = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._messages)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._messages)):
+            return None
+        message = self._messages[index.row()]
+        if role == self.MessageRole:
+            return message
+        if role == QtCore.Qt.DisplayRole:
+            return f"{message.username}: {message.text}"
+        return None
+
+    def append_messages(self, messages):
+        """Thêm nhiều tin nhắn với một lần beginInsertRows (một lần layout cho cả lô)"""
+        if not messages:
+            return
+        if self.max_messages and len(messages) > self.max_messages:
+            messages = messages[-self.max_messages:]
+        first = len(self._messages)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(messages) - 1)
+        self._messages.extend(messages)
+        self.endInsertRows()
+        self._trim()
+
+    def append_message(self, username, text, is_self=False):
+        self.append_messages([ChatMessage(username, text, is_self)])
+
+    def messages(self):
+        return list(self._messages)
+
+    def clear(self):
+        self.beginResetModel()
+        self._messages = []
+        self.endResetModel()
+
+    def _trim(self):
+        excess = len(self._messages) - self.max_messages if self.max_messages else 0
+        if excess > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, excess - 1)
+            del self._messages[:excess]
+            self.endRemoveRows()
+
+
+class ChatBubbleDelegate(QtWidgets.QStyledItemDelegate):
+    """Vẽ tên người gửi + bubble trực tiếp bằng QPainter (không tạo widget cho mỗi tin nhắn)."""
+
+    def __init__(self, style, parent=None):
+        super().__init__(parent)
+        self.bubble_style = style
+
+    def _text_width(self, view_width):
+        s = self.bubble_style
+        return max(40, min(s.max_bubble_width, view_width - 2 * s.margin_x) - 2 * s.pad_x)
+
+    def _layout(self, message, view_width):
+        """(name_height, text_rect_size) cho message ở độ rộng view, cache theo độ rộng"""
+        key = view_width
+        if message._size_key == key:
+            return message._size
+        s = self.bubble_style.ensure_built()
+        text_rect = s.text_metrics.boundingRect(
+            QtCore.QRect(0, 0, self._text_width(view_width), 1 << 20),
+            QtCore.Qt.TextWordWrap, message.text,
+        )
+        size = (s.name_metrics.height(), text_rect.size())
+        message._size_key = key
+        message._size = size
+        return size
+
+    def _view_width(self, option):
+        view = self.parent()
+        if isinstance(view, QtWidgets.QAbstractItemView):
+            return view.viewport().width()
+        return option.rect.width()
+
+    def sizeHint(self, option, index):
+        message = index.data(ChatLogModel.MessageRole)
+        if message is None:
+            return super().sizeHint(option, index)
+        s = self.bubble_style
+        view_width = self._view_width(option)
+        name_h, text_size = self._layout(message, view_width)
+        height = 2 * s.margin_y + name_h + s.name_spacing + text_size.height() + 2 * s.pad_y
+        return QtCore.QSize(view_width, height)
+
+    def paint(self, painter, option, index):
+        message = index.data(ChatLogModel.MessageRole)
+        if message is None:
+            return
+        s = self.bubble_style.ensure_built()
+        rect = option.rect
+        name_h, text_size = self._layout(message, self._view_width(option))
+        bubble_w = text_size.width() + 2 * s.pad_x
+        bubble_h = text_size.height() + 2 * s.pad_y
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        # Tên người gửi ("me" cho tin của mình), căn trái/phải như bubble
+        name_rect = QtCore.QRect(rect.left() + s.margin_x, rect.top() + s.margin_y,
+                                 rect.width() - 2 * s.margin_x, name_h)
+        align = QtCore.Qt.AlignRight if message.is_self else QtCore.Qt.AlignLeft
+        painter.setFont(s.name_font)
+        painter.setPen(s.colors["name"])
+        painter.drawText(name_rect, align | QtCore.Qt.AlignVCenter, "me" if message.is_self else message.username)
+
+        # Bubble
+        top = name_rect.bottom() + 1 + s.name_spacing
+        if message.is_self:
+            left = rect.right() - s.margin_x - bubble_w
+            bubble_color, text_color = s.colors["self_bubble"], s.colors["self_text"]
+        else:
+            left = rect.left() + s.margin_x
+            bubble_color, text_color = s.colors["other_bubble"], s.colors["other_text"]
+        bubble_rect = QtCore.QRectF(left, top, bubble_w, bubble_h)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(bubble_color)
+        painter.drawRoundedRect(bubble_rect, s.radius, s.radius)
+
+        painter.setFont(s.text_font)
+        painter.setPen(text_color)
+        text_rect = QtCore.QRect(int(left) + s.pad_x, int(top) + s.pad_y, text_size.width(), text_size.height())
+        painter.drawText(text_rect, QtCore.Qt.TextWordWrap, message.text)
+        painter.restore()
+
+
+class ChatIngestBuffer(QtCore.QObject):
+    """Gom tin nhắn đến trong một frame (~16ms) rồi thêm vào model thành một lô.
+
+    Mỗi lô = một beginInsertRows + một lần layout + một lần cuộn xuống cuối, thay vì
+    mỗi tin nhắn một lần. `frame_ms=0` = thêm ngay từng tin (không gom).
+
+    Bộ đếm: `messages_ingested`, `frames_rendered` (số lô đã flush), `render_time_s`
+    (tổng thời gian flush + layout), `messages_per_second()` từ lần `reset_stats()` gần nhất.
+    """
+
+    DEFAULT_FRAME_MS = 16
+
+    def __init__(self, view, frame_ms=DEFAULT_FRAME_MS):
+        super().__init__(view)
+        self.view = view
+        self.frame_ms = frame_ms
+        self._pending = []
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.reset_stats()
+
+    def push(self, username, text, is_self=False):
+        self._pending.append(ChatMessage(username, text, is_self))
+        self.messages_ingested += 1
+        if self.frame_ms <= 0:
+            self.flush()
+        elif not self._timer.isActive():
+            self._timer.start(self.frame_ms)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Thêm toàn bộ tin đang chờ vào model, layout và cuộn một lần"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        start = time.perf_counter()
+        self.view.chat_model.append_messages(batch)
+        self.view.scrollToBottom()
+        self.render_time_s += time.perf_counter() - start
+        self.frames_rendered += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def discard(self):
+        self._timer.stop()
+        self._pending = []
+
+    def reset_stats(self):
+        self.messages_ingested = 0
+        self.frames_rendered = 0
+        self.render_time_s = 0.0
+        self.largest_batch = 0
+        self._stats_start = time.monotonic()
+
+    def messages_per_second(self):
+        elapsed = time.monotonic() - self._stats_start
+        return self.messages_ingested / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "messages_ingested": self.messages_ingested,
+            "messages_per_second": self.messages_per_second(),
+            "frames_rendered": self.frames_rendered,
+            "render_time_ms": self.render_time_s * 1000,
+            "largest_batch": self.largest_batch,
+        }
+
+
+class ChatLogView(QtWidgets.QListView):
+    """QListView hiển thị ChatLogModel; chỉ các dòng trong viewport được vẽ.
+
+    Tin nhắn mới đi qua `ingest` (ChatIngestBuffer) nên một flood chỉ tốn một layout mỗi frame.
+
+    Bubble cao thấp khác nhau nên không dùng được uniformItemSizes; mỗi lần relayout (thêm
+    tin, đổi kích thước) QListView vẫn hỏi sizeHint của mọi dòng. Layout mode Batched chia
+    việc đó thành từng LAYOUT_BATCH_SIZE dòng giữa các lượt event loop, nên lịch sử dài không
+    chặn GUI thread; sizeHint lại rẻ nhờ cache theo độ rộng (ChatBubbleDelegate._layout).
+    Vì chiều cao danh sách tăng dần theo từng lô, view tự bám đáy khi đang ở cuối.
+    """
+
+    LAYOUT_BATCH_SIZE = 50
+
+    def __init__(self, style=DAY_CHAT_STYLE, max_messages=ChatLogModel.DEFAULT_MAX_MESSAGES,
+                 frame_ms=ChatIngestBuffer.DEFAULT_FRAME_MS, parent=None):
+        super().__init__(parent)
+        self.chat_model = ChatLogModel(max_messages, self)
+        self.setModel(self.chat_model)
+        self.setItemDelegate(ChatBubbleDelegate(style, self))
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setResizeMode(QtWidgets.QListView.Adjust)
+        self.setLayoutMode(QtWidgets.QListView.Batched)
+        self.setBatchSize(self.LAYOUT_BATCH_SIZE)
+        self._follow_bottom = True
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.rangeChanged.connect(self._on_range_changed)
+        scroll_bar.valueChanged.connect(self._on_scrolled)
+        self.ingest = ChatIngestBuffer(self, frame_ms)
+
+    def scrollToBottom(self):
+        self._follow_bottom = True
+        super().scrollToBottom()
+
+    def _on_range_changed(self, minimum, maximum):
+        # Lô layout kế tiếp làm danh sách dài thêm: giữ ở cuối nếu người dùng chưa cuộn lên
+        if self._follow_bottom:
+            self.verticalScrollBar().setValue(maximum)
+
+    def _on_scrolled(self, value):
+        self._follow_bottom = value >= self.verticalScrollBar().maximum()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # ListMode chỉ relayout khi chiều cao đổi; bubble word-wrap theo độ rộng nên cần đo lại
+        if event.oldSize().width() != event.size().width():
+            self.scheduleDelayedItemsLayout()
+
+    def append_message(self, username, text, is_self=False):
+        """Xếp tin nhắn vào buffer; được thêm và cuộn xuống cuối ở frame kế tiếp"""
+        self.ingest.push(username, text, is_self)
+
+    def clear(self):
+        self.ingest.discard()
+        self.chat_model.clear()
@@ -0,0 +1,159 @@
+from PyQt5 import QtWidgets, QtCore
+
+from utils.style_utils import set_style_properties, set_style_property
+
+
+class PlayerCard(QtWidgets.QFrame):
+    """Card một người chơi dùng lại được (tạo một lần, cập nhật tại chỗ).
+
+    Trạng thái alive/selected là dynamic property; giao diện lấy từ rule
+    `#<window> QFrame#user_card[...]` trong werewolf_theme.qss, nên đổi trạng thái chỉ
+    re-polish đúng card đó thay vì gán stylesheet mới.
+    """
+
+    clicked = QtCore.pyqtSignal(str)
+
+    # Hậu tố dưới tên khi card là của chính mình
+    self_suffix = "(You)"
+
+    def __init__(self, username, parent=None):
+        super().__init__(parent)
+        self.username = username
+        self.is_self = False
+        self.is_alive = True
+        self.is_selected = False
+        self.is_interactive = False
+        self.setObjectName("user_card")
+        self.setFrameShape(QtWidgets.QFrame.StyledPanel)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setSpacing(0)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.icon_label = QtWidgets.QLabel("👤")
+        self.icon_label.setObjectName("user_card_icon")
+        self.icon_label.setAlignment(QtCore.Qt.AlignCenter)
+        layout.addWidget(self.icon_label)
+
+        self.name_label = QtWidgets.QLabel(username)
+        self.name_label.setObjectName("user_card_name")
+        self.name_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.name_label.setWordWrap(True)
+        layout.addWidget(self.name_label)
+
+        self.setProperty("alive", True)
+        self.setProperty("selected", False)
+        self.name_label.setProperty("alive", True)
+        self._apply_interactive(False)
+
+    def set_state(self, is_alive, is_self=False, selected=False, interactive=False):
+        """Cập nhật trạng thái; chỉ đụng tới widget khi giá trị thực sự đổi"""
+        changed = {}
+        if is_alive != self.is_alive or is_self != self.is_self:
+            self.is_alive = is_alive
+            self.is_self = is_self
+            self.icon_label.setText("👤" if is_alive else "💀")
+            label = self.username
+            if is_self:
+                label = f"{label}\n{self.self_suffix}"
+            if not is_alive:
+                label = label + "\n(Dead)"
+            self.name_label.setText(label)
+            changed["alive"] = is_alive
+            set_style_property(self.name_label, "alive", is_alive)
+        selected = bool(selected and is_alive)
+        if selected != self.is_selected:
+            self.is_selected = selected
+            changed["selected"] = selected
+        if changed:
+            # alive và selected đổi cùng lúc (người đang được chọn chết) chỉ re-polish card một lần
+            set_style_properties(self, **changed)
+        interactive = bool(interactive and is_alive)
+        if interactive != self.is_interactive:
+            self._apply_interactive(interactive)
+
+    def set_selected(self, selected):
+        self.set_state(self.is_alive, self.is_self, selected, self.is_interactive)
+
+    def set_interactive(self, interactive):
+        self.set_state(self.is_alive, self.is_self, self.is_selected, interactive)
+
+    def _apply_interactive(self, interactive):
+        self.is_interactive = interactive
+        self.setEnabled(interactive)
+        self.setCursor(QtCore.Qt.PointingHandCursor if interactive else QtCore.Qt.ForbiddenCursor)
+
+    def mousePressEvent(self, event):
+        if self.is_interactive and event.button() == QtCore.Qt.LeftButton:
+            self.clicked.emit(self.username)
+        super().mousePressEvent(event)
+
+
+class PlayerCardGrid(QtWidgets.QWidget):
+    """Lưới PlayerCard có pool theo username, dùng cho các màn chọn ban đêm và DayVoteWindow.
+
+    Card chỉ được tạo lần đầu gặp username; `set_players()` các lần sau chỉ cập nhật
+    trạng thái và sắp lại lưới khi thứ tự đổi. Giao diện card theo màn hình chứa lưới
+    (`#seer_select_window QFrame#user_card`, `#day_vote_window ...` trong werewolf_theme.qss).
+    """
+
+    card_clicked = QtCore.pyqtSignal(str)
+
+    def __init__(self, col_count=3, self_suffix=None, card_min_size=None, parent=None):
+        super().__init__(parent)
+        self.col_count = col_count
+        self.self_suffix = self_suffix
+        self.card_min_size = card_min_size
+        self._card_pool = {}
+        self._card_order = []
+        self.grid_layout = QtWidgets.QGridLayout(self)
+        self.grid_layout.setSpacing(15)
+        self.grid_layout.setContentsMargins(10, 10, 10, 10)
+
+    def set_players(self, entries, selected=None, keep=()):
+        """entries: list (username, is_alive, is_self, interactive) theo thứ tự hiển thị
+
+        selected: username đang được chọn (giữ nguyên highlight qua các lần cập nhật)
+        keep:     username không hiển thị nhưng vẫn giữ card trong pool (ẩn), vd. người
+                  không phải ứng viên tie-break
+        """
+        usernames = [entry[0] for entry in entries]
+        for username in set(self._card_pool) - set(usernames) - set(keep):
+            card = self._card_pool.pop(username)
+            self.grid_layout.removeWidget(card)
+            card.deleteLater()
+
+        for username, is_alive, is_self, interactive in entries:
+            card = self._card_pool.get(username)
+            if card is None:
+                card = PlayerCard(username)
+                if self.self_suffix:
+                    card.self_suffix = self.self_suffix
+                if self.card_min_size:
+                    card.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+                    card.setMinimumSize(*self.card_min_size)
+                card.clicked.connect(self.card_clicked)
+                self._card_pool[username] = card
+            card.set_state(is_alive, is_self=is_self, selected=(username == selected), interactive=interactive)
+
+        if usernames != self._card_order:
+            shown = set(usernames)
+            for username in self._card_order:
+                card = self._card_pool.get(username)
+                if card is not None:
+                    self.grid_layout.removeWidget(card)
+                    if username not in shown:
+                        card.hide()
+            for i, username in enumerate(usernames):
+                card = self._card_pool[username]
+                self.grid_layout.addWidget(card, i // self.col_count, i % self.col_count)
+                card.show()
+            self._card_order = usernames
+
+    def set_selected(self, username):
+        for name in self._card_order:
+            self._card_pool[name].set_selected(name == username)
+
+    def cards(self):
+        """List (card, username, is_alive) theo thứ tự hiển thị"""
+        return [(self._card_pool[u], u, self._card_pool[u].is_alive) for u in self._card_order]
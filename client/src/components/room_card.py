@@ -0,0 +1,97 @@
+from PyQt5 import QtWidgets, QtCore
+import protocol
+from utils.style_utils import set_style_property
+
+
+class RoomCard(QtWidgets.QFrame):
+    """Card một phòng trong lobby. Tạo widget một lần, `update_room()` chỉ đổi label thay đổi.
+
+    Giao diện lấy từ rule `#lobby_window QFrame#room_card ...` trong werewolf_theme.qss;
+    màu trạng thái theo property `status` ("waiting" / "playing") của status label.
+    """
+
+    join_clicked = QtCore.pyqtSignal(int)
+
+    def __init__(self, room_id, parent=None):
+        super().__init__(parent)
+        self.room_id = room_id
+        # (name, current, max_players, status) đang hiển thị; None = chưa render
+        self._state = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setObjectName("room_card")
+        self.setFrameShape(QtWidgets.QFrame.StyledPanel)
+
+        card_layout = QtWidgets.QVBoxLayout(self)
+        card_layout.setSpacing(8)
+
+        # Header với biểu tượng và tên phòng
+        header_layout = QtWidgets.QHBoxLayout()
+
+        icon_label = QtWidgets.QLabel("🏠")
+        icon_label.setObjectName("room_card_icon_label")
+        header_layout.addWidget(icon_label)
+
+        self.room_name_label = QtWidgets.QLabel()
+        self.room_name_label.setObjectName("room_card_name_label")
+        self.room_name_label.setWordWrap(True)
+        header_layout.addWidget(self.room_name_label, 1)
+
+        card_layout.addLayout(header_layout)
+
+        # Room ID
+        id_label = QtWidgets.QLabel(f"Room #{self.room_id}")
+        id_label.setObjectName("room_card_id_label")
+        card_layout.addWidget(id_label)
+
+        # Players count
+        self.players_label = QtWidgets.QLabel()
+        self.players_label.setObjectName("room_card_players_label")
+        card_layout.addWidget(self.players_label)
+
+        # Status
+        self.status_label = QtWidgets.QLabel()
+        self.status_label.setObjectName("room_card_status_label")
+        card_layout.addWidget(self.status_label)
+
+        # Join button / FULL - IN GAME label: tạo cả hai, chỉ đổi visibility
+        self.join_button = QtWidgets.QPushButton("Join Room")
+        self.join_button.setObjectName("join_room_button")
+        self.join_button.setMinimumHeight(35)
+        self.join_button.clicked.connect(lambda: self.join_clicked.emit(self.room_id))
+        card_layout.addWidget(self.join_button)
+
+        self.full_label = QtWidgets.QLabel()
+        self.full_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.full_label.setObjectName("room_card_full_label")
+        self.full_label.hide()
+        card_layout.addWidget(self.full_label)
+
+    def update_room(self, name, current, max_players, status):
+        """Áp dữ liệu mới; trả về True nếu có gì thay đổi trên card"""
+        state = (name, current, max_players, status)
+        old = self._state
+        if state == old:
+            return False
+        self._state = state
+
+        if old is None or old[0] != name:
+            self.room_name_label.setText(name)
+        if old is None or old[1:3] != (current, max_players):
+            self.players_label.setText(f"👥 {current}/{max_players} players")
+        if old is None or old[3] != status:
+            # Chỉ re-polish khi status đổi (tránh re-polish mỗi lần refresh)
+            waiting = status == protocol.ROOM_WAITING
+            self.status_label.setText(f"● {'WAITING' if waiting else 'PLAYING'}")
+            set_style_property(self.status_label, "status", "waiting" if waiting else "playing")
+
+        joinable = status == protocol.ROOM_WAITING and current < max_players
+        if joinable:
+            self.full_label.hide()
+            self.join_button.show()
+        else:
+            self.full_label.setText("FULL" if current >= max_players else "IN GAME")
+            self.join_button.hide()
+            self.full_label.show()
+        return True
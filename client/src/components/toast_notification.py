@@ -1,269 +1,367 @@
-import sys
-import socket
-import json
+import time
+from collections import deque
+
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from utils.style_utils import set_style_property
+
 
 class ToastNotification(QtWidgets.QWidget):
     """
     Toast notification: hiển thị thông báo
+
+    Widget được ToastManager dùng lại: `set_content()` đổi nội dung/loại, `set_count()` hiện
+    số lần thông báo trùng đã gộp; khi fade out xong phát `finished` để trả về pool.
     """
-    
+
+    TYPES = ("info", "success", "warning", "error")
+    ICONS = {
+        "info": "ℹ️",
+        "success": "✓",
+        "warning": "⚠️",
+        "error": "✗"
+    }
+
+    finished = QtCore.pyqtSignal(object)
+
     def __init__(self, parent=None, message="", notification_type="info", duration=3000):
         super().__init__(parent, QtCore.Qt.ToolTip | QtCore.Qt.FramelessWindowHint)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self.setAttribute(QtCore.Qt.WA_ShowWithoutActivating)
-        
+
         self.message = message
         self.notification_type = notification_type
         self.duration = duration
-        
+        self.count = 1
+        self.is_closing = False
+        self.last_shown_at = 0.0  # time.monotonic() lần cuối được hiện / gộp
+
         self.setup_ui()
         self.setup_animation()
-        
+        self.set_content(message, notification_type, duration)
+
     def setup_ui(self):
         """Setup the toast UI"""
         layout = QtWidgets.QHBoxLayout(self)
         layout.setContentsMargins(15, 10, 15, 10)
-        
+
         # Icon
         self.icon_label = QtWidgets.QLabel()
+        self.icon_label.setObjectName("toast_icon_label")
         self.icon_label.setFixedSize(24, 24)
-        self.set_icon()
-        
+        self.icon_label.setAlignment(QtCore.Qt.AlignCenter)
+
         # Message
-        self.message_label = QtWidgets.QLabel(self.message)
+        self.message_label = QtWidgets.QLabel()
         self.message_label.setWordWrap(True)
-        self.message_label.setStyleSheet("color: white; font-size: 13px;")
-        
+        self.message_label.setObjectName("toast_message_label")
+
+        # Số lần thông báo trùng đã gộp (ẩn khi chỉ có một)
+        self.count_label = QtWidgets.QLabel()
+        self.count_label.setObjectName("toast_count_label")
+        self.count_label.hide()
+
         # Close button
         self.close_button = QtWidgets.QPushButton("✕")
         self.close_button.setFixedSize(20, 20)
-        self.close_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: white;
-                border: none;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                color: #ff6b6b;
-            }
-        """)
+        self.close_button.setObjectName("toast_close_button")
         self.close_button.clicked.connect(self.fade_out)
-        
+
         layout.addWidget(self.icon_label)
         layout.addWidget(self.message_label, 1)
+        layout.addWidget(self.count_label)
         layout.addWidget(self.close_button)
-        
-        # Set background color dựa trên loại thông báo
-        colors = {
-            "info": "#3498db",
-            "success": "#2ecc71",
-            "warning": "#f39c12",
-            "error": "#e74c3c"
-        }
-        bg_color = colors.get(self.notification_type, "#3498db")
-        
-        self.setStyleSheet(f"""
-            ToastNotification {{
-                background-color: {bg_color};
-                border-radius: 8px;
-                border: 2px solid rgba(255, 255, 255, 0.3);
-            }}
-        """)
-        
+
         # Set fixed width
         self.setFixedWidth(350)
+
+    def set_content(self, message, notification_type="info", duration=3000):
+        """Đổi nội dung, loại (màu nền / icon) và thời gian hiển thị; reset bộ đếm"""
+        # Màu nền theo loại thông báo: rule ToastNotification[toast_type="..."] trong theme
+        if notification_type not in self.TYPES:
+            notification_type = "info"
+        self.message = message
+        self.notification_type = notification_type
+        self.duration = duration
+        self.icon_label.setText(self.ICONS[notification_type])
+        self.message_label.setText(message)
+        set_style_property(self, "toast_type", notification_type)
+        self.set_count(1)
         self.adjustSize()
-        
-    def set_icon(self):
-        """Set icon dựa theo loại thông báo"""
-        icons = {
-            "info": "ℹ️",
-            "success": "✓",
-            "warning": "⚠️",
-            "error": "✗"
-        }
-        icon_text = icons.get(self.notification_type, "ℹ️")
-        self.icon_label.setText(icon_text)
-        self.icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.icon_label.setStyleSheet("color: white; font-size: 20px; font-weight: bold;")
-        
+
+    def set_count(self, count):
+        """Hiện số lần thông báo đã gộp (×N)"""
+        self.count = count
+        if count > 1:
+            self.count_label.setText(f"×{count}")
+        self.count_label.setVisible(count > 1)
+
     def setup_animation(self):
         """Hiệu ứng fade in/out"""
         # Opacity effect
         self.opacity_effect = QtWidgets.QGraphicsOpacityEffect()
         self.setGraphicsEffect(self.opacity_effect)
-        
+
         # Hiệu ứng fade in
-        self.fade_in_anim = QtCore.QPropertyAnimation(self.opacity_effect, b"opacity")
+        self.fade_in_anim = QtCore.QPropertyAnimation(self.opacity_effect, b"opacity", self)
         self.fade_in_anim.setDuration(300)
-        self.fade_in_anim.setStartValue(0.0)
         self.fade_in_anim.setEndValue(1.0)
         self.fade_in_anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-        
+
         # Hiệu ứng fade out
-        self.fade_out_anim = QtCore.QPropertyAnimation(self.opacity_effect, b"opacity")
+        self.fade_out_anim = QtCore.QPropertyAnimation(self.opacity_effect, b"opacity", self)
         self.fade_out_anim.setDuration(300)
-        self.fade_out_anim.setStartValue(1.0)
         self.fade_out_anim.setEndValue(0.0)
         self.fade_out_anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-        self.fade_out_anim.finished.connect(self.close)
-        
+        self.fade_out_anim.finished.connect(self._on_faded_out)
+
+        # Trượt tới vị trí mới khi toast phía trên biến mất (một animation cho mỗi toast)
+        self.move_anim = QtCore.QPropertyAnimation(self, b"pos", self)
+        self.move_anim.setDuration(200)
+        self.move_anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
+
         # Auto-hide timer
-        self.hide_timer = QtCore.QTimer()
+        self.hide_timer = QtCore.QTimer(self)
         self.hide_timer.setSingleShot(True)
         self.hide_timer.timeout.connect(self.fade_out)
-        
+
     def show_notification(self):
-        """Hiển thị thông báo"""
-        self.show()
+        """Hiển thị thông báo (fade in từ opacity hiện tại nếu đang fade out)"""
+        self.is_closing = False
+        self.fade_out_anim.stop()
+        if not self.isVisible():
+            self.opacity_effect.setOpacity(0.0)
+            self.show()
+        self.fade_in_anim.setStartValue(self.opacity_effect.opacity())
         self.fade_in_anim.start()
         self.hide_timer.start(self.duration)
-        
+
+    def is_active(self):
+        """Đang hiện và chưa bắt đầu fade out"""
+        return self.isVisible() and not self.is_closing
+
     def fade_out(self):
         """Hiệu ứng fade out thông báo"""
+        if self.is_closing:
+            return
+        self.is_closing = True
         self.hide_timer.stop()
+        self.fade_in_anim.stop()
+        self.fade_out_anim.setStartValue(self.opacity_effect.opacity())
         self.fade_out_anim.start()
 
+    def slide_to(self, pos):
+        """Di chuyển tới pos; có animation nếu đang hiện và chưa ở đúng chỗ"""
+        if self.move_anim.state() == QtCore.QAbstractAnimation.Running:
+            if self.move_anim.endValue() == pos:
+                return
+            self.move_anim.stop()
+        if self.pos() == pos:
+            return
+        if not self.isVisible():
+            self.move(pos)
+            return
+        self.move_anim.setStartValue(self.pos())
+        self.move_anim.setEndValue(pos)
+        self.move_anim.start()
+
+    def stop(self):
+        """Dừng timer/animation và ẩn ngay (không phát finished)"""
+        self.hide_timer.stop()
+        self.fade_in_anim.stop()
+        self.fade_out_anim.stop()
+        self.move_anim.stop()
+        self.hide()
+        self.is_closing = False
+
+    def _on_faded_out(self):
+        self.stop()
+        self.finished.emit(self)
+
 
 class ToastManager(QtCore.QObject):
     """
     Manager cho Toast Notifications
     Handles positioning và xếp chồng của nhiều thông báo
+
+    Khi thông báo dồn dập (vd. ROOM_STATUS_UPDATE join/leave liên tục):
+    - widget toast được dùng lại từ pool (tối đa POOL_SIZE widget rảnh), không tạo mới mỗi lần
+    - thông báo trùng (cùng loại + nội dung) trong COALESCE_WINDOW_MS gộp vào toast đang hiện
+      (hoặc đang chờ) và tăng bộ đếm ×N
+    - tối đa MAX_VISIBLE toast hiện cùng lúc; phần dư chờ trong hàng đợi MAX_PENDING phần tử,
+      đầy thì bỏ thông báo cũ nhất
     """
-    
+
+    MAX_VISIBLE = 4
+    MAX_PENDING = 8
+    POOL_SIZE = MAX_VISIBLE + 2
+    COALESCE_WINDOW_MS = 3000
+
     def __init__(self, parent_widget):
         super().__init__()
         self.parent_widget = parent_widget
-        self.active_toasts = []
+        self.active_toasts = []  # đang hiện (kể cả đang fade out), từ trên xuống
+        self.idle_toasts = []    # đã ẩn, chờ dùng lại
+        self.pending = deque()   # [message, notification_type, duration, count] chờ chỗ trống
         self.spacing = 10
-        
+        self.stats = {"shown": 0, "coalesced": 0, "dropped": 0, "created": 0}
+
     def show_toast(self, message, notification_type="info", duration=3000):
-        """Show a new toast notification"""
-        toast = ToastNotification(
-            parent=self.parent_widget,
-            message=message,
-            notification_type=notification_type,
-            duration=duration
-        )
-        
-        # Đặt vị trí cho toast
-        self.position_toast(toast)
-        
-        # Thêm vào danh sách active
+        """Show a toast notification; trả về toast hiển thị nó, None nếu đang chờ trong hàng đợi"""
+        if notification_type not in ToastNotification.TYPES:
+            notification_type = "info"
+        now = time.monotonic()
+
+        # Trùng với toast đang hiện: tăng bộ đếm và giữ toast lâu thêm
+        for toast in self.active_toasts:
+            try:
+                if (toast.is_active() and toast.notification_type == notification_type
+                        and toast.message == message
+                        and (now - toast.last_shown_at) * 1000 <= self.COALESCE_WINDOW_MS):
+                    toast.set_count(toast.count + 1)
+                    toast.duration = max(toast.duration, duration)
+                    toast.last_shown_at = now
+                    toast.show_notification()
+                    self.stats["coalesced"] += 1
+                    return toast
+            except RuntimeError:
+                continue
+
+        # Trùng với thông báo đang chờ
+        for entry in self.pending:
+            if entry[0] == message and entry[1] == notification_type:
+                entry[2] = max(entry[2], duration)
+                entry[3] += 1
+                self.stats["coalesced"] += 1
+                return None
+
+        self._prune()
+        if len(self.active_toasts) >= self.MAX_VISIBLE:
+            if len(self.pending) >= self.MAX_PENDING:
+                self.pending.popleft()
+                self.stats["dropped"] += 1
+            self.pending.append([message, notification_type, duration, 1])
+            return None
+
+        return self._present(message, notification_type, duration, 1)
+
+    def _present(self, message, notification_type, duration, count):
+        """Lấy toast từ pool (hoặc tạo mới), đặt vào cuối chồng và hiện"""
+        target_widget = self._target_widget()
+        toast = self._acquire(target_widget)
+        toast.set_content(message, notification_type, duration)
+        toast.set_count(count)
+        toast.last_shown_at = time.monotonic()
         self.active_toasts.append(toast)
-        
-        # Hiện thông báo
+        self.stats["shown"] += 1
+
+        # Toast mới đặt thẳng vào vị trí (chưa hiện nên slide_to không animate)
+        self.reposition_toasts()
         toast.show_notification()
-        
-        # xóa toast khi đóng
-        toast.destroyed.connect(lambda: self.remove_toast(toast))
-        
+        toast.raise_()
         return toast
-        
-    def position_toast(self, toast):
-        """Để toast ở bên phải, xếp chồng nếu có nhiều"""
-        if not self.parent_widget:
-            return
-        
-        try:
-            # Lấy window hiện tại đang visible
-            target_widget = self.parent_widget
-            if hasattr(self.parent_widget, 'window_manager'):
-                try:
-                    current_window = self.parent_widget.window_manager.get_current_window()
-                    if current_window and current_window.isVisible():
-                        target_widget = current_window
-                except RuntimeError:
-                    # Window đã bị deleted, dùng parent_widget
-                    pass
-            
-            # Đặt parent cho toast là window hiện tại
-            toast.setParent(target_widget)
-            
-            parent_rect = target_widget.geometry()
-            
-            # Tính vị trí - relative đến parent widget
-            x = parent_rect.width() - toast.width() - 20
-            y = 20
-            
-            # Xếp chồng các toast
-            for existing_toast in self.active_toasts:
-                try:
-                    if existing_toast.isVisible():
-                        y += existing_toast.height() + self.spacing
-                except RuntimeError:
+
+    def _acquire(self, target_widget):
+        while self.idle_toasts:
+            toast = self.idle_toasts.pop()
+            try:
+                # Đặt parent cho toast là window hiện tại
+                if target_widget is not None and toast.parentWidget() is not target_widget:
+                    toast.setParent(target_widget)
+                return toast
+            except RuntimeError:
+                # Đã bị xóa cùng cửa sổ cha
+                continue
+
+        toast = ToastNotification(parent=target_widget)
+        # Bỏ cờ ToolTip: toast là widget con nằm trên cửa sổ hiện tại
+        toast.setParent(target_widget, toast.windowFlags() & ~QtCore.Qt.WindowType_Mask)
+        toast.finished.connect(self._on_toast_finished)
+        toast.destroyed.connect(lambda: self._forget(toast))
+        self.stats["created"] += 1
+        return toast
+
+    def _on_toast_finished(self, toast):
+        """Toast fade out xong: trả về pool, hiện thông báo đang chờ, dồn các toast còn lại"""
+        if toast in self.active_toasts:
+            self.active_toasts.remove(toast)
+        self._release(toast)
+
+        self._prune()
+        while self.pending and len(self.active_toasts) < self.MAX_VISIBLE:
+            self._present(*self.pending.popleft())
+        self.reposition_toasts()
+
+    def _release(self, toast):
+        if len(self.idle_toasts) < self.POOL_SIZE:
+            self.idle_toasts.append(toast)
+        else:
+            self._forget(toast)
+            toast.deleteLater()
+
+    def _forget(self, toast):
+        for toasts in (self.active_toasts, self.idle_toasts):
+            if toast in toasts:
+                toasts.remove(toast)
+
+    def _prune(self):
+        """Toast nằm trên cửa sổ đã ẩn (đã navigate đi) trả về pool ngay; bỏ toast đã bị xóa"""
+        for toast in list(self.active_toasts):
+            try:
+                if toast.isVisible():
                     continue
-            
-            # Vị trí trong parent widget
-            toast.move(x, y)
-        except Exception:
-            # Fallback: đặt toast ở vị trí mặc định
-            pass
-        
-    def remove_toast(self, toast):
-        """Xóa toast khỏi danh sách active"""
-        try:
-            if toast in self.active_toasts:
-                self.active_toasts.remove(toast)
-                self.reposition_toasts()
-        except RuntimeError:
-            # Widget đã bị xóa
-            if toast in self.active_toasts:
+                toast.stop()
+            except RuntimeError:
                 self.active_toasts.remove(toast)
-            
+                continue
+            self.active_toasts.remove(toast)
+            self._release(toast)
+
+    def _target_widget(self):
+        """Lấy window hiện tại đang visible (fallback: parent_widget)"""
+        target_widget = self.parent_widget
+        if hasattr(self.parent_widget, 'window_manager'):
+            try:
+                current_window = self.parent_widget.window_manager.get_current_window()
+                if current_window and current_window.isVisible():
+                    target_widget = current_window
+            except RuntimeError:
+                # Window đã bị deleted, dùng parent_widget
+                pass
+        return target_widget
+
     def reposition_toasts(self):
-        """Đặt lại vị trí cho tất cả các toast đang hoạt động"""
+        """Xếp các toast đang hiện ở góc phải trên; chỉ toast đổi chỗ mới chạy animation"""
         try:
-            # Lấy window hiện tại đang visible
-            target_widget = self.parent_widget
-            if hasattr(self.parent_widget, 'window_manager'):
-                try:
-                    current_window = self.parent_widget.window_manager.get_current_window()
-                    if current_window and current_window.isVisible():
-                        target_widget = current_window
-                except RuntimeError:
-                    # Window đã bị deleted, dùng parent_widget
-                    pass
-            
+            target_widget = self._target_widget()
+            if target_widget is None:
+                return
+            parent_rect = target_widget.geometry()
             y = 20
             for toast in self.active_toasts:
                 try:
-                    if toast.isVisible():
-                        parent_rect = target_widget.geometry()
-                        x = parent_rect.width() - toast.width() - 20
-                        
-                        # Animate position change
-                        anim = QtCore.QPropertyAnimation(toast, b"pos")
-                        anim.setDuration(200)
-                        anim.setStartValue(toast.pos())
-                        anim.setEndValue(QtCore.QPoint(x, y))
-                        anim.setEasingCurve(QtCore.QEasingCurve.InOutQuad)
-                        anim.start()
-                        
-                        y += toast.height() + self.spacing
+                    x = parent_rect.width() - toast.width() - 20
+                    toast.slide_to(QtCore.QPoint(x, y))
+                    y += toast.height() + self.spacing
                 except RuntimeError:
                     # Toast đã bị xóa, bỏ qua
                     continue
         except Exception:
             # Ignore any errors during repositioning
             pass
-                
+
     def info(self, message, duration=3000):
         """Hiển thị thông báo info"""
         return self.show_toast(message, "info", duration)
-        
+
     def success(self, message, duration=3000):
         """Hiển thị thông báo success"""
         return self.show_toast(message, "success", duration)
-        
+
     def warning(self, message, duration=4000):
         """Hiển thị thông báo warning"""
         return self.show_toast(message, "warning", duration)
-        
+
     def error(self, message, duration=5000):
         """Hiển thị thông báo error"""
-        return self.show_toast(message, "error", duration)
\ No newline at end of file
+        return self.show_toast(message, "error", duration)
@@ -21,20 +21,7 @@ class UserHeader(QtWidgets.QWidget):
         self.user_button.setObjectName("user_button")
         self.user_button.setCursor(QtCore.Qt.PointingHandCursor)
         self.user_button.setFlat(True)
-        self.user_button.setStyleSheet("""
-            QPushButton#user_button {
-                background-color: transparent;
-                border: 2px solid #3498db;
-                border-radius: 20px;
-                padding: 8px 16px;
-                font-weight: bold;
-                color: #3498db;
-            }
-            QPushButton#user_button:hover {
-                background-color: #3498db;
-                color: white;
-            }
-        """)
+
         
         # Tạo menu
         self.menu = QtWidgets.QMenu(self)
@@ -1,6 +1,49 @@
 from PyQt5 import QtWidgets, QtCore
 
 
+class WindowRegistry(dict):
+    """dict name -> window, có thể đăng ký factory để tạo cửa sổ ở lần truy cập đầu.
+
+    `registry[name]`, `get()` và `in` thấy cả cửa sổ chưa tạo (truy cập sẽ tạo ngay);
+    `items()/values()/keys()` và vòng lặp chỉ duyệt cửa sổ đã tạo.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._factories = {}
+
+    def set_factory(self, name, factory):
+        dict.pop(self, name, None)
+        self._factories[name] = factory
+
+    def __setitem__(self, name, window):
+        self._factories.pop(name, None)
+        super().__setitem__(name, window)
+
+    def __missing__(self, name):
+        factory = self._factories[name]  # KeyError nếu chưa đăng ký
+        # Chỉ bỏ factory khi tạo thành công: factory lỗi thì lần truy cập sau thử lại
+        window = factory()
+        self._factories.pop(name, None)
+        super().__setitem__(name, window)
+        return window
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in self._factories
+
+    def is_built(self, name):
+        return dict.__contains__(self, name)
+
+    def pending(self):
+        """Tên các cửa sổ đã đăng ký factory nhưng chưa tạo"""
+        return list(self._factories)
+
+
 class WindowManager(QtCore.QObject):
     """Quản lý điều hướng và chuyển đổi giữa các cửa sổ"""
     
@@ -16,14 +59,53 @@ class WindowManager(QtCore.QObject):
     def __init__(self, app):
         super().__init__()
         self.app = app
-        self.windows = {}
+        self.windows = WindowRegistry()
+        self._prewarm_queue = []
+        self._prewarm_timer = None
         self.current_window = None
         self.shared_data = {}
         self.window_position_set = False
         
     def register_window(self, name, window_instance):
-        """Đăng ký một cửa sổ"""
-        self.windows[name] = window_instance
+        """Đăng ký một cửa sổ, hoặc factory (callable không tham số trả về cửa sổ).
+
+        Factory chỉ được gọi lần đầu cửa sổ được dùng (navigate_to/open_window/windows[name])
+        hoặc khi prewarm() tới lượt.
+        """
+        if isinstance(window_instance, QtWidgets.QWidget) or not callable(window_instance):
+            self.windows[name] = window_instance
+        else:
+            self.windows.set_factory(name, window_instance)
+
+    def ensure_window(self, name):
+        """Tạo cửa sổ (nếu đang là factory) và trả về instance"""
+        return self.windows[name]
+
+    def prewarm(self, names=None, interval_ms=0):
+        """Tạo dần các cửa sổ chưa tạo, mỗi lượt event loop một cửa sổ (không chặn UI lâu).
+
+        `names=None`: tất cả cửa sổ còn factory, theo thứ tự đăng ký.
+        """
+        queue = list(names) if names is not None else self.windows.pending()
+        self._prewarm_queue.extend(n for n in queue if n not in self._prewarm_queue)
+        if self._prewarm_timer is None:
+            self._prewarm_timer = QtCore.QTimer(self)
+            self._prewarm_timer.timeout.connect(self._prewarm_next)
+        self._prewarm_timer.setInterval(interval_ms)
+        if self._prewarm_queue and not self._prewarm_timer.isActive():
+            self._prewarm_timer.start()
+
+    def _prewarm_next(self):
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name in self.windows and not self.windows.is_built(name):
+                try:
+                    self.ensure_window(name)
+                except Exception as e:
+                    print(f"[WARNING] Failed to prewarm window '{name}': {e}")
+                break
+        if not self._prewarm_queue:
+            self._prewarm_timer.stop()
 
     def hide_all_except(self, except_names=None):
         """Ẩn tất cả các cửa sổ đã đăng ký ngoại trừ những cửa sổ được chỉ định.
@@ -9,13 +9,52 @@ import os
 import platform
 from pathlib import Path
 
+import payload_codec
+import protocol
+from packet_capture import PacketCapture
+
+
+class WWFrameInfo(ctypes.Structure):
+    """Khớp struct WWFrameInfo trong werewolf_client.h"""
+    _fields_ = [
+        ("header", ctypes.c_ushort),
+        ("offset", ctypes.c_uint),
+        ("length", ctypes.c_uint),
+    ]
+
 
 class WerewolfNetworkClient:
     """Python wrapper cho C Werewolf Network Client, sử dụng ctypes"""
+
+    INITIAL_RECV_BUFFER_SIZE = 65536
+    # Số frame tối đa lấy trong một lần gọi ww_client_receive_many
+    RECV_BATCH_SIZE = 64
+    # ww_client_receive_into: payload lớn hơn buffer hiện tại
+    RECV_BUFFER_TOO_SMALL = -2
     
     def __init__(self):
         self.client = None
         self.lib = None
+        # NetworkIOThread (tùy chọn): khi được gắn, send_packet chỉ xếp hàng và worker thread gửi
+        self.io_thread = None
+        # callback() khi hàng đợi gửi của C còn dữ liệu -> caller flush khi socket writable
+        self._send_pending_listener = None
+        # Buffer nhận dùng lại giữa các lần gọi receive_packet (tự lớn lên khi gặp payload lớn)
+        self._rx_size = self.INITIAL_RECV_BUFFER_SIZE
+        self._rx_buffer = ctypes.create_string_buffer(self._rx_size)
+        self._rx_header = ctypes.c_ushort()
+        self._rx_len = ctypes.c_int()
+        # Batch hiện tại từ ww_client_receive_many (payload nằm trong _rx_buffer)
+        self._rx_frames = (WWFrameInfo * self.RECV_BATCH_SIZE)()
+        self._rx_count = 0
+        self._rx_pos = 0
+        # PacketCapture (tùy chọn): ghi mọi frame vào/ra, xem start_capture()
+        self.capture = None
+        # Codec đề nghị sau connect và codec server đã chọn. Mặc định chỉ JSON = không gửi
+        # HELLO_REQ (server C không biết header này); đặt SUPPORTED_CODECS để bật compact1
+        self.offer_codecs = (payload_codec.CODEC_JSON,)
+        self.codec = payload_codec.CODEC_JSON
+        self._compact = False
         self._load_library()
         
     def _load_library(self):
@@ -80,6 +119,22 @@ class WerewolfNetworkClient:
             ctypes.c_char_p
         ]
         self.lib.ww_client_send.restype = ctypes.c_int
+
+        # Hàng đợi gửi non-blocking (optional, bản build cũ gửi đồng bộ)
+        if hasattr(self.lib, 'ww_client_send_priority'):
+            self.lib.ww_client_send_priority.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.c_char_p]
+            self.lib.ww_client_send_priority.restype = ctypes.c_int
+        # Gửi payload nhị phân (compact1); bản build cũ không có -> không đề nghị compact
+        for name in ('ww_client_send_len', 'ww_client_send_priority_len'):
+            if hasattr(self.lib, name):
+                getattr(self.lib, name).argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.c_char_p, ctypes.c_int]
+                getattr(self.lib, name).restype = ctypes.c_int
+        if hasattr(self.lib, 'ww_client_flush'):
+            self.lib.ww_client_flush.argtypes = [ctypes.c_void_p]
+            self.lib.ww_client_flush.restype = ctypes.c_int
+        if hasattr(self.lib, 'ww_client_send_queue_bytes'):
+            self.lib.ww_client_send_queue_bytes.argtypes = [ctypes.c_void_p]
+            self.lib.ww_client_send_queue_bytes.restype = ctypes.c_int
         
         # ww_client_receive(client, out_header, out_payload, max_size) -> int
         self.lib.ww_client_receive.argtypes = [
@@ -89,6 +144,29 @@ class WerewolfNetworkClient:
             ctypes.c_int
         ]
         self.lib.ww_client_receive.restype = ctypes.c_int
+
+        # ww_client_receive_into(client, out_header, out_payload, max_size, out_len) -> int (optional)
+        if hasattr(self.lib, 'ww_client_receive_into'):
+            self.lib.ww_client_receive_into.argtypes = [
+                ctypes.c_void_p,
+                ctypes.POINTER(ctypes.c_ushort),
+                ctypes.c_char_p,
+                ctypes.c_int,
+                ctypes.POINTER(ctypes.c_int)
+            ]
+            self.lib.ww_client_receive_into.restype = ctypes.c_int
+
+        # ww_client_receive_many(client, frames, max_frames, out_payload, out_size, out_used) -> int (optional)
+        if hasattr(self.lib, 'ww_client_receive_many'):
+            self.lib.ww_client_receive_many.argtypes = [
+                ctypes.c_void_p,
+                ctypes.POINTER(WWFrameInfo),
+                ctypes.c_int,
+                ctypes.c_char_p,
+                ctypes.c_int,
+                ctypes.POINTER(ctypes.c_int)
+            ]
+            self.lib.ww_client_receive_many.restype = ctypes.c_int
         
         # ww_client_disconnect(client)
         self.lib.ww_client_disconnect.argtypes = [ctypes.c_void_p]
@@ -121,10 +199,16 @@ class WerewolfNetworkClient:
         if hasattr(self.lib, 'ww_client_pong_send'):
             self.lib.ww_client_pong_send.argtypes = [ctypes.c_void_p]
             self.lib.ww_client_pong_send.restype = ctypes.c_int
+
+        # ww_client_get_fd(client) -> int (optional, bản build cũ không có)
+        if hasattr(self.lib, 'ww_client_get_fd'):
+            self.lib.ww_client_get_fd.argtypes = [ctypes.c_void_p]
+            self.lib.ww_client_get_fd.restype = ctypes.c_int
     
     def create(self):
         """Tạo instance client"""
         self.client = self.lib.ww_client_create()
+        self._rx_count = self._rx_pos = 0
         if not self.client:
             raise RuntimeError("Failed to create client")
         return self
@@ -140,24 +224,112 @@ class WerewolfNetworkClient:
         if result != 0:
             error = self.get_error()
             raise ConnectionError(f"Connection failed: {error}")
-            
+
+        # Capability handshake: server hỗ trợ trả HELLO_RES, server C hiện tại bỏ qua (giữ JSON)
+        self._set_codec(payload_codec.CODEC_JSON)
+        if payload_codec.CODEC_COMPACT in self.offer_codecs and hasattr(self.lib, 'ww_client_send_len'):
+            self.send_packet(protocol.HELLO_REQ, {"codecs": list(self.offer_codecs)})
         return True
+
+    def _set_codec(self, codec):
+        self.codec = codec
+        self._compact = codec == payload_codec.CODEC_COMPACT
         
+    def start_capture(self, path):
+        """Ghi mọi frame vào/ra (header, payload, monotonic time) vào file `path` (append).
+
+        Trong lúc capture, các helper gửi bằng hàm C (send_wolf_kill, send_pong, ...) đi qua
+        send_packet để file chứa đúng các byte đã gửi.
+        """
+        self.stop_capture()
+        self.capture = PacketCapture(path)
+        return self.capture
+
+    def stop_capture(self):
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+
+    def attach_io_thread(self, io_thread):
+        """Chuyển sang chế độ IO thread (None để quay lại gửi/nhận trực tiếp)."""
+        self.io_thread = io_thread
+
+    def _queued(self):
+        """True nếu send phải đi qua hàng đợi của IO thread (đang gọi từ thread khác)."""
+        io = self.io_thread
+        return io is not None and io.is_running() and not io.in_worker_thread()
+
+    def _uses_python_send(self):
+        """True nếu helper không được dùng hàm C tự dựng payload (đang xếp hàng hoặc đang capture)"""
+        return self.capture is not None or self._queued()
+
     def send_packet(self, header, payload_dict):
         """Gửi gói tin đến server"""
         if not self.client:
             raise RuntimeError("Client not created")
-            
-        payload_json = json.dumps(payload_dict)
-        payload_bytes = payload_json.encode('utf-8')
-        
-        result = self.lib.ww_client_send(self.client, header, payload_bytes)
+
+        if self._queued():
+            self.io_thread.enqueue_send(header, payload_dict)
+            return 0
+
+        return self.send_packet_now(header, payload_dict)
+
+    def send_packet_now(self, header, payload_dict):
+        """Gửi ngay trên thread hiện tại (IO thread dùng hàm này để flush outbox)"""
+        if not self.client:
+            raise RuntimeError("Client not created")
+
+        payload_bytes = payload_codec.encode_compact(header, payload_dict) if self._compact else None
+        if payload_bytes is not None:
+            # Payload compact có thể chứa byte 0: truyền độ dài thay vì chuỗi C
+            if header in (protocol.PING, protocol.PONG):
+                result = self.lib.ww_client_send_priority_len(self.client, header, payload_bytes, len(payload_bytes))
+            else:
+                result = self.lib.ww_client_send_len(self.client, header, payload_bytes, len(payload_bytes))
+        else:
+            payload_bytes = json.dumps(payload_dict).encode('utf-8')
+
+            # Heartbeat đi hàng đợi ưu tiên để không kẹt sau chat đang nghẽn
+            if header in (protocol.PING, protocol.PONG) and hasattr(self.lib, 'ww_client_send_priority'):
+                result = self.lib.ww_client_send_priority(self.client, header, payload_bytes)
+            else:
+                result = self.lib.ww_client_send(self.client, header, payload_bytes)
         
         if result < 0:
             error = self.get_error()
             raise RuntimeError(f"Send failed: {error}")
-            
+
+        if self.capture is not None:
+            self.capture.record_out(header, payload_bytes)
+
+        self._notify_send_pending()
         return result
+
+    def set_send_pending_listener(self, callback):
+        """callback() được gọi sau mỗi lần send nếu còn dữ liệu chờ socket writable"""
+        self._send_pending_listener = callback
+
+    def send_queue_depth(self):
+        """Số byte đang nằm trong hàng đợi gửi của C (0 nếu bản build cũ)"""
+        if not self.client or not hasattr(self.lib, 'ww_client_send_queue_bytes'):
+            return 0
+        return self.lib.ww_client_send_queue_bytes(self.client)
+
+    def flush_send_queue(self):
+        """Gửi tiếp hàng đợi khi socket writable. True nếu đã gửi hết.
+
+        Raises: RuntimeError nếu send lỗi
+        """
+        if not self.client or not hasattr(self.lib, 'ww_client_flush'):
+            return True
+        result = self.lib.ww_client_flush(self.client)
+        if result < 0:
+            raise RuntimeError(f"Send failed: {self.get_error()}")
+        return result == 0
+
+    def _notify_send_pending(self):
+        if self._send_pending_listener is not None and self.send_queue_depth() > 0:
+            self._send_pending_listener()
         
     def receive_packet(self):
         """
@@ -168,46 +340,146 @@ class WerewolfNetworkClient:
         if not self.client:
             raise RuntimeError("Client not created")
 
-        header = ctypes.c_ushort()
-        # Keep this comfortably above any expected server payload to avoid "Payload too large"
-        # from the C layer (ww_client_receive checks length >= max_size).
-        payload_buffer = ctypes.create_string_buffer(65536)
+        # Còn frame từ batch trước
+        if self._rx_pos < self._rx_count:
+            return self._next_batched_frame()
+
+        if hasattr(self.lib, 'ww_client_receive_many'):
+            return self._receive_batch()
+        if hasattr(self.lib, 'ww_client_receive_into'):
+            return self._receive_single()
+        return self._receive_packet_legacy()
+
+    def _receive_batch(self):
+        """Một lần gọi C lấy tối đa RECV_BATCH_SIZE frame, trả về frame đầu tiên"""
+        while True:
+            result = self.lib.ww_client_receive_many(
+                self.client,
+                self._rx_frames,
+                self.RECV_BATCH_SIZE,
+                self._rx_buffer,
+                self._rx_size,
+                ctypes.byref(self._rx_len)
+            )
+            if result != self.RECV_BUFFER_TOO_SMALL:
+                break
+            self._grow_rx_buffer(self._rx_len.value)
 
+        if result < 0:
+            self._raise_receive_error()
+        if result == 0:
+            return None, None
+
+        self._rx_count = result
+        self._rx_pos = 0
+        return self._next_batched_frame()
+
+    def _next_batched_frame(self):
+        frame = self._rx_frames[self._rx_pos]
+        self._rx_pos += 1
+        data = ctypes.string_at(ctypes.addressof(self._rx_buffer) + frame.offset, frame.length)
+        if self.capture is not None:
+            self.capture.record_in(frame.header, data)
+        return frame.header, self._decode(frame.header, data)
+
+    def _receive_single(self):
+        """Một frame mỗi lần gọi C (ww_client_receive_into)"""
+        while True:
+            result = self.lib.ww_client_receive_into(
+                self.client,
+                ctypes.byref(self._rx_header),
+                self._rx_buffer,
+                self._rx_size,
+                ctypes.byref(self._rx_len)
+            )
+            if result != self.RECV_BUFFER_TOO_SMALL:
+                break
+            # Frame vẫn nằm trong rbuf của C: nới buffer rồi lấy lại
+            self._grow_rx_buffer(self._rx_len.value)
+
+        if result < 0:
+            self._raise_receive_error()
+        if result == 0:
+            return None, None  # No data available
+
+        # Parse JSON từ đúng `length` byte của frame (một lần copy, không quét NUL / decode riêng)
+        data = ctypes.string_at(self._rx_buffer, self._rx_len.value)
+        if self.capture is not None:
+            self.capture.record_in(self._rx_header.value, data)
+        return self._rx_header.value, self._decode(self._rx_header.value, data)
+
+    def _receive_packet_legacy(self):
+        """receive_packet cho bản build C cũ chưa có ww_client_receive_into"""
         result = self.lib.ww_client_receive(
             self.client,
-            ctypes.byref(header),
-            payload_buffer,
-            65536
+            ctypes.byref(self._rx_header),
+            self._rx_buffer,
+            self._rx_size
         )
-
         if result < 0:
-            error = self.get_error()
-            # Detect connection lost - raise ConnectionError instead of RuntimeError
-            if "closed" in error.lower() or "connection" in error.lower():
-                raise ConnectionError(f"Server connection lost: {error}")
-            raise RuntimeError(f"Receive failed: {error}")
-        elif result == 0:
-            return None, None  # No data available
-        else:
-            # Parse payload JSON
-            payload_str = payload_buffer.value.decode('utf-8')
-            try:
-                payload_dict = json.loads(payload_str) if payload_str else {}
-            except json.JSONDecodeError:
-                payload_dict = {"raw": payload_str}
-
-            return header.value, payload_dict
-            
+            self._raise_receive_error()
+        if result == 0:
+            return None, None
+        data = self._rx_buffer.value
+        if self.capture is not None:
+            self.capture.record_in(self._rx_header.value, data)
+        return self._rx_header.value, self._decode(self._rx_header.value, data)
+
+    def _grow_rx_buffer(self, needed):
+        size = self._rx_size
+        while size < needed:
+            size *= 2
+        self._rx_buffer = ctypes.create_string_buffer(size)
+        self._rx_size = size
+
+    def _raise_receive_error(self):
+        error = self.get_error()
+        # Detect connection lost - raise ConnectionError instead of RuntimeError
+        if "closed" in error.lower() or "connection" in error.lower():
+            raise ConnectionError(f"Server connection lost: {error}")
+        raise RuntimeError(f"Receive failed: {error}")
+
+    def _decode(self, header, data):
+        payload = self._parse_payload(data)
+        if header == protocol.HELLO_RES:
+            self._set_codec(payload_codec.accepted_codec(payload, self.offer_codecs))
+        return payload
+
+    @staticmethod
+    def _parse_payload(payload_bytes):
+        if payload_bytes and payload_bytes[0] == payload_codec.COMPACT_MARK:
+            return payload_codec.decode_payload(payload_bytes)
+        try:
+            return json.loads(payload_bytes) if payload_bytes else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {"raw": payload_bytes.decode('utf-8', 'replace')}
+
+    def fileno(self):
+        """File descriptor của socket (cho QSocketNotifier/select).
+
+        Trả về -1 nếu chưa kết nối hoặc thư viện C không export ww_client_get_fd;
+        khi đó caller phải dùng polling.
+        """
+        if not self.client or not hasattr(self.lib, 'ww_client_get_fd'):
+            return -1
+        return self.lib.ww_client_get_fd(self.client)
+
     def disconnect(self):
         """Ngắt kết nối từ server"""
+        # Dừng IO thread trước để worker không dùng handle đã đóng
+        if self.io_thread is not None and not self.io_thread.in_worker_thread():
+            self.io_thread.stop()
         if self.client:
             self.lib.ww_client_disconnect(self.client)
             
     def destroy(self):
         """Hủy instance client"""
+        if self.io_thread is not None and not self.io_thread.in_worker_thread():
+            self.io_thread.stop()
         if self.client:
             self.lib.ww_client_destroy(self.client)
             self.client = None
+        self._rx_count = self._rx_pos = 0
             
     def get_error(self):
         """Lấy thông báo lỗi cuối cùng"""
@@ -229,11 +501,12 @@ class WerewolfNetworkClient:
         if not self.client:
             raise RuntimeError("Client not created")
 
-        if hasattr(self.lib, 'ww_client_role_card_done_send'):
+        if hasattr(self.lib, 'ww_client_role_card_done_send') and not self._uses_python_send():
             rid = int(room_id) if room_id is not None else 0
             result = self.lib.ww_client_role_card_done_send(self.client, rid)
             if result < 0:
                 raise RuntimeError(f"Send role card done failed: {self.get_error()}")
+            self._notify_send_pending()
             return result
 
         payload = {}
@@ -249,10 +522,13 @@ class WerewolfNetworkClient:
             raise RuntimeError("C library missing wolf kill send")
         if not isinstance(target_username, str):
             raise ValueError("target_username must be a string")
+        if self._uses_python_send():
+            return self.send_packet(403, {"room_id": int(room_id), "target_username": target_username})  # WOLF_KILL_REQ
         result = self.lib.ww_client_wolf_kill_send(self.client, int(room_id), target_username.encode('utf-8'))
         if result < 0:
             error = self.get_error()
             raise RuntimeError(f"Send wolf kill failed: {error}")
+        self._notify_send_pending()
         return result
 
     def send_seer_check(self, room_id, target_username):
@@ -263,10 +539,13 @@ class WerewolfNetworkClient:
             raise RuntimeError("C library missing seer check send")
         if not isinstance(target_username, str):
             raise ValueError("target_username must be a string")
+        if self._uses_python_send():
+            return self.send_packet(405, {"room_id": int(room_id), "target_username": target_username})  # SEER_CHECK_REQ
         result = self.lib.ww_client_seer_check_send(self.client, int(room_id), target_username.encode('utf-8'))
         if result < 0:
             error = self.get_error()
             raise RuntimeError(f"Send seer check failed: {error}")
+        self._notify_send_pending()
         return result
 
     def send_guard_protect(self, room_id, target_username):
@@ -279,13 +558,14 @@ class WerewolfNetworkClient:
         if target_username is None:
             target_username = ""
 
-        if hasattr(self.lib, 'ww_client_guard_protect_send') and self.client:
+        if hasattr(self.lib, 'ww_client_guard_protect_send') and self.client and not self._uses_python_send():
             if not isinstance(target_username, str):
                 raise ValueError("target_username must be a string")
             result = self.lib.ww_client_guard_protect_send(self.client, int(room_id), target_username.encode('utf-8'))
             if result < 0:
                 error = self.get_error()
                 raise RuntimeError(f"Send guard protect failed: {error}")
+            self._notify_send_pending()
             return result
 
         return self.send_packet(407, {
@@ -304,18 +584,24 @@ class WerewolfNetworkClient:
             "target_username": str(target_username),
         })
 
-    def send_ping(self):
+    def send_ping(self, client_time=None):
         """Client-initiated heartbeat ping (PING = 501).
 
         Prefer dedicated C helper if available; fallback to send_packet.
+        `client_time` (epoch seconds) is sent as `t0` for clock-offset estimation
+        (the C helper sends a fixed payload, so it is only used without it).
         """
         if not self.client:
             raise RuntimeError("Client not created")
 
-        if hasattr(self.lib, 'ww_client_ping_send'):
+        if client_time is not None:
+            return self.send_packet(501, {"type": "ping", "t0": client_time})
+
+        if hasattr(self.lib, 'ww_client_ping_send') and not self._uses_python_send():
             result = self.lib.ww_client_ping_send(self.client)
             if result < 0:
                 raise RuntimeError(f"Send ping failed: {self.get_error()}")
+            self._notify_send_pending()
             return result
 
         return self.send_packet(501, {"type": "ping"})
@@ -328,10 +614,11 @@ class WerewolfNetworkClient:
         if not self.client:
             raise RuntimeError("Client not created")
 
-        if hasattr(self.lib, 'ww_client_pong_send'):
+        if hasattr(self.lib, 'ww_client_pong_send') and not self._uses_python_send():
             result = self.lib.ww_client_pong_send(self.client)
             if result < 0:
                 raise RuntimeError(f"Send pong failed: {self.get_error()}")
+            self._notify_send_pending()
             return result
 
         return self.send_packet(502, {"type": "pong"})
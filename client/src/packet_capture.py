@@ -0,0 +1,150 @@
+"""Packet Capture - ghi mọi frame vào/ra của network client thành file log append-only
+
+Định dạng file (big-endian, giống framing của protocol.py):
+
+    MAGIC                                 8 bytes, chỉ ghi khi file mới/rỗng
+    [1B direction][8B t_ns][2B header][4B length][N bytes payload]   lặp lại
+
+- direction: 0 = server -> client (IN), 1 = client -> server (OUT)
+- t_ns:      time.monotonic_ns() lúc frame được nhận/gửi (chỉ dùng chênh lệch giữa các record)
+- payload:   đúng các byte trên dây - JSON hoặc compact (payload_codec.py) - không parse lại khi ghi
+
+Ghi thêm vào file cũ được (nhiều phiên nối tiếp nhau); record cuối bị cắt dở (app bị kill
+giữa chừng) bị bỏ qua khi đọc. Đọc lại bằng `read_capture(path)` hoặc
+`python3 packet_capture.py <file>` để xem tóm tắt / dump từng packet.
+"""
+
+import collections
+import json
+import os
+import struct
+import sys
+import threading
+import time
+
+import payload_codec
+import protocol
+
+MAGIC = b"WWCAP1\n\0"
+
+DIRECTION_IN = 0
+DIRECTION_OUT = 1
+
+_RECORD_HEAD = struct.Struct(">BQHI")
+
+CaptureRecord = collections.namedtuple("CaptureRecord", "direction t_ns header payload")
+
+
+class PacketCapture:
+    """Writer cho file capture; gọi được từ GUI thread và NetworkIOThread cùng lúc."""
+
+    def __init__(self, path, clock=time.monotonic_ns):
+        """
+        path:  file log; tạo mới nếu chưa có, ghi nối tiếp nếu đã có
+        clock: nguồn thời gian (nano giây), thay được trong test/benchmark
+        """
+        self.path = str(path)
+        self.clock = clock
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+
+    def record_in(self, header, payload_bytes):
+        self._write(DIRECTION_IN, header, payload_bytes)
+
+    def record_out(self, header, payload_bytes):
+        self._write(DIRECTION_OUT, header, payload_bytes)
+
+    def _write(self, direction, header, payload_bytes):
+        payload_bytes = bytes(payload_bytes or b"")
+        record = _RECORD_HEAD.pack(direction, self.clock(), header, len(payload_bytes)) + payload_bytes
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(record)
+            # Flush từng record: app crash vẫn giữ được các packet cuối cùng (thứ cần debug nhất)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_capture(path):
+    """Generator: CaptureRecord(direction, t_ns, header, payload_bytes) theo thứ tự ghi.
+
+    Raises ValueError nếu file không phải capture (sai MAGIC).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Not a packet capture: {path}")
+
+    offset = len(MAGIC)
+    head_size = _RECORD_HEAD.size
+    while len(data) - offset >= head_size:
+        direction, t_ns, header, length = _RECORD_HEAD.unpack_from(data, offset)
+        start = offset + head_size
+        end = start + length
+        if end > len(data):
+            break  # record cuối bị cắt dở
+        yield CaptureRecord(direction, t_ns, header, data[start:end])
+        offset = end
+
+
+def summarize(records):
+    """Số packet theo (direction, header) và thời lượng phiên (giây)"""
+    counts = collections.Counter()
+    first = last = None
+    for record in records:
+        counts[record.direction, record.header] += 1
+        if first is None:
+            first = record.t_ns
+        last = record.t_ns
+    duration = (last - first) / 1e9 if first is not None else 0.0
+    return counts, duration
+
+
+def main(argv=None):
+    """python3 packet_capture.py <file> [--dump]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__)
+        print("Usage: python3 packet_capture.py <capture file> [--dump]")
+        return 0 if argv else 2
+
+    path = argv[0]
+    records = list(read_capture(path))
+    if "--dump" in argv:
+        start = records[0].t_ns if records else 0
+        for record in records:
+            arrow = "<-" if record.direction == DIRECTION_IN else "->"
+            payload = record.payload.decode("utf-8", "replace")
+            if record.payload and record.payload[0] == payload_codec.COMPACT_MARK:
+                payload = "compact " + json.dumps(payload_codec.decode_payload(record.payload))
+            print(f"{(record.t_ns - start) / 1e6:>12.3f} ms {arrow} "
+                  f"{protocol.packet_name(record.header):<24} {payload}")
+        return 0
+
+    counts, duration = summarize(records)
+    print(f"{path}: {len(records)} packets, {os.path.getsize(path)} bytes, {duration:.3f} s")
+    for (direction, header), count in sorted(counts.items()):
+        arrow = "IN " if direction == DIRECTION_IN else "OUT"
+        print(f"  {arrow} {header:>4} {protocol.packet_name(header):<24} {count:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
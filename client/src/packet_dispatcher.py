@@ -0,0 +1,224 @@
+"""Packet Dispatcher - bộ đọc socket duy nhất, định tuyến packet theo header"""
+
+import time
+import traceback
+from collections import deque
+
+from PyQt5 import QtCore
+
+import protocol
+from utils.io_thread import NetworkIOThread
+from utils.packet_pump import PacketPump
+from utils.socket_notifier import SocketReadTrigger, SocketWriteFlusher
+
+
+class PacketDispatcher(QtCore.QObject):
+    """Consumer duy nhất của socket cho toàn bộ ứng dụng.
+
+    Trước đây mỗi window có recv_timer + handle_packet riêng và các window tranh nhau
+    đọc packet. Dispatcher đọc socket (SocketReadTrigger + PacketPump) và định tuyến mỗi
+    packet qua dict `header -> [handler]` (O(1)). Window đăng ký bằng
+    `subscribe(owner, {header: handler})` khi bắt đầu cần packet và `unsubscribe(owner)`
+    khi xong. PING/PONG được xử lý tại đây một lần cho cả ứng dụng.
+
+    Handler nhận một tham số: payload (dict).
+
+    Packet chưa có ai đăng ký (vd. tới giữa `navigate_to` và lúc window mới subscribe) được
+    giữ lại theo header (tối đa UNROUTED_LIMIT packet, UNROUTED_TTL giây) và được phát lại
+    đúng thứ tự cho owner đầu tiên subscribe header đó.
+
+    Với `use_io_thread=True`, việc đọc socket/parse JSON/gửi chạy trên NetworkIOThread;
+    dispatcher chỉ lấy các packet đã parse từ inbox khi nhận `packets_ready` (queued signal),
+    handler vẫn luôn chạy trên GUI thread.
+
+    Client tự đẩy packet (AsyncWerewolfNetworkClient có `set_packet_listener`) không cần
+    read trigger: dispatcher được gọi ngay khi transport parse xong frame.
+    """
+
+    # Bất kỳ packet nào từ server (ConnectionMonitor coi là connection còn sống)
+    activity = QtCore.pyqtSignal()
+    # Server đóng kết nối (ConnectionError từ receive_packet)
+    connection_lost = QtCore.pyqtSignal(str)
+    # Lỗi nhận khác (RuntimeError từ receive_packet)
+    receive_failed = QtCore.pyqtSignal(str)
+
+    # Packet chưa định tuyến được giữ tối đa bao nhiêu (mỗi header) và bao lâu (giây)
+    UNROUTED_LIMIT = 32
+    UNROUTED_TTL = 5.0
+    # Không giữ lại: PING/PONG/HELLO_RES đã được xử lý tại đây hoặc lúc handshake
+    UNROUTED_IGNORED = (protocol.PING, protocol.PONG, protocol.HELLO_RES)
+
+    def __init__(self, network_client, parent=None, use_io_thread=False):
+        super().__init__(parent)
+        self.network_client = network_client
+        self._routes = {}  # header -> list[handler]
+        self._owners = {}  # owner -> {header: handler}
+        self._unrouted = {}  # header -> deque[(monotonic time, payload)]
+
+        self.read_trigger = SocketReadTrigger(lambda: self.network_client, self)
+        self.read_trigger.timeout.connect(self.pump)
+        self.packet_pump = PacketPump(self.dispatch, is_active=self.is_running)
+
+        self.io_thread = None
+        self._push_active = False  # IO thread hoặc client có set_packet_listener
+        if use_io_thread:
+            self.io_thread = NetworkIOThread(network_client, parent=self)
+            self.io_thread.packets_ready.connect(self.pump)
+            network_client.attach_io_thread(self.io_thread)
+
+        # Hàng đợi gửi của C được flush khi socket writable (IO thread tự flush trong select)
+        self.write_flusher = SocketWriteFlusher(lambda: self.network_client, self)
+        # Lỗi gửi trễ báo qua cùng kênh với lỗi nhận
+        self.write_flusher.flush_failed.connect(self.receive_failed)
+        if self.io_thread is None and hasattr(network_client, "set_send_pending_listener"):
+            network_client.set_send_pending_listener(self.write_flusher.arm)
+
+    def start(self, network_client=None):
+        """Bắt đầu (hoặc gắn lại sau reconnect) đọc socket hiện tại của network client."""
+        if network_client is not None:
+            self.network_client = network_client
+        if self.network_client is None:
+            return
+        if self.io_thread is None:
+            if hasattr(self.network_client, "set_packet_listener"):
+                self._push_active = True
+                self.network_client.set_packet_listener(self.pump)
+                # Packet có thể đã nằm sẵn trong inbox trước khi subscribe
+                QtCore.QTimer.singleShot(0, self.pump)
+            else:
+                self.read_trigger.start()
+            return
+
+        if self.io_thread.network_client is not self.network_client:
+            self.io_thread.stop()
+            self.io_thread.network_client = self.network_client
+            self.network_client.attach_io_thread(self.io_thread)
+        # Chưa create() handle thì chưa có gì để đọc; subscribe sau khi connect sẽ start lại
+        if getattr(self.network_client, "client", None):
+            self._push_active = True
+            self.io_thread.start()
+
+    def stop(self):
+        self.read_trigger.stop()
+        self.write_flusher.disarm()
+        self._push_active = False
+        if self.io_thread is not None:
+            self.io_thread.stop()
+        elif hasattr(self.network_client, "set_packet_listener"):
+            self.network_client.set_packet_listener(None)
+
+    def is_running(self):
+        return self._push_active or self.read_trigger.isActive()
+
+    def subscribe(self, owner, handlers):
+        """Đăng ký handlers ({header: callable(payload)}) cho owner.
+
+        Gọi lại với cùng owner sẽ thay thế toàn bộ handlers cũ của owner đó.
+        """
+        self.unsubscribe(owner)
+        handlers = {int(header): handler for header, handler in handlers.items()}
+        self._owners[owner] = handlers
+        for header, handler in handlers.items():
+            self._routes.setdefault(header, []).append(handler)
+        self._replay_unrouted(handlers)
+        # Socket có thể đã đổi (reconnect) -> luôn gắn lại read trigger
+        self.start()
+
+    def unsubscribe(self, owner):
+        handlers = self._owners.pop(owner, None)
+        if not handlers:
+            return
+        for header, handler in handlers.items():
+            route = self._routes.get(header)
+            if not route:
+                continue
+            try:
+                route.remove(handler)
+            except ValueError:
+                pass
+            if not route:
+                del self._routes[header]
+
+    def is_subscribed(self, owner):
+        return owner in self._owners
+
+    def pump(self):
+        """Drain tất cả packet đang có và dispatch từng packet."""
+        if self.network_client is None or not getattr(self.network_client, "client", None):
+            self.stop()
+            return
+
+        source = self.io_thread if self.io_thread is not None else self.network_client
+        try:
+            self.packet_pump.drain(source)
+            if self.packet_pump.backlogged and self.is_running():
+                QtCore.QTimer.singleShot(0, self.pump)
+        except ConnectionError as e:
+            print(f"[DEBUG] Connection lost: {e}")
+            self.stop()
+            self.connection_lost.emit(str(e))
+        except RuntimeError as e:
+            print(f"[ERROR] Receive failed: {e}")
+            self.stop()
+            self.receive_failed.emit(str(e))
+
+    def dispatch(self, header, payload):
+        """Định tuyến một packet đến các handler đã đăng ký cho header đó."""
+        self.activity.emit()
+
+        if header == protocol.PING:
+            self._reply_pong()
+
+        handlers = self._routes.get(header)
+        if not handlers:
+            if header not in self.UNROUTED_IGNORED:
+                self._hold_unrouted(header, payload)
+            return
+
+        # Copy: handler có thể subscribe/unsubscribe trong lúc dispatch
+        self._call_handlers(header, tuple(handlers), payload)
+
+    def _call_handlers(self, header, handlers, payload):
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"[WARNING] Handler for packet {header} failed: {e}")
+                traceback.print_exc()
+
+    def _hold_unrouted(self, header, payload):
+        queue = self._unrouted.get(header)
+        if queue is None:
+            queue = self._unrouted[header] = deque(maxlen=self.UNROUTED_LIMIT)
+        elif len(queue) == queue.maxlen:
+            print(f"[DEBUG] No handler for packet {header}, dropped oldest held packet")
+        queue.append((time.monotonic(), payload))
+        print(f"[DEBUG] No handler for packet {header}, held for replay")
+
+    def _replay_unrouted(self, handlers):
+        """Phát lại packet đang giữ cho các header owner vừa đăng ký (bỏ packet quá hạn)"""
+        if not self._unrouted:
+            return
+        expired_before = time.monotonic() - self.UNROUTED_TTL
+        for header in handlers:
+            queue = self._unrouted.pop(header, None)
+            if not queue:
+                continue
+            held = [payload for held_at, payload in queue if held_at >= expired_before]
+            if len(held) < len(queue):
+                print(f"[DEBUG] Dropped {len(queue) - len(held)} stale packet(s) {header}")
+            for payload in held:
+                # Handler có thể unsubscribe trong lúc replay
+                route = self._routes.get(header)
+                if not route:
+                    break
+                self._call_handlers(header, tuple(route), payload)
+
+    def _reply_pong(self):
+        try:
+            if hasattr(self.network_client, "send_pong"):
+                self.network_client.send_pong()
+            else:
+                self.network_client.send_packet(protocol.PONG, {"type": "pong"})
+        except Exception as e:
+            print(f"[ERROR] Failed to send PONG: {e}")
@@ -0,0 +1,266 @@
+"""Payload Codec - encoding nhị phân gọn theo schema cho các packet nóng, JSON là fallback
+
+Bật theo từng connection bằng handshake ngay sau connect:
+
+    client -> HELLO_REQ {"codecs": ["compact1", "json"]}
+    server -> HELLO_RES {"codec": "compact1"}     (server không hỗ trợ: không trả lời -> giữ JSON)
+
+Sau khi hai bên chọn "compact1", payload của CHAT_BROADCAST, VOTE_RESULT, PHASE_*, PING/PONG
+được mã hóa theo các schema trong `_SCHEMAS`; payload không khớp schema nào (thiếu/thừa key,
+sai kiểu) vẫn gửi JSON. Bên nhận phân biệt theo byte đầu của payload: JSON luôn bắt đầu bằng
+ký tự in được, payload compact bắt đầu bằng COMPACT_MARK:
+
+    [0x01][1B variant][8B float64 cho mỗi field số][1-2B mask: field số nào là int][field còn lại]
+
+- chuỗi:    [2B length][UTF-8]
+- list chuỗi: [1B count][chuỗi]...
+- players:  [1B count]([chuỗi username][1B is_alive])...
+- field hằng số của variant (vd. "type": "phase_night") không tốn byte nào
+
+Mọi số nguyên đều big-endian như framing trong protocol.py.
+"""
+
+import json
+import struct
+
+import protocol
+
+CODEC_JSON = "json"
+CODEC_COMPACT = "compact1"
+# Thứ tự ưu tiên khi thương lượng
+SUPPORTED_CODECS = (CODEC_COMPACT, CODEC_JSON)
+
+COMPACT_MARK = 0x01
+
+# Loại field trong schema
+NUM = "num"          # int hoặc float (int được khôi phục nguyên vẹn nhờ mask)
+STR = "str"
+STR_LIST = "str_list"
+PLAYERS = "players"  # [{"username": str, "is_alive": int}]
+
+# (header, field hằng số, field mã hóa). Mỗi header không được có hai variant cùng tập key.
+_SCHEMAS = (
+    (protocol.CHAT_BROADCAST, {},
+     (("username", STR), ("message", STR), ("room_id", NUM), ("chat_type", STR))),
+    (protocol.PHASE_NIGHT, {"type": "phase_night"},
+     (("duration", NUM), ("seer_duration", NUM), ("guard_duration", NUM), ("wolf_duration", NUM),
+      ("seer_deadline", NUM), ("guard_deadline", NUM), ("wolf_deadline", NUM), ("players", PLAYERS))),
+    (protocol.PHASE_DAY, {"type": "phase_day"},
+     (("result", STR), ("targetId", STR), ("day_duration", NUM), ("day_deadline", NUM))),
+    (protocol.PHASE_DAY, {"type": "phase_day"},
+     (("result", STR), ("day_duration", NUM), ("day_deadline", NUM))),
+    (protocol.PHASE_GUARD_START, {"type": "phase_guard_start"},
+     (("guard_duration", NUM), ("guard_deadline", NUM), ("wolf_deadline", NUM))),
+    (protocol.PHASE_WOLF_START, {"type": "phase_wolf_start"},
+     (("wolf_duration", NUM), ("wolf_deadline", NUM))),
+    (protocol.VOTE_RESULT, {"type": "player_executed"}, (("playerId", STR),)),
+    (protocol.VOTE_RESULT, {"type": "execution"}, (("target", STR), ("votes", NUM))),
+    (protocol.VOTE_RESULT, {"type": "tie_break_start"},
+     (("candidates", STR_LIST), ("timer", NUM), ("deadline", NUM))),
+    (protocol.VOTE_RESULT, {"type": "execution_random_selected"},
+     (("candidates", STR_LIST), ("selected", STR), ("reason", STR))),
+    (protocol.VOTE_RESULT, {"type": "no_execution"}, (("message", STR),)),
+    (protocol.PING, {"type": "ping"}, ()),
+    (protocol.PING, {"type": "ping"}, (("t0", NUM),)),
+    (protocol.PONG, {"type": "pong"}, ()),
+    (protocol.PONG, {"type": "pong"}, (("t0", NUM), ("t1", NUM), ("t2", NUM))),
+)
+
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+# float64 biểu diễn chính xác mọi int trong khoảng này
+_MAX_EXACT_INT = 2 ** 53
+
+
+class _Mismatch(Exception):
+    """Payload không khớp schema -> gửi JSON"""
+
+
+class _Variant:
+    __slots__ = ("id", "header", "consts", "keys", "num_keys", "var_fields", "prefix", "numbers")
+
+    def __init__(self, variant_id, header, consts, fields):
+        self.id = variant_id
+        self.header = header
+        self.consts = tuple(consts.items())
+        self.keys = frozenset(consts) | frozenset(key for key, _ in fields)
+        self.num_keys = tuple(key for key, kind in fields if kind is NUM)
+        self.var_fields = tuple((key, kind) for key, kind in fields if kind is not NUM)
+        self.prefix = bytes((COMPACT_MARK, variant_id))
+        mask = "B" if len(self.num_keys) <= 8 else "H"
+        self.numbers = struct.Struct(">" + "d" * len(self.num_keys) + mask)
+
+
+def _build_variants():
+    variants = []
+    by_header = {}
+    for header, consts, fields in _SCHEMAS:
+        variant = _Variant(len(variants), header, consts, fields)
+        table = by_header.setdefault(header, {})
+        if variant.keys in table:
+            raise ValueError(f"Duplicate compact schema for {protocol.packet_name(header)}: {sorted(variant.keys)}")
+        table[variant.keys] = variant
+        variants.append(variant)
+    return tuple(variants), by_header
+
+
+_VARIANTS, _BY_HEADER = _build_variants()
+
+# Header có schema compact (gửi JSON cho mọi header khác)
+COMPACT_HEADERS = frozenset(_BY_HEADER)
+
+
+def choose_codec(offered, supported=SUPPORTED_CODECS):
+    """Codec đầu tiên (theo thứ tự ưu tiên của `supported`) mà bên kia cũng hỗ trợ"""
+    if isinstance(offered, (list, tuple)):
+        for codec in supported:
+            if codec in offered:
+                return codec
+    return CODEC_JSON
+
+
+def accepted_codec(hello_res, offered=SUPPORTED_CODECS):
+    """Codec server chọn trong payload HELLO_RES nếu client đã đề nghị, ngược lại JSON"""
+    codec = hello_res.get("codec") if isinstance(hello_res, dict) else None
+    return codec if codec in offered else CODEC_JSON
+
+
+def encode_compact(header, payload):
+    """bytes compact của payload, hoặc None nếu header/payload không khớp schema nào"""
+    table = _BY_HEADER.get(header)
+    if table is None or type(payload) is not dict:
+        return None
+    variant = table.get(frozenset(payload))
+    if variant is None:
+        return None
+    for key, value in variant.consts:
+        if payload[key] != value:
+            return None
+    try:
+        return _pack(variant, payload)
+    except (_Mismatch, KeyError, struct.error):
+        return None
+
+
+def _pack(variant, payload):
+    numbers = []
+    mask = 0
+    bit = 1
+    for key in variant.num_keys:
+        value = payload[key]
+        kind = type(value)
+        if kind is int:
+            if not -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                raise _Mismatch
+            mask |= bit
+        elif kind is not float:
+            raise _Mismatch
+        numbers.append(value)
+        bit <<= 1
+    parts = [variant.prefix, variant.numbers.pack(*numbers, mask)]
+
+    for key, kind in variant.var_fields:
+        value = payload[key]
+        if kind is STR:
+            _pack_str(parts, value)
+        elif kind is STR_LIST:
+            if type(value) is not list:
+                raise _Mismatch
+            parts.append(_U8.pack(len(value)))
+            for item in value:
+                _pack_str(parts, item)
+        else:  # PLAYERS
+            if type(value) is not list:
+                raise _Mismatch
+            parts.append(_U8.pack(len(value)))
+            for player in value:
+                if type(player) is not dict or len(player) != 2:
+                    raise _Mismatch
+                _pack_str(parts, player["username"])
+                alive = player["is_alive"]
+                if type(alive) is not int:
+                    raise _Mismatch
+                parts.append(_U8.pack(alive))
+    return b"".join(parts)
+
+
+def _pack_str(parts, value):
+    if type(value) is not str:
+        raise _Mismatch
+    data = value.encode("utf-8")
+    parts.append(_U16.pack(len(data)))
+    parts.append(data)
+
+
+def decode_compact(body):
+    """Payload dict từ bytes compact (body[0] == COMPACT_MARK). Raises ValueError nếu hỏng"""
+    try:
+        variant = _VARIANTS[body[1]]
+        numbers = variant.numbers.unpack_from(body, 2)
+        payload = dict(variant.consts)
+        mask = numbers[-1]
+        bit = 1
+        for key, value in zip(variant.num_keys, numbers):
+            payload[key] = int(value) if mask & bit else value
+            bit <<= 1
+
+        offset = 2 + variant.numbers.size
+        for key, kind in variant.var_fields:
+            if kind is STR:
+                payload[key], offset = _unpack_str(body, offset)
+            elif kind is STR_LIST:
+                count = body[offset]
+                offset += 1
+                items = []
+                for _ in range(count):
+                    item, offset = _unpack_str(body, offset)
+                    items.append(item)
+                payload[key] = items
+            else:  # PLAYERS
+                count = body[offset]
+                offset += 1
+                players = []
+                for _ in range(count):
+                    username, offset = _unpack_str(body, offset)
+                    players.append({"username": username, "is_alive": body[offset]})
+                    offset += 1
+                payload[key] = players
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt compact payload: {e}") from e
+    if offset != len(body):
+        raise ValueError(f"Corrupt compact payload: {len(body) - offset} trailing bytes")
+    return payload
+
+
+def _unpack_str(body, offset):
+    (length,) = _U16.unpack_from(body, offset)
+    start = offset + 2
+    end = start + length
+    if end > len(body):
+        raise IndexError("string past end of payload")
+    return body[start:end].decode("utf-8"), end
+
+
+def encode_payload(header, payload, compact=False):
+    """bytes của payload: compact nếu được phép và khớp schema, ngược lại JSON"""
+    if compact:
+        data = encode_compact(header, payload)
+        if data is not None:
+            return data
+    return json.dumps(payload).encode("utf-8") if payload is not None else b""
+
+
+def encode_packet(header, payload, compact=False):
+    """Như protocol.encode_packet, payload mã hóa bằng encode_payload"""
+    body = encode_payload(header, payload, compact)
+    return protocol.frame_head(header, len(body)) + body
+
+
+def decode_payload(body):
+    """Parse payload JSON hoặc compact (nhận biết theo byte đầu); lỗi -> {"raw": ...} như JSON hỏng"""
+    if body and body[0] == COMPACT_MARK:
+        try:
+            return decode_compact(body)
+        except ValueError:
+            return {"raw": bytes(body).decode("utf-8", "replace")}
+    return protocol.decode_payload(body)
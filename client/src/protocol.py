@@ -0,0 +1,148 @@
+"""Protocol constants - đồng bộ với server/include/protocol.h
+
+Định dạng gói tin: [2 bytes header][4 bytes length][N bytes JSON payload]
+"""
+
+import json as _json
+import struct as _struct
+
+# Authentication (100-199)
+LOGIN_REQ = 101
+LOGIN_RES = 102
+REGISTER_REQ = 103
+REGISTER_RES = 104
+LOGOUT_REQ = 105
+LOGOUT_RES = 106
+
+# Room management (200-299)
+GET_ROOMS_REQ = 201
+GET_ROOMS_RES = 202
+CREATE_ROOM_REQ = 203
+CREATE_ROOM_RES = 204
+JOIN_ROOM_REQ = 205
+JOIN_ROOM_RES = 206
+ROOM_STATUS_UPDATE = 207
+LEAVE_ROOM_REQ = 208
+LEAVE_ROOM_RES = 209
+GET_ROOM_INFO_REQ = 210
+GET_ROOM_INFO_RES = 211
+
+# Game flow (300-399)
+START_GAME_REQ = 301
+GAME_START_RES_AND_ROLE = 302
+PHASE_NIGHT = 303
+PHASE_DAY = 304
+GAME_OVER = 305
+ROLE_CARD_DONE_REQ = 310
+PHASE_GUARD_START = 311
+PHASE_WOLF_START = 312
+
+# Game actions (400-499)
+CHAT_REQ = 401
+CHAT_BROADCAST = 402
+WOLF_KILL_REQ = 403
+WOLF_KILL_RES = 404
+SEER_CHECK_REQ = 405
+SEER_RESULT = 406
+GUARD_PROTECT_REQ = 407
+GUARD_PROTECT_RES = 408
+VOTE_REQ = 409
+VOTE_STATUS_UPDATE = 410
+VOTE_RESULT = 411
+
+# System (500+)
+ERROR_MSG = 500
+PING = 501
+PONG = 502
+# Thương lượng encoding payload ngay sau connect (payload_codec.py); server C chưa hỗ trợ
+# nên bỏ qua HELLO_REQ và connection giữ JSON
+HELLO_REQ = 503
+HELLO_RES = 504
+
+# Framing
+HEADER_SIZE = 6  # 2 bytes header + 4 bytes length (big-endian)
+
+# Player roles (PlayerRole trong types.h)
+ROLE_VILLAGER = 0
+ROLE_WEREWOLF = 1
+ROLE_SEER = 2
+ROLE_GUARD = 3
+
+# Room status (RoomStatus trong types.h)
+ROOM_WAITING = 0
+ROOM_PLAYING = 1
+ROOM_FINISHED = 2
+
+
+_PACKET_NAMES = {value: name for name, value in list(globals().items())
+                 if name.isupper() and isinstance(value, int) and 100 <= value < 600}
+
+
+def packet_name(header):
+    """Tên hằng số của header (vd. 303 -> "PHASE_NIGHT"), str(header) nếu không biết"""
+    return _PACKET_NAMES.get(header, str(header))
+
+
+# Framing helpers (dùng cho transport thuần Python - không cần libwerewolf_client.so)
+
+_FRAME_HEAD = _struct.Struct(">HI")
+
+# Giới hạn an toàn cho một payload; frame lớn hơn coi như stream hỏng
+MAX_PAYLOAD_SIZE = 16 * 1024 * 1024
+
+
+def encode_packet(header, payload_dict):
+    """Đóng gói (header, dict) thành bytes: [2B header][4B length][JSON]"""
+    body = _json.dumps(payload_dict).encode("utf-8") if payload_dict is not None else b""
+    return _FRAME_HEAD.pack(header, len(body)) + body
+
+
+def frame_head(header, length):
+    """6 byte đầu frame cho payload đã mã hóa sẵn (`length` byte)"""
+    return _FRAME_HEAD.pack(header, length)
+
+
+def decode_payload(body):
+    """Parse JSON payload giống WerewolfNetworkClient.receive_packet"""
+    if not body:
+        return {}
+    try:
+        return _json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return {"raw": bytes(body).decode("utf-8", "replace")}
+
+
+class FrameDecoder:
+    """Tách stream bytes thành các frame hoàn chỉnh (tương đương rbuf trong werewolf_client.c)"""
+
+    def __init__(self, max_payload=MAX_PAYLOAD_SIZE, decode=decode_payload):
+        """decode: callable(body bytes) -> payload (payload_codec.decode_payload nhận cả compact)"""
+        self.max_payload = max_payload
+        self.decode = decode
+        self._buf = bytearray()
+
+    def feed(self, data):
+        """Thêm bytes vừa nhận, trả về list[(header, payload_dict)] của các frame đã đủ.
+
+        Raises ValueError nếu length vượt max_payload.
+        """
+        buf = self._buf
+        buf += data
+        decode = self.decode
+        frames = []
+        offset = 0
+        while len(buf) - offset >= HEADER_SIZE:
+            header, length = _FRAME_HEAD.unpack_from(buf, offset)
+            if length > self.max_payload:
+                raise ValueError(f"Payload too large: {length} bytes")
+            end = offset + HEADER_SIZE + length
+            if len(buf) < end:
+                break
+            frames.append((header, decode(bytes(buf[offset + HEADER_SIZE:end]))))
+            offset = end
+        if offset:
+            del buf[:offset]
+        return frames
+
+    def pending_bytes(self):
+        return len(self._buf)
@@ -0,0 +1,10 @@
+"""Reference Server - server Werewolf thuần Python (asyncio) cho test và benchmark
+
+Cài đặt lại phía server của protocol.h (sessions, phòng, chia vai, phase timer, vote) với user
+store trong bộ nhớ thay cho MySQL. Không cần build server/ hay PyQt5:
+`python3 -m reference_server --help` (trong client/src).
+"""
+
+from reference_server.rooms import Player, Room, RoomManager, role_distribution
+from reference_server.server import ReferenceServer, ServerConfig
+from reference_server.users import UserStore
@@ -0,0 +1,63 @@
+"""Chạy reference server từ dòng lệnh (thay cho ./server khi không có MySQL)
+
+Chạy:
+    cd client/src
+    python3 -m reference_server                                # port 5000, thời lượng như server C
+    python3 -m reference_server --time-scale 0.01 --verbose    # đêm 120s còn 1.2s
+    python3 -m reference_server --max-rooms 200 --max-sessions 5000 --time-scale 0.001
+    python3 -m reference_server --codecs ""                   # bỏ qua HELLO_REQ, chỉ JSON như server C
+"""
+
+import argparse
+import asyncio
+import sys
+
+import payload_codec
+from reference_server.server import ReferenceServer, ServerConfig
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m reference_server", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--max-rooms", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=30)
+    parser.add_argument("--min-players", type=int, default=6, help="số người tối thiểu để bắt đầu")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="nhân mọi thời lượng phase (0.001 = nhanh gấp 1000 lần)")
+    parser.add_argument("--codecs", default=",".join(payload_codec.SUPPORTED_CODECS),
+                        help="codec payload chấp nhận trong HELLO_REQ, theo thứ tự ưu tiên")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="in log [SERVER] cho phòng/ván")
+    return parser.parse_args(argv)
+
+
+def config_from_args(args):
+    config = ServerConfig(host=args.host, port=args.port, max_rooms=args.max_rooms,
+                          max_sessions=args.max_sessions, min_players=args.min_players,
+                          codecs=[codec for codec in args.codecs.split(",") if codec],
+                          seed=args.seed, verbose=args.verbose)
+    return config.scaled(args.time_scale) if args.time_scale != 1.0 else config
+
+
+async def run(args):
+    server = ReferenceServer(config_from_args(args))
+    try:
+        await server.serve_forever()
+    finally:
+        server.close()
+        print(f"[SERVER] {dict(server.stats)} | winners: {dict(server.winners)}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,773 @@
+"""Room Manager - phòng + luật chơi của reference server
+
+Tương đương room_manager.c, role_manager.c, role_handlers/*.c và chat_handler.c: cùng header,
+cùng field và cùng message lỗi để client/bot không phân biệt được với server C.
+
+Khác server C:
+- Mỗi phòng có đúng một TimerHandle cho phase hiện tại (role card -> seer -> guard -> wolf ->
+  day -> tie break) thay cho vòng check_*_timeout() mỗi giây, nên duration tính bằng mili
+  giây vẫn đúng và phòng không có gì để chờ thì không tốn CPU. Deadline gửi cho client là
+  epoch giây dạng float.
+- Các bước trong đêm tuần tự chặt: guard chỉ chọn được sau khi seer xong ("Guard phase is
+  not active"); server C nhận cả khi seer chưa chọn rồi broadcast PHASE_WOLF_START trước
+  PHASE_GUARD_START.
+- Kiểm tra thắng thua sau mọi lần sói cắn chết người (server C bỏ qua khi hết giờ wolf).
+"""
+
+import time
+
+import payload_codec
+import protocol
+
+ROOM_NAME_MAX_LENGTH = 49
+CHAT_MAX_LENGTH = 500
+
+# role -> thông tin gửi kèm GAME_START_RES_AND_ROLE (role_handlers/*_get_info)
+ROLE_INFO = {
+    protocol.ROLE_VILLAGER: ("Villager", "👨",
+                             "You are a VILLAGER! You have no special abilities, but your vote matters. "
+                             "Work with others to find and eliminate the werewolves."),
+    protocol.ROLE_WEREWOLF: ("Werewolf", "🐺",
+                             "You are a WEREWOLF! You know other werewolves. At night, discuss with your team "
+                             "to kill one villager. Your goal: Eliminate all villagers."),
+    protocol.ROLE_SEER: ("Seer", "🔮",
+                         "You are the SEER! Each night, you can check one player to know if they are a "
+                         "werewolf or not. Use your knowledge wisely to guide the village."),
+    protocol.ROLE_GUARD: ("Guard", "🛡️",
+                          "You are the GUARD! Each night, you can protect one player from werewolf attacks. "
+                          "Choose wisely to save the village."),
+}
+
+
+def role_distribution(num_players):
+    """(werewolves, seer, guard, villagers) như validate_role_distribution, None nếu không hợp lệ"""
+    werewolves = 2 if num_players <= 8 else 3
+    villagers = num_players - werewolves - 2
+    if villagers < 1:
+        return None
+    return werewolves, 1, 1, villagers
+
+
+def _is_number(value):
+    # cJSON_IsNumber: true/false không phải số
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Player:
+    """Một slot người chơi trong phòng. `conn` = None khi đã disconnect/rời ván."""
+
+    __slots__ = ("username", "user_id", "conn", "role", "is_alive", "disconnect_timer")
+
+    def __init__(self, conn):
+        self.username = conn.username
+        self.user_id = conn.user_id
+        self.conn = conn
+        self.role = protocol.ROLE_VILLAGER
+        self.is_alive = True
+        self.disconnect_timer = None
+
+
+class Room:
+    """Trạng thái một phòng (struct Room trong types.h)"""
+
+    __slots__ = ("id", "name", "players", "host", "status", "timer", "nights",
+                 "role_card_done", "role_card_start_time",
+                 "night_active", "seer_done", "guard_done", "wolf_done",
+                 "seer_deadline", "guard_deadline", "wolf_deadline", "guard_target", "wolf_votes",
+                 "day_active", "day_round", "day_deadline", "day_candidates", "day_votes")
+
+    def __init__(self, room_id, name):
+        self.id = room_id
+        self.name = name
+        self.players = []
+        self.host = None
+        self.status = protocol.ROOM_WAITING
+        self.timer = None   # TimerHandle của phase hiện tại
+        self.nights = 0
+        self.role_card_done = 0
+        self.role_card_start_time = 0
+        self.night_active = False
+        self.seer_done = self.guard_done = self.wolf_done = False
+        self.seer_deadline = self.guard_deadline = self.wolf_deadline = 0
+        self.guard_target = ""
+        self.wolf_votes = {}  # wolf username -> target ("" = skip)
+        self.day_active = False
+        self.day_round = 0
+        self.day_deadline = 0
+        self.day_candidates = ()
+        self.day_votes = {}   # voter username -> target ("" = skip)
+
+    def player_of(self, conn):
+        for player in self.players:
+            if player.conn is conn:
+                return player
+        return None
+
+    def player_named(self, username):
+        for player in self.players:
+            if player.username == username:
+                return player
+        return None
+
+    def alive(self):
+        return [p for p in self.players if p.is_alive]
+
+    def public_players(self, as_bool=False):
+        """[{username, is_alive}] (PHASE_NIGHT dùng số, SEER_RESULT/GUARD_PROTECT_RES dùng bool)"""
+        if as_bool:
+            return [{"username": p.username, "is_alive": p.is_alive} for p in self.players]
+        return [{"username": p.username, "is_alive": int(p.is_alive)} for p in self.players]
+
+
+class RoomManager:
+    """Giữ tối đa config.max_rooms phòng; id = slot + 1 và được dùng lại khi phòng bị xóa."""
+
+    def __init__(self, server):
+        self.server = server
+        self.config = server.config
+        self._slots = [None] * self.config.max_rooms
+
+    # ----- Helpers -----
+
+    def find(self, room_id):
+        if _is_number(room_id) and 1 <= room_id <= len(self._slots):
+            return self._slots[int(room_id) - 1]
+        return None
+
+    def rooms(self):
+        return [room for room in self._slots if room is not None]
+
+    def broadcast(self, room, header, payload, only=None):
+        """Encode một lần cho mỗi codec rồi ghi cùng bytes cho mọi người chơi còn kết nối"""
+        frames = {}  # conn.compact -> bytes
+        for player in self.players_connected(room):
+            if only is None or only(player):
+                conn = player.conn
+                data = frames.get(conn.compact)
+                if data is None:
+                    data = frames[conn.compact] = payload_codec.encode_packet(header, payload, conn.compact)
+                conn.write(data)
+
+    @staticmethod
+    def players_connected(room):
+        return [p for p in room.players if p.conn is not None]
+
+    def _schedule(self, room, delay, callback):
+        if room.timer is not None:
+            room.timer.cancel()
+        room.timer = self.server.loop.call_later(delay, self._fire, room, callback)
+
+    def _fire(self, room, callback):
+        room.timer = None
+        if self._slots[room.id - 1] is room:
+            callback(room)
+
+    def delete_room(self, room):
+        if self._slots[room.id - 1] is not room:
+            return
+        self._slots[room.id - 1] = None
+        if room.timer is not None:
+            room.timer.cancel()
+            room.timer = None
+        for player in room.players:
+            if player.disconnect_timer is not None:
+                player.disconnect_timer.cancel()
+                player.disconnect_timer = None
+            if player.conn is not None and player.conn.room is room:
+                player.conn.room = None
+        self.server.log(f"Room {room.id} ('{room.name}') deleted")
+
+    @staticmethod
+    def _fail(conn, header, message, **extra):
+        conn.send(header, dict(extra, status="fail", message=message))
+
+    # ----- Lobby -----
+
+    def get_rooms(self, conn, payload):
+        conn.send(protocol.GET_ROOMS_RES, [
+            {"id": room.id, "name": room.name, "current": len(room.players),
+             "max": self.config.max_players, "status": room.status}
+            for room in self.rooms()
+        ])
+
+    def create_room(self, conn, payload):
+        header = protocol.CREATE_ROOM_RES
+        if conn.user_id is None:
+            return self._fail(conn, header, "Please login first")
+        if conn.room is not None:
+            return self._fail(conn, header, "You are already in a room")
+        name = payload.get("room_name")
+        if not isinstance(name, str):
+            return self._fail(conn, header, "Invalid room name")
+        if not 1 <= len(name) <= ROOM_NAME_MAX_LENGTH:
+            return self._fail(conn, header, "Room name must be 1-49 characters")
+        if any(room.name == name for room in self.rooms()):
+            return self._fail(conn, header, "Room name already exists")
+        try:
+            index = self._slots.index(None)
+        except ValueError:
+            return self._fail(conn, header, "No available rooms")
+
+        room = Room(index + 1, name)
+        player = Player(conn)
+        room.players.append(player)
+        room.host = player
+        self._slots[index] = room
+        conn.room = room
+        self.server.stats["rooms_created"] += 1
+        self.server.log(f"Room created: {name} by {conn.username}")
+        conn.send(header, {"status": "success", "room_id": room.id, "room_name": room.name})
+
+    def join_room(self, conn, payload):
+        header = protocol.JOIN_ROOM_RES
+        if conn.user_id is None:
+            return self._fail(conn, header, "Please login first")
+        if conn.room is not None:
+            return self._fail(conn, header, "You are already in a room")
+        room_id = payload.get("room_id")
+        if not _is_number(room_id):
+            return self._fail(conn, header, "Invalid or missing room_id")
+        if not 1 <= room_id <= len(self._slots):
+            return self._fail(conn, header, "Invalid room_id")
+        room = self.find(room_id)
+        if room is None:
+            return self._fail(conn, header, "Room not found")
+        if room.status != protocol.ROOM_WAITING:
+            return self._fail(conn, header, "Game already started")
+        if len(room.players) >= self.config.max_players:
+            return self._fail(conn, header, "Room is full")
+
+        room.players.append(Player(conn))
+        conn.room = room
+        conn.send(header, {"status": "success", "is_host": 0, "room_id": room.id, "room_name": room.name,
+                           "players": [{"username": p.username} for p in room.players]})
+        self.broadcast(room, protocol.ROOM_STATUS_UPDATE, {
+            "type": "player_joined", "username": conn.username, "current_players": len(room.players)})
+
+    def leave_room(self, conn, payload):
+        header = protocol.LEAVE_ROOM_RES
+        if conn.user_id is None:
+            return self._fail(conn, header, "Please login first")
+        room = conn.room
+        player = room.player_of(conn) if room is not None else None
+        if player is None:
+            return self._fail(conn, header, "You are not in any room")
+        conn.room = None
+
+        if room.status == protocol.ROOM_PLAYING:
+            # Rời khi đang chơi = chết, slot vẫn giữ để còn công bố vai lúc GAME_OVER
+            player.is_alive = False
+            player.conn = None
+            conn.send(header, {"status": "success", "message": "You left the game and are considered dead"})
+            self.broadcast(room, protocol.ROOM_STATUS_UPDATE, {
+                "type": "player_disconnected", "username": player.username,
+                "message": "Player left and is considered dead"})
+            if not room.alive():
+                self.delete_room(room)
+            return
+
+        room.players.remove(player)
+        conn.send(header, {"status": "success", "message": "Left room successfully"})
+        if not room.players:
+            self.delete_room(room)
+            return
+        update = {"type": "player_left", "username": player.username, "current_players": len(room.players)}
+        if room.host is player:
+            room.host = room.players[0]
+            update["new_host"] = room.host.username
+        self.broadcast(room, protocol.ROOM_STATUS_UPDATE, update)
+
+    def disconnect(self, conn):
+        """Socket đóng / LOGOUT_REQ (handle_disconnect)"""
+        room = conn.room
+        conn.room = None
+        player = room.player_of(conn) if room is not None else None
+        if player is None:
+            return
+
+        if room.status == protocol.ROOM_PLAYING:
+            # Giữ slot DISCONNECT_TIMEOUT giây để người chơi login lại và chơi tiếp
+            player.conn = None
+            player.disconnect_timer = self.server.loop.call_later(
+                self.config.disconnect_timeout, self._disconnect_timeout, room, player)
+            self.broadcast(room, protocol.ROOM_STATUS_UPDATE, {
+                "type": "player_disconnected", "username": player.username,
+                "message": "Player disconnected", "game_started": True})
+            if not self.players_connected(room):
+                self.delete_room(room)  # cleanup_empty_rooms: mọi người đã mất kết nối
+            return
+
+        room.players.remove(player)
+        if not room.players:
+            self.delete_room(room)
+            return
+        update = {"type": "player_disconnected", "username": player.username,
+                  "current_players": len(room.players), "game_started": False}
+        if room.host is player:
+            room.host = room.players[0]
+            update["new_host"] = room.host.username
+        self.broadcast(room, protocol.ROOM_STATUS_UPDATE, update)
+
+    def _disconnect_timeout(self, room, player):
+        player.disconnect_timer = None
+        if self._slots[room.id - 1] is not room or room.status != protocol.ROOM_PLAYING:
+            return
+        if player.conn is not None or not player.is_alive:
+            return
+        player.is_alive = False
+        self.broadcast(room, protocol.ROOM_STATUS_UPDATE, {
+            "type": "player_eliminated", "username": player.username, "reason": "disconnect_timeout",
+            "message": "Player eliminated due to disconnect timeout (2 minutes)"})
+        self.check_win(room)
+
+    def rejoin(self, conn):
+        """Login lại khi vẫn còn slot trong phòng: gắn connection mới vào slot cũ.
+
+        Trả về (room_id, room_status, as_spectator) hoặc None.
+        """
+        for room in self.rooms():
+            player = room.player_named(conn.username)
+            if player is None:
+                continue
+            if player.disconnect_timer is not None:
+                player.disconnect_timer.cancel()
+                player.disconnect_timer = None
+            old = player.conn
+            if old is not None and old is not conn and old.room is room:
+                old.room = None
+            player.conn = conn
+            conn.room = room
+            spectator = room.status == protocol.ROOM_PLAYING and not player.is_alive
+            return room.id, room.status, int(spectator)
+        return None
+
+    def get_room_info(self, conn, payload):
+        header = protocol.GET_ROOM_INFO_RES
+        room_id = payload.get("room_id")
+        if not _is_number(room_id):
+            return self._fail(conn, header, "Invalid room ID")
+        room = self.find(room_id)
+        if room is None:
+            return self._fail(conn, header, "Room not found")
+        info = {
+            "status": "success", "room_id": room.id, "room_name": room.name,
+            "current_players": len(room.players), "max_players": self.config.max_players,
+            "day_phase_active": int(room.day_active), "day_round": room.day_round,
+            "day_deadline": room.day_deadline, "room_status": room.status,
+            "night_phase_active": int(room.night_active), "role_card_done_count": room.role_card_done,
+            "role_card_total": len(room.players) if room.status == protocol.ROOM_PLAYING else 0,
+            "role_card_start_time": room.role_card_start_time,
+            "seer_deadline": room.seer_deadline, "guard_deadline": room.guard_deadline,
+            "wolf_deadline": room.wolf_deadline,
+            "players": [{"username": p.username, "user_id": p.user_id, "is_host": int(p is room.host),
+                         "is_alive": int(p.is_alive)} for p in room.players],
+        }
+        if room.day_round == 2 and room.day_candidates:
+            info["day_candidates"] = list(room.day_candidates)
+        conn.send(header, info)
+
+    def chat(self, conn, payload):
+        header = protocol.ERROR_MSG
+        room_id = payload.get("room_id")
+        message = payload.get("message")
+        if not _is_number(room_id) or not isinstance(message, str):
+            return self._fail(conn, header, "Invalid or missing room_id/message")
+        if not 1 <= len(message.encode("utf-8")) <= CHAT_MAX_LENGTH:
+            return self._fail(conn, header, "Message too short or too long (max 500 chars)")
+        room = self.find(room_id)
+        if room is None:
+            return self._fail(conn, header, "Room not found")
+        sender = room.player_of(conn)
+        if sender is None:
+            return self._fail(conn, header, "You are not in this room")
+        if room.status == protocol.ROOM_PLAYING and not sender.is_alive:
+            return self._fail(conn, header, "Dead players cannot chat")
+
+        wolf_chat = room.night_active and sender.role == protocol.ROLE_WEREWOLF
+        self.broadcast(room, protocol.CHAT_BROADCAST, {
+            "username": sender.username, "message": message, "room_id": room.id,
+            "chat_type": "wolf" if wolf_chat else "day",
+        }, only=(lambda p: p.role == protocol.ROLE_WEREWOLF and p.is_alive) if wolf_chat else None)
+
+    # ----- Bắt đầu game -----
+
+    def start_game(self, conn, payload):
+        # Server C trả lời START_GAME_REQ bằng chính header 301 khi thất bại
+        header = protocol.START_GAME_REQ
+        room_id = payload.get("room_id")
+        if not _is_number(room_id):
+            return self._fail(conn, header, "Invalid or missing room_id")
+        if not 1 <= room_id <= len(self._slots):
+            return self._fail(conn, header, "Invalid room_id")
+        room = self.find(room_id)
+        if room is None:
+            return self._fail(conn, header, "Room not found")
+        if room.host is None or room.host.conn is not conn:
+            return self._fail(conn, header, "Only host can start the game")
+        if len(room.players) < self.config.min_players:
+            return self._fail(conn, header, f"Need at least {self.config.min_players} players to start")
+        if room.status == protocol.ROOM_PLAYING:
+            return self._fail(conn, header, "Game already started")
+        distribution = role_distribution(len(room.players))
+        if distribution is None:
+            return self._fail(conn, header, "Invalid player count for role distribution")
+
+        werewolves, seers, guards, villagers = distribution
+        roles = ([protocol.ROLE_WEREWOLF] * werewolves + [protocol.ROLE_SEER] * seers
+                 + [protocol.ROLE_GUARD] * guards + [protocol.ROLE_VILLAGER] * villagers)
+        self.server.rng.shuffle(roles)
+        for player, role in zip(room.players, roles):
+            player.role = role
+            player.is_alive = True
+
+        room.status = protocol.ROOM_PLAYING
+        room.role_card_done = 0
+        room.role_card_start_time = time.time()
+        self.server.stats["games_started"] += 1
+        wolves = [p.username for p in room.players if p.role == protocol.ROLE_WEREWOLF]
+        for player in self.players_connected(room):
+            role_name, role_icon, role_description = ROLE_INFO[player.role]
+            info = {"status": "success", "message": "Game started", "role": player.role,
+                    "role_name": role_name, "role_icon": role_icon, "role_description": role_description}
+            if player.role == protocol.ROLE_WEREWOLF:
+                info["werewolf_team"] = [name for name in wolves if name != player.username]
+            player.conn.send(protocol.GAME_START_RES_AND_ROLE, info)
+        # Đêm đầu bắt đầu khi mọi người đã xem xong role card hoặc hết giờ
+        self._schedule(room, self.config.role_card_timeout, self.start_night)
+
+    def role_card_done(self, conn, payload):
+        room = conn.room
+        if room is None or room.status != protocol.ROOM_PLAYING or room.nights:
+            return
+        room.role_card_done += 1
+        if room.role_card_done >= len(room.players):
+            self.start_night(room)
+
+    # ----- Đêm -----
+
+    def start_night(self, room):
+        config = self.config
+        now = time.time()
+        room.nights += 1
+        room.night_active = True
+        room.seer_done = room.guard_done = room.wolf_done = False
+        room.seer_deadline = now + config.seer_duration
+        room.guard_deadline = room.seer_deadline + config.guard_duration
+        room.wolf_deadline = room.guard_deadline + config.wolf_duration
+        room.guard_target = ""
+        room.wolf_votes = {}
+        self.broadcast(room, protocol.PHASE_NIGHT, {
+            "type": "phase_night",
+            "duration": config.seer_duration + config.guard_duration + config.wolf_duration,
+            "seer_duration": config.seer_duration,
+            "guard_duration": config.guard_duration,
+            "wolf_duration": config.wolf_duration,
+            "seer_deadline": room.seer_deadline,
+            "guard_deadline": room.guard_deadline,
+            "wolf_deadline": room.wolf_deadline,
+            "players": room.public_players(),
+        })
+        self._schedule(room, config.seer_duration, self._seer_timeout)
+
+    def _seer_timeout(self, room):
+        if room.night_active and not room.seer_done:
+            room.seer_done = True
+            self._start_guard_phase(room)
+
+    def _start_guard_phase(self, room):
+        config = self.config
+        room.guard_deadline = time.time() + config.guard_duration
+        room.wolf_deadline = room.guard_deadline + config.wolf_duration
+        self.broadcast(room, protocol.PHASE_GUARD_START, {
+            "type": "phase_guard_start", "guard_duration": config.guard_duration,
+            "guard_deadline": room.guard_deadline, "wolf_deadline": room.wolf_deadline})
+        self._schedule(room, config.guard_duration, self._guard_timeout)
+
+    def _guard_timeout(self, room):
+        if room.night_active and not room.guard_done:
+            room.guard_done = True
+            self._start_wolf_phase(room)
+
+    def _start_wolf_phase(self, room):
+        config = self.config
+        room.wolf_deadline = time.time() + config.wolf_duration
+        self.broadcast(room, protocol.PHASE_WOLF_START, {
+            "type": "phase_wolf_start", "wolf_duration": config.wolf_duration,
+            "wolf_deadline": room.wolf_deadline})
+        self._schedule(room, config.wolf_duration, self._wolf_timeout)
+
+    def _wolf_timeout(self, room):
+        if room.night_active and not room.wolf_done:
+            self._resolve_night(room)
+
+    def _night_request(self, conn, payload, header, fail_message="Invalid or missing room_id/target_username"):
+        """(room, requester, target) chung cho seer/guard/wolf, hoặc None nếu đã trả lỗi"""
+        room_id = payload.get("room_id")
+        target = payload.get("target_username")
+        if not _is_number(room_id) or not isinstance(target, str):
+            return self._fail(conn, header, fail_message)
+        room = self.find(room_id)
+        if room is None:
+            return self._fail(conn, header, "Room not found")
+        requester = room.player_of(conn)
+        if requester is None:
+            return self._fail(conn, header, "You are not in this room")
+        return room, requester, target
+
+    def _check_target(self, room, target):
+        """Message lỗi nếu target không hợp lệ, ngược lại None"""
+        player = room.player_named(target)
+        if player is None:
+            return "Target player not found"
+        if not player.is_alive:
+            return "Target is already dead"
+        return None
+
+    def seer_check(self, conn, payload):
+        header = protocol.SEER_RESULT
+        request = self._night_request(conn, payload, header)
+        if request is None:
+            return
+        room, seer, target = request
+        players = room.public_players(as_bool=True)
+        message = None
+        if seer.role != protocol.ROLE_SEER:
+            message = "You are not the Seer"
+        elif not room.night_active:
+            message = "Night phase is not active"
+        elif room.seer_done:
+            message = "Seer has already made a choice this night"
+        elif time.time() > room.seer_deadline:
+            message = "Seer selection window has expired"
+        elif target and not seer.is_alive:
+            message = "You are dead and cannot check"
+        elif target:
+            message = self._check_target(room, target)
+        if message is not None:
+            return self._fail(conn, header, message, players=players)
+
+        # Skip được cả khi đã chết; chọn xong thì chuyển ngay sang lượt guard
+        room.seer_done = True
+        if target:
+            result = {"status": "success", "target_username": target,
+                      "is_werewolf": room.player_named(target).role == protocol.ROLE_WEREWOLF}
+        else:
+            result = {"status": "success", "skipped": True}
+        result["players"] = players
+        self._start_guard_phase(room)
+        conn.send(header, result)
+
+    def guard_protect(self, conn, payload):
+        header = protocol.GUARD_PROTECT_RES
+        request = self._night_request(conn, payload, header)
+        if request is None:
+            return
+        room, guard, target = request
+        players = room.public_players(as_bool=True)
+        message = None
+        if guard.role != protocol.ROLE_GUARD:
+            message = "You are not the Guard"
+        elif not room.night_active:
+            message = "Night phase is not active"
+        elif room.guard_done:
+            message = "Guard has already made a choice this night"
+        elif not room.seer_done:
+            message = "Guard phase is not active"
+        elif time.time() > room.guard_deadline:
+            message = "Guard selection window has expired"
+        elif target and not guard.is_alive:
+            message = "You are dead and cannot protect"
+        elif target:
+            message = self._check_target(room, target)
+        if message is not None:
+            return self._fail(conn, header, message, players=players)
+
+        room.guard_done = True
+        room.guard_target = target
+        if target:
+            result = {"status": "success", "target_username": target}
+        else:
+            result = {"status": "success", "skipped": True}
+        result["players"] = players
+        self._start_wolf_phase(room)
+        conn.send(header, result)
+
+    def wolf_kill(self, conn, payload):
+        header = protocol.WOLF_KILL_RES
+        request = self._night_request(conn, payload, header, "Invalid request")
+        if request is None:
+            return
+        room, wolf, target = request
+        if not wolf.is_alive or wolf.role != protocol.ROLE_WEREWOLF:
+            return self._fail(conn, header, "You cannot vote (dead or not a werewolf)")
+        if not room.night_active:
+            return self._fail(conn, header, "Night phase is not active")
+        if time.time() > room.wolf_deadline:
+            return self._fail(conn, header, "Wolf phase deadline passed")
+        if target:
+            victim = room.player_named(target)
+            if victim is None:
+                return self._fail(conn, header, "Target not found")
+            if not victim.is_alive:
+                return self._fail(conn, header, "Target is already dead")
+
+        room.wolf_votes[wolf.username] = target
+        confirmation = {"type": "wolf_vote_received"}
+        if not target:
+            confirmation["skipped"] = True
+        conn.send(header, confirmation)
+
+        wolves = [p for p in room.players if p.role == protocol.ROLE_WEREWOLF and p.is_alive]
+        if not room.wolf_done and all(p.username in room.wolf_votes for p in wolves):
+            self._resolve_night(room)
+
+    def _resolve_night(self, room):
+        """Tổng hợp vote của sói còn sống (hòa -> random), guard chặn được nạn nhân"""
+        tally = {}
+        for player in room.players:
+            if player.role == protocol.ROLE_WEREWOLF and player.is_alive:
+                target = room.wolf_votes.get(player.username)
+                if target and room.player_named(target) is not None:
+                    tally[target] = tally.get(target, 0) + 1
+
+        victim = None
+        if tally:
+            top = max(tally.values())
+            candidates = [p for p in room.players if tally.get(p.username) == top]
+            victim = candidates[0] if len(candidates) == 1 else self.server.rng.choice(candidates)
+
+        killed = victim is not None and victim.is_alive and victim.username != room.guard_target
+        if killed:
+            victim.is_alive = False
+        room.wolf_done = True
+        room.night_active = False
+        if killed and self.check_win(room):
+            return
+
+        self._start_day(room)
+        result = {"type": "phase_day", "result": "killed" if killed else "no_kill"}
+        if killed:
+            result["targetId"] = victim.username
+        result["day_duration"] = self.config.day_duration
+        result["day_deadline"] = room.day_deadline
+        self.broadcast(room, protocol.PHASE_DAY, result)
+
+    # ----- Ngày -----
+
+    def _start_day(self, room):
+        room.day_active = True
+        room.day_round = 1
+        room.day_deadline = time.time() + self.config.day_duration
+        room.day_candidates = ()
+        room.day_votes = {}
+        self._schedule(room, self.config.day_duration, self._finalize_day)
+
+    def day_vote(self, conn, payload):
+        def error(message):
+            conn.send(protocol.ERROR_MSG, {"type": "vote_error", "message": message})
+
+        room_id = payload.get("room_id")
+        target = payload.get("target_username")
+        if not _is_number(room_id) or not isinstance(target, str):
+            return error("Invalid or missing room_id/target_username")
+        room = self.find(room_id)
+        if room is None:
+            return error("Room not found")
+        if room.status != protocol.ROOM_PLAYING or not room.day_active:
+            return error("Day phase is not active")
+        voter = room.player_of(conn)
+        if voter is None:
+            return error("You are not in this room")
+        if not voter.is_alive:
+            return error("Dead players cannot vote")
+        if target:
+            message = self._check_target(room, target)
+            if message is not None:
+                return error(message)
+            if room.day_round == 2 and target not in room.day_candidates:
+                return error("Target is not a valid candidate in round 2")
+
+        room.day_votes[voter.username] = target
+        if all(p.username in room.day_votes for p in room.alive()):
+            self._finalize_day(room)
+
+    def _finalize_day(self, room):
+        if not room.day_active:
+            return
+        tally = {}
+        for player in room.alive():
+            target = room.day_votes.get(player.username)
+            if not target:
+                continue  # skip / AFK
+            voted = room.player_named(target)
+            if voted is not None and voted.is_alive and (room.day_round != 2 or target in room.day_candidates):
+                tally[target] = tally.get(target, 0) + 1
+
+        candidates = []
+        if tally:
+            top = max(tally.values())
+            candidates = [p.username for p in room.players if tally.get(p.username) == top]
+
+        if not candidates:
+            self._end_day(room)
+            self.start_night(room)
+            return
+        if len(candidates) > 1 and room.day_round == 1:
+            self._start_tie_break(room, candidates)
+            return
+
+        if len(candidates) > 1:
+            selected = self.server.rng.choice(candidates)
+            self.broadcast(room, protocol.VOTE_RESULT, {
+                "type": "execution_random_selected", "candidates": candidates,
+                "selected": selected, "reason": "tie_break_still_equal"})
+        else:
+            selected = candidates[0]
+        room.player_named(selected).is_alive = False
+        self.broadcast(room, protocol.VOTE_RESULT, {"type": "player_executed", "playerId": selected})
+        self._end_day(room)
+        if not self.check_win(room):
+            self.start_night(room)
+
+    def _start_tie_break(self, room, candidates):
+        duration = self.config.tie_break_duration
+        room.day_round = 2
+        room.day_deadline = time.time() + duration
+        room.day_candidates = tuple(candidates)
+        room.day_votes = {}
+        self.broadcast(room, protocol.VOTE_RESULT, {
+            "type": "tie_break_start", "candidates": candidates,
+            "timer": duration, "deadline": room.day_deadline})
+        self._schedule(room, duration, self._finalize_day)
+
+    @staticmethod
+    def _end_day(room):
+        room.day_active = False
+        room.day_round = 0
+        room.day_candidates = ()
+
+    # ----- Kết thúc -----
+
+    def check_win(self, room):
+        """Broadcast GAME_OVER (công bố vai) và xóa phòng nếu một phe đã thắng"""
+        wolves = sum(1 for p in room.alive() if p.role == protocol.ROLE_WEREWOLF)
+        others = len(room.alive()) - wolves
+        if wolves == 0:
+            winner = "villagers"
+        elif wolves >= others:
+            winner = "werewolves"
+        else:
+            return False
+
+        room.status = protocol.ROOM_FINISHED
+        room.night_active = room.day_active = False
+        self.broadcast(room, protocol.GAME_OVER, {
+            "type": "game_over", "winner": winner,
+            "players": [{"username": p.username, "role": p.role, "is_alive": int(p.is_alive)}
+                        for p in room.players],
+        })
+        self.server.stats["games_finished"] += 1
+        self.server.winners[winner] += 1
+        self.server.log(f"Room {room.id} game over after {room.nights} nights: {winner} win")
+        self.delete_room(room)
+        return True
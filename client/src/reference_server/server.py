@@ -0,0 +1,308 @@
+"""Reference Server - server Werewolf thuần Python (asyncio) thay cho server C + MySQL
+
+Cùng framing (protocol.py), header và payload với server/src nên GUI, AsyncWerewolfNetworkClient,
+WerewolfNetworkClient và bot kết nối được mà không đổi gì. Dùng để chạy test / benchmark trên
+máy không có MySQL và để chơi nhanh hàng nghìn ván: mọi thời lượng phase nằm trong
+ServerConfig và nhận số thực (mili giây được).
+"""
+
+import asyncio
+import collections
+import random
+import time
+
+import payload_codec
+import protocol
+from reference_server.rooms import RoomManager
+from reference_server.users import UserStore
+
+
+class ServerConfig:
+    """Giới hạn và thời lượng phase (mặc định = hằng số trong server/include/*.h)."""
+
+    # Các field scaled() nhân lên; ping/session timeout giữ nguyên vì thuộc về connection
+    PHASE_FIELDS = ("role_card_timeout", "seer_duration", "guard_duration", "wolf_duration",
+                    "day_duration", "tie_break_duration", "disconnect_timeout")
+
+    def __init__(self, host="127.0.0.1", port=5000, max_rooms=10, max_players=12, min_players=6,
+                 max_sessions=30, role_card_timeout=30, seer_duration=30, guard_duration=30,
+                 wolf_duration=60, day_duration=120, tie_break_duration=30, disconnect_timeout=120,
+                 ping_interval=30, session_timeout=180, max_payload=65536,
+                 codecs=payload_codec.SUPPORTED_CODECS, seed=None, verbose=False):
+        """
+        port:            0 = để OS chọn port trống (xem ReferenceServer.port sau start())
+        max_sessions:    số user đăng nhập cùng lúc (MAX_SESSIONS)
+        *_duration:      giây, số thực; deadline gửi cho client tính từ các giá trị này
+        ping_interval:   server gửi PING khi session im lặng quá N giây (0 = tắt)
+        session_timeout: ngắt session không PING/PONG trong N giây (0 = tắt)
+        codecs:          codec payload chấp nhận trong HELLO_REQ theo thứ tự ưu tiên;
+                         ("json",) = luôn chọn JSON, () = bỏ qua HELLO_REQ như server C
+        seed:            seed cho chia vai / random khi hòa vote (ván lặp lại được)
+        verbose:         in log [SERVER] như server C
+        """
+        self.host = host
+        self.port = port
+        self.max_rooms = max_rooms
+        self.max_players = max_players
+        self.min_players = min_players
+        self.max_sessions = max_sessions
+        self.role_card_timeout = role_card_timeout
+        self.seer_duration = seer_duration
+        self.guard_duration = guard_duration
+        self.wolf_duration = wolf_duration
+        self.day_duration = day_duration
+        self.tie_break_duration = tie_break_duration
+        self.disconnect_timeout = disconnect_timeout
+        self.ping_interval = ping_interval
+        self.session_timeout = session_timeout
+        self.max_payload = max_payload
+        self.codecs = tuple(codecs)
+        self.seed = seed
+        self.verbose = verbose
+
+    def scaled(self, factor):
+        """Bản sao với mọi thời lượng phase nhân `factor` (0.001: một đêm 120s còn 0.12s)"""
+        config = ServerConfig.__new__(ServerConfig)
+        config.__dict__.update(self.__dict__)
+        for field in self.PHASE_FIELDS:
+            setattr(config, field, getattr(self, field) * factor)
+        return config
+
+
+class _ServerConnection(asyncio.Protocol):
+    """Một client: tách frame trong data_received rồi gọi handler ngay (không task riêng)."""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.decoder = protocol.FrameDecoder(server.config.max_payload, decode=payload_codec.decode_payload)
+        self.compact = False  # HELLO đã chọn "compact1" cho connection này
+        self.username = None
+        self.user_id = None   # != None khi đã login (có session)
+        self.room = None
+        self.last_ping = time.monotonic()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server._connections.add(self)
+        self.server.stats["connections"] += 1
+
+    def data_received(self, data):
+        self.server.stats["bytes_in"] += len(data)
+        try:
+            frames = self.decoder.feed(data)
+        except ValueError as e:
+            # Server C đóng connection khi length vượt giới hạn
+            print(f"[WARNING] Reference server: {e}, closing connection")
+            self.close()
+            return
+        for header, payload in frames:
+            if self.transport is None:
+                return
+            self.server.handle_packet(self, header, payload)
+
+    def connection_lost(self, exc):
+        self.transport = None
+        self.server._connection_lost(self)
+
+    def send(self, header, payload):
+        self.write(payload_codec.encode_packet(header, payload, self.compact))
+
+    def write(self, data):
+        transport = self.transport
+        if transport is not None and not transport.is_closing():
+            transport.write(data)
+            stats = self.server.stats
+            stats["packets_out"] += 1
+            stats["bytes_out"] += len(data)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class ReferenceServer:
+    """Server asyncio: sessions + auth ở đây, phòng và luật chơi ở RoomManager.
+
+        async with ReferenceServer(ServerConfig(port=0).scaled(0.001)) as server:
+            ... kết nối tới 127.0.0.1:server.port ...
+    """
+
+    def __init__(self, config=None, users=None):
+        self.config = config or ServerConfig()
+        self.users = users if users is not None else UserStore()
+        self.rng = random.Random(self.config.seed)
+        self.stats = collections.Counter()
+        self.winners = collections.Counter()
+        self.rooms = RoomManager(self)
+        self.loop = None
+        self.port = None
+        self._server = None
+        self._tick_handle = None
+        self._connections = set()
+        self._sessions = set()
+
+        rooms = self.rooms
+        self._handlers = {
+            protocol.REGISTER_REQ: self._on_register,
+            protocol.LOGIN_REQ: self._on_login,
+            protocol.LOGOUT_REQ: self._on_logout,
+            protocol.GET_ROOMS_REQ: rooms.get_rooms,
+            protocol.CREATE_ROOM_REQ: rooms.create_room,
+            protocol.JOIN_ROOM_REQ: rooms.join_room,
+            protocol.LEAVE_ROOM_REQ: rooms.leave_room,
+            protocol.GET_ROOM_INFO_REQ: rooms.get_room_info,
+            protocol.START_GAME_REQ: rooms.start_game,
+            protocol.ROLE_CARD_DONE_REQ: rooms.role_card_done,
+            protocol.SEER_CHECK_REQ: rooms.seer_check,
+            protocol.GUARD_PROTECT_REQ: rooms.guard_protect,
+            protocol.WOLF_KILL_REQ: rooms.wolf_kill,
+            protocol.VOTE_REQ: rooms.day_vote,
+            protocol.CHAT_REQ: rooms.chat,
+            protocol.PING: self._on_ping,
+            protocol.PONG: self._on_pong,
+            protocol.HELLO_REQ: self._on_hello,
+        }
+
+    # ----- Lifecycle -----
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._server = await self.loop.create_server(
+            lambda: _ServerConnection(self), self.config.host, self.config.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tick_handle = self.loop.call_later(1.0, self._tick)
+        print(f"[SERVER] Reference server listening on {self.config.host}:{self.port}")
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    def close(self):
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        if self._server is not None:
+            self._server.close()
+        for room in self.rooms.rooms():
+            self.rooms.delete_room(room)
+        for conn in list(self._connections):
+            conn.close()
+
+    async def wait_closed(self):
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        self.close()
+        await self.wait_closed()
+
+    def log(self, message):
+        if self.config.verbose:
+            print(f"[SERVER] {message}")
+
+    # ----- Connections / sessions -----
+
+    def handle_packet(self, conn, header, payload):
+        self.stats["packets_in"] += 1
+        handler = self._handlers.get(header)
+        if handler is None:
+            self.log(f"Unknown packet header: {header}")
+            return
+        if not isinstance(payload, dict):
+            return  # server C bỏ qua payload không phải JSON object
+        handler(conn, payload)
+
+    def _connection_lost(self, conn):
+        self._connections.discard(conn)
+        if conn.user_id is not None:
+            self.rooms.disconnect(conn)
+            self._sessions.discard(conn)
+
+    def _tick(self):
+        """Mỗi giây: PING session im lặng, ngắt session quá hạn (send_ping_to_all_clients/check_timeouts)"""
+        now = time.monotonic()
+        config = self.config
+        for conn in list(self._sessions):
+            silent = now - conn.last_ping
+            if config.session_timeout and silent >= config.session_timeout:
+                self.log(f"Session timeout: {conn.username}")
+                conn.close()
+            elif config.ping_interval and silent >= config.ping_interval:
+                conn.send(protocol.PING, {"type": "ping"})
+        self._tick_handle = self.loop.call_later(1.0, self._tick)
+
+    # ----- Handlers -----
+
+    @staticmethod
+    def _credentials(payload):
+        username = payload.get("username")
+        password = payload.get("password")
+        if isinstance(username, str) and isinstance(password, str):
+            return username, password
+        return None
+
+    def _on_register(self, conn, payload):
+        credentials = self._credentials(payload)
+        if credentials is None:
+            response = {"status": "fail", "message": "Missing username or password"}
+        elif self.users.register(*credentials) is None:
+            response = {"status": "fail", "message": "Username already exists"}
+        else:
+            response = {"status": "success"}
+        conn.send(protocol.REGISTER_RES, response)
+
+    def _on_login(self, conn, payload):
+        credentials = self._credentials(payload)
+        if credentials is None:
+            return conn.send(protocol.LOGIN_RES, {"status": "fail", "message": "Missing username or password"})
+        user_id = self.users.authenticate(*credentials)
+        if user_id is None:
+            return conn.send(protocol.LOGIN_RES, {"status": "fail", "message": "Wrong username or password"})
+        if conn not in self._sessions and len(self._sessions) >= self.config.max_sessions:
+            # Server C im lặng không tạo session (mọi request sau đó báo "Please login first")
+            return conn.send(protocol.LOGIN_RES, {"status": "fail", "message": "Too many sessions"})
+
+        conn.username = credentials[0]
+        conn.user_id = user_id
+        conn.last_ping = time.monotonic()
+        self._sessions.add(conn)
+        response = {"status": "success", "user_id": user_id, "username": conn.username}
+        resume = self.rooms.rejoin(conn)
+        if resume is not None:
+            response["resume_room_id"], response["resume_room_status"], response["resume_as_spectator"] = resume
+        conn.send(protocol.LOGIN_RES, response)
+
+    def _on_logout(self, conn, payload):
+        if conn.user_id is not None:
+            self.rooms.disconnect(conn)
+            self._sessions.discard(conn)
+            conn.user_id = conn.username = None
+
+    def _on_ping(self, conn, payload):
+        received = time.time()
+        conn.last_ping = time.monotonic()
+        pong = {"type": "pong"}
+        t0 = payload.get("t0")
+        if isinstance(t0, (int, float)) and not isinstance(t0, bool):
+            pong["t0"] = t0
+            pong["t1"] = received
+            pong["t2"] = time.time()
+        conn.send(protocol.PONG, pong)
+
+    def _on_pong(self, conn, payload):
+        conn.last_ping = time.monotonic()
+
+    def _on_hello(self, conn, payload):
+        if not self.config.codecs:
+            self.log(f"Unknown packet header: {protocol.HELLO_REQ}")
+            return
+        codec = payload_codec.choose_codec(payload.get("codecs"), self.config.codecs)
+        # HELLO_RES luôn là JSON; từ packet sau server gửi bằng codec đã chọn
+        conn.send(protocol.HELLO_RES, {"codec": codec})
+        conn.compact = codec == payload_codec.CODEC_COMPACT
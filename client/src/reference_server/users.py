@@ -0,0 +1,41 @@
+"""User Store - bảng `user` của MySQL (server/database) giữ trong bộ nhớ
+
+Giống handle_register / handle_login: mật khẩu lưu dạng SHA-256 hex, username trùng thì
+đăng ký thất bại, user_id tăng dần từ 1. Mất hết khi process kết thúc.
+"""
+
+import hashlib
+
+
+class UserStore:
+    """username -> (user_id, password_hash)"""
+
+    def __init__(self):
+        self._users = {}
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, username):
+        return username in self._users
+
+    @staticmethod
+    def hash_password(password):
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+    def register(self, username, password):
+        """user_id mới, hoặc None nếu username đã tồn tại (UNIQUE constraint)"""
+        if username in self._users:
+            return None
+        user_id = self._next_id
+        self._next_id += 1
+        self._users[username] = (user_id, self.hash_password(password))
+        return user_id
+
+    def authenticate(self, username, password):
+        """user_id nếu đúng username/password, ngược lại None"""
+        entry = self._users.get(username)
+        if entry is None or entry[1] != self.hash_password(password):
+            return None
+        return entry[0]
@@ -0,0 +1,224 @@
+"""Room State - trạng thái phòng/game dùng chung, thay cho các key rời rạc trong shared_data"""
+
+import time
+
+from PyQt5 import QtCore
+
+
+class PlayerInfo:
+    """Một người chơi trong phòng. `index` = vị trí (thứ tự server gửi), dùng làm bit trong bitset."""
+
+    __slots__ = ("username", "index", "is_alive", "role")
+
+    def __init__(self, username, index, is_alive=True, role=None):
+        self.username = username
+        self.index = index
+        self.is_alive = is_alive
+        self.role = role
+
+    def to_dict(self):
+        """Dạng dict như packet server (cho NightPhaseController và các window cũ)"""
+        return {
+            "username": self.username,
+            "is_alive": 1 if self.is_alive else 0,
+            "role": self.role,
+        }
+
+
+class RoomState(QtCore.QObject):
+    """Model trạng thái phòng hiện tại, một instance cho cả ứng dụng (shared_data "room_state").
+
+    - Player được index theo username (dict) -> tra cứu O(1), không cần quét list.
+    - Trạng thái sống và vai trò lưu dạng bitset theo `PlayerInfo.index`.
+    - Mỗi nhóm field có signal riêng; window connect vào field mình hiển thị thay vì tự
+      đọc lại/quét lại toàn bộ danh sách.
+    """
+
+    # Danh sách người chơi thay đổi (set_players / join / leave)
+    players_changed = QtCore.pyqtSignal()
+    # list[str]: các username vừa đổi trạng thái sống
+    alive_changed = QtCore.pyqtSignal(list)
+    # dict: role_info của mình (GAME_START_RES_AND_ROLE)
+    role_info_changed = QtCore.pyqtSignal(dict)
+    # deadline / candidates / lựa chọn của vòng vote ban ngày thay đổi
+    day_vote_changed = QtCore.pyqtSignal()
+    # dict: thông tin night phase đang chờ (PHASE_NIGHT)
+    night_phase_changed = QtCore.pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._players = {}  # username -> PlayerInfo
+        self._order = []  # list[PlayerInfo] theo index
+        self._alive_mask = 0
+        self._role_masks = {}  # role -> bitset
+        self.role_info = {}
+        self.day_vote_deadline = None
+        self._day_vote_mono_deadline = None  # day_vote_deadline theo time.monotonic()
+        self.day_vote_candidates = None
+        self.day_vote_selected_username = None
+        self.pending_night_phase = {}
+
+    # ----- Players -----
+
+    def set_players(self, players):
+        """Thay toàn bộ danh sách từ payload server (list[dict] hoặc list[str])."""
+        self._players = {}
+        self._order = []
+        for p in players or []:
+            if isinstance(p, dict):
+                username = p.get("username")
+                is_alive = self._to_alive(p.get("is_alive", 1))
+                role = p.get("role")
+            else:
+                username, is_alive, role = str(p), True, None
+            if not username or username in self._players:
+                continue
+            info = PlayerInfo(username, len(self._order), is_alive, role)
+            self._players[username] = info
+            self._order.append(info)
+        self._rebuild_masks()
+        self.players_changed.emit()
+
+    def add_player(self, username):
+        if not username or username in self._players:
+            return
+        info = PlayerInfo(username, len(self._order))
+        self._players[username] = info
+        self._order.append(info)
+        self._alive_mask |= 1 << info.index
+        self.players_changed.emit()
+
+    def remove_player(self, username):
+        info = self._players.pop(username, None)
+        if info is None:
+            return
+        self._order.remove(info)
+        for i, p in enumerate(self._order):
+            p.index = i
+        self._rebuild_masks()
+        self.players_changed.emit()
+
+    def mark_dead(self, usernames):
+        """Đánh dấu chết; chỉ emit alive_changed với những người thực sự đổi trạng thái."""
+        changed = []
+        for username in usernames or []:
+            info = self._players.get(username)
+            if info is None or not info.is_alive:
+                continue
+            info.is_alive = False
+            self._alive_mask &= ~(1 << info.index)
+            changed.append(username)
+        if changed:
+            self.alive_changed.emit(changed)
+        return changed
+
+    def get(self, username):
+        return self._players.get(username)
+
+    def is_alive(self, username, default=True):
+        """Trạng thái sống (O(1)); `default` nếu username không có trong phòng."""
+        info = self._players.get(username)
+        if info is None:
+            return default
+        return bool(self._alive_mask >> info.index & 1)
+
+    def players(self):
+        """list[PlayerInfo] theo thứ tự server"""
+        return list(self._order)
+
+    def player_dicts(self):
+        return [p.to_dict() for p in self._order]
+
+    def usernames(self):
+        return [p.username for p in self._order]
+
+    def usernames_with_role(self, role):
+        mask = self._role_masks.get(role, 0)
+        return [p.username for p in self._order if mask >> p.index & 1]
+
+    def host(self):
+        """Host = người đầu tiên trong danh sách (quy ước của server)"""
+        return self._order[0].username if self._order else None
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, username):
+        return username in self._players
+
+    # ----- Role / phases -----
+
+    def set_role_info(self, role_info):
+        self.role_info = dict(role_info or {})
+        self.role_info_changed.emit(self.role_info)
+
+    def my_role(self):
+        """Role số của mình (0=VILLAGER, 1=WEREWOLF, 2=SEER, 3=GUARD)"""
+        try:
+            return int(self.role_info.get("role", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def werewolf_team(self):
+        """Đồng đội sói từ role_info, fallback theo role trong danh sách người chơi"""
+        team = self.role_info.get("werewolf_team") or []
+        return list(team) if team else self.usernames_with_role(1)
+
+    def set_day_vote(self, deadline=None, candidates=None, reset_selection=False):
+        """Cập nhật vòng vote ban ngày. `candidates=None` = tất cả người còn sống."""
+        if deadline is not None:
+            self.day_vote_deadline = float(deadline)
+            # Đổi sang monotonic một lần (như DeadlineClock): chỉnh giờ hệ thống không làm lệch
+            self._day_vote_mono_deadline = time.monotonic() + (self.day_vote_deadline - time.time())
+        self.day_vote_candidates = list(candidates) if candidates else None
+        if reset_selection or (
+            self.day_vote_candidates is not None
+            and self.day_vote_selected_username not in self.day_vote_candidates
+        ):
+            self.day_vote_selected_username = None
+        self.day_vote_changed.emit()
+
+    def day_remaining(self):
+        """Số giây còn lại của vòng vote (0 nếu chưa có deadline)"""
+        if not self.day_vote_deadline:
+            return 0
+        return max(0, int(self._day_vote_mono_deadline - time.monotonic()))
+
+    def set_pending_night_phase(self, info):
+        self.pending_night_phase = dict(info or {})
+        self.night_phase_changed.emit(self.pending_night_phase)
+
+    def clear_game(self):
+        """Xóa trạng thái của ván (giữ danh sách người chơi)"""
+        self.role_info = {}
+        self.day_vote_deadline = None
+        self._day_vote_mono_deadline = None
+        self.day_vote_candidates = None
+        self.day_vote_selected_username = None
+        self.pending_night_phase = {}
+
+    def clear(self):
+        """Rời phòng: xóa hết"""
+        self.clear_game()
+        self.set_players([])
+
+    # ----- Internal -----
+
+    def _rebuild_masks(self):
+        alive = 0
+        roles = {}
+        for p in self._order:
+            bit = 1 << p.index
+            if p.is_alive:
+                alive |= bit
+            if p.role is not None:
+                roles[p.role] = roles.get(p.role, 0) | bit
+        self._alive_mask = alive
+        self._role_masks = roles
+
+    @staticmethod
+    def _to_alive(value):
+        try:
+            return int(value) != 0
+        except (TypeError, ValueError):
+            return True
@@ -1,8 +1,75 @@
 """Connection Monitor - Theo dõi và xử lý mất kết nối"""
 
+from collections import deque
 from PyQt5 import QtCore, QtWidgets
 import time
 
+import protocol
+from utils.deadline_clock import get_deadline_clock
+
+
+class ClockOffsetEstimator:
+    """Ước lượng RTT và độ lệch đồng hồ server từ các cặp PING/PONG có timestamp (kiểu NTP).
+
+    Mỗi mẫu: t0 = client gửi PING, t1 = server nhận, t2 = server gửi PONG, t3 = client nhận
+        rtt    = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) / 2    (đồng hồ server - đồng hồ client)
+    Giống clock filter của NTP: giữ WINDOW mẫu gần nhất và dùng offset của mẫu có RTT nhỏ
+    nhất (ít bị hàng đợi/độ trễ bất đối xứng làm lệch nhất). Dùng chung cho mọi
+    ConnectionMonitor qua shared_data["clock_offset"].
+    """
+
+    WINDOW = 8
+
+    def __init__(self):
+        self.samples = deque(maxlen=self.WINDOW)  # (rtt, offset)
+        self.sample_count = 0
+        self.rejected_count = 0
+        self.offset = 0.0      # offset của mẫu được chọn (giây)
+        self.min_rtt = None    # RTT của mẫu được chọn (giây)
+        self.last_rtt = None
+        self.burst_pings_sent = 0  # PING burst đã gửi khi chưa có mẫu (mọi monitor cộng dồn)
+        self._last_t0 = None
+
+    def add_sample(self, t0, t1, t2, t3):
+        """Thêm một mẫu; trả về True nếu mẫu hợp lệ (offset có thể đã đổi)"""
+        if t0 == self._last_t0:
+            # Cùng một PONG được nhiều monitor nhận
+            return False
+        self._last_t0 = t0
+        rtt = (t3 - t0) - (t2 - t1)
+        if rtt < 0 or t2 < t1 or t3 < t0:
+            self.rejected_count += 1
+            return False
+        self.last_rtt = rtt
+        self.samples.append((rtt, ((t1 - t0) + (t2 - t3)) / 2))
+        self.sample_count += 1
+        self.min_rtt, self.offset = min(self.samples)
+        return True
+
+    def add_rtt(self, rtt):
+        """Server không gửi t1/t2 (bản cũ): chỉ ghi nhận RTT"""
+        self.last_rtt = rtt
+
+    def jitter(self):
+        """RMS chênh lệch offset của các mẫu trong cửa sổ so với offset được chọn (giây)"""
+        if len(self.samples) < 2:
+            return 0.0
+        return (sum((o - self.offset) ** 2 for _, o in self.samples) / (len(self.samples) - 1)) ** 0.5
+
+    def stats(self):
+        """{samples, rejected, offset_ms, min_rtt_ms, last_rtt_ms, jitter_ms} cho chẩn đoán"""
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+        return {
+            "samples": self.sample_count,
+            "rejected": self.rejected_count,
+            "offset_ms": ms(self.offset),
+            "min_rtt_ms": ms(self.min_rtt),
+            "last_rtt_ms": ms(self.last_rtt),
+            "jitter_ms": ms(self.jitter()),
+        }
+
 
 class ConnectionMonitor(QtCore.QObject):
     """Monitor kết nối và xử lý reconnect"""
@@ -30,6 +97,20 @@ class ConnectionMonitor(QtCore.QObject):
         # Optional client-initiated ping (in addition to server->client ping).
         # Helps detect half-open connections where no packets arrive.
         self.ping_interval_ms = 25_000
+
+        # Vài PING liên tiếp lúc chưa có mẫu đồng hồ nào (như iburst của NTP). Tổng cộng chỉ
+        # burst_count PING cho cả app: server không echo t0 thì không burst lại mỗi lần start()
+        self.burst_count = 4
+        self.burst_interval_ms = 500
+        self._running = False
+
+        # Đo RTT / độ lệch đồng hồ server (dùng chung giữa các monitor của các cửa sổ)
+        self.clock_offset = window_manager.get_shared_data("clock_offset") if window_manager else None
+        if self.clock_offset is None:
+            self.clock_offset = ClockOffsetEstimator()
+            if window_manager:
+                window_manager.set_shared_data("clock_offset", self.clock_offset)
+        self._ping_sent_at = None  # monotonic, cho server không echo t0
         
         # Timer kiểm tra connection
         self.check_timer = QtCore.QTimer()
@@ -37,26 +118,52 @@ class ConnectionMonitor(QtCore.QObject):
 
         self.ping_timer = QtCore.QTimer()
         self.ping_timer.timeout.connect(self.send_ping)
+
+        self.burst_timer = QtCore.QTimer()
+        self.burst_timer.timeout.connect(self._send_burst_ping)
         
     def start(self):
         """Bắt đầu monitor"""
         self.last_pong_time = time.time()
         self.is_connected = True
+        self._running = True
         self.check_timer.start(self.check_interval_ms)
         self.ping_timer.start(self.ping_interval_ms)
+        dispatcher = self.window_manager.get_shared_data("packet_dispatcher") if self.window_manager else None
+        if dispatcher:
+            dispatcher.subscribe(self, {protocol.PONG: self.handle_pong})
+        if self.clock_offset.sample_count == 0 and self.clock_offset.burst_pings_sent < self.burst_count:
+            # PING đầu tiên ở lượt event loop kế tiếp, không gửi ngay trong showEvent
+            self.burst_timer.start(0)
         
     def stop(self):
         """Dừng monitor"""
+        self._running = False
         self.check_timer.stop()
         self.ping_timer.stop()
+        self.burst_timer.stop()
+        dispatcher = self.window_manager.get_shared_data("packet_dispatcher") if self.window_manager else None
+        if dispatcher:
+            dispatcher.unsubscribe(self)
+
+    def _send_burst_ping(self):
+        """Một PING của burst; dừng khi đã có mẫu hoặc đã gửi đủ burst_count"""
+        if self.clock_offset.sample_count or self.clock_offset.burst_pings_sent >= self.burst_count:
+            self.burst_timer.stop()
+            return
+        self.burst_timer.setInterval(self.burst_interval_ms)
+        self.clock_offset.burst_pings_sent += 1
+        self.send_ping()
 
     def send_ping(self):
         """Gửi ping định kỳ để keepalive / detect dead links."""
-        if not self.is_connected:
+        if not self._running or not self.is_connected:
             return
         try:
             if hasattr(self.network_client, "send_ping"):
-                self.network_client.send_ping()
+                self._ping_sent_at = time.monotonic()
+                # t0 được server echo lại trong PONG cùng t1/t2 để ước lượng độ lệch đồng hồ
+                self.network_client.send_ping(client_time=time.time())
         except Exception:
             # If sending fails, connection is likely broken.
             if self.is_connected:
@@ -70,6 +177,30 @@ class ConnectionMonitor(QtCore.QObject):
         self.is_connected = True
         self.reconnect_attempts = 0
 
+    def handle_pong(self, payload):
+        """PONG (trả lời PING của client): cập nhật RTT / độ lệch đồng hồ server"""
+        t3 = time.time()
+        self.on_pong_received()
+        if not isinstance(payload, dict):
+            return
+        try:
+            t0 = payload.get("t0")
+            t1, t2 = payload.get("t1"), payload.get("t2")
+            if t0 is None:
+                if self._ping_sent_at is not None:
+                    self.clock_offset.add_rtt(time.monotonic() - self._ping_sent_at)
+                return
+            if t1 is None or t2 is None:
+                self.clock_offset.add_rtt(t3 - float(t0))
+                return
+            if self.clock_offset.add_sample(float(t0), float(t1), float(t2), t3):
+                get_deadline_clock(self.window_manager).set_server_offset(self.clock_offset.offset)
+                stats = self.clock_offset.stats()
+                print(f"[DEBUG] Clock sync: offset {stats['offset_ms']:+.1f} ms, "
+                      f"rtt {stats['last_rtt_ms']:.1f} ms (min {stats['min_rtt_ms']:.1f} ms, {stats['samples']} samples)")
+        except (TypeError, ValueError) as e:
+            print(f"[WARNING] Invalid PONG timestamps: {e}")
+
     def on_activity(self):
         """Gọi khi nhận được bất kỳ packet nào từ server (treat as alive)."""
         self.on_pong_received()
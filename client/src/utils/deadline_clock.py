@@ -0,0 +1,175 @@
+"""Deadline clock - một đồng hồ đếm ngược dùng chung cho mọi màn hình có timer"""
+
+import math
+import time
+
+from PyQt5 import QtCore
+
+
+class DeadlineClock(QtCore.QObject):
+    """Quản lý các deadline có tên ("role_card", "seer", "wolf", "day", ...) trên một timer.
+
+    Trước đây mỗi màn hình đếm ngược có QTimer 1 Hz riêng (kể cả khi đã ẩn) và tự tính
+    `deadline - time.time()`. Clock giữ một QTimer single-shot duy nhất, hẹn giờ đúng vào
+    thời điểm số giây hiển thị của một deadline đổi (không lệch dần như timer 1000 ms),
+    và chỉ gọi subscriber khi số giây đó đổi.
+
+    Deadline nhận vào là epoch seconds (server gửi) nhưng được đổi sang `time.monotonic()`
+    một lần lúc set, nên chỉnh giờ hệ thống không làm countdown nhảy. Deadline theo đồng hồ
+    server được đổi sang đồng hồ client bằng `to_local()` (độ lệch do ConnectionMonitor ước
+    lượng từ PING/PONG, xem `set_server_offset`).
+
+    Subscriber đăng ký giống PacketDispatcher: `subscribe(owner, {name: callback})`,
+    `unsubscribe(owner)`. Callback nhận một tham số: số giây còn lại (int, 0 = hết giờ).
+    Subscriber mới (hoặc khi deadline được set lại) nhận giá trị hiện tại ở lượt event loop
+    kế tiếp, nên deadline đã hết hạn vẫn báo 0 đúng một lần.
+    """
+
+    # name, remaining (mỗi lần số giây hiển thị đổi, sau khi gọi callback)
+    second_changed = QtCore.pyqtSignal(str, int)
+
+    # Thức dậy trễ hơn mốc giây một chút để chắc chắn int(remaining) đã đổi
+    SLACK_MS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._deadlines = {}    # name -> monotonic deadline
+        self._subscribers = {}  # name -> {owner: [callback, last_value]}
+        self.server_offset = 0.0  # giây, đồng hồ server - đồng hồ client
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    # ----- deadlines -----
+
+    def set_deadline(self, name, deadline=None, duration_seconds=None):
+        """Đặt deadline `name` (epoch seconds, hoặc now + duration). Trả về số giây còn lại."""
+        if deadline is None:
+            deadline = time.time() + float(duration_seconds or 0)
+        self._deadlines[name] = time.monotonic() + (float(deadline) - time.time())
+        for entry in self._subscribers.get(name, {}).values():
+            entry[1] = None
+        self._schedule()
+        return self.remaining(name)
+
+    def set_server_offset(self, offset):
+        """Đặt độ lệch đồng hồ server - client (giây) dùng cho các deadline sau đó"""
+        self.server_offset = float(offset)
+
+    def to_local(self, server_deadline):
+        """Đổi epoch deadline theo đồng hồ server sang đồng hồ client (None/0 giữ nguyên)"""
+        if not server_deadline:
+            return server_deadline
+        return float(server_deadline) - self.server_offset
+
+    def clear(self, name):
+        self._deadlines.pop(name, None)
+
+    def has_deadline(self, name):
+        return name in self._deadlines
+
+    def remaining(self, name):
+        """Số giây còn lại (0 nếu hết giờ hoặc chưa đặt)"""
+        mono_deadline = self._deadlines.get(name)
+        if mono_deadline is None:
+            return 0
+        return max(0, int(mono_deadline - time.monotonic()))
+
+    def deadline(self, name):
+        """Deadline `name` quy đổi lại về epoch seconds (None nếu chưa đặt)"""
+        mono_deadline = self._deadlines.get(name)
+        if mono_deadline is None:
+            return None
+        return time.time() + (mono_deadline - time.monotonic())
+
+    # ----- subscribers -----
+
+    def subscribe(self, owner, callbacks):
+        """Đăng ký `{name: callback}` cho owner (đăng ký lại thì thay callback cũ)"""
+        for name, callback in callbacks.items():
+            self._subscribers.setdefault(name, {})[owner] = [callback, None]
+        if isinstance(owner, QtCore.QObject) and not getattr(owner, "_deadline_clock_hooked", False):
+            owner._deadline_clock_hooked = True
+            owner.destroyed.connect(lambda *_: self.unsubscribe(owner))
+        self._schedule()
+
+    def unsubscribe(self, owner, name=None):
+        """Bỏ đăng ký owner (mọi deadline, hoặc chỉ `name`)"""
+        names = [name] if name is not None else list(self._subscribers)
+        for key in names:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.pop(owner, None)
+                if not subscribers:
+                    del self._subscribers[key]
+
+    def is_subscribed(self, owner, name=None):
+        if name is not None:
+            return owner in self._subscribers.get(name, {})
+        return any(owner in subscribers for subscribers in self._subscribers.values())
+
+    # ----- timer -----
+
+    def _tick(self):
+        now = time.monotonic()
+        for name in list(self._subscribers):
+            mono_deadline = self._deadlines.get(name)
+            if mono_deadline is None:
+                continue
+            value = max(0, int(mono_deadline - now))
+            changed = False
+            for owner, entry in list(self._subscribers.get(name, {}).items()):
+                if entry[1] == value:
+                    continue
+                # Callback trước có thể đã unsubscribe owner này
+                if self._subscribers.get(name, {}).get(owner) is not entry:
+                    continue
+                entry[1] = value
+                changed = True
+                try:
+                    entry[0](value)
+                except Exception as e:
+                    print(f"[WARNING] DeadlineClock callback for '{name}' failed: {e}")
+            if changed:
+                self.second_changed.emit(name, value)
+        self._schedule()
+
+    def _schedule(self):
+        """Hẹn lần tick kế tiếp: mốc giây gần nhất của các deadline còn subscriber chờ"""
+        now = time.monotonic()
+        wait = None
+        for name, subscribers in self._subscribers.items():
+            mono_deadline = self._deadlines.get(name)
+            if mono_deadline is None or not subscribers:
+                continue
+            left = mono_deadline - now
+            value = max(0, int(left))
+            if any(entry[1] != value for entry in subscribers.values()):
+                wait = 0.0
+                break
+            if left > 0:
+                # int(left) đổi khi left đi qua số nguyên kế dưới
+                step = left - math.floor(left) or 1.0
+                wait = step if wait is None else min(wait, step)
+        if wait is None:
+            self._timer.stop()
+            return
+        self._timer.start(int(math.ceil(wait * 1000)) + (self.SLACK_MS if wait > 0 else 0))
+
+
+_default_clock = None
+
+
+def get_deadline_clock(window_manager=None):
+    """DeadlineClock dùng chung (shared_data["deadline_clock"]); tạo nếu chưa có"""
+    global _default_clock
+    if window_manager is not None:
+        clock = window_manager.get_shared_data("deadline_clock")
+        if clock is None:
+            clock = DeadlineClock()
+            window_manager.set_shared_data("deadline_clock", clock)
+        return clock
+    if _default_clock is None:
+        _default_clock = DeadlineClock()
+    return _default_clock
@@ -1,15 +1,79 @@
 """
 Util cho hình ảnh trong ứng dụng Werewolf Client
+
+Pixmap được decode + scale một lần rồi giữ trong QPixmapCache (dùng chung cả process) theo
+khóa (file, size, device pixel ratio); các label/cửa sổ tạo lại sau đó chỉ lấy pixmap đã scale.
+Danh sách file trong assets/images được đọc một lần thay vì gọi Path.exists() mỗi lần.
 """
 
+import os
+
 from PyQt5 import QtGui, QtWidgets, QtCore
 from pathlib import Path
 
 
+IMAGES_DIR = Path(__file__).parent.parent.parent / "assets" / "images"
+
+# Các biến thể đã scale dùng trên màn hình, warm lúc khởi động (warm_image_cache)
+PREWARM_IMAGES = (
+    ("werewolf_logo.png", 120),    # welcome
+    ("werewolf_logo.png", 100),    # login / register
+    ("is_werewolf.png", 180),      # seer result
+    ("is_not_werewolf.png", 180),
+)
+
+_image_files = None  # frozenset tên file trong IMAGES_DIR, đọc lần đầu cần
+_icon_cache = {}     # icon_name -> QIcon (None nếu không có file)
+
+
 def get_image_path(filename):
     """Lấy ảnh từ thư mục assets/images"""
-    images_dir = Path(__file__).parent.parent.parent / "assets" / "images"
-    return images_dir / filename
+    return IMAGES_DIR / filename
+
+
+def has_image(filename):
+    """True nếu assets/images có file này (list thư mục một lần cho cả process)"""
+    global _image_files
+    if _image_files is None:
+        try:
+            _image_files = frozenset(os.listdir(IMAGES_DIR))
+        except OSError:
+            _image_files = frozenset()
+    return filename in _image_files
+
+
+def _device_pixel_ratio():
+    app = QtGui.QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+def load_pixmap(filename, size):
+    """
+    Pixmap từ assets/images scale vừa khung size x size (KeepAspectRatio, smooth),
+    nét theo device pixel ratio của màn hình. Trả về QPixmap null nếu không có ảnh.
+    """
+    if not has_image(filename):
+        return QtGui.QPixmap()
+    dpr = _device_pixel_ratio()
+    key = f"werewolf:{filename}:{size}:{dpr}"
+    pixmap = QtGui.QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+
+    # Ảnh gốc không giữ lại: chỉ biến thể đã scale được cache (nhỏ hơn nhiều)
+    source = QtGui.QPixmap(str(get_image_path(filename)))
+    if source.isNull():
+        return source
+    pixel_size = round(size * dpr)
+    pixmap = source.scaled(pixel_size, pixel_size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    pixmap.setDevicePixelRatio(dpr)
+    QtGui.QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def warm_image_cache(variants=PREWARM_IMAGES):
+    """Decode + scale trước các ảnh dùng trên màn hình; trả về số biến thể đã có trong cache"""
+    return sum(1 for filename, size in variants if not load_pixmap(filename, size).isNull())
 
 
 def create_logo_label(size=150):
@@ -17,21 +81,13 @@ def create_logo_label(size=150):
     Tạo label logo từ file hình ảnh
     Trả về None nếu không tìm thấy hình ảnh
     """
-    image_path = get_image_path("werewolf_logo.png")
-    
-    if image_path.exists():
-        pixmap = QtGui.QPixmap(str(image_path))
-        if not pixmap.isNull():
-            logo_label = QtWidgets.QLabel()
-            logo_label.setAlignment(QtCore.Qt.AlignCenter)
-            scaled_pixmap = pixmap.scaled(
-                size, size,
-                QtCore.Qt.KeepAspectRatio,
-                QtCore.Qt.SmoothTransformation
-            )
-            logo_label.setPixmap(scaled_pixmap)
-            return logo_label
-    return None
+    pixmap = load_pixmap("werewolf_logo.png", size)
+    if pixmap.isNull():
+        return None
+    logo_label = QtWidgets.QLabel()
+    logo_label.setAlignment(QtCore.Qt.AlignCenter)
+    logo_label.setPixmap(pixmap)
+    return logo_label
 
 
 
@@ -53,24 +109,28 @@ def create_image_icon_label(image_filename, size=48):
     """
     Tạo label icon từ ảnh (png, jpg...)
     """
-    image_path = get_image_path(image_filename)
     icon_label = QtWidgets.QLabel()
     icon_label.setAlignment(QtCore.Qt.AlignCenter)
-    if image_path.exists():
-        pixmap = QtGui.QPixmap(str(image_path))
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            icon_label.setPixmap(scaled_pixmap)
+    pixmap = load_pixmap(image_filename, size)
+    if not pixmap.isNull():
+        icon_label.setPixmap(pixmap)
     return icon_label
 
+def get_icon(icon_name):
+    """QIcon từ assets/images (cache theo tên), None nếu không có file"""
+    if icon_name not in _icon_cache:
+        icon = None
+        if has_image(icon_name):
+            icon = QtGui.QIcon(str(get_image_path(icon_name)))
+            if icon.isNull():
+                icon = None
+        _icon_cache[icon_name] = icon
+    return _icon_cache[icon_name]
+
 def set_window_icon(window, icon_name="werewolf_icon.png"):
     """Set window icon"""
-    icon_path = get_image_path(icon_name)
-    
-    if icon_path.exists():
-        icon = QtGui.QIcon(str(icon_path))
-        if not icon.isNull():
-            window.setWindowIcon(icon)
-            return True
-    
-    return False
+    icon = get_icon(icon_name)
+    if icon is None:
+        return False
+    window.setWindowIcon(icon)
+    return True
@@ -0,0 +1,168 @@
+"""Network IO Thread - đọc/ghi socket và decode JSON ngoài GUI thread"""
+
+import collections
+import select
+import socket
+import threading
+
+from PyQt5 import QtCore
+
+
+class NetworkIOThread(QtCore.QObject):
+    """Worker thread sở hữu handle `WerewolfClient*` trong lúc chạy.
+
+    - Thread đọc socket (`receive_packet`, gồm cả `json.loads`) và đẩy `(header, payload)`
+      đã parse vào `inbox` (deque: append/popleft atomic, không cần lock).
+    - GUI gửi bằng `enqueue_send()` (qua `WerewolfNetworkClient.send_packet`): chỉ append vào
+      `outbox` rồi đánh thức thread, trả về ngay. `json.dumps` và `ww_client_send` chạy trên
+      thread này; phần C chưa gửi được (EAGAIN) được flush khi select báo writable.
+    - `packets_ready` được emit từ worker thread -> Qt tự chuyển thành queued connection sang
+      GUI thread. Chỉ emit khi inbox từ rỗng sang có dữ liệu để tránh ngập event queue.
+
+    Interface `receive_packet()` giống `WerewolfNetworkClient` nên `PacketPump` dùng được
+    nguyên vẹn. Lỗi từ worker (ConnectionError/RuntimeError) được xếp vào inbox theo đúng
+    thứ tự và ném lại khi GUI lấy tới.
+    """
+
+    packets_ready = QtCore.pyqtSignal()
+
+    # Số packet tối đa chờ GUI xử lý; đầy thì worker ngừng đọc (TCP tự backpressure)
+    DEFAULT_MAX_INBOX = 4096
+    # Timeout select khi thư viện C không có ww_client_get_fd (polling fallback)
+    POLL_INTERVAL_S = 0.02
+
+    def __init__(self, network_client, max_inbox=DEFAULT_MAX_INBOX, parent=None):
+        super().__init__(parent)
+        self.network_client = network_client
+        self.max_inbox = max_inbox
+        self.inbox = collections.deque()
+        self.outbox = collections.deque()
+        self._thread = None
+        self._running = False
+        self._notify_pending = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+    def start(self):
+        """Chạy worker (no-op nếu đang chạy). Gọi lại sau reconnect để gắn socket mới."""
+        if self.is_running():
+            return
+        self.inbox.clear()
+        self._notify_pending = False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="werewolf-io", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Dừng worker và chờ thread thoát. Packet chưa gửi trong outbox bị bỏ."""
+        self._running = False
+        self._wake()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+        self.outbox.clear()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_worker_thread(self):
+        return self._thread is not None and self._thread is threading.current_thread()
+
+    def enqueue_send(self, header, payload_dict):
+        """Xếp packet vào hàng đợi gửi, trả về ngay (GUI thread)."""
+        if not self.is_running():
+            raise RuntimeError("Send failed: IO thread not running")
+        self.outbox.append((header, payload_dict))
+        self._wake()
+
+    def receive_packet(self):
+        """Lấy packet đã parse kế tiếp (GUI thread). (None, None) nếu inbox rỗng."""
+        # Reset trước khi pop: packet đến sau thời điểm này sẽ emit packets_ready lần nữa
+        self._notify_pending = False
+        try:
+            header, payload = self.inbox.popleft()
+        except IndexError:
+            return None, None
+        if header is None:
+            raise payload
+        return header, payload
+
+    @property
+    def client(self):
+        """Cho PacketDispatcher kiểm tra `client` giống WerewolfNetworkClient."""
+        return getattr(self.network_client, "client", None)
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Buffer đầy = đã có wake-up đang chờ
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _publish(self, header, payload):
+        self.inbox.append((header, payload))
+        if not self._notify_pending:
+            self._notify_pending = True
+            self.packets_ready.emit()
+
+    def _fail(self, error):
+        """Xếp lỗi vào inbox (giữ thứ tự với packet trước đó) và dừng worker."""
+        self._running = False
+        self._publish(None, error)
+
+    def _run(self):
+        client = self.network_client
+        while self._running:
+            # 1. Gửi toàn bộ outbox
+            while self._running and self.outbox:
+                header, payload_dict = self.outbox.popleft()
+                try:
+                    client.send_packet_now(header, payload_dict)
+                except Exception as e:
+                    self._fail(e if isinstance(e, (ConnectionError, RuntimeError)) else RuntimeError(str(e)))
+                    return
+
+            # 2. Đọc mọi frame hoàn chỉnh (trừ khi GUI chưa kịp xử lý)
+            while self._running and len(self.inbox) < self.max_inbox:
+                try:
+                    header, payload = client.receive_packet()
+                except Exception as e:
+                    self._fail(e)
+                    return
+                if header is None:
+                    break
+                self._publish(header, payload)
+
+            if not self._running:
+                break
+
+            # 3. Chờ socket readable, writable (nếu hàng đợi gửi của C còn dữ liệu) hoặc GUI enqueue send
+            fd = client.fileno()
+            read_fds = [self._wake_r]
+            if fd >= 0 and len(self.inbox) < self.max_inbox:
+                read_fds.append(fd)
+            write_fds = [fd] if fd >= 0 and client.send_queue_depth() > 0 else []
+            timeout = None if fd >= 0 else self.POLL_INTERVAL_S
+            if len(self.inbox) >= self.max_inbox:
+                timeout = self.POLL_INTERVAL_S
+            try:
+                readable, writable, _ = select.select(read_fds, write_fds, [], timeout)
+            except (OSError, ValueError):
+                # fd bị đóng từ thread khác (disconnect) -> vòng sau receive_packet báo lỗi
+                readable, writable = [self._wake_r], []
+            if self._wake_r in readable:
+                self._drain_wake()
+            if writable or (fd < 0 and client.send_queue_depth() > 0):
+                try:
+                    client.flush_send_queue()
+                except Exception as e:
+                    self._fail(e if isinstance(e, RuntimeError) else RuntimeError(str(e)))
+                    return
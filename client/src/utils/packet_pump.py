@@ -0,0 +1,62 @@
+"""Packet Pump - drain tất cả frame đã sẵn sàng trong mỗi lần wake-up"""
+
+import time
+
+
+class PacketPump:
+    """Drain mọi frame hoàn chỉnh đang nằm trong receive buffer, có giới hạn thời gian.
+
+    `WerewolfNetworkClient.receive_packet()` chỉ trả về một frame mỗi lần gọi. Nếu chỉ
+    gọi một lần mỗi tick 100ms thì một burst (PHASE_NIGHT + 20x CHAT_BROADCAST + PING)
+    mất hơn 2 giây mới xử lý xong. Pump gọi lặp lại cho đến khi hết frame, nhưng dừng lại
+    khi vượt quá `budget_ms` để UI không bị đứng; khi đó `backlogged` = True và caller
+    nên lên lịch drain tiếp ngay (ví dụ `QTimer.singleShot(0, ...)`).
+    """
+
+    DEFAULT_BUDGET_MS = 8
+
+    def __init__(self, handler, budget_ms=DEFAULT_BUDGET_MS, is_active=None, clock=time.perf_counter):
+        """
+        handler:   callable(header, payload) xử lý từng packet
+        budget_ms: thời gian tối đa cho một lần drain
+        is_active: callable() -> bool; dừng drain ngay khi trả về False (ví dụ handler vừa
+                   stop recv_timer và chuyển sang window khác - các frame còn lại thuộc về
+                   consumer tiếp theo)
+        clock:     nguồn thời gian (giây), thay được trong benchmark
+        """
+        self.handler = handler
+        self.budget_ms = budget_ms
+        self.is_active = is_active
+        self.clock = clock
+        self.backlogged = False
+        self.total_packets = 0
+        self.total_drains = 0
+
+    def drain(self, network_client):
+        """Xử lý tất cả packet đang có. Trả về số packet đã xử lý.
+
+        Exception từ receive_packet() (ConnectionError/RuntimeError) được ném lại cho
+        caller, giống như khi gọi receive_packet() trực tiếp.
+        """
+        self.backlogged = False
+        if not network_client:
+            return 0
+
+        self.total_drains += 1
+        deadline = self.clock() + self.budget_ms / 1000.0
+        handled = 0
+        while True:
+            header, payload = network_client.receive_packet()
+            if header is None:
+                break
+
+            handled += 1
+            self.total_packets += 1
+            self.handler(header, payload)
+
+            if self.is_active is not None and not self.is_active():
+                break
+            if self.clock() >= deadline:
+                self.backlogged = True
+                break
+        return handled
@@ -0,0 +1,134 @@
+"""Packet Replay - phát lại file capture (packet_capture.py) vào PacketDispatcher"""
+
+import collections
+import time
+
+from PyQt5 import QtCore
+
+import payload_codec
+from async_network_client import AsyncWerewolfNetworkClient
+from packet_capture import DIRECTION_IN, DIRECTION_OUT
+
+
+class ReplayNetworkClient(AsyncWerewolfNetworkClient):
+    """Network client giả cho replay: không có socket.
+
+    Packet IN được PacketReplayer đẩy vào inbox (cùng đường set_packet_listener với
+    AsyncWerewolfNetworkClient, nên PacketDispatcher/PacketPump chạy như khi có server).
+    Mọi packet window gửi đi được giữ trong `sent` để so với packet OUT trong capture.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.client = "replay"
+        self.sent = []  # [(header, payload_dict)]
+
+    async def connect(self, host, port, timeout=10.0):
+        self.client = "replay"
+        return True
+
+    def send_packet(self, header, payload_dict):
+        self.sent.append((header, payload_dict))
+        return 0
+
+    def disconnect(self):
+        pass
+
+    def destroy(self):
+        self.client = None
+        self._inbox.clear()
+
+    def deliver(self, header, payload):
+        self._deliver(((header, payload),))
+
+
+class PacketReplayer(QtCore.QObject):
+    """Phát lại các packet IN của một capture theo đúng nhịp gốc hoặc nhanh nhất có thể.
+
+    - speed > 0:  giữ khoảng cách thời gian gốc giữa các packet, chia cho `speed`
+                  (2.0 = nhanh gấp đôi); `max_gap` (giây) cắt các khoảng im lặng dài
+    - speed = 0:  mỗi lượt event loop một packet, không chờ - vẫn để window vẽ / chạy timer
+                  giữa các packet như khi nhận từ socket; dùng làm benchmark throughput
+
+    Payload được parse lại (payload_codec.decode_payload, JSON hoặc compact) lúc phát nên chi
+    phí decode cũng tính vào thời gian xử lý. `handler_ms[header]` là thời gian dispatch đồng
+    bộ (handler + cập nhật window ngay trong handler) của từng packet.
+    """
+
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, network_client, records, speed=1.0, max_gap=None, parent=None):
+        """
+        network_client: ReplayNetworkClient đã gắn với PacketDispatcher
+        records:        iterable CaptureRecord (read_capture); packet OUT chỉ dùng để so sánh
+        """
+        super().__init__(parent)
+        self.network_client = network_client
+        self.speed = speed
+        self.max_gap = max_gap
+        records = list(records)
+        self.inbound = [r for r in records if r.direction == DIRECTION_IN]
+        self.outbound = [r for r in records if r.direction == DIRECTION_OUT]
+        self.offsets = self._schedule(self.inbound)
+        self.position = 0
+        self.handler_ms = collections.defaultdict(list)
+        self.started_at = None
+        self.elapsed = 0.0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+    def _schedule(self, records):
+        """Thời điểm (giây, tính từ packet đầu) của từng packet sau khi cắt khoảng lặng"""
+        offsets = []
+        offset = 0.0
+        previous = None
+        for record in records:
+            if previous is not None:
+                gap = (record.t_ns - previous) / 1e9
+                if self.max_gap is not None:
+                    gap = min(gap, self.max_gap)
+                offset += gap
+            offsets.append(offset)
+            previous = record.t_ns
+        return offsets
+
+    def start(self):
+        self.position = 0
+        self.handler_ms.clear()
+        self.started_at = time.perf_counter()
+        self._timer.start(0)
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def _step(self):
+        inbound = self.inbound
+        if self.position < len(inbound):
+            record = inbound[self.position]
+            self.position += 1
+            t0 = time.perf_counter()
+            self.network_client.deliver(record.header, payload_codec.decode_payload(record.payload))
+            self.handler_ms[record.header].append((time.perf_counter() - t0) * 1000)
+
+        if self.position >= len(inbound):
+            self.elapsed = time.perf_counter() - self.started_at
+            self.finished.emit()
+            return
+        if self.speed > 0:
+            due = self.offsets[self.position] / self.speed
+            delay_ms = (due - (time.perf_counter() - self.started_at)) * 1000
+            self._timer.start(max(0, int(delay_ms)))
+        else:
+            self._timer.start(0)
+
+    def outbound_diff(self):
+        """{header: (số packet trong capture, số packet gửi khi replay)} cho header lệch nhau"""
+        expected = collections.Counter(r.header for r in self.outbound)
+        actual = collections.Counter(header for header, _ in self.network_client.sent)
+        return {header: (expected[header], actual[header])
+                for header in sorted(expected.keys() | actual.keys())
+                if expected[header] != actual[header]}
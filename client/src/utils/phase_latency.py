@@ -0,0 +1,91 @@
+"""Phase latency probe - đo độ trễ từ lúc nhận packet PHASE_* tới khi màn hình phase được vẽ"""
+
+import time
+
+from PyQt5 import QtCore
+
+
+class PhaseLatencyProbe(QtCore.QObject):
+    """Đo PHASE_* packet -> màn hình hiển thị.
+
+    Handler gọi `mark(phase)` ngay khi nhận packet. Cửa sổ đầu tiên mà WindowManager
+    điều hướng tới trong cùng lượt xử lý được theo dõi tới Paint event đầu tiên của nó;
+    khoảng thời gian đó là một mẫu (ms), được log `[PERF]` và lưu trong `samples`.
+    """
+
+    # phase, window_name, latency_ms
+    latency_measured = QtCore.pyqtSignal(str, str, float)
+
+    # Bỏ theo dõi nếu cửa sổ không được vẽ trong khoảng này (vd. đã hiển thị sẵn)
+    PAINT_TIMEOUT_MS = 2000
+
+    def __init__(self, window_manager, log=True):
+        super().__init__()
+        self.window_manager = window_manager
+        self.log = log
+        self.samples = {}
+        self._mark = None    # (phase, t0)
+        self._watch = None   # (phase, t0, window_name, window)
+        window_manager.window_changed.connect(self._on_window_changed)
+
+    def mark(self, phase):
+        mark = (phase, time.perf_counter())
+        self._mark = mark
+        # Handler không điều hướng (vd. packet trùng) -> bỏ mark ở lượt event loop kế tiếp
+        QtCore.QTimer.singleShot(0, lambda: self._expire_mark(mark))
+
+    def _expire_mark(self, mark):
+        if self._mark is mark:
+            self._mark = None
+
+    def _on_window_changed(self, window_name):
+        if self._mark is None:
+            return
+        phase, t0 = self._mark
+        self._mark = None
+        window = self.window_manager.windows.get(window_name)
+        if window is None:
+            return
+        self._stop_watch()
+        watch = (phase, t0, window_name, window)
+        self._watch = watch
+        window.installEventFilter(self)
+        QtCore.QTimer.singleShot(self.PAINT_TIMEOUT_MS, lambda: self._expire_watch(watch))
+
+    def _expire_watch(self, watch):
+        if self._watch is watch:
+            self._stop_watch()
+
+    def _stop_watch(self):
+        if self._watch is not None:
+            self._watch[3].removeEventFilter(self)
+            self._watch = None
+
+    def eventFilter(self, obj, event):
+        watch = self._watch
+        if watch is not None and obj is watch[3] and event.type() == QtCore.QEvent.Paint:
+            phase, t0, window_name, _ = watch
+            self._stop_watch()
+            self._record(phase, window_name, (time.perf_counter() - t0) * 1000)
+        return False
+
+    def _record(self, phase, window_name, latency_ms):
+        self.samples.setdefault(phase, []).append(latency_ms)
+        if self.log:
+            print(f"[PERF] {phase} -> {window_name} visible in {latency_ms:.1f} ms")
+        self.latency_measured.emit(phase, window_name, latency_ms)
+
+    def stats(self):
+        """{phase: {count, median_ms, max_ms}} từ các mẫu đã đo"""
+        result = {}
+        for phase, values in self.samples.items():
+            ordered = sorted(values)
+            result[phase] = {
+                "count": len(ordered),
+                "median_ms": ordered[len(ordered) // 2],
+                "max_ms": ordered[-1],
+            }
+        return result
+
+    def reset_stats(self):
+        self.samples = {}
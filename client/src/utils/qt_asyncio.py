@@ -0,0 +1,135 @@
+"""Qt <-> asyncio - chạy AsyncWerewolfNetworkClient trong app PyQt (không cần qasync)"""
+
+import asyncio
+import threading
+
+from PyQt5 import QtCore
+
+from async_network_client import AsyncWerewolfNetworkClient
+
+
+class AsyncioLoopThread:
+    """asyncio event loop chạy trên thread daemon riêng.
+
+    Loop tự chờ socket bằng selector của nó (epoll/kqueue/select) nên không có timer poll
+    nào trên GUI thread; GUI gọi vào loop qua `call()` / `run()` (thread-safe).
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+
+    def start(self):
+        """Chạy loop (no-op nếu đang chạy)"""
+        if self.is_running():
+            return
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self.loop, started),
+                                        name="werewolf-asyncio", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def _run(self, loop, started):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def stop(self, timeout=1.0):
+        """Dừng loop sau các callback đã xếp hàng (vd. đóng transport) và chờ thread thoát"""
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self):
+        return self._thread is not None and self._thread is threading.current_thread()
+
+    def call(self, callback, *args):
+        """Chạy callback trên loop thread (không chờ)"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def run(self, coro, timeout=None):
+        """Chạy coroutine trên loop thread và chờ kết quả (chặn thread gọi)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+class _PacketRelay(QtCore.QObject):
+    """Signal emit từ loop thread -> Qt tự chuyển thành queued connection sang GUI thread"""
+
+    packets_ready = QtCore.pyqtSignal()
+
+
+class QtAsyncNetworkClient(AsyncWerewolfNetworkClient):
+    """AsyncWerewolfNetworkClient dùng được như WerewolfNetworkClient trong GUI (WEREWOLF_ASYNCIO=1).
+
+    - `create()` chạy AsyncioLoopThread; `connect(host, port)` đồng bộ như bản C
+      (WelcomeWindow / ConnectionMonitor gọi trực tiếp).
+    - Frame được tách trên loop thread; listener (PacketDispatcher.pump) luôn được gọi trên
+      GUI thread qua `packets_ready`, chỉ emit khi chưa có lượt pump nào đang chờ.
+    - `send_packet` mã hóa trên thread gọi rồi chuyển `transport.write` sang loop thread.
+    """
+
+    def __init__(self, loop_thread=None):
+        super().__init__()
+        self.loop_thread = loop_thread or AsyncioLoopThread()
+        self._relay = _PacketRelay()
+        self._relay.packets_ready.connect(self._fire_listener)
+        self._notify_pending = False
+
+    def create(self):
+        self.loop_thread.start()
+        self.loop = self.loop_thread.loop
+        return self
+
+    def connect(self, host, port, timeout=10.0):
+        """Kết nối đến server (chặn tới khi xong, như WerewolfNetworkClient.connect)"""
+        if not self.loop_thread.is_running():
+            self.create()
+        return self.loop_thread.run(super().connect(host, port, timeout), timeout + 1.0)
+
+    def disconnect(self):
+        """Ngắt kết nối từ server"""
+        transport = self._transport
+        if transport is not None and self.loop_thread.is_running():
+            self.loop_thread.call(transport.close)
+
+    def destroy(self):
+        """Hủy instance client và dừng loop thread"""
+        super().destroy()
+        self.loop_thread.stop()
+
+    def _write(self, frame):
+        if self.loop_thread.in_loop_thread():
+            self._transport.write(frame)
+        else:
+            self.loop_thread.call(self._write_if_open, self._transport, frame)
+
+    @staticmethod
+    def _write_if_open(transport, frame):
+        if not transport.is_closing():
+            transport.write(frame)
+
+    def _notify(self):
+        # Loop thread: bot/script chờ recv_packet vẫn dùng waiter như bản gốc
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        if self._packet_listener is not None and not self._notify_pending:
+            self._notify_pending = True
+            self._relay.packets_ready.emit()
+
+    def _fire_listener(self):
+        # Xóa cờ trước khi drain: packet tới trong lúc pump sẽ emit lượt mới
+        self._notify_pending = False
+        if self._packet_listener is not None:
+            self._packet_listener()
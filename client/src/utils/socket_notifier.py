@@ -0,0 +1,146 @@
+"""Socket Read Trigger - đánh thức receive loop khi socket có dữ liệu (QSocketNotifier)"""
+
+from PyQt5 import QtCore
+
+
+class SocketReadTrigger(QtCore.QObject):
+    """Thay thế cho `QTimer.start(100)` trong các receive loop.
+
+    Giữ nguyên interface của QTimer (`timeout`, `start`, `stop`, `isActive`) để các window
+    chỉ cần đổi chỗ khởi tạo. Khi network client cung cấp được file descriptor, `timeout`
+    được emit ngay khi socket readable thông qua QSocketNotifier - không có độ trễ polling
+    và không đánh thức CPU khi idle. Nếu thư viện C không export `ww_client_get_fd`
+    (bản build cũ) thì fallback về polling bằng QTimer như trước.
+    """
+
+    timeout = QtCore.pyqtSignal()
+
+    DEFAULT_POLL_INTERVAL_MS = 100
+
+    def __init__(self, client_getter, parent=None):
+        """client_getter: callable() -> WerewolfNetworkClient (window có thể đổi client khi reconnect)"""
+        super().__init__(parent)
+        self._client_getter = client_getter
+        self._active = False
+        self._notifier = None
+        self._notifier_fd = -1
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.timeout.connect(self._fire)
+
+    def start(self, interval=DEFAULT_POLL_INTERVAL_MS):
+        """Bắt đầu theo dõi socket. `interval` chỉ dùng cho polling fallback."""
+        self._active = True
+
+        fd = self._current_fd()
+        if fd >= 0:
+            if self._notifier is None or self._notifier_fd != fd:
+                self._release_notifier()
+                self._notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, self)
+                self._notifier.activated.connect(self._fire)
+                self._notifier_fd = fd
+            self._notifier.setEnabled(True)
+            self._poll_timer.stop()
+        else:
+            self._release_notifier()
+            self._poll_timer.start(interval)
+
+        # Consumer trước có thể để lại frame hoàn chỉnh trong receive buffer của C;
+        # socket sẽ không readable nữa nên phải drain một lần ngay khi start.
+        QtCore.QTimer.singleShot(0, self._fire)
+
+    def stop(self):
+        self._active = False
+        self._poll_timer.stop()
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+
+    def isActive(self):
+        return self._active
+
+    def _current_fd(self):
+        client = self._client_getter() if self._client_getter else None
+        if client is None or not hasattr(client, "fileno"):
+            return -1
+        try:
+            return int(client.fileno())
+        except Exception:
+            return -1
+
+    def _release_notifier(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+            self._notifier_fd = -1
+
+    def _fire(self, *_args):
+        if self._active:
+            self.timeout.emit()
+
+
+class SocketWriteFlusher(QtCore.QObject):
+    """Flush hàng đợi gửi của C client khi socket writable (thay cho spin trên EAGAIN).
+
+    `arm()` được gọi khi send còn dữ liệu chờ; QSocketNotifier(Write) chỉ bật trong lúc
+    hàng đợi khác rỗng rồi tự tắt, để không bị đánh thức liên tục khi socket luôn writable.
+    Không có fd thì fallback về QTimer polling.
+    """
+
+    # Lỗi khi flush (RuntimeError từ flush_send_queue)
+    flush_failed = QtCore.pyqtSignal(str)
+
+    DEFAULT_POLL_INTERVAL_MS = 10
+
+    def __init__(self, client_getter, parent=None):
+        super().__init__(parent)
+        self._client_getter = client_getter
+        self._notifier = None
+        self._notifier_fd = -1
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.timeout.connect(self._flush)
+
+    def arm(self):
+        """Bắt đầu chờ writable (gọi sau send khi hàng đợi còn dữ liệu)."""
+        client = self._client_getter() if self._client_getter else None
+        fd = -1
+        if client is not None and hasattr(client, "fileno"):
+            try:
+                fd = int(client.fileno())
+            except Exception:
+                fd = -1
+
+        if fd >= 0:
+            if self._notifier is None or self._notifier_fd != fd:
+                self._release_notifier()
+                self._notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Write, self)
+                self._notifier.activated.connect(self._flush)
+                self._notifier_fd = fd
+            self._notifier.setEnabled(True)
+        elif not self._poll_timer.isActive():
+            self._poll_timer.start(self.DEFAULT_POLL_INTERVAL_MS)
+
+    def disarm(self):
+        self._poll_timer.stop()
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+
+    def _release_notifier(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+            self._notifier_fd = -1
+
+    def _flush(self, *_args):
+        client = self._client_getter() if self._client_getter else None
+        if client is None or not getattr(client, "client", None):
+            self.disarm()
+            return
+        try:
+            if client.flush_send_queue():
+                self.disarm()
+        except RuntimeError as e:
+            self.disarm()
+            self.flush_failed.emit(str(e))
@@ -0,0 +1,41 @@
+"""Style utils - đổi giao diện widget qua dynamic property thay vì setStyleSheet
+
+Toàn bộ style nằm trong assets/werewolf_theme.qss (parse một lần khi app khởi động).
+Widget chọn rule bằng objectName (`#seer_select_window #timer_label`) và dynamic property
+(`QLabel#room_status_label[status="playing"]`). Đổi trạng thái = đổi property + re-polish
+đúng widget đó; không parse lại CSS như khi gán stylesheet mới.
+"""
+
+from PyQt5 import QtCore, QtWidgets
+
+
+def repolish(widget):
+    """Áp lại rule QSS cho widget (sau khi đổi property mà selector dùng tới)"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    # polish() không tự cập nhật padding/sizeHint; StyleChange cho widget tính lại
+    # contents margins và layout như khi gán stylesheet
+    QtWidgets.QApplication.sendEvent(widget, QtCore.QEvent(QtCore.QEvent.StyleChange))
+    widget.update()
+
+
+def set_style_property(widget, name, value):
+    """Đặt dynamic property `name` và re-polish nếu giá trị đổi. Trả về True nếu đã đổi."""
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    repolish(widget)
+    return True
+
+
+def set_style_properties(widget, **properties):
+    """Như set_style_property cho nhiều property, chỉ re-polish một lần"""
+    changed = False
+    for name, value in properties.items():
+        if widget.property(name) != value:
+            widget.setProperty(name, value)
+            changed = True
+    if changed:
+        repolish(widget)
+    return changed
@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
+from components.chat_log import ChatLogView, DAY_CHAT_STYLE
 from utils.image_utils import set_window_icon
+import protocol
 
 class DayChatWindow(QtWidgets.QWidget):
     """Day phase chat window - tất cả người chơi có thể chat"""
@@ -17,7 +19,14 @@ class DayChatWindow(QtWidgets.QWidget):
         self.setWindowTitle("Werewolf - Day Phase")
         self.setup_ui()
         # IMPORTANT: Do NOT read from network socket here.
-        # RoomWindow is the single consumer of packets and will dispatch CHAT_BROADCAST to this window.
+        # PacketDispatcher is the single consumer of packets and routes CHAT_BROADCAST to this window.
+        dispatcher = self.window_manager.get_shared_data("packet_dispatcher") if self.window_manager else None
+        if dispatcher:
+            dispatcher.subscribe(self, {protocol.CHAT_BROADCAST: self.handle_chat_broadcast})
+        # Người chơi chết (đêm / bị treo cổ) -> khóa ô chat ngay, không cần room window gọi vào
+        self.room_state = self.window_manager.get_shared_data("room_state") if self.window_manager else None
+        if self.room_state is not None:
+            self.room_state.alive_changed.connect(self._on_alive_changed)
         
     def showEvent(self, event):
         """Called when window is shown"""
@@ -39,18 +48,13 @@ class DayChatWindow(QtWidgets.QWidget):
 
         # Initialize countdown label from shared deadline if available
         try:
-            import time
-            deadline = self.window_manager.get_shared_data("day_vote_deadline") if self.window_manager else None
-            if deadline:
-                remaining = max(0, int(float(deadline) - time.time()))
-            else:
-                remaining = int(self.window_manager.get_shared_data("day_remaining_time", 0) or 0) if self.window_manager else 0
+            remaining = self.room_state.day_remaining() if self.room_state is not None else 0
             if hasattr(self, "timer_label"):
                 self.timer_label.setText(f"⏱️ {remaining}s")
         except Exception:
             pass
 
-        # Packets are received by RoomWindow; this window only renders chat UI.
+        # Packets are received by PacketDispatcher; this window only renders chat UI.
 
         # Add a welcome message to show chat is working
         QtCore.QTimer.singleShot(100, lambda: self.append_message("System", "Day phase started. Discuss who might be a werewolf!"))
@@ -64,20 +68,16 @@ class DayChatWindow(QtWidgets.QWidget):
         QtCore.QTimer.singleShot(200, set_input_focus)
 
     def _is_me_alive(self) -> bool:
-        """Best-effort alive status based on shared room_players."""
-        if not self.window_manager or not self.my_username:
-            return True
-        players = self.window_manager.get_shared_data("room_players", [])
-        if not isinstance(players, list):
+        """Best-effort alive status based on shared RoomState."""
+        if self.room_state is None or not self.my_username:
             return True
-        for p in players:
-            if isinstance(p, dict) and p.get("username") == self.my_username:
-                raw = p.get("is_alive", 1)
-                try:
-                    return int(raw) != 0
-                except Exception:
-                    return bool(raw)
-        return True
+        return self.room_state.is_alive(self.my_username)
+
+    def _on_alive_changed(self, usernames):
+        my_username = self.my_username or (self.window_manager.get_shared_data("username") if self.window_manager else None)
+        if my_username in usernames:
+            self.my_username = my_username
+            self.refresh_chat_permissions()
 
     def refresh_chat_permissions(self):
         alive = self._is_me_alive()
@@ -98,7 +98,7 @@ class DayChatWindow(QtWidgets.QWidget):
         # No socket receive loop here.
 
     def handle_chat_broadcast(self, payload: dict):
-        """Called by RoomWindow when receiving CHAT_BROADCAST (402)."""
+        """Called by PacketDispatcher when receiving CHAT_BROADCAST (402)."""
         if not isinstance(payload, dict):
             return
         chat_type = payload.get("chat_type", "day")
@@ -139,23 +139,17 @@ class DayChatWindow(QtWidgets.QWidget):
         header_layout.addStretch()
         
         sun_icon = QtWidgets.QLabel("☀️")
-        sun_icon.setStyleSheet("font-size: 40px;")
+        sun_icon.setObjectName("day_sun_icon_label")
         header_layout.addWidget(sun_icon)
         
         # Title
         title_label = QtWidgets.QLabel("DAY PHASE")
         title_label.setObjectName("day_title_label")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            font-size: 28px;
-            color: #f39c12;
-            font-weight: bold;
-            letter-spacing: 2px;
-        """)
         header_layout.addWidget(title_label)
         
         sun_icon2 = QtWidgets.QLabel("☀️")
-        sun_icon2.setStyleSheet("font-size: 40px;")
+        sun_icon2.setObjectName("day_sun_icon_label")
         header_layout.addWidget(sun_icon2)
         
         header_layout.addStretch()
@@ -164,42 +158,18 @@ class DayChatWindow(QtWidgets.QWidget):
         # Subtitle
         subtitle = QtWidgets.QLabel("Discuss and vote to eliminate the werewolves!")
         subtitle.setAlignment(QtCore.Qt.AlignCenter)
-        subtitle.setStyleSheet("font-size: 14px; color: #cccccc; margin-bottom: 10px;")
+        subtitle.setObjectName("day_subtitle_label")
         main_layout.addWidget(subtitle)
 
         # Shared day-phase countdown (updated by RoomWindow)
         self.timer_label = QtWidgets.QLabel("⏱️ --s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-            margin-bottom: 6px;
-        """)
+        self.timer_label.setObjectName("day_timer_label")
         main_layout.addWidget(self.timer_label)
 
         # Vote navigation button
         self.vote_btn = QtWidgets.QPushButton("🗳️ Vote")
-        self.vote_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f39c12;
-                color: black;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 14px;
-                padding: 10px 18px;
-            }
-            QPushButton:hover {
-                background-color: #ffb84d;
-            }
-            QPushButton:pressed {
-                background-color: #d68910;
-            }
-        """)
+        self.vote_btn.setObjectName("day_vote_nav_button")
         self.vote_btn.clicked.connect(self.on_go_to_vote)
 
         vote_row = QtWidgets.QHBoxLayout()
@@ -211,98 +181,32 @@ class DayChatWindow(QtWidgets.QWidget):
         # Chat area
         chat_group = QtWidgets.QGroupBox("Chat")
         chat_group.setObjectName("chat_group")
-        chat_group.setStyleSheet("""
-            QGroupBox#chat_group {
-                border: 2px solid #f39c12;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                color: #f39c12;
-            }
-        """)
         chat_layout = QtWidgets.QVBoxLayout()
         
-        # Messages area
-        self.messages_area = QtWidgets.QScrollArea()
-        self.messages_area.setWidgetResizable(True)
+        # Messages area (model/view: chỉ vẽ các tin nhắn đang hiển thị)
+        self.messages_area = ChatLogView(DAY_CHAT_STYLE)
         self.messages_area.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.messages_area.setMinimumHeight(300)  # Ensure chat area is visible
-        self.messages_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #0f1a2e;
-                border: 1px solid #0f3460;
-                border-radius: 8px;
-            }
-        """)
-        
-        self.messages_container = QtWidgets.QWidget()
-        self.messages_container.setStyleSheet("background: #0f1a2e;")
-        self.messages_layout = QtWidgets.QVBoxLayout(self.messages_container)
-        self.messages_layout.setContentsMargins(12, 12, 12, 12)
-        self.messages_layout.setSpacing(10)
-        self.messages_layout.addStretch()
-        self.messages_area.setWidget(self.messages_container)
+        self.messages_area.setObjectName("day_chat_messages")
         chat_layout.addWidget(self.messages_area, 1)
 
         # Hint for dead users
         self.chat_hint_label = QtWidgets.QLabel("You are dead. Cannot send message!")
         self.chat_hint_label.setAlignment(QtCore.Qt.AlignCenter)
         self.chat_hint_label.setVisible(False)
-        self.chat_hint_label.setStyleSheet("""
-            font-size: 12px;
-            color: #f39c12;
-            background-color: rgba(243, 156, 18, 0.12);
-            padding: 6px;
-            border-radius: 6px;
-            margin-top: 6px;
-        """)
+        self.chat_hint_label.setObjectName("day_chat_hint_label")
         chat_layout.addWidget(self.chat_hint_label)
         
         # Input row
         input_layout = QtWidgets.QHBoxLayout()
         self.input_box = QtWidgets.QLineEdit()
         self.input_box.setPlaceholderText("Type a message...")
-        self.input_box.setStyleSheet("""
-            QLineEdit {
-                background: #0f1a2e;
-                border: 1px solid #0f3460;
-                color: #eaeaea;
-                padding: 10px;
-                border-radius: 8px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #f39c12;
-            }
-        """)
+        self.input_box.setObjectName("day_chat_input")
         self.input_box.returnPressed.connect(self.send_message)
         input_layout.addWidget(self.input_box)
         
         self.send_btn = QtWidgets.QPushButton("Send")
-        self.send_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71;
-                color: black;
-                border: none;
-                border-radius: 5px;
-                font-weight: bold;
-                font-size: 14px;
-                padding: 10px 20px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #3fe07a;
-            }
-            QPushButton:pressed {
-                background-color: #23b45a;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-        """)
+        self.send_btn.setObjectName("day_chat_send_button")
         self.send_btn.setEnabled(False)
         self.send_btn.clicked.connect(self.send_message)
         input_layout.addWidget(self.send_btn)
@@ -351,54 +255,8 @@ class DayChatWindow(QtWidgets.QWidget):
     
     def append_message(self, username, msg):
         """Thêm tin nhắn vào chat"""
-        def _esc(text):
-            return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'))
-        
-        safe_user = _esc(username if username is not None else "")
-        safe_msg = _esc(msg if msg is not None else "")
-        
-        is_self = (username == self.my_username)
-        
-        # Message frame
-        msg_frame = QtWidgets.QFrame()
-        msg_frame.setFrameShape(QtWidgets.QFrame.NoFrame)
-        v = QtWidgets.QVBoxLayout(msg_frame)
-        v.setContentsMargins(6, 2, 6, 2)
-        v.setSpacing(4)
-        
-        user_lbl = QtWidgets.QLabel(safe_user if not is_self else "me")
-        user_lbl.setStyleSheet("font-size:11px; color:rgba(255,255,255,0.75);")
-        v.addWidget(user_lbl, alignment=QtCore.Qt.AlignLeft if not is_self else QtCore.Qt.AlignRight)
-        
-        bubble = QtWidgets.QLabel(safe_msg)
-        bubble.setWordWrap(True)
-        bubble.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
-        bubble.setContentsMargins(10, 8, 10, 8)
-        bubble.setMaximumWidth(500)
-        if is_self:
-            bubble.setStyleSheet("background:#2ecc71; color:#062b1a; padding:8px; border-radius:12px;")
-        else:
-            bubble.setStyleSheet("background:#3498db; color:white; padding:8px; border-radius:12px;")
-        v.addWidget(bubble, alignment=QtCore.Qt.AlignLeft if not is_self else QtCore.Qt.AlignRight)
-        
-        # Wrap into hbox to align left or right
-        row = QtWidgets.QHBoxLayout()
-        row.setContentsMargins(0, 0, 0, 0)
-        if is_self:
-            row.addStretch()
-            row.addWidget(msg_frame)
-        else:
-            row.addWidget(msg_frame)
-            row.addStretch()
-        
-        # Insert just before the stretch spacer
-        self.messages_layout.insertLayout(self.messages_layout.count()-1, row)
-        
-        # Auto-scroll to bottom
-        QtCore.QTimer.singleShot(50, lambda: self.messages_area.verticalScrollBar().setValue(
-            self.messages_area.verticalScrollBar().maximum()
-        ))
-    
+        self.messages_area.append_message(username, msg, is_self=(username == self.my_username))
+
     def on_logout(self):
         """Handle logout button click"""
         reply = QtWidgets.QMessageBox.question(
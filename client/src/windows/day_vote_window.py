@@ -1,33 +1,12 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
+from components.player_card import PlayerCardGrid
 from utils.image_utils import set_window_icon
+from utils.deadline_clock import get_deadline_clock
 
 class DayVoteWindow(QtWidgets.QWidget):
     """Day phase voting window - all players vote to eliminate someone"""
 
-    _CARD_STYLE_ALIVE = """
-        QFrame#user_card {
-            background-color: #1a1a2e;
-            border: 2px solid #f39c12;
-            border-radius: 10px;
-        }
-    """
-    _CARD_STYLE_ALIVE_SELECTED = """
-        QFrame#user_card {
-            background-color: #3a2a1e;
-            border: 3px solid #f39c12;
-            border-radius: 10px;
-        }
-    """
-    _CARD_STYLE_DEAD = """
-        QFrame#user_card {
-            background-color: #333333;
-            border: 2px solid #555555;
-            border-radius: 10px;
-            opacity: 0.6;
-        }
-    """
-
     def __init__(self, toast_manager=None, window_manager=None):
         super().__init__()
         self.toast_manager = toast_manager
@@ -39,11 +18,17 @@ class DayVoteWindow(QtWidgets.QWidget):
         self.has_voted = False
         self.my_is_alive = True
         self.remaining_time = 60
-        self.timer = None
+        self.clock = get_deadline_clock(window_manager)
+        self.user_cards = []
         
         self.setObjectName("day_vote_window")
         self.setWindowTitle("Werewolf - Day Vote")
         self.setup_ui()
+        # Chỉ vẽ lại khi field mình hiển thị đổi (alive / candidates); ẩn thì showEvent tự rebuild
+        self.room_state = self.window_manager.get_shared_data("room_state") if self.window_manager else None
+        if self.room_state is not None:
+            self.room_state.alive_changed.connect(self._on_alive_changed)
+            self.room_state.day_vote_changed.connect(self._on_day_vote_changed)
 
     def showEvent(self, event):
         """Called when window is shown"""
@@ -54,11 +39,10 @@ class DayVoteWindow(QtWidgets.QWidget):
         self.current_room_id = self.window_manager.get_shared_data("current_room_id")
         self.my_username = self.window_manager.get_shared_data("username")
         
-        # Get deadline from shared data if available
-        deadline = self.window_manager.get_shared_data("day_vote_deadline")
+        # Get deadline from RoomState if available
+        deadline = self.room_state.day_vote_deadline
         if deadline:
-            import time
-            self.remaining_time = max(0, int(deadline - time.time()))
+            self.remaining_time = self.room_state.day_remaining()
         
         print(f"[DEBUG] DayVoteWindow shown - network_client: {self.network_client is not None}, room_id: {self.current_room_id}, username: {self.my_username}")
 
@@ -67,23 +51,14 @@ class DayVoteWindow(QtWidgets.QWidget):
             self.user_header.set_username(self.my_username)
         
         # Get players and check if I'm alive
-        players = self.window_manager.get_shared_data("room_players", [])
-        self.my_is_alive = True
-        for p in players:
-            if isinstance(p, dict):
-                if p.get("username") == self.my_username:
-                    try:
-                        self.my_is_alive = int(p.get("is_alive", 1)) != 0
-                    except Exception:
-                        self.my_is_alive = True
-                    break
+        self.my_is_alive = self.room_state.is_alive(self.my_username)
         
         # Reset vote state - IMPORTANT: reset on every showEvent to allow voting in day 2, 3, etc.
         self.selected_username = None
         self.has_voted = False
 
-        # Rebuild player cards
-        self.rebuild_player_cards()
+        # Update player cards
+        self.update_player_cards()
         # Re-enable buttons if alive
         if self.my_is_alive:
             self.submit_btn.setEnabled(False)  # Will be enabled when player selected
@@ -106,9 +81,7 @@ class DayVoteWindow(QtWidgets.QWidget):
     def hideEvent(self, event):
         """Called when window is hidden"""
         super().hideEvent(event)
-        if self.timer:
-            self.timer.stop()
-            self.timer = None
+        self.stop_timer()
 
     def setup_ui(self):
         """Setup user interface"""
@@ -122,14 +95,6 @@ class DayVoteWindow(QtWidgets.QWidget):
         # Main card container
         card = QtWidgets.QFrame()
         card.setObjectName("day_vote_card")
-        card.setStyleSheet("""
-            QFrame#day_vote_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #f39c12;
-                border-radius: 15px;
-            }
-        """)
         self.card_layout = QtWidgets.QVBoxLayout()
         self.card_layout.setSpacing(20)
         self.card_layout.setContentsMargins(30, 30, 30, 30)
@@ -143,27 +108,14 @@ class DayVoteWindow(QtWidgets.QWidget):
         # Timer label
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining_time}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("day_timer_label")
         self.card_layout.addWidget(self.timer_label)
 
         # Hint for dead voters
         self.dead_hint_label = QtWidgets.QLabel("You are dead. Cannot vote.")
         self.dead_hint_label.setAlignment(QtCore.Qt.AlignCenter)
         self.dead_hint_label.setVisible(False)
-        self.dead_hint_label.setStyleSheet("""
-            font-size: 12px;
-            color: #f39c12;
-            background-color: rgba(243, 156, 18, 0.12);
-            padding: 6px;
-            border-radius: 6px;
-        """)
+        self.dead_hint_label.setObjectName("day_vote_dead_hint_label")
         self.card_layout.addWidget(self.dead_hint_label)
 
         # Header
@@ -171,17 +123,17 @@ class DayVoteWindow(QtWidgets.QWidget):
 
         sun_label = QtWidgets.QLabel("☀️ 🗳️")
         sun_label.setAlignment(QtCore.Qt.AlignCenter)
-        sun_label.setStyleSheet("font-size: 36px;")
+        sun_label.setObjectName("day_vote_icon_label")
         header_v.addWidget(sun_label)
 
         title_label = QtWidgets.QLabel("Day Phase: Vote to Eliminate")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 22px; color: #f39c12; font-weight: bold; margin-top: 4px;")
+        title_label.setObjectName("day_vote_title_label")
         header_v.addWidget(title_label)
 
         subtitle = QtWidgets.QLabel("Select a player you suspect is a werewolf")
         subtitle.setAlignment(QtCore.Qt.AlignCenter)
-        subtitle.setStyleSheet("font-size: 13px; color: #cccccc; margin-top: 2px;")
+        subtitle.setObjectName("day_subtitle_label")
         header_v.addWidget(subtitle)
 
         self.card_layout.addLayout(header_v)
@@ -190,12 +142,12 @@ class DayVoteWindow(QtWidgets.QWidget):
         scroll_area = QtWidgets.QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QtWidgets.QFrame.NoFrame)
-        scroll_area.setStyleSheet("background: transparent;")
+        scroll_area.setObjectName("vote_scroll_area")
         
-        self.user_grid_widget = QtWidgets.QWidget()
-        self.user_grid_layout = QtWidgets.QGridLayout(self.user_grid_widget)
-        self.user_grid_layout.setSpacing(15)
-        self.user_grid_layout.setContentsMargins(10, 10, 10, 10)
+        # Pool card theo username: tạo một lần mỗi ván, sau đó chỉ cập nhật trạng thái
+        self.user_grid_widget = PlayerCardGrid(col_count=4)
+        self.user_grid_widget.card_clicked.connect(self._on_card_clicked)
+        self.user_grid_layout = self.user_grid_widget.grid_layout
         
         scroll_area.setWidget(self.user_grid_widget)
         self.card_layout.addWidget(scroll_area, 1)
@@ -206,76 +158,20 @@ class DayVoteWindow(QtWidgets.QWidget):
 
         # Go to chat button
         self.chat_btn = QtWidgets.QPushButton("💬 Go to Day Chat")
-        self.chat_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 14px;
-                padding: 12px 20px;
-            }
-            QPushButton:hover {
-                background-color: #5dade2;
-            }
-            QPushButton:pressed {
-                background-color: #2874a6;
-            }
-        """)
+        self.chat_btn.setObjectName("day_chat_nav_button")
         self.chat_btn.clicked.connect(self.on_go_to_chat)
         btn_row.addWidget(self.chat_btn)
 
         # Submit vote button
         self.submit_btn = QtWidgets.QPushButton("✓ Submit Vote")
         self.submit_btn.setEnabled(False)
-        self.submit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 15px;
-                padding: 12px 24px;
-            }
-            QPushButton:hover {
-                background-color: #3fe07a;
-            }
-            QPushButton:pressed {
-                background-color: #23b45a;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-        """)
+        self.submit_btn.setObjectName("day_vote_submit_button")
         self.submit_btn.clicked.connect(self.on_submit_vote)
         btn_row.addWidget(self.submit_btn)
 
         # Skip vote button
         self.skip_btn = QtWidgets.QPushButton("⏭️ Skip Vote")
-        self.skip_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #95a5a6;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 14px;
-                padding: 12px 20px;
-            }
-            QPushButton:hover {
-                background-color: #b8c4c5;
-            }
-            QPushButton:pressed {
-                background-color: #7f8c8d;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-        """)
+        self.skip_btn.setObjectName("day_vote_skip_button")
         self.skip_btn.clicked.connect(self.on_skip_vote)
         btn_row.addWidget(self.skip_btn)
 
@@ -283,147 +179,88 @@ class DayVoteWindow(QtWidgets.QWidget):
 
         main_layout.addWidget(card)
 
-    def rebuild_player_cards(self):
-        """Rebuild player cards from shared data"""
-        # Clear existing cards
-        while self.user_grid_layout.count():
-            item = self.user_grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+    def _on_alive_changed(self, usernames):
+        if self.my_username in usernames:
+            self.my_is_alive = False
+            if hasattr(self, "dead_hint_label"):
+                self.dead_hint_label.setVisible(True)
+            self.submit_btn.setEnabled(False)
+            self.skip_btn.setEnabled(False)
+        if self.isVisible():
+            self.update_player_cards()
+
+    def _on_day_vote_changed(self):
+        if self.isVisible():
+            self.update_player_cards()
 
-        # Get players from shared data
-        players = self.window_manager.get_shared_data("room_players", [])
+    def update_player_cards(self):
+        """Cập nhật lưới card từ RoomState, dùng lại card trong pool"""
+        room_state = self.room_state
+        players = room_state.players()
 
         # If server started a tie-break round, only allow voting among candidates.
-        candidates = self.window_manager.get_shared_data("day_vote_candidates")
+        candidates = room_state.day_vote_candidates
         candidate_set = None
         if isinstance(candidates, list) and candidates:
             try:
                 candidate_set = {str(x) for x in candidates if x}
             except Exception:
                 candidate_set = None
-        
+
         if not players:
-            print("[DEBUG] No players found in shared data")
+            print("[DEBUG] No players found in RoomState")
+
+        # Người ngoài danh sách ứng viên tie-break: card ẩn nhưng vẫn giữ trong pool.
+        # Card của người không còn trong phòng (ván mới / rời phòng) bị bỏ khỏi pool.
+        can_vote = self.my_is_alive and not self.has_voted
+        entries = [
+            (player.username, room_state.is_alive(player.username),
+             player.username == self.my_username, can_vote)
+            for player in players
+            if candidate_set is None or player.username in candidate_set
+        ]
+        self.user_grid_widget.set_players(entries, selected=self.selected_username,
+                                          keep=room_state.usernames())
+        self.user_cards = self.user_grid_widget.cards()
+
+    def set_cards_interactive(self, interactive):
+        """Bật/tắt click trên các card (card của người chết luôn tắt)"""
+        for card, _, _ in self.user_cards:
+            card.set_interactive(interactive)
+
+    def _on_card_clicked(self, username):
+        if self.has_voted:
+            if self.toast_manager:
+                self.toast_manager.warning("You have already voted!")
             return
-        
-        self.user_cards = []
-        col_count = 4
-        row = 0
-        col = 0
-        
-        for player in players:
-            if not isinstance(player, dict):
-                continue
-            
-            username = player.get("username", "Unknown")
 
-            if candidate_set is not None and username not in candidate_set:
-                continue
-            try:
-                is_alive = int(player.get("is_alive", 1)) != 0
-            except Exception:
-                is_alive = True
-            
-            is_self = (username == self.my_username)
+        if not self.my_is_alive:
+            if self.toast_manager:
+                self.toast_manager.warning("Dead players cannot vote!")
+            return
 
-            card_item = QtWidgets.QFrame()
-            card_item.setObjectName("user_card")
-            card_item.setFrameShape(QtWidgets.QFrame.StyledPanel)
-            
-            if is_alive:
-                card_item.setStyleSheet(self._CARD_STYLE_ALIVE)
-            else:
-                card_item.setStyleSheet(self._CARD_STYLE_DEAD)
-
-            card_item_layout = QtWidgets.QVBoxLayout(card_item)
-            card_item_layout.setSpacing(0)
-            card_item_layout.setContentsMargins(5, 5, 5, 5)
-
-            icon_label = QtWidgets.QLabel("💀" if not is_alive else "👤")
-            icon_label.setAlignment(QtCore.Qt.AlignCenter)
-            icon_label.setStyleSheet("font-size: 32px; padding-top: 5px;")
-            card_item_layout.addWidget(icon_label)
-
-            label_name = username
-            if is_self:
-                label_name = f"{label_name}\n(You)"
-            if not is_alive:
-                label_name = label_name + "\n(Dead)"
-
-            name_label = QtWidgets.QLabel(label_name)
-            name_label.setAlignment(QtCore.Qt.AlignCenter)
-            name_label.setStyleSheet(f"""
-                font-size: 11px;
-                font-weight: bold;
-                color: {'#888888' if not is_alive else '#eaeaea'};
-                padding: 2px;
-                background-color: transparent;
-            """)
-            name_label.setWordWrap(True)
-            card_item_layout.addWidget(name_label)
-
-            if is_alive and self.my_is_alive and not self.has_voted:
-                card_item.mousePressEvent = self._make_card_click(card_item, username)
-                card_item.setCursor(QtCore.Qt.PointingHandCursor)
-            else:
-                card_item.setCursor(QtCore.Qt.ForbiddenCursor)
-                card_item.setEnabled(False)
-
-            self.user_cards.append((card_item, username, is_alive))
-            self.user_grid_layout.addWidget(card_item, row, col)
-            
-            col += 1
-            if col >= col_count:
-                col = 0
-                row += 1
-
-    def _make_card_click(self, card_widget, username):
-        """Create click handler for a card"""
-        def handler(event):
-            if self.has_voted:
-                if self.toast_manager:
-                    self.toast_manager.warning("You have already voted!")
-                return
-            
-            if not self.my_is_alive:
-                if self.toast_manager:
-                    self.toast_manager.warning("Dead players cannot vote!")
-                return
-            
-            # Deselect previous selection
-            if self.selected_username:
-                for card, uname, is_alive in self.user_cards:
-                    if uname == self.selected_username and is_alive:
-                        card.setStyleSheet(self._CARD_STYLE_ALIVE)
-                        break
-            
-            # Select this card
-            self.selected_username = username
-            card_widget.setStyleSheet(self._CARD_STYLE_ALIVE_SELECTED)
-            self.submit_btn.setEnabled(True)
-            
-            print(f"[DEBUG] Selected player for voting: {username}")
-        
-        return handler
+        # Deselect previous selection, select this card
+        self.selected_username = username
+        self.user_grid_widget.set_selected(username)
+        self.submit_btn.setEnabled(True)
+
+        print(f"[DEBUG] Selected player for voting: {username}")
 
     def start_timer(self):
-        """Start countdown timer"""
-        if self.timer:
-            self.timer.stop()
-        
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self._update_timer)
-        self.timer.start(1000)  # 1 second interval
+        """Start local countdown (no server deadline) on the shared "day" deadline"""
+        self.remaining_time = self.clock.set_deadline("day", duration_seconds=self.remaining_time)
+        self.clock.subscribe(self, {"day": self._update_timer})
+
+    def stop_timer(self):
+        self.clock.unsubscribe(self)
         
-    def _update_timer(self):
+    def _update_timer(self, remaining):
         """Update timer display"""
-        self.remaining_time -= 1
+        self.remaining_time = remaining
         self.timer_label.setText(f"⏱️ {self.remaining_time}s")
         
         if self.remaining_time <= 0:
-            if self.timer:
-                self.timer.stop()
+            self.stop_timer()
             self.timer_label.setText("⏱️ Time's up!")
             # Auto-submit or disable voting
             if not self.has_voted:
@@ -471,9 +308,7 @@ class DayVoteWindow(QtWidgets.QWidget):
             self.skip_btn.setEnabled(False)
             
             # Disable all cards temporarily
-            for card, _, _ in self.user_cards:
-                card.setEnabled(False)
-                card.setCursor(QtCore.Qt.ForbiddenCursor)
+            self.set_cards_interactive(False)
             
             # Note: Success message will be shown when VOTE_RESULT is received
             # If error occurs, state will be reset by room_window error handler
@@ -486,9 +321,7 @@ class DayVoteWindow(QtWidgets.QWidget):
             self.submit_btn.setEnabled(self.selected_username is not None)
             if self.my_is_alive:
                 self.skip_btn.setEnabled(True)
-            for card, _, _ in self.user_cards:
-                card.setEnabled(True)
-                card.setCursor(QtCore.Qt.PointingHandCursor)
+            self.set_cards_interactive(True)
 
     def on_skip_vote(self):
         """Skip voting"""
@@ -531,7 +364,6 @@ class DayVoteWindow(QtWidgets.QWidget):
     
     def closeEvent(self, event):
         """Xử lý khi đóng cửa sổ"""
-        if hasattr(self, 'timer') and self.timer:
-            self.timer.stop()
+        self.stop_timer()
         # Never disconnect the shared network client here.
         event.accept()
@@ -3,6 +3,8 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from components.user_header import UserHeader
+from utils.deadline_clock import get_deadline_clock
+from utils.style_utils import set_style_property
 
 class DeathAnnouncementWindow(QtWidgets.QWidget):
     """Window hiển thị danh sách người chết sau đêm (10 giây)"""
@@ -15,7 +17,7 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
         self.window_manager = window_manager
         self.duration = 5
         self.remaining = 5
-        self.timer = None
+        self.clock = get_deadline_clock(window_manager)
         self.dead_players = []  # List of usernames who died
         self.setObjectName("death_announcement_window")
         self.setWindowTitle("Night Results")
@@ -32,7 +34,7 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
         # Set username cho user_header
         username = self.window_manager.get_shared_data("username", "Player")
         self.user_header.set_username(username)
-        self.remaining = self.duration
+        self.remaining = self.clock.set_deadline("death_announcement", duration_seconds=self.duration)
         self.timer_label.setText(f"⏱️ {self.remaining}s")
         self.start_timer()
         
@@ -48,68 +50,43 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("death_announcement_card")
-        card.setStyleSheet("""
-            QFrame#death_announcement_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #e74c3c;
-                border-radius: 15px;
-            }
-        """)
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(20)
         card_layout.setContentsMargins(40, 40, 40, 40)
 
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("death_timer_label")
         card_layout.addWidget(self.timer_label)
 
         # Icon
         icon_label = QtWidgets.QLabel("💀")
         icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 100px;")
+        icon_label.setObjectName("death_icon_label")
         card_layout.addWidget(icon_label)
 
         # Title
         title_label = QtWidgets.QLabel("NIGHT RESULTS")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            font-size: 36px;
-            color: #e74c3c;
-            font-weight: bold;
-            letter-spacing: 2px;
-        """)
+        title_label.setObjectName("death_title_label")
         card_layout.addWidget(title_label)
 
         # Subtitle
         subtitle = QtWidgets.QLabel("Last night's victims:")
         subtitle.setAlignment(QtCore.Qt.AlignCenter)
-        subtitle.setStyleSheet("font-size: 18px; color: #cccccc; margin-top: 10px;")
+        subtitle.setObjectName("death_subtitle_label")
         card_layout.addWidget(subtitle)
 
         # Death list container
         self.death_list_container = QtWidgets.QWidget()
-        self.death_list_container.setStyleSheet("background: rgba(0, 0, 0, 0.3); border-radius: 10px; padding: 20px;")
+        self.death_list_container.setObjectName("death_list_container")
         death_list_layout = QtWidgets.QVBoxLayout(self.death_list_container)
         death_list_layout.setSpacing(15)
         death_list_layout.setContentsMargins(20, 20, 20, 20)
         
         self.death_list_label = QtWidgets.QLabel("No one died last night.")
         self.death_list_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.death_list_label.setStyleSheet("""
-            font-size: 24px;
-            color: #2ecc71;
-            font-weight: bold;
-            padding: 20px;
-        """)
+        self.death_list_label.setObjectName("death_list_label")
         death_list_layout.addWidget(self.death_list_label)
         
         card_layout.addWidget(self.death_list_container)
@@ -121,34 +98,24 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
         """Cập nhật danh sách người chết"""
         if not self.dead_players:
             self.death_list_label.setText("No one died last night.")
-            self.death_list_label.setStyleSheet("""
-                font-size: 24px;
-                color: #2ecc71;
-                font-weight: bold;
-                padding: 20px;
-            """)
         else:
             # Hiển thị danh sách người chết
             death_text = "\n".join([f"💀 {username}" for username in self.dead_players])
             self.death_list_label.setText(death_text)
-            self.death_list_label.setStyleSheet("""
-                font-size: 20px;
-                color: #e74c3c;
-                font-weight: bold;
-                padding: 20px;
-            """)
+        set_style_property(self.death_list_label, "has_victims", bool(self.dead_players))
 
     def start_timer(self):
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)
+        self.clock.subscribe(self, {"death_announcement": self._tick})
 
-    def _tick(self):
-        self.remaining -= 1
+    def stop_timer(self):
+        self.clock.unsubscribe(self)
+
+    def _tick(self, remaining):
+        self.remaining = remaining
         if self.remaining > 0:
             self.timer_label.setText(f"⏱️ {self.remaining}s")
         else:
-            self.timer.stop()
+            self.stop_timer()
             self.on_timer_complete()
 
     def on_timer_complete(self):
@@ -159,8 +126,7 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
             self.close()
 
     def closeEvent(self, event):
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         event.accept()
     
     def on_logout(self):
@@ -183,8 +149,7 @@ class DeathAnnouncementWindow(QtWidgets.QWidget):
                     self.toast_manager.info("Logging out...")
                 
                 # Stop timer
-                if hasattr(self, 'timer'):
-                    self.timer.stop()
+                self.stop_timer()
                 
                 # Clear shared data
                 if self.window_manager:
@@ -1,18 +1,11 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 from components.user_header import UserHeader
 from utils.image_utils import set_window_icon
+from utils.style_utils import set_style_property
 
 class GameResultWindow(QtWidgets.QWidget):
     """Game result window - shows winner team and all player roles"""
 
-    # Role colors
-    ROLE_COLORS = {
-        "werewolf": "#e74c3c",  # Red
-        "seer": "#3498db",      # Blue
-        "guard": "#2ecc71",     # Green
-        "villager": "#95a5a6",  # Gray
-    }
-
     ROLE_ICONS = {
         "werewolf": "🐺",
         "seer": "🔮",
@@ -62,14 +55,6 @@ class GameResultWindow(QtWidgets.QWidget):
         # Main card container
         card = QtWidgets.QFrame()
         card.setObjectName("game_result_card")
-        card.setStyleSheet("""
-            QFrame#game_result_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #9b59b6;
-                border-radius: 15px;
-            }
-        """)
         self.card_layout = QtWidgets.QVBoxLayout()
         self.card_layout.setSpacing(20)
         self.card_layout.setContentsMargins(30, 30, 30, 30)
@@ -88,27 +73,17 @@ class GameResultWindow(QtWidgets.QWidget):
         
         self.winner_icon = QtWidgets.QLabel("🏆")
         self.winner_icon.setAlignment(QtCore.Qt.AlignCenter)
-        self.winner_icon.setStyleSheet("font-size: 60px;")
+        self.winner_icon.setObjectName("winner_icon_label")
         winner_layout.addWidget(self.winner_icon)
         
         self.winner_title = QtWidgets.QLabel("GAME OVER")
         self.winner_title.setAlignment(QtCore.Qt.AlignCenter)
-        self.winner_title.setStyleSheet("""
-            font-size: 32px;
-            font-weight: bold;
-            color: #ffffff;
-            letter-spacing: 3px;
-        """)
+        self.winner_title.setObjectName("winner_title_label")
         winner_layout.addWidget(self.winner_title)
         
         self.winner_label = QtWidgets.QLabel()
         self.winner_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.winner_label.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            padding: 10px;
-            border-radius: 10px;
-        """)
+        self.winner_label.setObjectName("winner_label")
         winner_layout.addWidget(self.winner_label)
         
         self.card_layout.addWidget(self.winner_container)
@@ -116,24 +91,14 @@ class GameResultWindow(QtWidgets.QWidget):
         # Players reveal section
         reveal_title = QtWidgets.QLabel("📜 Player Roles Revealed")
         reveal_title.setAlignment(QtCore.Qt.AlignCenter)
-        reveal_title.setStyleSheet("""
-            font-size: 20px;
-            font-weight: bold;
-            color: #ecf0f1;
-            margin-top: 10px;
-        """)
+        reveal_title.setObjectName("reveal_title_label")
         self.card_layout.addWidget(reveal_title)
 
         # Scrollable player cards
         scroll_area = QtWidgets.QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QtWidgets.QFrame.NoFrame)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-        """)
+        scroll_area.setObjectName("reveal_scroll_area")
         
         self.players_grid_widget = QtWidgets.QWidget()
         self.players_grid_layout = QtWidgets.QGridLayout(self.players_grid_widget)
@@ -148,23 +113,7 @@ class GameResultWindow(QtWidgets.QWidget):
         btn_row.setSpacing(15)
         
         self.back_to_lobby_btn = QtWidgets.QPushButton("🏠 Back to Lobby")
-        self.back_to_lobby_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 15px;
-                padding: 12px 24px;
-            }
-            QPushButton:hover {
-                background-color: #5dade2;
-            }
-            QPushButton:pressed {
-                background-color: #2874a6;
-            }
-        """)
+        self.back_to_lobby_btn.setObjectName("back_to_lobby_button")
         self.back_to_lobby_btn.clicked.connect(self.on_back_to_lobby)
         btn_row.addWidget(self.back_to_lobby_btn)
         
@@ -177,34 +126,12 @@ class GameResultWindow(QtWidgets.QWidget):
         # Update winner label
         if self.winner_team == "villagers":
             self.winner_label.setText("🎉 VILLAGERS WIN! 🎉")
-            self.winner_label.setStyleSheet("""
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 10px;
-                background-color: rgba(46, 204, 113, 0.3);
-                color: #2ecc71;
-            """)
         elif self.winner_team == "werewolves":
             self.winner_label.setText("🐺 WEREWOLVES WIN! 🐺")
-            self.winner_label.setStyleSheet("""
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 10px;
-                background-color: rgba(231, 76, 60, 0.3);
-                color: #e74c3c;
-            """)
         else:
             self.winner_label.setText("Game Over")
-            self.winner_label.setStyleSheet("""
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 10px;
-                background-color: rgba(149, 165, 166, 0.3);
-                color: #95a5a6;
-            """)
+        # Màu theo property [winner] trong werewolf_theme.qss
+        set_style_property(self.winner_label, "winner", self.winner_team if self.winner_team in ("villagers", "werewolves") else "none")
 
         # Clear existing player cards
         while self.players_grid_layout.count():
@@ -238,18 +165,10 @@ class GameResultWindow(QtWidgets.QWidget):
         card = QtWidgets.QFrame()
         card.setObjectName("player_reveal_card")
         
-        # Get role color
-        role_color = self.ROLE_COLORS.get(role, "#95a5a6")
+        # Màu viền / tên role theo property [role] trong werewolf_theme.qss (role lạ: như villager)
         role_icon = self.ROLE_ICONS.get(role, "👤")
-        
-        card.setStyleSheet(f"""
-            QFrame#player_reveal_card {{
-                background-color: #1a1a2e;
-                border: 3px solid {role_color};
-                border-radius: 12px;
-                padding: 10px;
-            }}
-        """)
+        style_role = role if role in self.ROLE_ICONS else "villager"
+        card.setProperty("role", style_role)
         
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(8)
@@ -258,43 +177,29 @@ class GameResultWindow(QtWidgets.QWidget):
         # Player icon
         icon_label = QtWidgets.QLabel(role_icon)
         icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 48px;")
+        icon_label.setObjectName("reveal_icon_label")
         card_layout.addWidget(icon_label)
         
         # Username
         username_label = QtWidgets.QLabel(username)
         username_label.setAlignment(QtCore.Qt.AlignCenter)
-        username_label.setStyleSheet("""
-            font-size: 14px;
-            font-weight: bold;
-            color: #ecf0f1;
-        """)
+        username_label.setObjectName("reveal_username_label")
         username_label.setWordWrap(True)
         card_layout.addWidget(username_label)
         
         # Role
         role_label = QtWidgets.QLabel(role.title())
         role_label.setAlignment(QtCore.Qt.AlignCenter)
-        role_label.setStyleSheet(f"""
-            font-size: 12px;
-            font-weight: bold;
-            color: {role_color};
-            background-color: rgba(255, 255, 255, 0.1);
-            padding: 4px 8px;
-            border-radius: 5px;
-        """)
+        role_label.setObjectName("reveal_role_label")
+        role_label.setProperty("role", style_role)
         card_layout.addWidget(role_label)
         
         # Status
         status_text = "✓ Survived" if is_alive else "✗ Dead"
-        status_color = "#2ecc71" if is_alive else "#e74c3c"
         status_label = QtWidgets.QLabel(status_text)
         status_label.setAlignment(QtCore.Qt.AlignCenter)
-        status_label.setStyleSheet(f"""
-            font-size: 11px;
-            color: {status_color};
-            font-weight: bold;
-        """)
+        status_label.setObjectName("reveal_status_label")
+        status_label.setProperty("alive", is_alive)
         card_layout.addWidget(status_label)
         
         return card
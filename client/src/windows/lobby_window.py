@@ -6,7 +6,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.image_utils import set_window_icon
 from components.user_header import UserHeader
+from components.room_card import RoomCard
 from utils.connection_monitor import ConnectionMonitor
+import protocol
 
 
 class LobbyWindow(QtWidgets.QWidget):
@@ -25,12 +27,18 @@ class LobbyWindow(QtWidgets.QWidget):
         self.network_client = None
 
         self.setObjectName("lobby_window")
+        # Room cards đang hiển thị: room_id -> RoomCard, thứ tự theo GET_ROOMS_RES
+        self._room_cards = {}
+        self._room_order = []
+        self._room_stretch_row = None
         self.setup_ui()
 
-        # Timers
-        self.recv_timer = QtCore.QTimer()
-        self.recv_timer.timeout.connect(self.receive_packets)
+        # Nhận packet qua dispatcher dùng chung (subscribe khi window hiển thị)
+        self.dispatcher = self.window_manager.get_shared_data("packet_dispatcher")
+        self.dispatcher.connection_lost.connect(self.on_receive_connection_lost)
+        self.dispatcher.receive_failed.connect(self.on_receive_failed)
 
+        # Timers
         self.auto_refresh_timer = QtCore.QTimer()
         self.auto_refresh_timer.timeout.connect(self.on_refresh_rooms)
 
@@ -57,7 +65,7 @@ class LobbyWindow(QtWidgets.QWidget):
         
         # Village icon
         village_icon = QtWidgets.QLabel("🏘️")
-        village_icon.setStyleSheet("font-size: 48px;")
+        village_icon.setObjectName("lobby_header_icon_label")
         header_layout.addWidget(village_icon)
         
         # Welcome label
@@ -68,7 +76,7 @@ class LobbyWindow(QtWidgets.QWidget):
         
         # Moon icon
         moon_icon = QtWidgets.QLabel("🌙")
-        moon_icon.setStyleSheet("font-size: 48px;")
+        moon_icon.setObjectName("lobby_header_icon_label")
         header_layout.addWidget(moon_icon)
         
         header_layout.addStretch()
@@ -136,7 +144,7 @@ class LobbyWindow(QtWidgets.QWidget):
             self.user_header.set_username(username)
 
         # Bắt đầu nhận gói tin
-        self.recv_timer.start(100)
+        self.dispatcher.subscribe(self, self.packet_handlers())
 
         # Lấy danh sách phòng ban đầu
         self.on_refresh_rooms()
@@ -153,12 +161,13 @@ class LobbyWindow(QtWidgets.QWidget):
             )
             self.connection_monitor.connection_lost.connect(self.on_connection_lost)
             self.connection_monitor.connection_restored.connect(self.on_connection_restored)
+            self.dispatcher.activity.connect(self.connection_monitor.on_activity)
         self.connection_monitor.start()
         
     def hideEvent(self, event):
         """Called when window is hidden"""
         super().hideEvent(event)
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         self.auto_refresh_timer.stop()
         if self.connection_monitor:
             self.connection_monitor.stop()
@@ -193,46 +202,35 @@ class LobbyWindow(QtWidgets.QWidget):
         except Exception as e:
             self.toast_manager.error(f"Failed to join room: {str(e)}")
             
-    def receive_packets(self):
-        """Nhận gói tin từ server"""
-        try:
-            header, payload = self.network_client.receive_packet()
+    def on_receive_failed(self, error_msg):
+        """Dispatcher báo lỗi nhận (RuntimeError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        # Kiểm tra xem có phải server disconnect không
+        if "Server closed" in error_msg or "Receive failed" in error_msg:
+            print(f"[ERROR] Server disconnected: {error_msg}")
+            self.handle_server_disconnect()
+        else:
+            self.toast_manager.error(f"Receive error: {error_msg}")
 
-            if header is None:
-                return
+    def on_receive_connection_lost(self, error_msg):
+        """Dispatcher báo server đóng kết nối (ConnectionError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        self.dispatcher.unsubscribe(self)
+        self.auto_refresh_timer.stop()
 
-            self.handle_packet(header, payload)
-            
-        except RuntimeError as e:
-            error_msg = str(e)
-            # Kiểm tra xem có phải server disconnect không
-            if "Server closed" in error_msg or "Receive failed" in error_msg:
-                print(f"[ERROR] Server disconnected: {error_msg}")
-                self.handle_server_disconnect()
-            else:
-                self.toast_manager.error(f"Receive error: {error_msg}")
-        except ConnectionError as e:
-            # Connection lost detected
-            print(f"[DEBUG] Connection lost: {e}")
-            self.recv_timer.stop()
-            self.auto_refresh_timer.stop()
-
-            # Trigger connection lost handling via monitor
-            if self.connection_monitor:
-                self.connection_monitor.is_connected = False
-                self.connection_monitor.stop()
-                self.connection_monitor.handle_connection_lost()
-        except Exception as e:
-            # Other errors - just show toast
-            error_msg = str(e)
-            print(f"[DEBUG] Other error: {error_msg}")
-            self.toast_manager.error(f"Receive error: {error_msg}")
+        # Trigger connection lost handling via monitor
+        if self.connection_monitor:
+            self.connection_monitor.is_connected = False
+            self.connection_monitor.stop()
+            self.connection_monitor.handle_connection_lost()
             
     def handle_server_disconnect(self):
         """Xử lý khi server disconnect"""
         print("[DEBUG] Handling server disconnect...")
-        # Dừng timers
-        self.recv_timer.stop()
+        # Dừng nhận packet + timers
+        self.dispatcher.unsubscribe(self)
         self.auto_refresh_timer.stop()
         
         # Hiển thị thông báo
@@ -254,194 +252,138 @@ class LobbyWindow(QtWidgets.QWidget):
         # Navigate về welcome screen
         self.window_manager.navigate_to("welcome")
             
-    def handle_packet(self, header, payload):
-        """Xử lý gói tin nhận được"""
-        # Handle PING from server
-        if header == 501:  # PING
-            try:
-                self.network_client.send_packet(502, {"type": "pong"})  # 502 = PONG
-                if self.connection_monitor:
-                    self.connection_monitor.on_pong_received()
-            except Exception as e:
-                print(f"[ERROR] Failed to send PONG: {e}")
-            return
-        elif header == 502:  # PONG - Server trả về PONG (không cần xử lý)
-            pass
-        elif header == 202:  # GET_ROOMS_RES
-            self.update_room_table(payload)
+    def packet_handlers(self):
+        """Bảng định tuyến header -> handler đăng ký với dispatcher"""
+        return {
+            protocol.GET_ROOMS_RES: self.update_room_table,
+            protocol.CREATE_ROOM_RES: self.on_create_room_res,
+            protocol.JOIN_ROOM_RES: self.on_join_room_res,
+        }
+
+    def on_create_room_res(self, payload):
+        """CREATE_ROOM_RES"""
+        if payload.get("status") == "success":
+            room_id = payload.get("room_id")
+            room_name = payload.get("room_name")
             
-        elif header == 204:  # CREATE_ROOM_RES
-            if payload.get("status") == "success":
-                room_id = payload.get("room_id")
-                room_name = payload.get("room_name")
-                
-                self.toast_manager.success(f"Room '{room_name}' created!")
-                
-                # Lưu dữ liệu phòng và chuyển hướng
-                self.window_manager.set_shared_data("current_room_id", room_id)
-                self.window_manager.set_shared_data("current_room_name", room_name)
-                self.window_manager.set_shared_data("last_room_id", room_id)
-                self.window_manager.set_shared_data("last_room_name", room_name)
-                self.window_manager.set_shared_data("is_host", True)
-                self.window_manager.set_shared_data("spectator_mode", False)
-                # Creator is first player, so initial count is 1
-                username = self.window_manager.get_shared_data("username")
-                self.window_manager.set_shared_data("room_players", [{"username": username}])
-                
-                self.window_manager.navigate_to("room")
-            else:
-                msg = payload.get("message", "Unknown error")
-                self.toast_manager.error(f"Failed to create room: {msg}")
-                
-        elif header == 206:  # JOIN_ROOM_RES
-            if payload.get("status") == "success":
-                room_id = payload.get("room_id")
-                room_name = payload.get("room_name")
-                is_host = payload.get("is_host", 0) == 1
-                
-                self.toast_manager.success(f"Joined room '{room_name}'!")
-                
-                # Lưu dữ liệu phòng và chuyển hướng
-                self.window_manager.set_shared_data("current_room_id", room_id)
-                self.window_manager.set_shared_data("current_room_name", room_name)
-                self.window_manager.set_shared_data("last_room_id", room_id)
-                self.window_manager.set_shared_data("last_room_name", room_name)
-                self.window_manager.set_shared_data("is_host", is_host)
-                self.window_manager.set_shared_data("spectator_mode", False)
-                self.window_manager.set_shared_data("room_players", payload.get("players", []))
-                
-                self.window_manager.navigate_to("room")
-            else:
-                msg = payload.get("message", "Unknown error")
-                self.toast_manager.error(f"Failed to join room: {msg}")
+            self.toast_manager.success(f"Room '{room_name}' created!")
+            
+            # Lưu dữ liệu phòng và chuyển hướng
+            self.window_manager.set_shared_data("current_room_id", room_id)
+            self.window_manager.set_shared_data("current_room_name", room_name)
+            self.window_manager.set_shared_data("last_room_id", room_id)
+            self.window_manager.set_shared_data("last_room_name", room_name)
+            self.window_manager.set_shared_data("is_host", True)
+            self.window_manager.set_shared_data("spectator_mode", False)
+            # Creator is first player, so initial count is 1
+            username = self.window_manager.get_shared_data("username")
+            self.window_manager.get_shared_data("room_state").set_players([{"username": username}])
+            
+            self.window_manager.navigate_to("room")
+        else:
+            msg = payload.get("message", "Unknown error")
+            self.toast_manager.error(f"Failed to create room: {msg}")
+            
+    def on_join_room_res(self, payload):
+        """JOIN_ROOM_RES"""
+        if payload.get("status") == "success":
+            room_id = payload.get("room_id")
+            room_name = payload.get("room_name")
+            is_host = payload.get("is_host", 0) == 1
+            
+            self.toast_manager.success(f"Joined room '{room_name}'!")
+            
+            # Lưu dữ liệu phòng và chuyển hướng
+            self.window_manager.set_shared_data("current_room_id", room_id)
+            self.window_manager.set_shared_data("current_room_name", room_name)
+            self.window_manager.set_shared_data("last_room_id", room_id)
+            self.window_manager.set_shared_data("last_room_name", room_name)
+            self.window_manager.set_shared_data("is_host", is_host)
+            self.window_manager.set_shared_data("spectator_mode", False)
+            self.window_manager.get_shared_data("room_state").set_players(payload.get("players", []))
+            
+            self.window_manager.navigate_to("room")
+        else:
+            msg = payload.get("message", "Unknown error")
+            self.toast_manager.error(f"Failed to join room: {msg}")
                 
     def update_room_table(self, rooms):
-        """Cập nhật grid cards với danh sách phòng"""
-        # Xóa các thẻ hiện có
-        for i in reversed(range(self.room_grid_layout.count())):
-            widget = self.room_grid_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-                widget.deleteLater()
-        
-        # Tạo các thẻ phòng (3-4 mỗi hàng)
-        columns = 3  # 3 rooms per row
-        for i, room in enumerate(rooms):
+        """Cập nhật grid cards với danh sách phòng (diff theo room id)"""
+        # Chuẩn hóa: room_id -> (name, current, max_players, status), giữ thứ tự server
+        entries = {}
+        for room in rooms or []:
             room_id = room.get("id", 0)
-            name = room.get("name", "Unknown")
-            current = room.get("current", 0)
-            max_players = room.get("max", self.MAX_PLAYERS_PER_ROOM)
-            status = room.get("status", 0)
-            
-            # Tạo thẻ phòng
-            card = self.create_room_card(room_id, name, current, max_players, status)
-            
+            if room_id in entries:
+                continue
+            entries[room_id] = (
+                room.get("name", "Unknown"),
+                room.get("current", 0),
+                room.get("max", self.MAX_PLAYERS_PER_ROOM),
+                room.get("status", 0),
+            )
+        order = list(entries)
+
+        # Không có gì đổi -> không động vào widget, không repaint
+        if order == self._room_order and not any(
+            self._room_cards[room_id].update_room(*entries[room_id]) for room_id in order
+        ):
+            return
+
+        self.room_container.setUpdatesEnabled(False)
+        try:
+            # Xóa các thẻ của phòng đã biến mất
+            for room_id in set(self._room_cards) - set(entries):
+                card = self._room_cards.pop(room_id)
+                self.room_grid_layout.removeWidget(card)
+                card.setParent(None)
+                card.deleteLater()
+
+            # Thêm thẻ mới, cập nhật thẻ cũ (chỉ label thay đổi)
+            for room_id in order:
+                card = self._room_cards.get(room_id)
+                if card is None:
+                    card = self.create_room_card(room_id)
+                    self._room_cards[room_id] = card
+                card.update_room(*entries[room_id])
+
+            # Chỉ sắp lại lưới khi thứ tự/tập phòng đổi
+            if order != self._room_order:
+                self._layout_room_cards(order)
+        finally:
+            self.room_container.setUpdatesEnabled(True)
+
+    def _layout_room_cards(self, order):
+        """Đặt các thẻ vào lưới theo thứ tự server (3 mỗi hàng)"""
+        columns = 3  # 3 rooms per row
+        for room_id in order:
+            self.room_grid_layout.removeWidget(self._room_cards[room_id])
+        for i, room_id in enumerate(order):
             # Thêm vào lưới (hàng, cột)
-            row = i // columns
-            col = i % columns
-            self.room_grid_layout.addWidget(card, row, col)
-        
-        # Thêm spacer để đẩy các thẻ lên trên
-        self.room_grid_layout.setRowStretch(len(rooms) // columns + 1, 1)
-    
-    def create_room_card(self, room_id, name, current, max_players, status):
+            self.room_grid_layout.addWidget(self._room_cards[room_id], i // columns, i % columns)
+
+        # Spacer để đẩy các thẻ lên trên (bỏ stretch của lần layout trước)
+        if self._room_stretch_row is not None:
+            self.room_grid_layout.setRowStretch(self._room_stretch_row, 0)
+        self._room_stretch_row = len(order) // columns + 1
+        self.room_grid_layout.setRowStretch(self._room_stretch_row, 1)
+        self._room_order = order
+
+    def create_room_card(self, room_id):
         """Tạo card cho một phòng chơi"""
-        card = QtWidgets.QFrame()
-        card.setObjectName("room_card")
-        card.setFrameShape(QtWidgets.QFrame.StyledPanel)
-        card.setStyleSheet("""
-            QFrame#room_card {
-                background-color: #16213e;
-                border: 2px solid #0f3460;
-                border-radius: 10px;
-                padding: 10px;
-            }
-            QFrame#room_card:hover {
-                border-color: #e94560;
-            }
-        """)
-        
-        card_layout = QtWidgets.QVBoxLayout(card)
-        card_layout.setSpacing(8)
-        
-        # Header với biểu tượng và tên phòng
-        header_layout = QtWidgets.QHBoxLayout()
-        
-        icon_label = QtWidgets.QLabel("🏠")
-        icon_label.setStyleSheet("font-size: 32px;")
-        header_layout.addWidget(icon_label)
-        
-        room_name_label = QtWidgets.QLabel(name)
-        room_name_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #eaeaea;")
-        room_name_label.setWordWrap(True)
-        header_layout.addWidget(room_name_label, 1)
-        
-        card_layout.addLayout(header_layout)
-        
-        # Room ID
-        id_label = QtWidgets.QLabel(f"Room #{room_id}")
-        id_label.setStyleSheet("font-size: 11px; color: #888888;")
-        card_layout.addWidget(id_label)
-        
-        # Players count
-        players_label = QtWidgets.QLabel(f"👥 {current}/{max_players} players")
-        players_label.setStyleSheet("font-size: 13px; color: #aaaaaa;")
-        card_layout.addWidget(players_label)
-        
-        # Status
-        status_text = "WAITING" if status == self.ROOM_WAITING else "PLAYING"
-        status_color = "#2ecc71" if status == self.ROOM_WAITING else "#e74c3c"
-        status_label = QtWidgets.QLabel(f"● {status_text}")
-        status_label.setStyleSheet(f"font-size: 12px; color: {status_color}; font-weight: bold;")
-        card_layout.addWidget(status_label)
-        
-        # Join button
-        if status == self.ROOM_WAITING and current < max_players:
-            join_button = QtWidgets.QPushButton("Join Room")
-            join_button.setObjectName("join_room_button")
-            join_button.setMinimumHeight(35)
-            join_button.setStyleSheet("""
-                QPushButton#join_room_button {
-                    background-color: #e94560;
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                QPushButton#join_room_button:hover {
-                    background-color: #ff5770;
-                }
-                QPushButton#join_room_button:pressed {
-                    background-color: #d03550;
-                }
-            """)
-            join_button.clicked.connect(lambda checked, rid=room_id: self.join_room(rid))
-            card_layout.addWidget(join_button)
-        else:
-            full_label = QtWidgets.QLabel("FULL" if current >= max_players else "IN GAME")
-            full_label.setAlignment(QtCore.Qt.AlignCenter)
-            full_label.setStyleSheet("""
-                background-color: #555555;
-                color: #888888;
-                padding: 8px;
-                border-radius: 5px;
-                font-weight: bold;
-            """)
-            card_layout.addWidget(full_label)
-        
+        card = RoomCard(room_id)
+        card.join_clicked.connect(self.join_room)
         return card
-    
+
     def on_connection_lost(self):
         """Handle connection lost"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         self.auto_refresh_timer.stop()
 
     def on_connection_restored(self):
         """Handle connection restored after reconnect"""
         print("[DEBUG] Lobby: Connection restored, navigating to login")
         # Stop timers
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         self.auto_refresh_timer.stop()
 
         # Clear session data
@@ -468,7 +410,7 @@ class LobbyWindow(QtWidgets.QWidget):
                 self.toast_manager.info("Logging out...")
 
                 # Stop timers
-                self.recv_timer.stop()
+                self.dispatcher.unsubscribe(self)
                 self.auto_refresh_timer.stop()
 
                 # Clear shared data
@@ -6,6 +6,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.image_utils import create_logo_label
 from utils.connection_monitor import ConnectionMonitor
+from utils.deadline_clock import get_deadline_clock
+import protocol
 
 
 class LoginWindow(QtWidgets.QWidget):
@@ -21,9 +23,10 @@ class LoginWindow(QtWidgets.QWidget):
         self.setObjectName("login_window")
         self.setup_ui()
 
-        # Receive timer
-        self.recv_timer = QtCore.QTimer()
-        self.recv_timer.timeout.connect(self.receive_packets)
+        # Nhận packet qua dispatcher dùng chung (subscribe khi window hiển thị)
+        self.dispatcher = self.window_manager.get_shared_data("packet_dispatcher")
+        self.dispatcher.connection_lost.connect(self.on_receive_connection_lost)
+        self.dispatcher.receive_failed.connect(self.on_receive_failed)
 
         # Connection monitor
         self.connection_monitor = None
@@ -45,7 +48,7 @@ class LoginWindow(QtWidgets.QWidget):
             self.window_manager.navigate_to("welcome")
             return
 
-        self.recv_timer.start(100)
+        self.dispatcher.subscribe(self, self.packet_handlers())
 
         # Set focus to username input
         QtCore.QTimer.singleShot(100, lambda: self.username_input.setFocus())
@@ -59,6 +62,7 @@ class LoginWindow(QtWidgets.QWidget):
             )
             self.connection_monitor.connection_lost.connect(self.on_connection_lost)
             self.connection_monitor.connection_restored.connect(self.on_connection_restored)
+            self.dispatcher.activity.connect(self.connection_monitor.on_activity)
         if self.connection_monitor:
             self.connection_monitor.start()
         
@@ -129,7 +133,7 @@ class LoginWindow(QtWidgets.QWidget):
     def hideEvent(self, event):
         """Called when window is hidden"""
         super().hideEvent(event)
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         if self.connection_monitor:
             self.connection_monitor.stop()
 
@@ -158,47 +162,35 @@ class LoginWindow(QtWidgets.QWidget):
         except Exception as e:
             self.toast_manager.error(f"Failed to send login: {str(e)}")
             
-    def receive_packets(self):
-        """Nhận gói tin từ server"""
-        try:
-            header, payload = self.network_client.receive_packet()
-
-            if header is None:
-                return  # No data
-            
-            self.handle_packet(header, payload)
-            
-        except RuntimeError as e:
-            error_msg = str(e)
-            # Kiểm tra xem có phải server disconnect không
-            if "Server closed" in error_msg or "Receive failed" in error_msg:
-                print(f"[ERROR] Server disconnected: {error_msg}")
-                self.handle_server_disconnect()
-            else:
-                self.toast_manager.error(f"Receive error: {error_msg}")
-                self.recv_timer.stop()
-        except ConnectionError as e:
-            # Connection lost detected
-            print(f"[DEBUG] Connection lost: {e}")
-            self.recv_timer.stop()
-
-            # Trigger connection lost handling via monitor
-            if self.connection_monitor:
-                self.connection_monitor.is_connected = False
-                self.connection_monitor.stop()
-                self.connection_monitor.handle_connection_lost()
-        except Exception as e:
-            # Other errors
-            error_msg = str(e)
-            print(f"[DEBUG] Other error: {error_msg}")
+    def on_receive_failed(self, error_msg):
+        """Dispatcher báo lỗi nhận (RuntimeError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        # Kiểm tra xem có phải server disconnect không
+        if "Server closed" in error_msg or "Receive failed" in error_msg:
+            print(f"[ERROR] Server disconnected: {error_msg}")
+            self.handle_server_disconnect()
+        else:
             self.toast_manager.error(f"Receive error: {error_msg}")
-            self.recv_timer.stop()
+            self.dispatcher.unsubscribe(self)
+
+    def on_receive_connection_lost(self, error_msg):
+        """Dispatcher báo server đóng kết nối (ConnectionError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        self.dispatcher.unsubscribe(self)
+
+        # Trigger connection lost handling via monitor
+        if self.connection_monitor:
+            self.connection_monitor.is_connected = False
+            self.connection_monitor.stop()
+            self.connection_monitor.handle_connection_lost()
             
     def handle_server_disconnect(self):
         """Xử lý khi server disconnect"""
         print("[DEBUG] Handling server disconnect...")
-        # Dừng receive timer
-        self.recv_timer.stop()
+        # Dừng nhận packet
+        self.dispatcher.unsubscribe(self)
         
         # Hiển thị thông báo
         self.toast_manager.error("⚠️ Server disconnected! Returning to welcome screen...")
@@ -214,232 +206,232 @@ class LoginWindow(QtWidgets.QWidget):
         # Navigate về welcome screen
         self.window_manager.navigate_to("welcome")
             
-    def handle_packet(self, header, payload):
-        """Xử lý gói tin nhận được"""
-        # Handle PING from server
-        if header == 501:  # PING
-            try:
-                self.network_client.send_packet(502, {"type": "pong"})  # 502 = PONG
-                if self.connection_monitor:
-                    self.connection_monitor.on_pong_received()
-            except Exception as e:
-                print(f"[ERROR] Failed to send PONG: {e}")
+    def packet_handlers(self):
+        """Bảng định tuyến header -> handler đăng ký với dispatcher"""
+        return {
+            protocol.LOGIN_RES: self.on_login_res,
+            protocol.GET_ROOM_INFO_RES: self.on_room_info_res,
+        }
+
+    def on_login_res(self, payload):
+        """LOGIN_RES"""
+        if payload.get("status") == "success":
+            user_id = payload.get("user_id")
+            username = payload.get("username")
+            
+            self.toast_manager.success(f"Welcome back, {username}!")
+            
+            # Store user data
+            self.window_manager.set_shared_data("user_id", user_id)
+            self.window_manager.set_shared_data("username", username)
+            self.window_manager.set_shared_data("spectator_mode", False)
+
+            # Try resume (dead spectator) if we have a known room.
+            resume_room_id = payload.get("resume_room_id")
+            resume_room_status = payload.get("resume_room_status")
+            resume_flag = self.window_manager.get_shared_data("resume_room_after_login", False)
+            last_room_id = self.window_manager.get_shared_data("last_room_id")
+
+            room_id_to_check = resume_room_id or (last_room_id if resume_flag else None)
+
+            # Only auto-resume if the room is playing (or unknown status and user asked resume).
+            should_try_resume = False
+            if room_id_to_check:
+                if resume_room_status is None:
+                    should_try_resume = True
+                else:
+                    should_try_resume = int(resume_room_status) == 1
+
+            if should_try_resume:
+                self._pending_resume_room_id = int(room_id_to_check)
+                self.window_manager.set_shared_data("resume_room_after_login", False)
+                self.toast_manager.info("Resuming ongoing game...")
+                try:
+                    self.network_client.send_packet(210, {"room_id": self._pending_resume_room_id})  # GET_ROOM_INFO_REQ
+                    self._resume_timeout_timer.start(2500)
+                    # Keep subscription to receive GET_ROOM_INFO_RES.
+                    return
+                except Exception as e:
+                    print(f"[WARNING] Failed to request room info for resume: {e}")
+                    self._pending_resume_room_id = None
+
+            # Default: stop receiving here and go to lobby
+            self.dispatcher.unsubscribe(self)
+            self.window_manager.navigate_to("lobby")
+        else:
+            msg = payload.get("message", "Unknown error")
+            self.toast_manager.error(f"Login failed: {msg}")
+
+    def on_room_info_res(self, payload):
+        """GET_ROOM_INFO_RES (resume vào game đang chơi)"""
+        if not self._pending_resume_room_id:
             return
-        elif header == 502:  # PONG - Server trả về PONG (không cần xử lý)
-            pass
-        elif header == 102:  # LOGIN_RES
-            if payload.get("status") == "success":
-                user_id = payload.get("user_id")
-                username = payload.get("username")
-                
-                self.toast_manager.success(f"Welcome back, {username}!")
-                
-                # Store user data
-                self.window_manager.set_shared_data("user_id", user_id)
-                self.window_manager.set_shared_data("username", username)
-                self.window_manager.set_shared_data("spectator_mode", False)
-
-                # Try resume (dead spectator) if we have a known room.
-                resume_room_id = payload.get("resume_room_id")
-                resume_room_status = payload.get("resume_room_status")
-                resume_flag = self.window_manager.get_shared_data("resume_room_after_login", False)
-                last_room_id = self.window_manager.get_shared_data("last_room_id")
-
-                room_id_to_check = resume_room_id or (last_room_id if resume_flag else None)
-
-                # Only auto-resume if the room is playing (or unknown status and user asked resume).
-                should_try_resume = False
-                if room_id_to_check:
-                    if resume_room_status is None:
-                        should_try_resume = True
-                    else:
-                        should_try_resume = int(resume_room_status) == 1
-
-                if should_try_resume:
-                    self._pending_resume_room_id = int(room_id_to_check)
-                    self.window_manager.set_shared_data("resume_room_after_login", False)
-                    self.toast_manager.info("Resuming ongoing game...")
-                    try:
-                        self.network_client.send_packet(210, {"room_id": self._pending_resume_room_id})  # GET_ROOM_INFO_REQ
-                        self._resume_timeout_timer.start(2500)
-                        # Keep recv_timer running to receive GET_ROOM_INFO_RES.
-                        return
-                    except Exception as e:
-                        print(f"[WARNING] Failed to request room info for resume: {e}")
-                        self._pending_resume_room_id = None
-
-                # Default: stop receiving here and go to lobby
-                self.recv_timer.stop()
-                self.window_manager.navigate_to("lobby")
-            else:
-                msg = payload.get("message", "Unknown error")
-                self.toast_manager.error(f"Login failed: {msg}")
-
-        elif header == 211:  # GET_ROOM_INFO_RES
-            if not self._pending_resume_room_id:
-                return
-
-            self._resume_timeout_timer.stop()
-            pending_id = self._pending_resume_room_id
-            self._pending_resume_room_id = None
-
-            if payload.get("status") != "success":
-                self.toast_manager.warning("Could not resume room. Going to lobby.")
-                self.recv_timer.stop()
-                self.window_manager.navigate_to("lobby")
-                return
-
-            room_status = payload.get("room_status")
-            if room_status is None:
-                room_status = payload.get("status")  # fallback if server older
-
-            try:
-                room_status_int = int(room_status)
-            except Exception:
-                room_status_int = 0
-
-            if room_status_int != 1:
-                # Not playing anymore
-                self.recv_timer.stop()
-                self.window_manager.navigate_to("lobby")
-                return
-
-            room_id = payload.get("room_id", pending_id)
-            room_name = payload.get("room_name")
-            players = payload.get("players", [])
-
-            # Determine which phase screen to show.
-            night_phase_active = False
-            try:
-                night_phase_active = int(payload.get("night_phase_active", 0)) != 0
-            except Exception:
-                night_phase_active = bool(payload.get("night_phase_active", False))
 
+        self._resume_timeout_timer.stop()
+        pending_id = self._pending_resume_room_id
+        self._pending_resume_room_id = None
+
+        if payload.get("status") != "success":
+            self.toast_manager.warning("Could not resume room. Going to lobby.")
+            self.dispatcher.unsubscribe(self)
+            self.window_manager.navigate_to("lobby")
+            return
+
+        room_status = payload.get("room_status")
+        if room_status is None:
+            room_status = payload.get("status")  # fallback if server older
+
+        try:
+            room_status_int = int(room_status)
+        except Exception:
+            room_status_int = 0
+
+        if room_status_int != 1:
+            # Not playing anymore
+            self.dispatcher.unsubscribe(self)
+            self.window_manager.navigate_to("lobby")
+            return
+
+        room_id = payload.get("room_id", pending_id)
+        room_name = payload.get("room_name")
+        players = payload.get("players", [])
+
+        # Determine which phase screen to show.
+        night_phase_active = False
+        try:
+            night_phase_active = int(payload.get("night_phase_active", 0)) != 0
+        except Exception:
+            night_phase_active = bool(payload.get("night_phase_active", False))
+
+        role_card_active = False
+        try:
+            total = int(payload.get("role_card_total", 0))
+            done = int(payload.get("role_card_done_count", 0))
+            start_time = float(payload.get("role_card_start_time", 0))
+            role_card_active = (total > 0 and done < total and start_time > 0)
+        except Exception:
             role_card_active = False
-            try:
-                total = int(payload.get("role_card_total", 0))
-                done = int(payload.get("role_card_done_count", 0))
-                start_time = float(payload.get("role_card_start_time", 0))
-                role_card_active = (total > 0 and done < total and start_time > 0)
-            except Exception:
-                role_card_active = False
-
-            # Enter room as dead spectator
-            self.window_manager.set_shared_data("current_room_id", room_id)
-            self.window_manager.set_shared_data("current_room_name", room_name)
-            self.window_manager.set_shared_data("room_players", players)
-            self.window_manager.set_shared_data("is_host", False)
-            self.window_manager.set_shared_data("spectator_mode", True)
-
-            # Day phase voting state (for resume into day)
-            try:
-                day_deadline = payload.get("day_deadline")
-                day_candidates = payload.get("day_candidates")
-                if day_deadline:
-                    self.window_manager.set_shared_data("day_vote_deadline", float(day_deadline))
-                if isinstance(day_candidates, list) and day_candidates:
-                    self.window_manager.set_shared_data("day_vote_candidates", day_candidates)
-            except Exception:
-                pass
-
-            # Start RoomWindow in background so it can receive/dispatch packets,
-            # without ever showing the Room window (avoid black Room window after resume).
-            try:
-                room_window = self.window_manager.windows.get("room")
-                if room_window and hasattr(room_window, "activate_room_context"):
-                    room_window.activate_room_context(start_receiving=True)
-                    room_window.hide()
-            except Exception as e:
-                print(f"[WARNING] Failed to start RoomWindow in background: {e}")
-
-            if role_card_active and not night_phase_active:
-                # Players are still reading role cards; spectator just waits.
-                # DON'T show night_begin - wait for server PHASE_NIGHT
-                # Navigate to role_card instead
-                self.window_manager.navigate_to("role_card")
-            elif night_phase_active:
-                # Resume into the correct sub-phase screen like others.
-                import time
-                now = time.time()
-
-                def _to_float(v):
-                    try:
-                        return float(v)
-                    except Exception:
-                        return 0.0
-
-                seer_deadline = _to_float(payload.get("seer_deadline", 0))
-                guard_deadline = _to_float(payload.get("guard_deadline", 0))
-                wolf_deadline = _to_float(payload.get("wolf_deadline", 0))
-
-                seer_remaining = max(0, int(seer_deadline - now)) if seer_deadline else 0
-                guard_remaining = max(0, int(guard_deadline - now)) if guard_deadline else 0
-                wolf_remaining = max(0, int(wolf_deadline - now)) if wolf_deadline else 0
-
-                # Build players list as dicts (username/is_alive) for controller
-                ctrl_players = []
-                for p in players:
-                    if isinstance(p, dict):
-                        ctrl_players.append({
-                            "username": p.get("username", ""),
-                            "is_alive": p.get("is_alive", 1),
-                        })
-
-                from .night_phase_controller import NightPhaseController
-                night_ctrl = NightPhaseController(
-                    self.window_manager,
-                    self.window_manager.get_shared_data("network_client"),
-                    ctrl_players,
-                    self.window_manager.get_shared_data("username"),
-                    room_id,
-                    False,
-                    False,
-                    False,
-                    [],
-                    seer_duration=max(1, seer_remaining) if seer_remaining else 30,
-                    guard_duration=max(1, guard_remaining) if guard_remaining else 30,
-                    wolf_duration=max(1, wolf_remaining) if wolf_remaining else 30,
+
+        # Enter room as dead spectator
+        self.window_manager.set_shared_data("current_room_id", room_id)
+        self.window_manager.set_shared_data("current_room_name", room_name)
+        room_state = self.window_manager.get_shared_data("room_state")
+        room_state.set_players(players)
+        self.window_manager.set_shared_data("is_host", False)
+        self.window_manager.set_shared_data("spectator_mode", True)
+
+        # Day phase voting state (for resume into day)
+        try:
+            day_deadline = get_deadline_clock(self.window_manager).to_local(payload.get("day_deadline"))
+            day_candidates = payload.get("day_candidates")
+            if day_deadline or (isinstance(day_candidates, list) and day_candidates):
+                room_state.set_day_vote(
+                    float(day_deadline) if day_deadline else None,
+                    day_candidates if isinstance(day_candidates, list) else None,
                 )
-                self.window_manager.set_shared_data("night_phase_controller", night_ctrl)
-
-                if seer_deadline and now < seer_deadline:
-                    night_ctrl.seer_duration = max(1, seer_remaining)
-                    night_ctrl.start_seer_phase()
-                elif guard_deadline and now < guard_deadline:
-                    night_ctrl.guard_duration = max(1, guard_remaining)
-                    night_ctrl.start_guard_phase()
-                elif wolf_deadline and now < wolf_deadline:
-                    night_ctrl.wolf_duration = max(1, wolf_remaining)
-                    night_ctrl.start_wolf_phase()
-                else:
-                    self.window_manager.navigate_to("day_chat")
+        except Exception:
+            pass
+
+        # Start RoomWindow in background so it can receive/dispatch packets,
+        # without ever showing the Room window (avoid black Room window after resume).
+        try:
+            room_window = self.window_manager.windows.get("room")
+            if room_window and hasattr(room_window, "activate_room_context"):
+                room_window.activate_room_context(start_receiving=True)
+                room_window.hide()
+        except Exception as e:
+            print(f"[WARNING] Failed to start RoomWindow in background: {e}")
+
+        if role_card_active and not night_phase_active:
+            # Players are still reading role cards; spectator just waits.
+            # DON'T show night_begin - wait for server PHASE_NIGHT
+            # Navigate to role_card instead
+            self.window_manager.navigate_to("role_card")
+        elif night_phase_active:
+            # Resume into the correct sub-phase screen like others.
+            import time
+            now = time.time()
+
+            def _to_float(v):
+                try:
+                    return float(v)
+                except Exception:
+                    return 0.0
+
+            # Deadline theo đồng hồ server -> đồng hồ client
+            clock = get_deadline_clock(self.window_manager)
+            seer_deadline = clock.to_local(_to_float(payload.get("seer_deadline", 0)))
+            guard_deadline = clock.to_local(_to_float(payload.get("guard_deadline", 0)))
+            wolf_deadline = clock.to_local(_to_float(payload.get("wolf_deadline", 0)))
+
+            seer_remaining = max(0, int(seer_deadline - now)) if seer_deadline else 0
+            guard_remaining = max(0, int(guard_deadline - now)) if guard_deadline else 0
+            wolf_remaining = max(0, int(wolf_deadline - now)) if wolf_deadline else 0
+
+            # Build players list as dicts (username/is_alive) for controller
+            ctrl_players = []
+            for p in players:
+                if isinstance(p, dict):
+                    ctrl_players.append({
+                        "username": p.get("username", ""),
+                        "is_alive": p.get("is_alive", 1),
+                    })
+
+            from .night_phase_controller import NightPhaseController
+            night_ctrl = NightPhaseController(
+                self.window_manager,
+                self.window_manager.get_shared_data("network_client"),
+                ctrl_players,
+                self.window_manager.get_shared_data("username"),
+                room_id,
+                False,
+                False,
+                False,
+                [],
+                seer_duration=max(1, seer_remaining) if seer_remaining else 30,
+                guard_duration=max(1, guard_remaining) if guard_remaining else 30,
+                wolf_duration=max(1, wolf_remaining) if wolf_remaining else 30,
+            )
+            self.window_manager.set_shared_data("night_phase_controller", night_ctrl)
+
+            if seer_deadline and now < seer_deadline:
+                night_ctrl.seer_duration = max(1, seer_remaining)
+                night_ctrl.start_seer_phase()
+            elif guard_deadline and now < guard_deadline:
+                night_ctrl.guard_duration = max(1, guard_remaining)
+                night_ctrl.start_guard_phase()
+            elif wolf_deadline and now < wolf_deadline:
+                night_ctrl.wolf_duration = max(1, wolf_remaining)
+                night_ctrl.start_wolf_phase()
             else:
                 self.window_manager.navigate_to("day_chat")
+        else:
+            self.window_manager.navigate_to("day_chat")
 
-            self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
 
     def _on_resume_timeout(self):
         if not self._pending_resume_room_id:
             return
         self._pending_resume_room_id = None
         self.toast_manager.warning("Resume timed out. Going to lobby.")
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         self.window_manager.navigate_to("lobby")
 
     def on_connection_lost(self):
         """Handle connection lost"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
 
     def on_connection_restored(self):
         """Handle connection restored after reconnect"""
-        print("[DEBUG] Login: Connection restored, restarting timer")
-        # Restart timer
-        if not self.recv_timer.isActive():
-            self.recv_timer.start(100)
+        print("[DEBUG] Login: Connection restored, resubscribing")
+        # Subscribe lại để nhận packet
+        if not self.dispatcher.is_subscribed(self):
+            self.dispatcher.subscribe(self, self.packet_handlers())
 
     def closeEvent(self, event):
         """Xử lý khi đóng cửa sổ"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         if self.connection_monitor:
             self.connection_monitor.stop()
         event.accept()
@@ -4,6 +4,7 @@ import time
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from components.user_header import UserHeader
+from utils.deadline_clock import get_deadline_clock
 
 class NightBeginWindow(QtWidgets.QWidget):
     """Night begin screen styled like RoleCardWindow, with countdown"""
@@ -17,7 +18,7 @@ class NightBeginWindow(QtWidgets.QWidget):
         self.duration = 30
         self.remaining = 30
         self.deadline = None
-        self.timer = None
+        self.clock = get_deadline_clock(window_manager)
         self.setObjectName("night_begin_window")
         self.setWindowTitle("Night Begins")
         self.setup_ui()
@@ -36,7 +37,7 @@ class NightBeginWindow(QtWidgets.QWidget):
             self.window_manager.set_shared_data("night_begin_deadline", shared_deadline)
 
         self.deadline = shared_deadline
-        self.remaining = max(0, int(self.deadline - time.time()))
+        self.remaining = self.clock.set_deadline("night_begin", shared_deadline)
         self.timer_label.setText(f"⏱️ {self.remaining}s")
         if self.remaining > 0:
             self.start_timer()
@@ -56,79 +57,57 @@ class NightBeginWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("night_card")
-        card.setStyleSheet("""
-            QFrame#night_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #3a86ff;
-                border-radius: 15px;
-            }
-        """)
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(30)
         card_layout.setContentsMargins(30, 30, 30, 30)
 
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("night_timer_label")
         card_layout.addWidget(self.timer_label)
 
         icon_label = QtWidgets.QLabel("🌙")
         icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 120px;")
+        icon_label.setObjectName("night_icon_label")
         card_layout.addWidget(icon_label)
 
         title_label = QtWidgets.QLabel("NIGHT FALLS")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            font-size: 36px;
-            color: #3a86ff;
-            font-weight: bold;
-            letter-spacing: 2px;
-        """)
+        title_label.setObjectName("night_title_label")
         card_layout.addWidget(title_label)
 
         subtitle = QtWidgets.QLabel("Everyone go to sleep.")
         subtitle.setAlignment(QtCore.Qt.AlignCenter)
-        subtitle.setStyleSheet("font-size: 16px; color: #cccccc; margin-top: 10px;")
+        subtitle.setObjectName("night_subtitle_label")
         card_layout.addWidget(subtitle)
 
         card_layout.addStretch()
         main_layout.addWidget(card)
 
     def start_timer(self):
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)
+        # showEvent gọi lại mỗi đêm: subscribe ghi đè callback cũ, không sinh thêm timer
+        self.clock.subscribe(self, {"night_begin": self._tick})
 
-    def _tick(self):
-        if self.deadline is not None:
-            self.remaining = max(0, int(self.deadline - time.time()))
-        else:
-            self.remaining = max(0, self.remaining - 1)
+    def stop_timer(self):
+        self.clock.unsubscribe(self)
 
+    def _tick(self, remaining):
+        self.remaining = remaining
         if self.remaining > 0:
             self.timer_label.setText(f"⏱️ {self.remaining}s")
         else:
-            self.timer.stop()
+            self.stop_timer()
             self.accept_or_close()
 
     def accept_or_close(self):
         # Close window and start night phase
         self.hide()
-        if hasattr(self, 'timer') and self.timer:
-            self.timer.stop()
+        self.stop_timer()
         
         # Start night phase after night_begin closes
         if self.window_manager:
-            pending = self.window_manager.get_shared_data("pending_night_phase")
+            room_state = self.window_manager.get_shared_data("room_state")
+            pending = room_state.pending_night_phase
             if pending:
                 room_window = self.window_manager.windows.get("room")
                 if room_window and hasattr(room_window, "start_night_phase"):
@@ -138,11 +117,10 @@ class NightBeginWindow(QtWidgets.QWidget):
                         pending["guard_duration"],
                         pending["wolf_duration"]
                     )
-                    self.window_manager.set_shared_data("pending_night_phase", None)
+                    room_state.set_pending_night_phase(None)
 
     def closeEvent(self, event):
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         event.accept()
     
     def on_logout(self):
@@ -165,8 +143,7 @@ class NightBeginWindow(QtWidgets.QWidget):
                     self.toast_manager.info("Logging out...")
                 
                 # Stop timer
-                if hasattr(self, 'timer'):
-                    self.timer.stop()
+                self.stop_timer()
                 
                 # Clear shared data
                 self.window_manager.set_shared_data("user_id", None)
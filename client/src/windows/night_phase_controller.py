@@ -1,5 +1,4 @@
 
-from PyQt5 import QtCore, QtWidgets
 from .roles.seer.seer_select_window import SeerSelectWindow
 from .roles.seer.seer_result_window import SeerResultWindow
 from .roles.seer.seer_wait_window import SeerWaitWindow
@@ -11,7 +10,10 @@ from .roles.wolf.wolf_wait_window import WolfWaitWindow
 
 
 class NightPhaseController:
-    """Điều phối night phase: seer -> guard -> wolf (role-based windows)"""
+    """Điều phối night phase: seer -> guard -> wolf (role-based windows).
+
+    Các màn hình được tạo một lần (main.py) và chỉ `reset(...)` khi chuyển phase.
+    """
     def __init__(self, window_manager, network_client, players, my_username, room_id, is_seer, is_guard, is_wolf, wolf_usernames, seer_duration=30, guard_duration=30, wolf_duration=30, toast_manager=None, seer_deadline=None, guard_deadline=None, wolf_deadline=None):
         self.window_manager = window_manager
         self.network_client = network_client
@@ -34,6 +36,7 @@ class NightPhaseController:
         self.seer_result_window = None
         self.guard_window = None
         self.wolf_controller = None
+        self.wolf_chat_window = None
         self.seer_choice_made = False
         self.guard_phase_started = False  # Flag để tránh chuyển phase nhiều lần
         self.wolf_phase_started = False   # Flag để tránh chuyển phase nhiều lần
@@ -45,47 +48,49 @@ class NightPhaseController:
         print("[DEBUG] Starting seer phase...")
         self.start_seer_phase()
 
+    def _screen(self, name, factory):
+        """Màn hình đã đăng ký sẵn ở main.py; chỉ tạo (một lần) nếu chưa có"""
+        window = self.window_manager.windows.get(name)
+        if window is None:
+            window = factory()
+            self.window_manager.register_window(name, window)
+        return window
+
     def start_seer_phase(self):
         if self.is_seer:
-            print("[DEBUG] User is seer - creating and showing SeerSelectWindow")
+            print("[DEBUG] User is seer - resetting and showing SeerSelectWindow")
             try:
                 print(f"[DEBUG] Seer select - players list: {[p.get('username', 'unknown') if isinstance(p, dict) else str(p) for p in (self.players or [])]}")
             except Exception:
                 print("[DEBUG] Seer select - players list: <unavailable>")
             print(f"[DEBUG] Seer select - total players: {len(self.players)}")
             try:
-                self.seer_window = SeerSelectWindow(
+                self.seer_window = self._screen("seer_select", lambda: SeerSelectWindow(
+                    [], self.my_username, self.seer_duration,
+                    window_manager=self.window_manager, toast_manager=self.toast_manager,
+                ))
+                # SEER_CHECK_REQ -> đợi SEER_RESULT (406) -> handle_seer_result
+                self.seer_window.reset(
                     self.players,
-                    self.my_username,
-                    self.seer_duration,
-                    self.network_client,
-                    self.room_id,
-                    window_manager=self.window_manager,
-                    toast_manager=self.toast_manager,
-                    deadline=self.seer_deadline
+                    self.seer_deadline,
+                    duration_seconds=self.seer_duration,
+                    my_username=self.my_username,
+                    network_client=self.network_client,
+                    room_id=self.room_id,
                 )
-                # Register + navigate (single-window flow)
-                self.window_manager.register_window("seer_select", self.seer_window)
                 self.window_manager.navigate_to("seer_select")
                 print("[DEBUG] SeerSelectWindow navigated successfully")
-                # Connect to handle when seer makes choice or skips
-                # Note: seer_select_window will send SEER_CHECK_REQ, then wait for SEER_RESULT (406)
-                # When SEER_RESULT arrives, handle_seer_result will be called
-                # If seer skips or times out, the window will close and trigger destroyed signal
-                self.seer_window.destroyed.connect(self._on_seer_window_closed)
             except Exception as e:
                 print(f"[ERROR] Failed to show SeerSelectWindow: {e}")
                 import traceback
                 traceback.print_exc()
         else:
-            print("[DEBUG] User is not seer - creating and showing SeerWaitWindow")
+            print("[DEBUG] User is not seer - resetting and showing SeerWaitWindow")
             try:
-                self.seer_window = SeerWaitWindow(
-                    self.seer_duration,
-                    window_manager=self.window_manager,
-                    toast_manager=self.toast_manager
-                )
-                self.window_manager.register_window("seer_wait", self.seer_window)
+                self.seer_window = self._screen("seer_wait", lambda: SeerWaitWindow(
+                    self.seer_duration, window_manager=self.window_manager, toast_manager=self.toast_manager,
+                ))
+                self.seer_window.reset(self.seer_deadline, duration_seconds=self.seer_duration)
                 self.window_manager.navigate_to("seer_wait")
                 print("[DEBUG] SeerWaitWindow navigated successfully")
                 # Do NOT auto-advance locally; wait for server PHASE_GUARD_START.
@@ -94,12 +99,6 @@ class NightPhaseController:
                 import traceback
                 traceback.print_exc()
 
-    def _on_seer_window_closed(self):
-        """Called when seer select window is closed (either by choice or skip)"""
-        print("[DEBUG] Seer window closed")
-        # Always wait for server-driven transitions (SEER_RESULT + PHASE_GUARD_START).
-        self.seer_window = None
-    
     def handle_seer_result(self, target_username, is_werewolf):
         """Handle SEER_RESULT packet from server"""
         print(f"[DEBUG] Received seer result - target: {target_username}, is_werewolf: {is_werewolf}")
@@ -113,33 +112,12 @@ class NightPhaseController:
                 pass
             self.seer_window = None
         
-        # Show result window
-        self.seer_result_window = SeerResultWindow(target_username, is_werewolf)
-        self.window_manager.register_window("seer_result", self.seer_result_window)
+        # Show result window. OK chỉ đóng màn hình; guard phase bắt đầu khi server broadcast PHASE_GUARD_START
+        self.seer_result_window = self._screen("seer_result", lambda: SeerResultWindow(
+            "", False, window_manager=self.window_manager, toast_manager=self.toast_manager,
+        ))
+        self.seer_result_window.reset(target_username, is_werewolf)
         self.window_manager.navigate_to("seer_result")
-        
-        # When result window is closed (OK button clicked), move to guard phase immediately
-        # Connect to the OK button's clicked signal instead of destroyed
-        # Find the OK button and connect it
-        for widget in self.seer_result_window.findChildren(QtWidgets.QPushButton):
-            if widget.text() == "OK":
-                widget.clicked.connect(self._on_seer_result_closed)
-                break
-        
-        # Also connect destroyed as fallback
-        self.seer_result_window.destroyed.connect(self._on_seer_result_closed)
-    
-    def _on_seer_result_closed(self):
-        """Called when seer result window is closed"""
-        print("[DEBUG] Seer result window closed")
-        if self.seer_result_window:
-            self.seer_result_window = None
-        # Không tự động chuyển sang guard phase - đợi server broadcast PHASE_GUARD_START
-        # Nếu server đã broadcast thì guard_phase_started sẽ là True
-        if not self.guard_phase_started:
-            print("[DEBUG] Waiting for PHASE_GUARD_START from server...")
-        else:
-            print("[DEBUG] Guard phase already started, skipping")
 
     def start_guard_phase(self):
         # Tránh chuyển phase nhiều lần
@@ -162,31 +140,28 @@ class NightPhaseController:
             print("[DEBUG] User is guard - showing GuardSelectWindow")
             print(f"[DEBUG] Guard select - players list: {[p.get('username', 'unknown') if isinstance(p, dict) else str(p) for p in self.players]}")
             print(f"[DEBUG] Guard select - total players: {len(self.players)}")
-            print(f"[DEBUG] Guard select - full players data: {self.players}")
             # Đảm bảo truyền TẤT CẢ players vào GuardSelectWindow, không filter
-            # Truyền window_manager và toast_manager để có thể lấy username và hiển thị thông báo
-            self.guard_window = GuardSelectWindow(
-                self.players, 
-                self.my_username, 
-                self.guard_duration, 
-                self.network_client, 
-                self.room_id,
-                window_manager=self.window_manager,
-                toast_manager=self.toast_manager,
-                deadline=self.guard_deadline
+            self.guard_window = self._screen("guard_select", lambda: GuardSelectWindow(
+                [], self.my_username, self.guard_duration,
+                window_manager=self.window_manager, toast_manager=self.toast_manager,
+            ))
+            self.guard_window.reset(
+                self.players,
+                self.guard_deadline,
+                duration_seconds=self.guard_duration,
+                my_username=self.my_username,
+                network_client=self.network_client,
+                room_id=self.room_id,
             )
-            self.window_manager.register_window("guard_select", self.guard_window)
             self.window_manager.navigate_to("guard_select")
             # Guard window sẽ tự đóng khi guard chọn xong, nhưng không tự động chuyển sang wolf
-            # Đợi server broadcast PHASE_WOLF_START (không connect destroyed signal)
+            # Đợi server broadcast PHASE_WOLF_START
         else:
             print("[DEBUG] User is not guard - showing GuardWaitWindow")
-            self.guard_window = GuardWaitWindow(
-                self.guard_duration,
-                window_manager=self.window_manager,
-                toast_manager=self.toast_manager
-            )
-            self.window_manager.register_window("guard_wait", self.guard_window)
+            self.guard_window = self._screen("guard_wait", lambda: GuardWaitWindow(
+                self.guard_duration, window_manager=self.window_manager, toast_manager=self.toast_manager,
+            ))
+            self.guard_window.reset(self.guard_deadline, duration_seconds=self.guard_duration)
             self.window_manager.navigate_to("guard_wait")
             # Do NOT auto-advance locally; wait for server PHASE_WOLF_START.
 
@@ -240,57 +215,51 @@ class NightPhaseController:
         if self.is_wolf:
             print("[DEBUG] User is wolf - showing WolfSelectWindow")
 
-            self.wolf_controller = WolfSelectWindow(
+            self.wolf_controller = self._screen("wolf_select", lambda: WolfSelectWindow(
+                [], [], self.my_username, duration_seconds=self.wolf_duration,
+                window_manager=self.window_manager, toast_manager=self.toast_manager,
+            ))
+            self.wolf_controller.reset(
                 player_list,
                 alive_status,
-                self.my_username,
+                self.wolf_deadline,
+                can_vote=my_is_alive,
                 duration_seconds=self.wolf_duration,
+                my_username=self.my_username,
                 network_client=self.network_client,
                 room_id=self.room_id,
-                can_vote=my_is_alive,
-                deadline=self.wolf_deadline,
             )
-            self.window_manager.register_window("wolf_select", self.wolf_controller)
-
-            # Create (or reuse) chat screen. This remains an overlay screen managed by WindowManager.
-            if not hasattr(self, "wolf_chat_window"):
-                self.wolf_chat_window = None
-
-            def _send_wolf_chat(message: str):
-                try:
-                    if self.network_client and self.room_id:
-                        payload = {"room_id": self.room_id, "message": message}
-                        self.network_client.send_packet(401, payload)  # CHAT_REQ
-                        print(f"[DEBUG] Sent wolf chat: {message}")
-                except Exception as e:
-                    print(f"[ERROR] Failed to send wolf chat: {e}")
-
-            if self.wolf_chat_window is None:
-                self.wolf_chat_window = WolfChatWindow(
-                    self.my_username,
-                    self.wolf_usernames,
-                    send_callback=_send_wolf_chat,
-                    duration_seconds=self.wolf_duration,
-                    network_client=self.network_client,
-                    room_id=self.room_id,
-                    deadline=self.wolf_deadline,
-                )
-                self.window_manager.register_window("wolf_chat", self.wolf_chat_window)
-
-            # Wire navigation buttons
-            if hasattr(self.wolf_controller, "chat_btn"):
-                self.wolf_controller.chat_btn.clicked.connect(lambda: self.window_manager.navigate_to("wolf_chat"))
-            if hasattr(self.wolf_chat_window, "switch_btn"):
-                self.wolf_chat_window.switch_btn.clicked.connect(lambda: self.window_manager.navigate_to("wolf_select"))
 
-            # Sync countdown each time we open chat
-            if hasattr(self.wolf_chat_window, "sync_remaining"):
-                self.wolf_chat_window.sync_remaining(getattr(self.wolf_controller, "remaining", self.wolf_duration))
+            # Chat screen (overlay screen managed by WindowManager); nút chuyển qua lại do window tự nối
+            self.wolf_chat_window = self._screen("wolf_chat", lambda: WolfChatWindow(
+                self.my_username, self.wolf_usernames, duration_seconds=self.wolf_duration,
+                window_manager=self.window_manager, toast_manager=self.toast_manager,
+            ))
+            self.wolf_chat_window.reset(
+                self.my_username,
+                self.wolf_usernames,
+                self.wolf_deadline,
+                duration_seconds=self.wolf_duration,
+                send_callback=self._send_wolf_chat,
+                network_client=self.network_client,
+                room_id=self.room_id,
+            )
 
             self.window_manager.navigate_to("wolf_select")
         else:
             print("[DEBUG] User is not wolf - showing WolfWaitWindow")
-            self.wolf_controller = WolfWaitWindow(self.wolf_duration)
-            self.window_manager.register_window("wolf_wait", self.wolf_controller)
+            self.wolf_controller = self._screen("wolf_wait", lambda: WolfWaitWindow(
+                self.wolf_duration, window_manager=self.window_manager, toast_manager=self.toast_manager,
+            ))
+            self.wolf_controller.reset(self.wolf_deadline, duration_seconds=self.wolf_duration)
             self.window_manager.navigate_to("wolf_wait")
             # Không tự động đóng - sẽ đợi server broadcast phase tiếp theo hoặc đóng khi nhận signal
+
+    def _send_wolf_chat(self, message: str):
+        try:
+            if self.network_client and self.room_id:
+                payload = {"room_id": self.room_id, "message": message}
+                self.network_client.send_packet(401, payload)  # CHAT_REQ
+                print(f"[DEBUG] Sent wolf chat: {message}")
+        except Exception as e:
+            print(f"[ERROR] Failed to send wolf chat: {e}")
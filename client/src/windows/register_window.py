@@ -6,6 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.image_utils import create_logo_label
 from utils.connection_monitor import ConnectionMonitor
+import protocol
 
 
 class RegisterWindow(QtWidgets.QWidget):
@@ -20,9 +21,10 @@ class RegisterWindow(QtWidgets.QWidget):
         self.setObjectName("register_window")
         self.setup_ui()
 
-        # Receive timer
-        self.recv_timer = QtCore.QTimer()
-        self.recv_timer.timeout.connect(self.receive_packets)
+        # Nhận packet qua dispatcher dùng chung (subscribe khi window hiển thị)
+        self.dispatcher = self.window_manager.get_shared_data("packet_dispatcher")
+        self.dispatcher.connection_lost.connect(self.on_receive_connection_lost)
+        self.dispatcher.receive_failed.connect(self.on_receive_failed)
 
         # Connection monitor
         self.connection_monitor = None
@@ -39,8 +41,8 @@ class RegisterWindow(QtWidgets.QWidget):
             return
         print(f"[DEBUG] Register window shown, network_client: {self.network_client}")
         if self.network_client:
-            print("[DEBUG] Starting recv_timer for register window")
-            self.recv_timer.start(100)
+            print("[DEBUG] Subscribing register window to packet dispatcher")
+            self.dispatcher.subscribe(self, self.packet_handlers())
         else:
             print("[ERROR] No network_client available!")
 
@@ -56,6 +58,7 @@ class RegisterWindow(QtWidgets.QWidget):
             )
             self.connection_monitor.connection_lost.connect(self.on_connection_lost)
             self.connection_monitor.connection_restored.connect(self.on_connection_restored)
+            self.dispatcher.activity.connect(self.connection_monitor.on_activity)
         if self.connection_monitor:
             self.connection_monitor.start()
         
@@ -171,7 +174,7 @@ class RegisterWindow(QtWidgets.QWidget):
     def hideEvent(self, event):
         """Called when window is hidden"""
         super().hideEvent(event)
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         if self.connection_monitor:
             self.connection_monitor.stop()
 
@@ -179,49 +182,36 @@ class RegisterWindow(QtWidgets.QWidget):
         """Quay lại cửa sổ chào mừng"""
         self.window_manager.navigate_to("welcome")
             
-    def receive_packets(self):
-        """Nhận gói tin từ server"""
-        try:
-            header, payload = self.network_client.receive_packet()
-
-            if header is None:
-                return  # No data
+    def on_receive_failed(self, error_msg):
+        """Dispatcher báo lỗi nhận (RuntimeError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        print(f"[ERROR] Receive error in register window: {error_msg}")
+        # Kiểm tra xem có phải server disconnect không
+        if "Server closed" in error_msg or "Receive failed" in error_msg:
+            print(f"[ERROR] Server disconnected: {error_msg}")
+            self.handle_server_disconnect()
+        else:
+            self.toast_manager.error(f"Receive error: {error_msg}")
+            self.dispatcher.unsubscribe(self)
 
-            print(f"[DEBUG] Register window received packet: header={header}, payload={payload}")
-            self.handle_packet(header, payload)
-            
-        except RuntimeError as e:
-            error_msg = str(e)
-            print(f"[ERROR] Receive error in register window: {error_msg}")
-            # Kiểm tra xem có phải server disconnect không
-            if "Server closed" in error_msg or "Receive failed" in error_msg:
-                print(f"[ERROR] Server disconnected: {error_msg}")
-                self.handle_server_disconnect()
-            else:
-                self.toast_manager.error(f"Receive error: {error_msg}")
-                self.recv_timer.stop()
-        except ConnectionError as e:
-            # Connection lost detected
-            print(f"[DEBUG] Connection lost: {e}")
-            self.recv_timer.stop()
+    def on_receive_connection_lost(self, error_msg):
+        """Dispatcher báo server đóng kết nối (ConnectionError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        self.dispatcher.unsubscribe(self)
 
-            # Trigger connection lost handling via monitor
-            if self.connection_monitor:
-                self.connection_monitor.is_connected = False
-                self.connection_monitor.stop()
-                self.connection_monitor.handle_connection_lost()
-        except Exception as e:
-            # Other errors
-            error_msg = str(e)
-            print(f"[ERROR] Receive error in register window: {error_msg}")
-            self.toast_manager.error(f"Receive error: {error_msg}")
-            self.recv_timer.stop()
+        # Trigger connection lost handling via monitor
+        if self.connection_monitor:
+            self.connection_monitor.is_connected = False
+            self.connection_monitor.stop()
+            self.connection_monitor.handle_connection_lost()
             
     def handle_server_disconnect(self):
         """Xử lý khi server disconnect"""
         print("[DEBUG] Handling server disconnect...")
-        # Dừng receive timer
-        self.recv_timer.stop()
+        # Dừng nhận packet
+        self.dispatcher.unsubscribe(self)
         
         # Hiển thị thông báo
         self.toast_manager.error("⚠️ Server disconnected! Returning to welcome screen...")
@@ -237,56 +227,48 @@ class RegisterWindow(QtWidgets.QWidget):
         # Navigate về welcome screen
         self.window_manager.navigate_to("welcome")
             
-    def handle_packet(self, header, payload):
-        """Xử lý gói tin nhận được"""
-        print(f"[DEBUG] Register handle_packet: header={header}, payload={payload}")
-        # Handle PING from server
-        if header == 501:  # PING
-            try:
-                self.network_client.send_packet(502, {"type": "pong"})  # 502 = PONG
-                if self.connection_monitor:
-                    self.connection_monitor.on_pong_received()
-            except Exception as e:
-                print(f"[ERROR] Failed to send PONG: {e}")
-            return
-        elif header == 502:  # PONG - Server trả về PONG (không cần xử lý)
-            pass
-        elif header == 104:  # REGISTER_RES
-            if payload.get("status") == "success":
-                # Lấy username từ input vì server không gửi lại
-                username = self.username_input.text().strip()
-                print(f"[SUCCESS] Registration successful for {username}")
-                self.toast_manager.success(f"Account created! Welcome {username}")
-                
-                # Clear inputs
-                self.username_input.clear()
-                self.password_input.clear()
-                self.confirm_password_input.clear()
-                
-                # Navigate to login
-                self.recv_timer.stop()
-                self.window_manager.navigate_to("login")
-            else:
-                msg = payload.get("message", "Unknown error")
-                print(f"[ERROR] Registration failed: {msg}")
-                self.toast_manager.error(f"Registration failed: {msg}")
+    def packet_handlers(self):
+        """Bảng định tuyến header -> handler đăng ký với dispatcher"""
+        return {
+            protocol.REGISTER_RES: self.on_register_res,
+        }
+
+    def on_register_res(self, payload):
+        """REGISTER_RES"""
+        print(f"[DEBUG] Register received REGISTER_RES: payload={payload}")
+        if payload.get("status") == "success":
+            # Lấy username từ input vì server không gửi lại
+            username = self.username_input.text().strip()
+            print(f"[SUCCESS] Registration successful for {username}")
+            self.toast_manager.success(f"Account created! Welcome {username}")
+            
+            # Clear inputs
+            self.username_input.clear()
+            self.password_input.clear()
+            self.confirm_password_input.clear()
+            
+            # Navigate to login
+            self.dispatcher.unsubscribe(self)
+            self.window_manager.navigate_to("login")
         else:
-            print(f"[WARNING] Unexpected packet in register window: {header}")
+            msg = payload.get("message", "Unknown error")
+            print(f"[ERROR] Registration failed: {msg}")
+            self.toast_manager.error(f"Registration failed: {msg}")
 
     def on_connection_lost(self):
         """Handle connection lost"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
 
     def on_connection_restored(self):
         """Handle connection restored after reconnect"""
-        print("[DEBUG] Register: Connection restored, restarting timer")
-        # Restart timer
-        if not self.recv_timer.isActive():
-            self.recv_timer.start(100)
+        print("[DEBUG] Register: Connection restored, resubscribing")
+        # Subscribe lại để nhận packet
+        if not self.dispatcher.is_subscribed(self):
+            self.dispatcher.subscribe(self, self.packet_handlers())
 
     def closeEvent(self, event):
         """Xử lý khi đóng cửa sổ"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
         if self.connection_monitor:
             self.connection_monitor.stop()
         event.accept()
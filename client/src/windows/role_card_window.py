@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 import time
 from components.user_header import UserHeader
+from utils.deadline_clock import get_deadline_clock
+from utils.style_utils import set_style_property
 
 class RoleCardWindow(QtWidgets.QWidget):
     """Window hiển thị role card với timer 30s"""
@@ -16,6 +18,7 @@ class RoleCardWindow(QtWidgets.QWidget):
         self._sent_done = False
         self.network_client = None
         self.room_id = None
+        self.clock = get_deadline_clock(window_manager)
         self.setObjectName("role_card_window")
         self.setWindowTitle("Your Role")
         self.setup_ui()
@@ -34,8 +37,8 @@ class RoleCardWindow(QtWidgets.QWidget):
         if hasattr(self, "user_header"):
             self.user_header.set_username(username)
         
-        # Lấy role_data từ shared data nếu có
-        role_info = self.window_manager.get_shared_data("role_info", {})
+        # Lấy role_data từ RoomState nếu có
+        role_info = self.window_manager.get_shared_data("room_state").role_info
         if role_info:
             self.set_role_data(role_info)
 
@@ -50,7 +53,7 @@ class RoleCardWindow(QtWidgets.QWidget):
 
         self.deadline = shared_deadline
         if self.deadline is not None:
-            self.remaining_time = max(0, int(self.deadline - time.time()))
+            self.remaining_time = self.clock.set_deadline("role_card", self.deadline)
             self.timer_label.setText(f"⏱️ {self.remaining_time}s")
             if self.remaining_time > 0:
                 self.start_timer()
@@ -103,24 +106,13 @@ class RoleCardWindow(QtWidgets.QWidget):
                 self.team_label.setVisible(True)
                 for teammate in self.role_data["werewolf_team"]:
                     team_card = QtWidgets.QFrame()
-                    team_card.setStyleSheet("""
-                        QFrame {
-                            background-color: rgba(233, 69, 96, 0.15);
-                            border: 2px solid #e94560;
-                            border-radius: 8px;
-                            padding: 8px 12px;
-                        }
-                    """)
+                    team_card.setObjectName("wolf_team_card")
                     team_card_layout = QtWidgets.QVBoxLayout(team_card)
                     team_card_layout.setContentsMargins(5, 5, 5, 5)
                     
                     teammate_label = QtWidgets.QLabel(teammate)
                     teammate_label.setAlignment(QtCore.Qt.AlignCenter)
-                    teammate_label.setStyleSheet("""
-                        font-size: 12px;
-                        color: #ff6b6b;
-                        font-weight: bold;
-                    """)
+                    teammate_label.setObjectName("wolf_team_member_label")
                     team_card_layout.addWidget(teammate_label)
                     
                     self.team_layout.addWidget(team_card)
@@ -130,36 +122,25 @@ class RoleCardWindow(QtWidgets.QWidget):
                 self.team_container.setVisible(False)
         
     def start_timer(self):
-        """Bắt đầu bộ đếm thời gian 30 giây"""
-        if hasattr(self, 'countdown_timer') and self.countdown_timer:
-            self.countdown_timer.stop()
-        self.countdown_timer = QtCore.QTimer()
-        self.countdown_timer.timeout.connect(self.update_timer)
-        self.countdown_timer.start(1000)  # Cập nhật mỗi giây
+        """Bắt đầu bộ đếm thời gian 30 giây (theo deadline "role_card" của DeadlineClock)"""
+        self.clock.subscribe(self, {"role_card": self.update_timer})
         # Update UI ngay lập tức
         self.timer_label.setText(f"⏱️ {self.remaining_time}s")
-        
-    def update_timer(self):
-        """Cập nhật bộ đếm thời gian"""
-        if self.deadline is None:
-            self.countdown_timer.stop()
-            return
+        set_style_property(self.timer_label, "timed_out", False)
 
-        self.remaining_time = max(0, int(self.deadline - time.time()))
+    def stop_timer(self):
+        self.clock.unsubscribe(self)
+        
+    def update_timer(self, remaining):
+        """Cập nhật bộ đếm thời gian (DeadlineClock gọi khi số giây đổi)"""
+        self.remaining_time = remaining
         
         if self.remaining_time > 0:
             self.timer_label.setText(f"⏱️ {self.remaining_time}s")
         else:
             self.timer_label.setText("✓ Time's up!")
-            self.timer_label.setStyleSheet("""
-                font-size: 18px;
-                color: #2ecc71;
-                font-weight: bold;
-                background-color: rgba(46, 204, 113, 0.1);
-                padding: 8px;
-                border-radius: 5px;
-            """)
-            self.countdown_timer.stop()
+            set_style_property(self.timer_label, "timed_out", True)
+            self.stop_timer()
             # Hết thời gian: gửi ROLE_CARD_DONE_REQ và chuyển sang night_begin để chờ mọi người
             self.send_timeout_and_wait()
             
@@ -169,19 +150,14 @@ class RoleCardWindow(QtWidgets.QWidget):
         self.ready_button.setEnabled(False)
         self.ready_button.setText("Ready...")
         # Dừng timer
-        if hasattr(self, 'countdown_timer'):
-            self.countdown_timer.stop()
+        self.stop_timer()
         # Ready: gửi ROLE_CARD_DONE_REQ và chuyển sang night_begin để chờ mọi người
         self.send_timeout_and_wait()
 
     def hideEvent(self, event):
         """Stop timers when window is hidden (e.g., server forces phase transition)."""
         super().hideEvent(event)
-        try:
-            if hasattr(self, 'countdown_timer') and self.countdown_timer:
-                self.countdown_timer.stop()
-        except Exception:
-            pass
+        self.stop_timer()
         
     def send_timeout_and_wait(self):
         """Gửi ROLE_CARD_DONE_REQ và chuyển sang night_begin (countdown đồng bộ theo deadline)."""
@@ -193,7 +169,7 @@ class RoleCardWindow(QtWidgets.QWidget):
         # Persist night_begin countdown based on the same deadline
         if self.deadline is not None:
             self.window_manager.set_shared_data("night_begin_deadline", self.deadline)
-            self.window_manager.set_shared_data("night_begin_remaining_time", max(0, int(self.deadline - time.time())))
+            self.window_manager.set_shared_data("night_begin_remaining_time", self.clock.remaining("role_card"))
 
         if self.network_client:
             try:
@@ -216,8 +192,7 @@ class RoleCardWindow(QtWidgets.QWidget):
             
     def closeEvent(self, event):
         """Stop timer when closing"""
-        if hasattr(self, 'countdown_timer'):
-            self.countdown_timer.stop()
+        self.stop_timer()
         # Note: ROLE_CARD_DONE_REQ đã được gửi trong send_ready_and_close() hoặc update_timer()
         event.accept()
 
@@ -235,14 +210,6 @@ class RoleCardWindow(QtWidgets.QWidget):
         # Main card container
         card = QtWidgets.QFrame()
         card.setObjectName("role_card")
-        card.setStyleSheet("""
-            QFrame#role_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #e94560;
-                border-radius: 15px;
-            }
-        """)
 
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(20)
@@ -251,76 +218,41 @@ class RoleCardWindow(QtWidgets.QWidget):
         # Timer ở trên cùng
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining_time}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("role_timer_label")
         card_layout.addWidget(self.timer_label)
 
         # Biểu tượng vai trò
         self.icon_label = QtWidgets.QLabel("❓")
         self.icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.icon_label.setStyleSheet("font-size: 120px;")
+        self.icon_label.setObjectName("role_icon_label")
         card_layout.addWidget(self.icon_label)
 
         # Role
         you_are_label = QtWidgets.QLabel("YOU ARE")
         you_are_label.setAlignment(QtCore.Qt.AlignCenter)
-        you_are_label.setStyleSheet("""
-            font-size: 16px;
-            color: #888888;
-            letter-spacing: 3px;
-        """)
+        you_are_label.setObjectName("role_you_are_label")
         card_layout.addWidget(you_are_label)
 
         self.role_label = QtWidgets.QLabel("UNKNOWN")
         self.role_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.role_label.setStyleSheet("""
-            font-size: 36px;
-            color: #e94560;
-            font-weight: bold;
-            letter-spacing: 2px;
-        """)
+        self.role_label.setObjectName("role_name_label")
         card_layout.addWidget(self.role_label)
 
         line = QtWidgets.QFrame()
         line.setFrameShape(QtWidgets.QFrame.HLine)
-        line.setStyleSheet("background-color: #444444; max-height: 2px;")
+        line.setObjectName("role_divider")
         card_layout.addWidget(line)
 
         # Mô tả vai trò
         description_scroll = QtWidgets.QScrollArea()
         description_scroll.setWidgetResizable(True)
         description_scroll.setFrameShape(QtWidgets.QFrame.NoFrame)
-        description_scroll.setStyleSheet("""
-            QScrollArea {
-                background-color: transparent;
-                border: none;
-            }
-            QScrollBar:vertical {
-                width: 8px;
-                background-color: #2a2a3e;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #e94560;
-                border-radius: 4px;
-            }
-        """)
+        description_scroll.setObjectName("role_description_scroll")
 
         description_text = QtWidgets.QLabel("")
         description_text.setWordWrap(True)
         description_text.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
-        description_text.setStyleSheet("""
-            font-size: 14px;
-            color: #cccccc;
-            line-height: 1.6;
-            padding: 10px;
-        """)
+        description_text.setObjectName("role_description_label")
 
         self.description_text = description_text
         description_scroll.setWidget(self.description_text)
@@ -328,12 +260,7 @@ class RoleCardWindow(QtWidgets.QWidget):
 
         # Werewolf team
         self.team_label = QtWidgets.QLabel("🐺 Your Werewolf Team:")
-        self.team_label.setStyleSheet("""
-            font-size: 14px;
-            color: #e94560;
-            font-weight: bold;
-            margin-top: 10px;
-        """)
+        self.team_label.setObjectName("wolf_team_label")
         self.team_label.setVisible(False)
         card_layout.addWidget(self.team_label)
 
@@ -349,24 +276,6 @@ class RoleCardWindow(QtWidgets.QWidget):
         # Ready button
         self.ready_button = QtWidgets.QPushButton("✓ Ready")
         self.ready_button.setObjectName("ready_button")
-        self.ready_button.setStyleSheet("""
-            QPushButton#ready_button {
-                background-color: #2ecc71;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 12px 30px;
-                border: none;
-                border-radius: 8px;
-                min-height: 40px;
-            }
-            QPushButton#ready_button:hover {
-                background-color: #27ae60;
-            }
-            QPushButton#ready_button:pressed {
-                background-color: #229954;
-            }
-        """)
         self.ready_button.clicked.connect(self.on_ready_clicked)
         card_layout.addWidget(self.ready_button)
 
@@ -398,8 +307,7 @@ class RoleCardWindow(QtWidgets.QWidget):
             if self.toast_manager:
                 self.toast_manager.info("Logging out...")
 
-            if hasattr(self, 'countdown_timer') and self.countdown_timer:
-                self.countdown_timer.stop()
+            self.stop_timer()
 
             # Clear session data
             if self.window_manager:
@@ -408,7 +316,7 @@ class RoleCardWindow(QtWidgets.QWidget):
                 self.window_manager.set_shared_data("current_room_id", None)
                 self.window_manager.set_shared_data("current_room_name", None)
                 self.window_manager.set_shared_data("is_host", False)
-                self.window_manager.set_shared_data("role_info", {})
+                self.window_manager.get_shared_data("room_state").clear()
                 self.window_manager.set_shared_data("role_card_deadline", None)
                 self.window_manager.set_shared_data("night_begin_deadline", None)
                 self.window_manager.set_shared_data("connected", False)
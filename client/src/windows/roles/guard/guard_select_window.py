@@ -1,45 +1,76 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
-import time
+from components.player_card import PlayerCardGrid
+from utils.deadline_clock import get_deadline_clock
 
 class GuardSelectWindow(QtWidgets.QWidget):
     """Màn hình chọn người chơi để bảo vệ"""
-    def __init__(self, players, my_username, duration_seconds=30, network_client=None, room_id=None, parent=None, window_manager=None, toast_manager=None, deadline=None):
+
+    def __init__(self, players, my_username, duration_seconds=30, network_client=None, room_id=None, parent=None, window_manager=None, toast_manager=None):
         super().__init__(parent)
         self.use_default_size = True
         self.preserve_window_flags = False
-        self.players = players
+        self.players = [p for p in (players or []) if isinstance(p, (dict, str))]
         self.my_username = my_username
         self.duration = duration_seconds
-        # Sử dụng deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
-        
-        self.deadline = deadline
-        if self.deadline is None:
-            # Fallback: tính từ duration
-            self.deadline = time.time() + duration_seconds
-        # Tính remaining từ deadline
-        self.remaining = max(0, int(self.deadline - time.time()))
+        self.deadline = None
+        self.remaining = duration_seconds
         self.network_client = network_client
         self.room_id = room_id
         self.window_manager = window_manager
         self.toast_manager = toast_manager
         self.selected_username = None
         self.my_is_alive = True
+        self.setObjectName("guard_select_window")
+        self.setWindowTitle("Guard — Protect a player")
+        self.timer_active = False  # True từ reset() tới khi phase của màn hình kết thúc
+        self.clock = get_deadline_clock(window_manager)
+        self.setup_ui()
+        # Chỉ dựng widget; deadline được đặt và đồng hồ được subscribe khi NightPhaseController gọi reset()
+        self.update_player_cards()
+
+    def reset(self, players, deadline=None, duration_seconds=None, my_username=None, network_client=None, room_id=None):
+        """Đưa màn hình về trạng thái đầu phase cho đêm mới (không tạo lại widget).
+
+        `deadline` là epoch seconds từ server; None thì tính từ duration.
+        """
+        if duration_seconds is not None:
+            self.duration = duration_seconds
+        if my_username is not None:
+            self.my_username = my_username
+            self.user_header.set_username(my_username or "Player")
+        if network_client is not None:
+            self.network_client = network_client
+        if room_id is not None:
+            self.room_id = room_id
+        # Sử dụng deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
+        self.remaining = self.clock.set_deadline("guard", deadline, self.duration)
+        self.deadline = self.clock.deadline("guard")
+        self.timer_label.setText(f"⏱️ {self.remaining}s")
+
+        self.players = [p for p in (players or []) if isinstance(p, (dict, str))]
+        self.my_is_alive = True
         try:
-            for p in (players or []):
-                if isinstance(p, dict) and p.get("username") == my_username:
+            for p in self.players:
+                if isinstance(p, dict) and p.get("username") == self.my_username:
                     self.my_is_alive = int(p.get("is_alive", 1)) != 0
                     break
         except Exception:
             self.my_is_alive = True
-        self.setObjectName("guard_select_window")
-        self.setWindowTitle("Guard — Protect a player")
-        self.setup_ui()
+        self.dead_hint_label.setVisible(not self.my_is_alive)
+
+        self.selected_username = None
+        self.update_player_cards()
+        # Disabled cho đến khi player selected (guard chết chỉ Skip được)
+        self.select_btn.setEnabled(False)
+        self.skip_btn.setEnabled(True)
         self.start_timer()
-    
+
     def showEvent(self, event):
         """Called when window is shown - update username from shared_data"""
         super().showEvent(event)
+        if self.timer_active:
+            self.start_timer()
         # Update username from shared_data to ensure it's current
         if self.window_manager:
             username = self.window_manager.get_shared_data("username")
@@ -59,14 +90,6 @@ class GuardSelectWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("guard_card")
-        card.setStyleSheet("""
-            QFrame#guard_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #43d9ad;
-                border-radius: 15px;
-            }
-        """)
         
         self.card_layout = QtWidgets.QVBoxLayout()
         self.card_layout.setSpacing(20)
@@ -75,37 +98,23 @@ class GuardSelectWindow(QtWidgets.QWidget):
 
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #43d9ad;
-            font-weight: bold;
-            background-color: rgba(67, 217, 173, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("night_timer_label")
         self.card_layout.addWidget(self.timer_label)
 
         icon_label = QtWidgets.QLabel("🛡️")
         icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 100px;")
+        icon_label.setObjectName("night_icon_label")
         self.card_layout.addWidget(icon_label)
 
         title_label = QtWidgets.QLabel("Guard: Choose a player to protect")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 22px; color: #43d9ad; font-weight: bold;")
+        title_label.setObjectName("night_title_label")
         self.card_layout.addWidget(title_label)
 
         self.dead_hint_label = QtWidgets.QLabel("You are dead. Cannot select anyone. You can still press Skip.")
         self.dead_hint_label.setAlignment(QtCore.Qt.AlignCenter)
         self.dead_hint_label.setVisible(not self.my_is_alive)
-        self.dead_hint_label.setStyleSheet("""
-            font-size: 12px;
-            color: #43d9ad;
-            background-color: rgba(67, 217, 173, 0.12);
-            padding: 6px;
-            border-radius: 6px;
-            margin-top: 6px;
-        """)
+        self.dead_hint_label.setObjectName("night_dead_hint_label")
         self.card_layout.addWidget(self.dead_hint_label)
 
         # Grid chọn user dạng card nhỏ vuông như lobby
@@ -114,168 +123,31 @@ class GuardSelectWindow(QtWidgets.QWidget):
         scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-        """)
+        scroll_area.setObjectName("player_scroll_area")
         
-        self.user_grid_widget = QtWidgets.QWidget()
+        # Card dùng lại qua các đêm, chỉ cập nhật trạng thái khi reset
+        self.user_grid_widget = PlayerCardGrid(col_count=3, card_min_size=(100, 100))
         self.user_grid_widget.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        self.user_grid_layout = QtWidgets.QGridLayout(self.user_grid_widget)
-        self.user_grid_layout.setSpacing(15)
-        self.user_grid_layout.setContentsMargins(10, 10, 10, 10)
-        
-        scroll_area.setWidget(self.user_grid_widget)
-
+        self.user_grid_widget.card_clicked.connect(self._on_card_clicked)
+        self.user_grid_layout = self.user_grid_widget.grid_layout
         self.user_cards = []
-        col_count = 3
-        row = 0
-        col = 0
-        print(f"[DEBUG] GuardSelectWindow rendering {len(self.players)} players")
-        print(f"[DEBUG] GuardSelectWindow players list: {self.players}")
-        # Đảm bảo hiển thị TẤT CẢ players, không filter
-        safe_players = []
-        for p in (self.players or []):
-            if isinstance(p, dict) or isinstance(p, str):
-                safe_players.append(p)
-
-        for p in safe_players:
-            uname = (p.get("username") if isinstance(p, dict) else str(p))
-            if not uname:
-                uname = "(Unknown)"
-            raw_alive = p.get("is_alive", 1) if isinstance(p, dict) else 1
-            try:
-                is_alive = int(raw_alive) != 0
-            except Exception:
-                is_alive = bool(raw_alive)
-
-            card_item = QtWidgets.QFrame()
-            card_item.setObjectName("user_card")
-            card_item.setFrameShape(QtWidgets.QFrame.StyledPanel)
-            
-            # Style khác nhau cho alive và dead players
-            if is_alive:
-                card_item.setStyleSheet("""
-                    QFrame#user_card {
-                        background-color: #1a1a2e;
-                        border: 2px solid #43d9ad;
-                        border-radius: 10px;
-                    }
-                """)
-            else:
-                card_item.setStyleSheet("""
-                    QFrame#user_card {
-                        background-color: #333333;
-                        border: 2px solid #555555;
-                        border-radius: 10px;
-                        opacity: 0.6;
-                    }
-                """)
 
-            card_item_layout = QtWidgets.QVBoxLayout(card_item)
-            card_item_layout.setSpacing(0)
-            card_item_layout.setContentsMargins(5, 5, 5, 5)
-
-            # Icon: 💀 cho dead, 👤 cho alive
-            icon_label = QtWidgets.QLabel("💀" if not is_alive else "👤")
-            icon_label.setAlignment(QtCore.Qt.AlignCenter)
-            icon_label.setStyleSheet("font-size: 32px; padding-top: 5px;")
-            card_item_layout.addWidget(icon_label)
-
-            label_name = uname
-            if uname == self.my_username:
-                label_name = f"{uname}\n(You)"
-            if not is_alive:
-                label_name = label_name + "\n(Dead)"
-
-            name_label = QtWidgets.QLabel(label_name)
-            name_label.setAlignment(QtCore.Qt.AlignCenter)
-            name_label.setStyleSheet(f"""
-                font-size: 11px;
-                font-weight: bold;
-                color: {'#888888' if not is_alive else '#eaeaea'};
-                padding: 2px;
-                background-color: transparent;
-            """)
-            name_label.setWordWrap(True)
-            card_item_layout.addWidget(name_label)
+        scroll_area.setWidget(self.user_grid_widget)
 
-            # If guard is dead: show cards but disable selection (only allow skip)
-            # If guard is alive: allow selection of alive players
-            if self.my_is_alive and is_alive:
-                card_item.mousePressEvent = self._make_card_click(card_item, uname, is_alive)
-                card_item.setCursor(QtCore.Qt.PointingHandCursor)
-            else:
-                # Dead guard or dead target: không thể click, cursor mặc định
-                card_item.setCursor(QtCore.Qt.ForbiddenCursor)
-                # Disable card để không thể tương tác
-                card_item.setEnabled(False)
-            
-            self.user_cards.append((card_item, uname, is_alive))
-            # Size policy để có thể hiển thị
-            card_item.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-            card_item.setMinimumSize(100, 100)
-            self.user_grid_layout.addWidget(card_item, row, col)
-            print(f"[DEBUG] Added card for {uname} at row={row}, col={col}")
-            col += 1
-            if col >= col_count:
-                col = 0
-                row += 1
-        print(f"[DEBUG] Total cards added to grid: {len(self.user_cards)}")
-        
         # Thêm scroll area
         self.card_layout.addWidget(scroll_area, 1)  # stretch factor = 1
         btn_layout = QtWidgets.QHBoxLayout()
         btn_layout.setSpacing(10)
         self.skip_btn = QtWidgets.QPushButton("Skip")
         self.skip_btn.setMinimumHeight(35)
-        self.skip_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #555555;
-                color: #888888;
-                border: none;
-                border-radius: 5px;
-                font-weight: bold;
-                font-size: 13px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #666666;
-                color: #999999;
-            }
-            QPushButton:pressed {
-                background-color: #444444;
-            }
-        """)
+        self.skip_btn.setObjectName("night_skip_button")
         self.skip_btn.clicked.connect(self.on_skip)
         btn_layout.addWidget(self.skip_btn)
         self.select_btn = QtWidgets.QPushButton("Protect")
         self.select_btn.setMinimumHeight(35)
         # If guard is dead, disable select button (only allow skip)
         self.select_btn.setEnabled(False if not self.my_is_alive else False)  # Disabled cho đến khi player selected
-        self.select_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #43d9ad;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                font-weight: bold;
-                font-size: 13px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #5fffd0;
-            }
-            QPushButton:pressed {
-                background-color: #2bbd7e;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-        """)
+        self.select_btn.setObjectName("night_select_button")
         self.select_btn.clicked.connect(self.on_select)
         btn_layout.addWidget(self.select_btn)
         self.card_layout.addLayout(btn_layout)
@@ -283,51 +155,56 @@ class GuardSelectWindow(QtWidgets.QWidget):
         main_layout.addWidget(card)
 
     def start_timer(self):
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)
+        # DeadlineClock dùng chung: _tick chỉ được gọi khi số giây hiển thị đổi.
+        # Màn đang ẩn chỉ ghi nhận, subscribe khi được hiện (showEvent)
+        self.timer_active = True
+        if self.isVisible():
+            self.clock.subscribe(self, {"guard": self._tick})
+
+    def stop_timer(self):
+        self.timer_active = False
+        self.clock.unsubscribe(self)
 
-    def _tick(self):
-        # Tính remaining từ deadline để đồng bộ với server
-        self.remaining = max(0, int(self.deadline - time.time()))
+    def hideEvent(self, event):
+        # Màn ẩn không giữ subscription: deadline "guard" có thể được màn khác đặt lại
+        self.clock.unsubscribe(self)
+        super().hideEvent(event)
+
+    def _tick(self, remaining):
+        self.remaining = remaining
         if self.remaining >= 0:
             self.timer_label.setText(f"⏱️ {self.remaining}s")
         if self.remaining <= 0:
-            self.timer.stop()
+            self.stop_timer()
             self.on_skip()
 
-    def _make_card_click(self, card_item, uname, is_alive):
-        def handler(event):
-            # Chỉ cho phép chọn nếu người chơi còn sống
-            if not is_alive:
-                return
-            
-            # Guard có thể chọn chính mình (bảo vệ chính mình)
-            # Bỏ chọn tất cả
-            for c, _, alive in self.user_cards:
-                if alive:  # Chỉ cập nhật style cho người chơi còn sống
-                    c.setProperty("selected", False)
-                    # Cập nhật style để hiển thị trạng thái không được chọn
-                    c.setStyleSheet("""
-                        QFrame#user_card {
-                            background-color: #1a1a2e;
-                            border: 2px solid #43d9ad;
-                            border-radius: 10px;
-                        }
-                    """)
-            
-            # Chọn card này
-            card_item.setProperty("selected", True)
-            card_item.setStyleSheet("""
-                QFrame#user_card {
-                    background-color: #2a4a5e;
-                    border: 3px solid #43d9ad;
-                    border-radius: 10px;
-                }
-            """)
-            self.selected_username = uname
-            self.select_btn.setEnabled(True)
-        return handler
+    def update_player_cards(self):
+        # Đảm bảo hiển thị TẤT CẢ players, không filter
+        entries = []
+        for p in self.players:
+            uname = (p.get("username") if isinstance(p, dict) else str(p))
+            if not uname:
+                uname = "(Unknown)"
+            raw_alive = p.get("is_alive", 1) if isinstance(p, dict) else 1
+            try:
+                is_alive = int(raw_alive) != 0
+            except Exception:
+                is_alive = bool(raw_alive)
+            # Guard còn sống chọn được mọi người còn sống (kể cả chính mình);
+            # guard chết vẫn thấy card nhưng chỉ Skip được
+            entries.append((uname, is_alive, uname == self.my_username, self.my_is_alive and is_alive))
+        print(f"[DEBUG] GuardSelectWindow rendering {len(entries)} players")
+        self.user_grid_widget.set_players(entries)
+        self.user_cards = self.user_grid_widget.cards()
+
+    def _on_card_clicked(self, uname):
+        # Chỉ cho phép chọn nếu người chơi còn sống
+        if not any(u == uname and alive for _, u, alive in self.user_cards):
+            return
+        # Guard có thể chọn chính mình (bảo vệ chính mình)
+        self.user_grid_widget.set_selected(uname)
+        self.selected_username = uname
+        self.select_btn.setEnabled(True)
 
     def on_select(self):
         if not self.my_is_alive:
@@ -346,8 +223,7 @@ class GuardSelectWindow(QtWidgets.QWidget):
         self.skip_btn.setEnabled(False)
         
         # Dừng bộ đếm thời gian
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         
         if self.network_client and self.room_id is not None:
             try:
@@ -365,8 +241,7 @@ class GuardSelectWindow(QtWidgets.QWidget):
                 # Bật lại nút khi có lỗi
                 self.select_btn.setEnabled(True)
                 self.skip_btn.setEnabled(True)
-                if hasattr(self, 'timer'):
-                    self.timer.start(1000)
+                self.start_timer()
                 return
         
         # Close window - server sẽ broadcast PHASE_WOLF_START khi guard chọn xong
@@ -409,8 +284,7 @@ class GuardSelectWindow(QtWidgets.QWidget):
 
     def on_skip(self):
         # Dừng bộ đếm thời gian
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         # Vô hiệu hóa nút
         self.select_btn.setEnabled(False)
         self.skip_btn.setEnabled(False)
@@ -427,6 +301,5 @@ class GuardSelectWindow(QtWidgets.QWidget):
         self.close()
 
     def closeEvent(self, event):
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         event.accept()
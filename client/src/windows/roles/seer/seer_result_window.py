@@ -1,5 +1,6 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
+from utils.style_utils import set_style_property
 try:
     from utils.image_utils import create_image_icon_label
 except ImportError:
@@ -17,9 +18,23 @@ class SeerResultWindow(QtWidgets.QWidget):
         self.toast_manager = toast_manager
         self.setObjectName("seer_result_window")
         self.setWindowTitle("Seer Result")
-        self.setup_ui(target_username, is_werewolf)
+        self.setup_ui()
+        self.reset(target_username, is_werewolf)
 
-    def setup_ui(self, target_username, is_werewolf):
+    def reset(self, target_username, is_werewolf):
+        """Hiển thị kết quả mới trên widget có sẵn (không tạo lại ảnh/label)"""
+        self.target_username = target_username
+        self.is_werewolf = bool(is_werewolf)
+        self.werewolf_icon.setVisible(self.is_werewolf)
+        self.not_werewolf_icon.setVisible(not self.is_werewolf)
+        self.title_label.setText(f"{target_username}")
+        self.subtitle_label.setText("IS A WEREWOLF" if self.is_werewolf else "IS NOT A WEREWOLF")
+        # Màu theo property [werewolf] trong werewolf_theme.qss
+        set_style_property(self.subtitle_label, "werewolf", self.is_werewolf)
+        if self.window_manager:
+            self.user_header.set_username(self.window_manager.get_shared_data("username") or "Player")
+
+    def setup_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
@@ -34,45 +49,32 @@ class SeerResultWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("seer_result_card")
-        card.setStyleSheet("""
-            QFrame#seer_result_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #3a86ff;
-                border-radius: 15px;
-            }
-        """)
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(30)
         card_layout.setContentsMargins(30, 30, 30, 30)
 
-        # Render ảnh thay vì emoji
-        if is_werewolf:
-            icon_label = create_image_icon_label("is_werewolf.png", size=180)
-        else:
-            icon_label = create_image_icon_label("is_not_werewolf.png", size=180)
-        card_layout.addWidget(icon_label)
+        # Render ảnh thay vì emoji; tạo cả hai ảnh một lần, reset() chỉ đổi cái nào hiện
+        self.werewolf_icon = create_image_icon_label("is_werewolf.png", size=180)
+        card_layout.addWidget(self.werewolf_icon)
+        self.not_werewolf_icon = create_image_icon_label("is_not_werewolf.png", size=180)
+        card_layout.addWidget(self.not_werewolf_icon)
 
-        title = QtWidgets.QLabel(f"{target_username}")
-        title.setAlignment(QtCore.Qt.AlignCenter)
-        title.setStyleSheet("font-size:28px; font-weight:bold; color:#fff;")
-        card_layout.addWidget(title)
+        self.title_label = QtWidgets.QLabel()
+        self.title_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.title_label.setObjectName("seer_result_name_label")
+        card_layout.addWidget(self.title_label)
 
-        subtitle = "IS A WEREWOLF" if is_werewolf else "IS NOT A WEREWOLF"
-        subtitle_lbl = QtWidgets.QLabel(subtitle)
-        subtitle_lbl.setAlignment(QtCore.Qt.AlignCenter)
-        if is_werewolf:
-            subtitle_lbl.setStyleSheet("font-size:20px; color:#e94560; font-weight:bold;")
-        else:
-            subtitle_lbl.setStyleSheet("font-size:20px; color:#3a86ff; font-weight:bold;")
-        card_layout.addWidget(subtitle_lbl)
+        self.subtitle_label = QtWidgets.QLabel()
+        self.subtitle_label.setObjectName("seer_result_verdict_label")
+        self.subtitle_label.setAlignment(QtCore.Qt.AlignCenter)
+        card_layout.addWidget(self.subtitle_label)
 
         card_layout.addStretch()
 
-        btn = QtWidgets.QPushButton("OK")
-        btn.setStyleSheet("font-size:18px; padding:10px 30px; border-radius:8px; background:#3a86ff; color:white;")
-        btn.clicked.connect(self.close)
-        card_layout.addWidget(btn, alignment=QtCore.Qt.AlignCenter)
+        self.ok_btn = QtWidgets.QPushButton("OK")
+        self.ok_btn.setObjectName("seer_result_ok_button")
+        self.ok_btn.clicked.connect(self.close)
+        card_layout.addWidget(self.ok_btn, alignment=QtCore.Qt.AlignCenter)
 
         main_layout.addWidget(card)
 
@@ -1,5 +1,6 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
+from utils.deadline_clock import get_deadline_clock
 
 class SeerWaitWindow(QtWidgets.QWidget):
     """Màn chờ cho non seer"""
@@ -8,12 +9,26 @@ class SeerWaitWindow(QtWidgets.QWidget):
         self.use_default_size = True
         self.preserve_window_flags = False
         self.duration = duration_seconds
+        self.deadline = None
         self.remaining = duration_seconds
         self.window_manager = window_manager
         self.toast_manager = toast_manager
         self.setObjectName("seer_wait_window")
         self.setWindowTitle("Night — Seer is choosing")
+        self.timer_active = False  # True từ reset() tới khi phase của màn hình kết thúc
+        self.clock = get_deadline_clock(window_manager)
         self.setup_ui()
+        # Chỉ dựng widget; deadline được đặt và đồng hồ được subscribe khi NightPhaseController gọi reset()
+
+    def reset(self, deadline=None, duration_seconds=None):
+        """Đếm ngược lại cho đêm mới (không tạo lại widget); `deadline` là epoch seconds từ server"""
+        if duration_seconds is not None:
+            self.duration = duration_seconds
+        self.remaining = self.clock.set_deadline("seer", deadline, self.duration)
+        self.deadline = self.clock.deadline("seer")
+        self.timer_label.setText(f"⏱️ {self.remaining}s")
+        if self.window_manager:
+            self.user_header.set_username(self.window_manager.get_shared_data("username") or "Player")
         self.start_timer()
 
     def setup_ui(self):
@@ -32,43 +47,28 @@ class SeerWaitWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("seer_wait_card")
-        card.setStyleSheet("""
-            QFrame#seer_wait_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #3a86ff;
-                border-radius: 15px;
-            }
-        """)
         card_layout = QtWidgets.QVBoxLayout(card)
         card_layout.setSpacing(30)
         card_layout.setContentsMargins(30, 30, 30, 30)
 
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("night_timer_label")
         card_layout.addWidget(self.timer_label)
 
         icon_label = QtWidgets.QLabel("🔮")
         icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 100px;")
+        icon_label.setObjectName("night_icon_label")
         card_layout.addWidget(icon_label)
 
         title_label = QtWidgets.QLabel("The Seer is checking a player...")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 22px; color: #3a86ff; font-weight: bold;")
+        title_label.setObjectName("night_title_label")
         card_layout.addWidget(title_label)
 
         subtitle = QtWidgets.QLabel("Please wait while the Seer performs their action.")
         subtitle.setAlignment(QtCore.Qt.AlignCenter)
-        subtitle.setStyleSheet("font-size: 16px; color: #cccccc; margin-top: 10px;")
+        subtitle.setObjectName("night_subtitle_label")
         card_layout.addWidget(subtitle)
 
         card_layout.addStretch()
@@ -109,19 +109,35 @@ class SeerWaitWindow(QtWidgets.QWidget):
                 self.toast_manager.error(f"Logout error: {str(e)}")
 
     def start_timer(self):
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)
+        # DeadlineClock dùng chung: _tick chỉ được gọi khi số giây hiển thị đổi.
+        # Màn đang ẩn chỉ ghi nhận, subscribe khi được hiện (showEvent)
+        self.timer_active = True
+        if self.isVisible():
+            self.clock.subscribe(self, {"seer": self._tick})
+
+    def stop_timer(self):
+        self.timer_active = False
+        self.clock.unsubscribe(self)
+
+    def hideEvent(self, event):
+        # Màn ẩn không giữ subscription: deadline "seer" có thể được màn khác đặt lại
+        self.clock.unsubscribe(self)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Hiện trong phase (sau reset, hoặc qua lại wolf chat) thì đếm theo deadline hiện tại
+        if self.timer_active:
+            self.start_timer()
 
-    def _tick(self):
-        self.remaining -= 1
+    def _tick(self, remaining):
+        self.remaining = remaining
         if self.remaining > 0:
             self.timer_label.setText(f"⏱️ {self.remaining}s")
         else:
-            self.timer.stop()
+            self.stop_timer()
             self.close()
 
     def closeEvent(self, event):
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         event.accept()
@@ -1,32 +1,10 @@
 from PyQt5 import QtWidgets, QtCore
 from components.user_header import UserHeader
-import time
+from components.player_card import PlayerCardGrid
+from utils.deadline_clock import get_deadline_clock
 class WolfSelectWindow(QtWidgets.QWidget):
     """Wolf selection window: choose a living target to bite (UI-only selection until submit)."""
 
-    _CARD_STYLE_ALIVE = """
-        QFrame#user_card {
-            background-color: #1a1a2e;
-            border: 2px solid #e94560;
-            border-radius: 10px;
-        }
-    """
-    _CARD_STYLE_ALIVE_SELECTED = """
-        QFrame#user_card {
-            background-color: #3a1a2e;
-            border: 3px solid #e94560;
-            border-radius: 10px;
-        }
-    """
-    _CARD_STYLE_DEAD = """
-        QFrame#user_card {
-            background-color: #333333;
-            border: 2px solid #555555;
-            border-radius: 10px;
-            opacity: 0.6;
-        }
-    """
-
     def __init__(
         self,
         player_list,
@@ -39,22 +17,17 @@ class WolfSelectWindow(QtWidgets.QWidget):
         parent=None,
         window_manager=None,
         toast_manager=None,
-        deadline=None,
     ):
+        super().__init__(parent)
         super().__init__(parent)
         self.use_default_size = True
         self.preserve_window_flags = False
-        self.player_list = player_list
-        self.alive_status = alive_status
+        self.player_list = list(player_list or [])
+        self.alive_status = list(alive_status or [])
         self.my_username = my_username
         self.duration = duration_seconds
-        # Sử dụng deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
-        self.deadline = deadline
-        if self.deadline is None:
-            # Fallback: tính từ duration
-            self.deadline = time.time() + duration_seconds
-        # Tính remaining từ deadline
-        self.remaining = max(0, int(self.deadline - time.time()))
+        self.deadline = None
+        self.remaining = duration_seconds
         self.network_client = network_client
         self.room_id = room_id
         self.window_manager = window_manager
@@ -64,7 +37,41 @@ class WolfSelectWindow(QtWidgets.QWidget):
 
         self.setObjectName("wolf_select_window")
         self.setWindowTitle("Wolf — Choose a victim")
+        self.timer_active = False  # True từ reset() tới khi phase của màn hình kết thúc
+        self.clock = get_deadline_clock(window_manager)
         self.setup_ui()
+        # Chỉ dựng widget; deadline được đặt và đồng hồ được subscribe khi NightPhaseController gọi reset()
+        self.update_player_cards()
+
+    def reset(self, player_list, alive_status, deadline=None, can_vote=True, duration_seconds=None,
+              my_username=None, network_client=None, room_id=None):
+        """Đưa màn hình về trạng thái đầu phase cho đêm mới (không tạo lại widget).
+
+        `deadline` là epoch seconds từ server; None thì tính từ duration.
+        """
+        if duration_seconds is not None:
+            self.duration = duration_seconds
+        if my_username is not None:
+            self.my_username = my_username
+            self.user_header.set_username(my_username or "Player")
+        if network_client is not None:
+            self.network_client = network_client
+        if room_id is not None:
+            self.room_id = room_id
+        # Sử dụng deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
+        self.remaining = self.clock.set_deadline("wolf", deadline, self.duration)
+        self.deadline = self.clock.deadline("wolf")
+        self.timer_label.setText(f"⏱️ {self.remaining}s")
+
+        self.player_list = list(player_list or [])
+        self.alive_status = list(alive_status or [])
+        self.can_vote = bool(can_vote)
+        self.dead_hint_label.setVisible(not self.can_vote)
+
+        self.selected_username = None
+        self.update_player_cards()
+        self.select_btn.setEnabled(False)  # Disabled until a living player is selected
+        self.skip_btn.setEnabled(self.can_vote)
         self.start_timer()
 
     def setup_ui(self):
@@ -79,14 +86,6 @@ class WolfSelectWindow(QtWidgets.QWidget):
 
         card = QtWidgets.QFrame()
         card.setObjectName("wolf_card")
-        card.setStyleSheet("""
-            QFrame#wolf_card {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border: 3px solid #e94560;
-                border-radius: 15px;
-            }
-        """)
         self.card_layout = QtWidgets.QVBoxLayout()
         self.card_layout.setSpacing(20)
         self.card_layout.setContentsMargins(30, 30, 30, 30)
@@ -94,14 +93,7 @@ class WolfSelectWindow(QtWidgets.QWidget):
 
         self.timer_label = QtWidgets.QLabel(f"⏱️ {self.remaining}s")
         self.timer_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.timer_label.setStyleSheet("""
-            font-size: 18px;
-            color: #f39c12;
-            font-weight: bold;
-            background-color: rgba(243, 156, 18, 0.1);
-            padding: 8px;
-            border-radius: 5px;
-        """)
+        self.timer_label.setObjectName("night_timer_label")
         self.card_layout.addWidget(self.timer_label)
 
         # Header
@@ -109,85 +101,22 @@ class WolfSelectWindow(QtWidgets.QWidget):
 
         title_label = QtWidgets.QLabel("Wolves: Choose a player to bite")
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 20px; color: #e94560; font-weight: bold; margin-top: 4px;")
+        title_label.setObjectName("night_title_label")
         header_v.addWidget(title_label, alignment=QtCore.Qt.AlignCenter)
 
         self.dead_hint_label = QtWidgets.QLabel("You are dead. You cannot vote.")
         self.dead_hint_label.setAlignment(QtCore.Qt.AlignCenter)
         self.dead_hint_label.setVisible(not self.can_vote)
-        self.dead_hint_label.setStyleSheet("""
-            font-size: 12px;
-            color: #f39c12;
-            background-color: rgba(243, 156, 18, 0.12);
-            padding: 6px;
-            border-radius: 6px;
-            margin-top: 6px;
-        """)
+        self.dead_hint_label.setObjectName("night_dead_hint_label")
         header_v.addWidget(self.dead_hint_label)
 
         self.card_layout.addLayout(header_v)
 
-        # Grid of players (cards)
-        self.user_grid_widget = QtWidgets.QWidget()
-        self.user_grid_layout = QtWidgets.QGridLayout(self.user_grid_widget)
-        self.user_grid_layout.setSpacing(15)
-        self.user_grid_layout.setContentsMargins(10, 10, 10, 10)
-
+        # Grid of players (cards), reused across nights
+        self.user_grid_widget = PlayerCardGrid(col_count=3)
+        self.user_grid_widget.card_clicked.connect(self._on_card_clicked)
+        self.user_grid_layout = self.user_grid_widget.grid_layout
         self.user_cards = []
-        col_count = 3
-        row = 0
-        col = 0
-        for i, uname in enumerate(self.player_list):
-            raw_alive = self.alive_status[i] if i < len(self.alive_status) else 1
-            try:
-                is_alive = int(raw_alive) != 0
-            except Exception:
-                is_alive = bool(raw_alive)
-
-            card_item = QtWidgets.QFrame()
-            card_item.setObjectName("user_card")
-            card_item.setFrameShape(QtWidgets.QFrame.StyledPanel)
-            
-            if is_alive:
-                card_item.setStyleSheet(self._CARD_STYLE_ALIVE)
-            else:
-                card_item.setStyleSheet(self._CARD_STYLE_DEAD)
-
-            card_item_layout = QtWidgets.QVBoxLayout(card_item)
-            card_item_layout.setSpacing(0)
-            card_item_layout.setContentsMargins(5, 5, 5, 5)
-
-            icon_label = QtWidgets.QLabel("💀" if not is_alive else "👤")
-            icon_label.setAlignment(QtCore.Qt.AlignCenter)
-            icon_label.setStyleSheet("font-size: 32px; padding-top: 5px;")
-            card_item_layout.addWidget(icon_label)
-
-            name_label = QtWidgets.QLabel(uname + ("\n(Dead)" if not is_alive else ""))
-            name_label.setAlignment(QtCore.Qt.AlignCenter)
-            name_label.setStyleSheet(f"""
-                font-size: 11px;
-                font-weight: bold;
-                color: {'#888888' if not is_alive else '#eaeaea'};
-                padding: 2px;
-                background-color: transparent;
-            """)
-            name_label.setWordWrap(True)
-            card_item_layout.addWidget(name_label)
-
-            if is_alive and self.can_vote:
-                card_item.mousePressEvent = self._make_card_click(card_item, uname)
-                card_item.setCursor(QtCore.Qt.PointingHandCursor)
-            else:
-                card_item.setCursor(QtCore.Qt.ForbiddenCursor)
-                card_item.setEnabled(False)
-
-            self.user_cards.append((card_item, uname, is_alive))
-            self.user_grid_layout.addWidget(card_item, row, col)
-            col += 1
-            if col >= col_count:
-                col = 0
-                row += 1
-
         self.card_layout.addWidget(self.user_grid_widget)
 
         btn_layout = QtWidgets.QHBoxLayout()
@@ -195,52 +124,14 @@ class WolfSelectWindow(QtWidgets.QWidget):
 
         self.skip_btn = QtWidgets.QPushButton("Skip")
         self.skip_btn.setMinimumHeight(35)
-        self.skip_btn.setEnabled(self.can_vote)
-        self.skip_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #555555;
-                color: #888888;
-                border: none;
-                border-radius: 5px;
-                font-weight: bold;
-                font-size: 13px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #666666;
-                color: #999999;
-            }
-            QPushButton:pressed {
-                background-color: #444444;
-            }
-        """)
+        self.skip_btn.setObjectName("night_skip_button")
         self.skip_btn.clicked.connect(self.on_skip)
         btn_layout.addWidget(self.skip_btn)
 
         self.select_btn = QtWidgets.QPushButton("Bite")
         self.select_btn.setMinimumHeight(35)
         self.select_btn.setEnabled(False)  # Disabled until a living player is selected
-        self.select_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e94560;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                font-weight: bold;
-                font-size: 13px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #ff5770;
-            }
-            QPushButton:pressed {
-                background-color: #d03550;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-        """)
+        self.select_btn.setObjectName("night_select_button")
         self.select_btn.clicked.connect(self.on_select)
         btn_layout.addWidget(self.select_btn)
 
@@ -251,29 +142,8 @@ class WolfSelectWindow(QtWidgets.QWidget):
         self.chat_btn.setMinimumHeight(36)
         self.chat_btn.setMinimumWidth(180)
         self.chat_btn.setCursor(QtCore.Qt.PointingHandCursor)
-        self.chat_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ffffff;
-                color: #1a1a2e;
-                border: 2px solid rgba(233,69,96,0.12);
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 13px;
-                padding: 8px 18px;
-            }
-            QPushButton:hover {
-                border-color: #e94560;
-                box-shadow: 0px 4px 10px rgba(233,69,96,0.1);
-            }
-            QPushButton:pressed {
-                background-color: #f8f8f8;
-            }
-            QPushButton:disabled {
-                background-color: #efefef;
-                color: #999999;
-                border-color: rgba(0,0,0,0.06);
-            }
-        """)
+        self.chat_btn.setObjectName("wolf_chat_button")
+        self.chat_btn.clicked.connect(self._open_chat)
         self.card_layout.addWidget(self.chat_btn, alignment=QtCore.Qt.AlignCenter)
 
         self.card_layout.addStretch()
@@ -314,33 +184,56 @@ class WolfSelectWindow(QtWidgets.QWidget):
                 self.toast_manager.error(f"Logout error: {str(e)}")
 
     def start_timer(self):
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)
-
-    def _tick(self):
-        # Tính remaining từ deadline để đồng bộ với server
-        self.remaining = max(0, int(self.deadline - time.time()))
+        # DeadlineClock dùng chung: _tick chỉ được gọi khi số giây hiển thị đổi.
+        # Màn đang ẩn chỉ ghi nhận, subscribe khi được hiện (showEvent)
+        self.timer_active = True
+        if self.isVisible():
+            self.clock.subscribe(self, {"wolf": self._tick})
+
+    def stop_timer(self):
+        self.timer_active = False
+        self.clock.unsubscribe(self)
+
+    def hideEvent(self, event):
+        # Màn ẩn không giữ subscription: deadline "wolf" có thể được màn khác đặt lại
+        self.clock.unsubscribe(self)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Hiện trong phase (sau reset, hoặc qua lại wolf chat) thì đếm theo deadline hiện tại
+        if self.timer_active:
+            self.start_timer()
+
+    def _tick(self, remaining):
+        self.remaining = remaining
         if self.remaining >= 0:
             self.timer_label.setText(f"⏱️ {self.remaining}s")
         if self.remaining <= 0:
-            self.timer.stop()
+            self.stop_timer()
             self.on_skip()
 
-    def _make_card_click(self, card_item, uname):
-        def handler(event):
-            # Before submit, wolves can change target freely by clicking another card.
-            for c, _, alive in self.user_cards:
-                if alive:
-                    c.setProperty("selected", False)
-                    c.setStyleSheet(self._CARD_STYLE_ALIVE)
+    def update_player_cards(self):
+        entries = []
+        for i, uname in enumerate(self.player_list):
+            raw_alive = self.alive_status[i] if i < len(self.alive_status) else 1
+            try:
+                is_alive = int(raw_alive) != 0
+            except Exception:
+                is_alive = bool(raw_alive)
+            entries.append((uname, is_alive, False, is_alive and self.can_vote))
+        self.user_grid_widget.set_players(entries)
+        self.user_cards = self.user_grid_widget.cards()
 
-            card_item.setProperty("selected", True)
-            card_item.setStyleSheet(self._CARD_STYLE_ALIVE_SELECTED)
+    def _on_card_clicked(self, uname):
+        # Before submit, wolves can change target freely by clicking another card.
+        self.user_grid_widget.set_selected(uname)
+        self.selected_username = uname
+        self.select_btn.setEnabled(True)
 
-            self.selected_username = uname
-            self.select_btn.setEnabled(True)
-        return handler
+    def _open_chat(self):
+        if self.window_manager and "wolf_chat" in self.window_manager.windows:
+            self.window_manager.navigate_to("wolf_chat")
 
     def get_selected_username(self):
         return self.selected_username
@@ -369,8 +262,7 @@ class WolfSelectWindow(QtWidgets.QWidget):
         self.select_btn.setEnabled(False)
         self.skip_btn.setEnabled(False)
         
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         
         if self.network_client and self.room_id is not None:
             try:
@@ -380,8 +272,7 @@ class WolfSelectWindow(QtWidgets.QWidget):
                 # Re-enable buttons on error (allow changing selection and re-submit)
                 self.select_btn.setEnabled(True)
                 self.skip_btn.setEnabled(True)
-                if hasattr(self, 'timer'):
-                    self.timer.start(1000)
+                self.start_timer()
                 return
         
         # Close window; server will send (optional) WOLF_KILL_RES ack and later PHASE_DAY
@@ -391,15 +282,13 @@ class WolfSelectWindow(QtWidgets.QWidget):
         # Dead wolves cannot skip (no server action), but the window should still close (e.g. on timeout).
         if not self.can_vote:
             try:
-                if hasattr(self, 'timer'):
-                    self.timer.stop()
+                self.stop_timer()
             except Exception:
                 pass
             self.close()
             return
 
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
 
         self.select_btn.setEnabled(False)
         self.skip_btn.setEnabled(False)
@@ -413,6 +302,5 @@ class WolfSelectWindow(QtWidgets.QWidget):
         self.close()
 
     def closeEvent(self, event):
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.stop_timer()
         event.accept()
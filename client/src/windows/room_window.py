@@ -5,6 +5,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.image_utils import set_window_icon
 from components.user_header import UserHeader
 from utils.connection_monitor import ConnectionMonitor
+from utils.deadline_clock import get_deadline_clock
+from utils.style_utils import set_style_property
+import protocol
 
 
 class RoomWindow(QtWidgets.QWidget):    
@@ -25,13 +28,13 @@ class RoomWindow(QtWidgets.QWidget):
         self.setObjectName("room_window")
         self.setup_ui()
 
-        # Timer
-        self.recv_timer = QtCore.QTimer()
-        self.recv_timer.timeout.connect(self.receive_packets)
+        # Nhận packet qua dispatcher dùng chung (subscribe từ lúc vào phòng đến lúc rời phòng)
+        self.dispatcher = self.window_manager.get_shared_data("packet_dispatcher")
+        self.dispatcher.connection_lost.connect(self.on_receive_connection_lost)
+        self.dispatcher.receive_failed.connect(self.on_receive_failed)
 
-        # Day phase shared timer (updates vote panel countdown)
-        self.day_timer = QtCore.QTimer()
-        self.day_timer.timeout.connect(self._update_day_timer)
+        # Day phase countdown (deadline "day" trên DeadlineClock dùng chung, cập nhật vote/chat panel)
+        self.clock = get_deadline_clock(self.window_manager)
         self._day_deadline = None
 
         # Connection monitor
@@ -54,7 +57,7 @@ class RoomWindow(QtWidgets.QWidget):
         header_layout.addStretch()
         
         wolf_icon = QtWidgets.QLabel("🐺")
-        wolf_icon.setStyleSheet("font-size: 40px;")
+        wolf_icon.setObjectName("room_header_icon_label")
         header_layout.addWidget(wolf_icon)
         
         # Room title
@@ -64,7 +67,7 @@ class RoomWindow(QtWidgets.QWidget):
         header_layout.addWidget(self.room_title_label)
         
         wolf_icon2 = QtWidgets.QLabel("🐺")
-        wolf_icon2.setStyleSheet("font-size: 40px;")
+        wolf_icon2.setObjectName("room_header_icon_label")
         header_layout.addWidget(wolf_icon2)
         
         header_layout.addStretch()
@@ -84,7 +87,7 @@ class RoomWindow(QtWidgets.QWidget):
         # Legend
         legend_layout = QtWidgets.QHBoxLayout()
         legend_label = QtWidgets.QLabel("👑 = Host  |  👤 = Player")
-        legend_label.setStyleSheet("color: #FFD700; font-size: 11px; padding: 5px;")
+        legend_label.setObjectName("room_legend_label")
         legend_layout.addWidget(legend_label)
         legend_layout.addStretch()
         players_layout.addLayout(legend_layout)
@@ -99,7 +102,6 @@ class RoomWindow(QtWidgets.QWidget):
         self.min_players_label = QtWidgets.QLabel(f"⚠️ Minimum {self.MIN_PLAYERS} players required to start")
         self.min_players_label.setObjectName("min_players_label")
         self.min_players_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.min_players_label.setStyleSheet("color: #f39c12; font-weight: bold;")
         self.min_players_label.setVisible(True)
         players_layout.addWidget(self.min_players_label)
         
@@ -144,13 +146,11 @@ class RoomWindow(QtWidgets.QWidget):
         self.is_host = self.window_manager.get_shared_data("is_host", False)
         username = self.window_manager.get_shared_data("username")
 
-        # Determine host from room_players
-        players = self.window_manager.get_shared_data("room_players", [])
+        # Determine host from RoomState (first player)
+        room_state = self.window_manager.get_shared_data("room_state")
+        players = room_state.player_dicts()
         if players:
-            try:
-                self.current_host = players[0].get("username")
-            except Exception:
-                self.current_host = None
+            self.current_host = room_state.host()
         else:
             self.current_host = username if self.is_host else None
 
@@ -172,7 +172,7 @@ class RoomWindow(QtWidgets.QWidget):
         # Load players into UI
         try:
             self.update_player_list(players, username)
-            self.current_player_count = len(players) if isinstance(players, list) else 0
+            self.current_player_count = len(players)
             self.update_player_count_ui()
         except Exception:
             pass
@@ -186,13 +186,21 @@ class RoomWindow(QtWidgets.QWidget):
             )
             self.connection_monitor.connection_lost.connect(self.on_connection_lost)
             self.connection_monitor.connection_restored.connect(self.on_connection_restored)
+            # Any inbound traffic means the connection is alive.
+            self.dispatcher.activity.connect(self.connection_monitor.on_activity)
 
         if self.connection_monitor:
             self.connection_monitor.start()
 
+        # Day/wolf chat subscribe CHAT_BROADCAST trong __init__: phải được tạo trước khi game bắt đầu
+        # (bình thường prewarm đã tạo; cửa sổ đã tạo thì ensure_window không tốn gì)
+        for name in ("day_chat", "wolf_chat"):
+            if name in self.window_manager.windows:
+                self.window_manager.ensure_window(name)
+
         # Start receiving packets
-        if start_receiving and self.network_client and not self.recv_timer.isActive():
-            self.recv_timer.start(100)
+        if start_receiving and self.network_client and not self.dispatcher.is_subscribed(self):
+            self.dispatcher.subscribe(self, self.packet_handlers())
         
     def showEvent(self, event):
         """Called when window is shown"""
@@ -202,9 +210,8 @@ class RoomWindow(QtWidgets.QWidget):
     def hideEvent(self, event):
         """Called when window is hidden"""
         super().hideEvent(event)
-        # KHÔNG dừng recv_timer khi hide - vẫn cần receive packets khi ở night_begin hoặc role_card
+        # KHÔNG unsubscribe khi hide - vẫn cần receive packets khi ở night_begin hoặc role_card
         # Chỉ dừng khi thực sự rời khỏi room (leave room, logout, etc.)
-        # self.recv_timer.stop()  # Comment out để vẫn receive packets
         # Connection monitor vẫn chạy để monitor connection
         
     def update_player_list(self, players, current_username):
@@ -243,32 +250,23 @@ class RoomWindow(QtWidgets.QWidget):
         # Update label
         if self.current_player_count < self.MIN_PLAYERS:
             status_text = f"⚠️ Players: {self.current_player_count}/{self.MAX_PLAYERS_PER_ROOM} (Need {self.MIN_PLAYERS} to start)"
-            self.player_count_label.setStyleSheet("font-size: 14px; color: #e74c3c; padding: 5px; font-weight: bold;")
         else:
             status_text = f"✓ Players: {self.current_player_count}/{self.MAX_PLAYERS_PER_ROOM} (Ready to start!)"
-            self.player_count_label.setStyleSheet("font-size: 14px; color: #2ecc71; padding: 5px; font-weight: bold;")
         
         self.player_count_label.setText(status_text)
+        set_style_property(self.player_count_label, "ready", self.current_player_count >= self.MIN_PLAYERS)
         
         # Cập nhật trạng thái nút bắt đầu
         if self.is_host:
             can_start = self.current_player_count >= self.MIN_PLAYERS
             self.start_game_button.setEnabled(can_start)
             
+            # Gray out when disabled (rule [can_start="false"]:disabled trong theme)
+            set_style_property(self.start_game_button, "can_start", can_start)
             if not can_start:
                 self.start_game_button.setToolTip(f"Need at least {self.MIN_PLAYERS} players to start")
-                # Gray out when disabled
-                self.start_game_button.setStyleSheet("""
-                    QPushButton:disabled {
-                        background-color: #555555;
-                        color: #888888;
-                        border: 1px solid #444444;
-                    }
-                """)
             else:
                 self.start_game_button.setToolTip("Start the game!")
-                # Reset style when enabled
-                self.start_game_button.setStyleSheet("")
                 
     def on_start_game(self):
         """Xử lý khi nhấn nút bắt đầu"""
@@ -330,49 +328,34 @@ class RoomWindow(QtWidgets.QWidget):
         except Exception as e:
             self.toast_manager.error(f"Failed to leave room: {str(e)}")
             
-    def receive_packets(self):
-        """Nhận gói tin từ server"""
-        if not self.network_client:
+    def on_receive_failed(self, error_msg):
+        """Dispatcher báo lỗi nhận (RuntimeError)"""
+        # Chỉ handle disconnect khi room đang nhận packet
+        if not self.dispatcher.is_subscribed(self):
             return
-            
-        try:
-            header, payload = self.network_client.receive_packet()
-
-            if header is None:
-                return
+        # Kiểm tra xem có phải server disconnect không
+        if "Server closed" in error_msg or "Receive failed" in error_msg:
+            print(f"[ERROR] Server disconnected: {error_msg}")
+            self.handle_server_disconnect()
+        else:
+            # Không hiển thị error cho mọi exception - có thể chỉ là timeout
+            print(f"[DEBUG] Receive error (non-critical): {error_msg}")
 
-            self.handle_packet(header, payload)
-            
-        except RuntimeError as e:
-            error_msg = str(e)
-            # Kiểm tra xem có phải server disconnect không
-            if "Server closed" in error_msg or "Receive failed" in error_msg:
-                print(f"[ERROR] Server disconnected: {error_msg}")
-                # Chỉ handle disconnect nếu thực sự disconnect, không phải timeout
-                if self.recv_timer.isActive():
-                    self.handle_server_disconnect()
-            else:
-                # Không hiển thị error cho mọi exception - có thể chỉ là timeout
-                print(f"[DEBUG] Receive error (non-critical): {error_msg}")
-        except ConnectionError as e:
-            # Connection lost detected
-            print(f"[DEBUG] Connection lost: {e}")
-            # Trigger connection lost handling via monitor
-            if self.connection_monitor:
-                self.connection_monitor.is_connected = False
-                self.connection_monitor.stop()
-                self.connection_monitor.handle_connection_lost()
-        except Exception as e:
-            # Catch all other exceptions để tránh crash
-            print(f"[WARNING] Unexpected error in receive_packets: {e}")
-            import traceback
-            traceback.print_exc()
+    def on_receive_connection_lost(self, error_msg):
+        """Dispatcher báo server đóng kết nối (ConnectionError)"""
+        if not self.dispatcher.is_subscribed(self):
+            return
+        # Trigger connection lost handling via monitor
+        if self.connection_monitor:
+            self.connection_monitor.is_connected = False
+            self.connection_monitor.stop()
+            self.connection_monitor.handle_connection_lost()
             
     def handle_server_disconnect(self):
         """Xử lý khi server disconnect"""
         print("[DEBUG] Handling server disconnect...")
-        # Dừng receive timer
-        self.recv_timer.stop()
+        # Dừng nhận packet
+        self.dispatcher.unsubscribe(self)
         
         # Hiển thị thông báo
         self.toast_manager.error("⚠️ Server disconnected! Returning to welcome screen...")
@@ -403,571 +386,516 @@ class RoomWindow(QtWidgets.QWidget):
         # Navigate về welcome screen
         self.window_manager.navigate_to("welcome")
             
-    def handle_packet(self, header, payload):
-        """Xử lý gói tin nhận được"""
-        # Any inbound traffic means the connection is alive.
-        try:
-            if self.connection_monitor:
-                self.connection_monitor.on_activity()
-        except Exception:
-            pass
+    def packet_handlers(self):
+        """Bảng định tuyến header -> handler đăng ký với dispatcher.
 
-        # Handle PING from server
-        if header == 501:  # PING
-            try:
-                # Reply with proper PONG header (502).
-                if hasattr(self.network_client, "send_pong"):
-                    self.network_client.send_pong()
-                else:
-                    self.network_client.send_packet(502, {"type": "pong"})
-                if self.connection_monitor:
-                    self.connection_monitor.on_pong_received()
-            except:
-                pass
-            return
+        PING/PONG do dispatcher xử lý chung; CHAT_BROADCAST được DayChatWindow và
+        WolfChatWindow tự subscribe.
+        """
+        return {
+            protocol.VOTE_RESULT: self._handle_vote_result,
+            protocol.ERROR_MSG: self._handle_error_msg,
+            protocol.GAME_OVER: self._handle_game_over,
+            protocol.GUARD_PROTECT_RES: self._handle_guard_protect_res,
+            protocol.ROOM_STATUS_UPDATE: self._handle_room_status_update,
+            protocol.LEAVE_ROOM_RES: self._handle_leave_room_res,
+            protocol.GAME_START_RES_AND_ROLE: self._handle_game_start,
+            protocol.PHASE_NIGHT: self._handle_phase_night,
+            protocol.SEER_RESULT: self._handle_seer_result,
+            protocol.WOLF_KILL_RES: self._handle_wolf_kill_res,
+            protocol.PHASE_GUARD_START: self._handle_phase_guard_start,
+            protocol.PHASE_WOLF_START: self._handle_phase_wolf_start,
+            protocol.PHASE_DAY: self._handle_phase_day,
+        }
+
+    def _handle_error_msg(self, payload):
+        """ERROR_MSG - hiện chỉ xử lý lỗi vote"""
+        if isinstance(payload, dict) and payload.get("type") == "vote_error":
+            message = payload.get("message", "Vote failed")
+            # Reset vote state to allow retry
+            vote_win = self.window_manager.windows.get("day_vote")
+            if vote_win:
+                vote_win.has_voted = False
+                if hasattr(vote_win, "submit_btn"):
+                    vote_win.submit_btn.setEnabled(vote_win.selected_username is not None)
+                if hasattr(vote_win, "skip_btn") and vote_win.my_is_alive:
+                    vote_win.skip_btn.setEnabled(True)
+                # Re-enable all cards
+                if hasattr(vote_win, "set_cards_interactive"):
+                    vote_win.set_cards_interactive(True)
+                if hasattr(vote_win, "toast_manager") and vote_win.toast_manager:
+                    vote_win.toast_manager.error(message)
+            else:
+                # Fallback: show error in toast if available
+                if self.toast_manager:
+                    self.toast_manager.error(message)
+
+    def _handle_guard_protect_res(self, payload):
+        """GUARD_PROTECT_RES"""
+        # Optionally handle guard result/confirmation here (e.g., show toast)
+        status = payload.get("status")
+        if status == "success":
+            self.toast_manager.success("Guard action sent!")
+        else:
+            msg = payload.get("message", "Guard action failed")
+            self.toast_manager.warning(msg)
 
-        # CHAT_BROADCAST (centralized receive to avoid multiple windows stealing packets)
-        if header == 402:  # CHAT_BROADCAST
-            try:
-                chat_type = payload.get("chat_type", "day") if isinstance(payload, dict) else "day"
+    def _handle_room_status_update(self, payload):
+        """ROOM_STATUS_UPDATE: player joined/left/disconnected"""
+        username = self.window_manager.get_shared_data("username")
+        update_type = payload.get("type")
 
-                if chat_type == "wolf":
-                    night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
-                    wolf_chat = getattr(night_ctrl, "wolf_chat_window", None) if night_ctrl else None
-                    if wolf_chat and hasattr(wolf_chat, "handle_chat_broadcast"):
-                        wolf_chat.handle_chat_broadcast(payload)
-                else:
-                    day_chat = self.window_manager.windows.get("day_chat") if hasattr(self.window_manager, "windows") else None
-                    if day_chat and hasattr(day_chat, "handle_chat_broadcast"):
-                        day_chat.handle_chat_broadcast(payload)
-            except Exception as e:
-                print(f"[WARNING] Failed to dispatch CHAT_BROADCAST: {e}")
-            return
+        if update_type == "player_joined":
+            player_username = payload.get("username")
+            current = payload.get("current_players", 0)
+            self.current_player_count = current
 
-        # Day vote events
-        if header == 411:  # VOTE_RESULT
-            self._handle_vote_result(payload)
-            return
+            # Show notification for all players
+            self.toast_manager.info(f"👤 {player_username} joined the room ({current} players)")
+            self.window_manager.get_shared_data("room_state").add_player(player_username)
 
-        # Error message - check if it's related to vote
-        if header == 500:  # ERROR_MSG
-            if isinstance(payload, dict) and payload.get("type") == "vote_error":
-                message = payload.get("message", "Vote failed")
-                # Reset vote state to allow retry
-                vote_win = self.window_manager.windows.get("day_vote")
-                if vote_win:
-                    vote_win.has_voted = False
-                    if hasattr(vote_win, "submit_btn"):
-                        vote_win.submit_btn.setEnabled(vote_win.selected_username is not None)
-                    if hasattr(vote_win, "skip_btn") and vote_win.my_is_alive:
-                        vote_win.skip_btn.setEnabled(True)
-                    # Re-enable all cards
-                    if hasattr(vote_win, "user_cards"):
-                        for card, _, _ in vote_win.user_cards:
-                            card.setEnabled(True)
-                            card.setCursor(QtCore.Qt.PointingHandCursor)
-                    if hasattr(vote_win, "toast_manager") and vote_win.toast_manager:
-                        vote_win.toast_manager.error(message)
+            # Add to list if not already there (for host receiving the update)
+            if player_username != username:
+                # Check if player already in list
+                player_exists = False
+                for i in range(self.player_list.count()):
+                    if player_username in self.player_list.item(i).text():
+                        player_exists = True
+                        break
+
+                if not player_exists:
+                    self.player_list.addItem(f"👤 {player_username}")
+
+            # Update UI
+            self.update_player_count_ui()
+
+        elif update_type == "player_left":
+            player_username = payload.get("username")
+            current = payload.get("current_players", 0)
+            new_host = payload.get("new_host")  # Server gửi host mới nếu có
+            self.current_player_count = current
+
+            self.toast_manager.warning(f"{player_username} left ({current} players)")
+            self.window_manager.get_shared_data("room_state").remove_player(player_username)
+
+            # Remove from list
+            for i in range(self.player_list.count()):
+                if player_username in self.player_list.item(i).text():
+                    self.player_list.takeItem(i)
+                    break
+
+            # Check if host changed
+            if new_host and new_host != self.current_host:
+                old_host = self.current_host
+                self.current_host = new_host
+                my_username = self.window_manager.get_shared_data("username")
+
+                if new_host == my_username:
+                    # I became host
+                    self.is_host = True
+                    self.window_manager.set_shared_data("is_host", True)
+                    self.toast_manager.success(f"👑 You are now the room host!")
+
+                    # Update UI
+                    self.start_game_button.setVisible(True)
+                    self.room_info_label.setText(f"Room ID: {self.current_room_id} - You are HOST 👑")
                 else:
-                    # Fallback: show error in toast if available
-                    if self.toast_manager:
-                        self.toast_manager.error(message)
-            return
+                    # Someone else became host
+                    self.toast_manager.info(f"👑 {new_host} is now the room host")
 
-        if header == 305:  # GAME_OVER
-            self._handle_game_over(payload)
-            return
+                # Rebuild player list với host mới
+                self.rebuild_player_list_from_ui()
 
-        username = self.window_manager.get_shared_data("username")
-        # Guard protect response - this shouldn't trigger night phase start
-        # Night phase should start from PHASE_NIGHT (303) packet
-        if header == 407:  # GUARD_PROTECT_REQ (this is wrong - 407 is request, should be response)
-            # Actually this seems wrong - 407 is GUARD_PROTECT_REQ from protocol.h
-            # This handler should probably be removed or handle something else
-            pass
+            # Update UI
+            self.update_player_count_ui()
 
-        if header == 408:  # GUARD_PROTECT_RES
-            # Optionally handle guard result/confirmation here (e.g., show toast)
-            status = payload.get("status")
-            if status == "success":
-                self.toast_manager.success("Guard action sent!")
+            # Extra warning for host if below minimum
+            if self.is_host and current < self.MIN_PLAYERS:
+                needed = self.MIN_PLAYERS - current
+                self.toast_manager.warning(f"⚠️ Need {needed} more player{'s' if needed > 1 else ''} to start!")
+
+        elif update_type == "player_disconnected":
+            player_username = payload.get("username")
+            game_started = payload.get("game_started", False)
+
+            if game_started:
+                # In-game disconnect: do NOT mark as dead (server allows reconnect).
+                self.toast_manager.warning(f"⚠️ {player_username} disconnected")
             else:
-                msg = payload.get("message", "Guard action failed")
-                self.toast_manager.warning(msg)
-            return
-        
-        if header == 207:  # ROOM_STATUS_UPDATE
-            update_type = payload.get("type")
-            
-            if update_type == "player_joined":
-                player_username = payload.get("username")
-                current = payload.get("current_players", 0)
-                self.current_player_count = current
-                
-                # Show notification for all players
-                self.toast_manager.info(f"👤 {player_username} joined the room ({current} players)")
-                
-                # Add to list if not already there (for host receiving the update)
-                if player_username != username:
-                    # Check if player already in list
-                    player_exists = False
-                    for i in range(self.player_list.count()):
-                        if player_username in self.player_list.item(i).text():
-                            player_exists = True
-                            break
-                    
-                    if not player_exists:
-                        self.player_list.addItem(f"👤 {player_username}")
-                
-                # Update UI
-                self.update_player_count_ui()
-                    
-            elif update_type == "player_left":
-                player_username = payload.get("username")
+                # Trước khi game start: treat như player_left
                 current = payload.get("current_players", 0)
-                new_host = payload.get("new_host")  # Server gửi host mới nếu có
                 self.current_player_count = current
-                
-                self.toast_manager.warning(f"{player_username} left ({current} players)")
-                
+
+                self.toast_manager.warning(f"{player_username} disconnected ({current} players)")
+                self.window_manager.get_shared_data("room_state").remove_player(player_username)
+
                 # Remove from list
                 for i in range(self.player_list.count()):
                     if player_username in self.player_list.item(i).text():
                         self.player_list.takeItem(i)
                         break
-                
+
                 # Check if host changed
+                new_host = payload.get("new_host")
                 if new_host and new_host != self.current_host:
-                    old_host = self.current_host
                     self.current_host = new_host
                     my_username = self.window_manager.get_shared_data("username")
-                    
+
                     if new_host == my_username:
-                        # I became host
                         self.is_host = True
                         self.window_manager.set_shared_data("is_host", True)
                         self.toast_manager.success(f"👑 You are now the room host!")
-                        
-                        # Update UI
                         self.start_game_button.setVisible(True)
                         self.room_info_label.setText(f"Room ID: {self.current_room_id} - You are HOST 👑")
                     else:
-                        # Someone else became host
                         self.toast_manager.info(f"👑 {new_host} is now the room host")
-                    
+
                     # Rebuild player list với host mới
                     self.rebuild_player_list_from_ui()
-                
+
                 # Update UI
                 self.update_player_count_ui()
-                
-                # Extra warning for host if below minimum
+
                 if self.is_host and current < self.MIN_PLAYERS:
                     needed = self.MIN_PLAYERS - current
                     self.toast_manager.warning(f"⚠️ Need {needed} more player{'s' if needed > 1 else ''} to start!")
-                    
-            elif update_type == "player_disconnected":
-                player_username = payload.get("username")
-                game_started = payload.get("game_started", False)
-                
-                if game_started:
-                    # In-game disconnect: do NOT mark as dead (server allows reconnect).
-                    self.toast_manager.warning(f"⚠️ {player_username} disconnected")
-                else:
-                    # Trước khi game start: treat như player_left
-                    current = payload.get("current_players", 0)
-                    self.current_player_count = current
-                    
-                    self.toast_manager.warning(f"{player_username} disconnected ({current} players)")
-                    
-                    # Remove from list
-                    for i in range(self.player_list.count()):
-                        if player_username in self.player_list.item(i).text():
-                            self.player_list.takeItem(i)
-                            break
-                    
-                    # Check if host changed
-                    new_host = payload.get("new_host")
-                    if new_host and new_host != self.current_host:
-                        self.current_host = new_host
-                        my_username = self.window_manager.get_shared_data("username")
-                        
-                        if new_host == my_username:
-                            self.is_host = True
-                            self.window_manager.set_shared_data("is_host", True)
-                            self.toast_manager.success(f"👑 You are now the room host!")
-                            self.start_game_button.setVisible(True)
-                            self.room_info_label.setText(f"Room ID: {self.current_room_id} - You are HOST 👑")
-                        else:
-                            self.toast_manager.info(f"👑 {new_host} is now the room host")
-                        
-                        # Rebuild player list với host mới
-                        self.rebuild_player_list_from_ui()
-                    
-                    # Update UI
-                    self.update_player_count_ui()
-                    
-                    if self.is_host and current < self.MIN_PLAYERS:
-                        needed = self.MIN_PLAYERS - current
-                        self.toast_manager.warning(f"⚠️ Need {needed} more player{'s' if needed > 1 else ''} to start!")
-                        
-        elif header == 209:  # LEAVE_ROOM_RES
-            if payload.get("status") == "success":
-                self.toast_manager.success("Left room successfully")
-                
-                # Clear shared data
-                self.window_manager.set_shared_data("current_room_id", None)
-                self.window_manager.set_shared_data("current_room_name", None)
-                self.window_manager.set_shared_data("is_host", False)
-                
-                # Navigate back to lobby
-                self.window_manager.navigate_to("lobby")
-            else:
-                msg = payload.get("message", "Unknown error")
-                self.toast_manager.error(f"Failed to leave room: {msg}")
-                
-        elif header == 302:  # GAME_START_RES_AND_ROLE
-            if payload.get("status") == "success":
-                print("[DEBUG] Game Started! Received role assignment")
-                
-                # Show toast for game start
-                self.toast_manager.success("🎮 Game Started!")
-                
-                # Disable buttons
-                self.start_game_button.setEnabled(False)
-                self.leave_room_button.setEnabled(False)
-                
-                # Save role info for later (used during night)
-                self.window_manager.set_shared_data("role_info", payload)
 
-                # Navigate to role card window
-                # Role card window will send ROLE_CARD_DONE_REQ when ready/timer expires
-                # and then navigate to night_begin window
-                self.window_manager.navigate_to("role_card")
-                
-            else:
-                msg = payload.get("message", "Unknown error")
-                self.toast_manager.error(f"Failed to start game: {msg}")
-        elif header == 303:  # PHASE_NIGHT
-            print("[DEBUG] Received PHASE_NIGHT from server, showing night_begin first")
-            # payload may contain duration và các phase duration riêng
-            duration = payload.get("duration", 90)  # Total duration (seer + guard + wolf)
-            seer_duration = payload.get("seer_duration", 30)
-            guard_duration = payload.get("guard_duration", 30)
-            wolf_duration = payload.get("wolf_duration", 30)
-            # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
-            import time
-            seer_deadline = payload.get("seer_deadline")
-            guard_deadline = payload.get("guard_deadline")
-            wolf_deadline = payload.get("wolf_deadline")
-            
-            # Nếu không có deadline từ server, tính từ duration (fallback)
-            if seer_deadline is None:
-                seer_deadline = time.time() + seer_duration
-            if guard_deadline is None:
-                guard_deadline = time.time() + seer_duration + guard_duration
-            if wolf_deadline is None:
-                wolf_deadline = time.time() + seer_duration + guard_duration + wolf_duration
-            
-            print(f"[DEBUG] Phase durations - seer: {seer_duration}s, guard: {guard_duration}s, wolf: {wolf_duration}s, total: {duration}s")
-            print(f"[DEBUG] Phase deadlines - seer: {seer_deadline}, guard: {guard_deadline}, wolf: {wolf_deadline}")
-            
-            # Lấy players list từ server (đảm bảo tất cả clients có cùng players list)
-            players_from_server = payload.get("players", [])
-            if players_from_server:
-                # Update room_players trong shared_data với players list từ server
-                # Đảm bảo tất cả clients có cùng players list
-                self.window_manager.set_shared_data("room_players", players_from_server)
-                print(f"[DEBUG] Updated room_players from server: {len(players_from_server)} players")
-                print(f"[DEBUG] Players from server: {[p.get('username', 'unknown') for p in players_from_server]}")
-            else:
-                print(f"[WARNING] No players list in PHASE_NIGHT packet, using existing room_players")
-            
-            # Đóng role_card window nếu đang mở
-            if "role_card" in self.window_manager.windows:
-                role_card_win = self.window_manager.windows["role_card"]
-                if role_card_win.isVisible():
-                    print(f"[DEBUG] Closing role_card_window, showing night_begin")
-                    role_card_win.hide()
-            
-            # Show night_begin window FIRST (only when PHASE_NIGHT is received)
-            # Set deadline for night_begin countdown (short 3 second display)
-            night_begin_duration = 3  # Show night_begin for 3 seconds
-            night_begin_deadline = time.time() + night_begin_duration
-            self.window_manager.set_shared_data("night_begin_deadline", night_begin_deadline)
-            self.window_manager.set_shared_data("night_begin_remaining_time", night_begin_duration)
-            
-            # Store night phase info for later use (bao gồm deadline)
-            self.window_manager.set_shared_data("pending_night_phase", {
-                "duration": duration,
-                "seer_duration": seer_duration,
-                "guard_duration": guard_duration,
-                "wolf_duration": wolf_duration,
-                "seer_deadline": seer_deadline,
-                "guard_deadline": guard_deadline,
-                "wolf_deadline": wolf_deadline
-            })
-            
-            # Show night_begin window
-            if "night_begin" in self.window_manager.windows:
-                self.window_manager.navigate_to("night_begin")
-
-        # NOTE: PING/PONG handled at the top of this function to avoid duplicate branches.
-        elif header == 406:  # SEER_RESULT
-            # Only the seer will receive this normally
-            status = payload.get("status")
-            if status == "success":
-                if isinstance(payload, dict) and (payload.get("skipped") or not payload.get("target_username")):
-                    # Seer skipped (or is dead); wait for PHASE_GUARD_START.
-                    return
-
-                target = payload.get("target_username")
-                is_wolf = bool(payload.get("is_werewolf"))
-                # Get night phase controller from shared data
-                night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
-                if night_ctrl:
-                    night_ctrl.handle_seer_result(target, is_wolf)
-                else:
-                    print("[ERROR] Night phase controller not found when receiving SEER_RESULT")
-                    self.toast_manager.warning("Error: Night phase controller not initialized")
-            else:
-                msg = payload.get("message", "Seer check failed")
-                self.toast_manager.warning(msg)
+    def _handle_leave_room_res(self, payload):
+        """LEAVE_ROOM_RES"""
+        if payload.get("status") == "success":
+            self.toast_manager.success("Left room successfully")
 
-        elif header == 404:  # WOLF_KILL_RES (vote received confirmation)
-            if isinstance(payload, dict) and payload.get("type") == "wolf_vote_received":
-                try:
-                    self.toast_manager.success("✅ Wolf vote submitted!")
-                except Exception:
-                    pass
-            else:
-                print(f"[DEBUG] Received WOLF_KILL_RES (404): {payload}")
-        
-        elif header == 311:  # PHASE_GUARD_START
-            # Server báo tất cả client chuyển sang guard phase
-            print("[DEBUG] Received PHASE_GUARD_START from server, moving to guard phase")
-            guard_duration = payload.get("guard_duration", 30)
-            # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
-            import time
-            guard_deadline = payload.get("guard_deadline")
-            wolf_deadline = payload.get("wolf_deadline")
-            
-            # Nếu không có deadline từ server, tính từ duration (fallback)
-            if guard_deadline is None:
-                guard_deadline = time.time() + guard_duration
-            if wolf_deadline is None:
-                wolf_deadline = guard_deadline + 60  # Default wolf duration
-            
-            print(f"[DEBUG] Guard phase deadlines - guard: {guard_deadline}, wolf: {wolf_deadline}")
-            
-            # Get night phase controller from shared data
-            night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
-            if night_ctrl:
-                # Update players list từ shared_data để đảm bảo có đầy đủ thông tin mới nhất
-                players_from_shared = self.window_manager.get_shared_data("room_players", [])
-                if players_from_shared:
-                    # Normalize players list format
-                    updated_players = []
-                    for p in players_from_shared:
-                        if isinstance(p, dict):
-                            updated_players.append({
-                                "username": p.get("username", ""),
-                                "is_alive": p.get("is_alive", 1),
-                                "role": p.get("role", None)
-                            })
-                    if updated_players:
-                        night_ctrl.players = updated_players
-                        print(f"[DEBUG] Guard phase - updated players list from shared_data: {len(updated_players)} players")
-                        print(f"[DEBUG] Players with roles: {[(p.get('username'), p.get('role'), p.get('is_alive')) for p in updated_players]}")
-                
-                # Update guard duration và deadline
-                night_ctrl.guard_duration = guard_duration
-                night_ctrl.guard_deadline = guard_deadline
-                night_ctrl.wolf_deadline = wolf_deadline
-                # Chuyển sang guard phase - guard sẽ thấy GuardSelectWindow, còn lại thấy GuardWaitWindow
-                night_ctrl.start_guard_phase()
-            else:
-                print("[ERROR] Night phase controller not found when receiving PHASE_GUARD_START")
-                self.toast_manager.warning("Error: Night phase controller not initialized")
-        
-        elif header == 312:  # PHASE_WOLF_START
-            # Server báo tất cả client chuyển sang wolf phase
-            print("[DEBUG] Received PHASE_WOLF_START from server, moving to wolf phase")
-            wolf_duration = payload.get("wolf_duration", 30)
-            # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
-            import time
-            wolf_deadline = payload.get("wolf_deadline")
-            
-            # Nếu không có deadline từ server, tính từ duration (fallback)
-            if wolf_deadline is None:
-                wolf_deadline = time.time() + wolf_duration
-            
-            print(f"[DEBUG] Wolf phase deadline: {wolf_deadline}")
-            
+            # Clear shared data
+            self.window_manager.set_shared_data("current_room_id", None)
+            self.window_manager.set_shared_data("current_room_name", None)
+            self.window_manager.set_shared_data("is_host", False)
+
+            # Navigate back to lobby
+            self.window_manager.navigate_to("lobby")
+        else:
+            msg = payload.get("message", "Unknown error")
+            self.toast_manager.error(f"Failed to leave room: {msg}")
+
+    def _handle_game_start(self, payload):
+        """GAME_START_RES_AND_ROLE"""
+        if payload.get("status") == "success":
+            print("[DEBUG] Game Started! Received role assignment")
+
+            # Show toast for game start
+            self.toast_manager.success("🎮 Game Started!")
+
+            # Disable buttons
+            self.start_game_button.setEnabled(False)
+            self.leave_room_button.setEnabled(False)
+
+            # Save role info for later (used during night)
+            self.window_manager.get_shared_data("room_state").set_role_info(payload)
+
+            # Navigate to role card window
+            # Role card window will send ROLE_CARD_DONE_REQ when ready/timer expires
+            # and then navigate to night_begin window
+            self.window_manager.navigate_to("role_card")
+
+        else:
+            msg = payload.get("message", "Unknown error")
+            self.toast_manager.error(f"Failed to start game: {msg}")
+
+    def _handle_phase_night(self, payload):
+        """PHASE_NIGHT"""
+        self._mark_phase("PHASE_NIGHT")
+        print("[DEBUG] Received PHASE_NIGHT from server, showing night_begin first")
+        # payload may contain duration và các phase duration riêng
+        duration = payload.get("duration", 90)  # Total duration (seer + guard + wolf)
+        seer_duration = payload.get("seer_duration", 30)
+        guard_duration = payload.get("guard_duration", 30)
+        wolf_duration = payload.get("wolf_duration", 30)
+        # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác,
+        # đổi sang đồng hồ client theo độ lệch ước lượng từ PING/PONG
+        import time
+        seer_deadline = self.clock.to_local(payload.get("seer_deadline"))
+        guard_deadline = self.clock.to_local(payload.get("guard_deadline"))
+        wolf_deadline = self.clock.to_local(payload.get("wolf_deadline"))
+
+        # Nếu không có deadline từ server, tính từ duration (fallback)
+        if seer_deadline is None:
+            seer_deadline = time.time() + seer_duration
+        if guard_deadline is None:
+            guard_deadline = time.time() + seer_duration + guard_duration
+        if wolf_deadline is None:
+            wolf_deadline = time.time() + seer_duration + guard_duration + wolf_duration
+
+        print(f"[DEBUG] Phase durations - seer: {seer_duration}s, guard: {guard_duration}s, wolf: {wolf_duration}s, total: {duration}s")
+        print(f"[DEBUG] Phase deadlines - seer: {seer_deadline}, guard: {guard_deadline}, wolf: {wolf_deadline}")
+
+        # Lấy players list từ server (đảm bảo tất cả clients có cùng players list)
+        players_from_server = payload.get("players", [])
+        if players_from_server:
+            # Update RoomState với players list từ server
+            # Đảm bảo tất cả clients có cùng players list
+            self.window_manager.get_shared_data("room_state").set_players(players_from_server)
+            print(f"[DEBUG] Updated room players from server: {len(players_from_server)} players")
+            print(f"[DEBUG] Players from server: {[p.get('username', 'unknown') for p in players_from_server]}")
+        else:
+            print(f"[WARNING] No players list in PHASE_NIGHT packet, using existing room players")
+
+        # Đóng role_card window nếu đang mở
+        if "role_card" in self.window_manager.windows:
+            role_card_win = self.window_manager.windows["role_card"]
+            if role_card_win.isVisible():
+                print(f"[DEBUG] Closing role_card_window, showing night_begin")
+                role_card_win.hide()
+
+        # Show night_begin window FIRST (only when PHASE_NIGHT is received)
+        # Set deadline for night_begin countdown (short 3 second display)
+        night_begin_duration = 3  # Show night_begin for 3 seconds
+        night_begin_deadline = time.time() + night_begin_duration
+        self.window_manager.set_shared_data("night_begin_deadline", night_begin_deadline)
+        self.window_manager.set_shared_data("night_begin_remaining_time", night_begin_duration)
+
+        # Store night phase info for later use (bao gồm deadline)
+        self.window_manager.get_shared_data("room_state").set_pending_night_phase({
+            "duration": duration,
+            "seer_duration": seer_duration,
+            "guard_duration": guard_duration,
+            "wolf_duration": wolf_duration,
+            "seer_deadline": seer_deadline,
+            "guard_deadline": guard_deadline,
+            "wolf_deadline": wolf_deadline
+        })
+
+        # Show night_begin window
+        if "night_begin" in self.window_manager.windows:
+            self.window_manager.navigate_to("night_begin")
+
+    def _mark_phase(self, phase):
+        probe = self.window_manager.get_shared_data("phase_latency_probe")
+        if probe is not None:
+            probe.mark(phase)
+
+    def _handle_seer_result(self, payload):
+        """SEER_RESULT (chỉ seer nhận được)"""
+        # Only the seer will receive this normally
+        status = payload.get("status")
+        if status == "success":
+            if isinstance(payload, dict) and (payload.get("skipped") or not payload.get("target_username")):
+                # Seer skipped (or is dead); wait for PHASE_GUARD_START.
+                return
+
+            target = payload.get("target_username")
+            is_wolf = bool(payload.get("is_werewolf"))
             # Get night phase controller from shared data
             night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
             if night_ctrl:
-                # Update players list từ shared_data để đảm bảo có đầy đủ thông tin mới nhất
-                players_from_shared = self.window_manager.get_shared_data("room_players", [])
-                if players_from_shared:
-                    # Normalize players list format
-                    updated_players = []
-                    for p in players_from_shared:
-                        if isinstance(p, dict):
-                            updated_players.append({
-                                "username": p.get("username", ""),
-                                "is_alive": p.get("is_alive", 1),
-                                "role": p.get("role", None)
-                            })
-                    if updated_players:
-                        night_ctrl.players = updated_players
-                        print(f"[DEBUG] Wolf phase - updated players list from shared_data: {len(updated_players)} players")
-                        print(f"[DEBUG] Players with roles: {[(p.get('username'), p.get('role'), p.get('is_alive')) for p in updated_players]}")
-                
-                # Re-check role info to ensure is_wolf is correct
-                role_info = self.window_manager.get_shared_data("role_info", {})
-                role_num = role_info.get("role", 0)
-                is_wolf = (role_num == 1)
-                # Update is_wolf in night_ctrl to ensure correct detection
-                night_ctrl.is_wolf = is_wolf
-                # Also update wolf_usernames from role_info or players list
-                wolf_usernames = role_info.get("werewolf_team", [])
-                if not wolf_usernames:
-                    # Fallback: check role in players list
-                    wolf_usernames = [p.get("username") for p in night_ctrl.players if p.get("role") == 1]
-                night_ctrl.wolf_usernames = wolf_usernames
-                
-                print(f"[DEBUG] Updated wolf info - is_wolf: {is_wolf}, wolf_usernames: {wolf_usernames}")
-                print(f"[DEBUG] All players in room: {[p.get('username', 'unknown') if isinstance(p, dict) else str(p) for p in night_ctrl.players]}")
-                
-                # Update wolf duration if needed
-                # Update wolf duration và deadline
-                night_ctrl.wolf_duration = wolf_duration
-                night_ctrl.wolf_deadline = wolf_deadline
-                # Chuyển sang wolf phase - wolf sẽ thấy WolfSelectWindow/WolfChatWindow, còn lại thấy wait window
-                night_ctrl.start_wolf_phase()
+                night_ctrl.handle_seer_result(target, is_wolf)
             else:
-                print("[ERROR] Night phase controller not found when receiving PHASE_WOLF_START")
+                print("[ERROR] Night phase controller not found when receiving SEER_RESULT")
                 self.toast_manager.warning("Error: Night phase controller not initialized")
-        
-        elif header == 304:  # PHASE_DAY
-            # Server báo bắt đầu day phase sau khi night phase kết thúc
-            print("[DEBUG] Received PHASE_DAY from server, starting day phase")
-            
-            # Payload compact (mới): { result: "killed"|"no_kill", targetId? }
-            # Payload legacy (cũ): { dead_players: [...] }
-            dead_players = []
-            if isinstance(payload, dict) and "result" in payload:
-                result = payload.get("result")
-                target = payload.get("targetId") or payload.get("target_username")
-                if result == "killed" and target:
-                    dead_players = [target]
-                print(f"[DEBUG] PHASE_DAY compact result: {result}, target={target}")
-            else:
-                dead_players = payload.get("dead_players", [])
-                print(f"[DEBUG] Dead players (legacy): {dead_players}")
+        else:
+            msg = payload.get("message", "Seer check failed")
+            self.toast_manager.warning(msg)
 
-            # Update shared room_players alive status so day chat can disable sending for dead users
+    def _handle_wolf_kill_res(self, payload):
+        """WOLF_KILL_RES (vote received confirmation)"""
+        if isinstance(payload, dict) and payload.get("type") == "wolf_vote_received":
             try:
-                room_players = self.window_manager.get_shared_data("room_players", [])
-                if isinstance(room_players, list) and dead_players:
-                    for p in room_players:
-                        if isinstance(p, dict) and p.get("username") in dead_players:
-                            p["is_alive"] = 0
-                    self.window_manager.set_shared_data("room_players", room_players)
+                self.toast_manager.success("✅ Wolf vote submitted!")
+            except Exception:
+                pass
+        else:
+            print(f"[DEBUG] Received WOLF_KILL_RES (404): {payload}")
+
+    def _handle_phase_guard_start(self, payload):
+        """PHASE_GUARD_START"""
+        self._mark_phase("PHASE_GUARD_START")
+        # Server báo tất cả client chuyển sang guard phase
+        print("[DEBUG] Received PHASE_GUARD_START from server, moving to guard phase")
+        guard_duration = payload.get("guard_duration", 30)
+        # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
+        import time
+        guard_deadline = self.clock.to_local(payload.get("guard_deadline"))
+        wolf_deadline = self.clock.to_local(payload.get("wolf_deadline"))
+
+        # Nếu không có deadline từ server, tính từ duration (fallback)
+        if guard_deadline is None:
+            guard_deadline = time.time() + guard_duration
+        if wolf_deadline is None:
+            wolf_deadline = guard_deadline + 60  # Default wolf duration
+
+        print(f"[DEBUG] Guard phase deadlines - guard: {guard_deadline}, wolf: {wolf_deadline}")
+
+        # Get night phase controller from shared data
+        night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
+        if night_ctrl:
+            # Update players list từ RoomState để đảm bảo có đầy đủ thông tin mới nhất
+            room_state = self.window_manager.get_shared_data("room_state")
+            if len(room_state):
+                updated_players = room_state.player_dicts()
+                if updated_players:
+                    night_ctrl.players = updated_players
+                    print(f"[DEBUG] Guard phase - updated players list from RoomState: {len(updated_players)} players")
+                    print(f"[DEBUG] Players with roles: {[(p.get('username'), p.get('role'), p.get('is_alive')) for p in updated_players]}")
+
+            # Update guard duration và deadline
+            night_ctrl.guard_duration = guard_duration
+            night_ctrl.guard_deadline = guard_deadline
+            night_ctrl.wolf_deadline = wolf_deadline
+            # Chuyển sang guard phase - guard sẽ thấy GuardSelectWindow, còn lại thấy GuardWaitWindow
+            night_ctrl.start_guard_phase()
+        else:
+            print("[ERROR] Night phase controller not found when receiving PHASE_GUARD_START")
+            self.toast_manager.warning("Error: Night phase controller not initialized")
+
+    def _handle_phase_wolf_start(self, payload):
+        """PHASE_WOLF_START"""
+        self._mark_phase("PHASE_WOLF_START")
+        # Server báo tất cả client chuyển sang wolf phase
+        print("[DEBUG] Received PHASE_WOLF_START from server, moving to wolf phase")
+        wolf_duration = payload.get("wolf_duration", 30)
+        # Nhận deadline từ server (epoch seconds) để đồng bộ thời gian chính xác
+        import time
+        wolf_deadline = self.clock.to_local(payload.get("wolf_deadline"))
+
+        # Nếu không có deadline từ server, tính từ duration (fallback)
+        if wolf_deadline is None:
+            wolf_deadline = time.time() + wolf_duration
+
+        print(f"[DEBUG] Wolf phase deadline: {wolf_deadline}")
+
+        # Get night phase controller from shared data
+        night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
+        if night_ctrl:
+            # Update players list từ RoomState để đảm bảo có đầy đủ thông tin mới nhất
+            room_state = self.window_manager.get_shared_data("room_state")
+            if len(room_state):
+                updated_players = room_state.player_dicts()
+                if updated_players:
+                    night_ctrl.players = updated_players
+                    print(f"[DEBUG] Wolf phase - updated players list from RoomState: {len(updated_players)} players")
+                    print(f"[DEBUG] Players with roles: {[(p.get('username'), p.get('role'), p.get('is_alive')) for p in updated_players]}")
+
+            # Re-check role info to ensure is_wolf is correct
+            is_wolf = (room_state.my_role() == 1)
+            # Update is_wolf in night_ctrl to ensure correct detection
+            night_ctrl.is_wolf = is_wolf
+            # Also update wolf_usernames from role_info or players list
+            wolf_usernames = room_state.werewolf_team()
+            night_ctrl.wolf_usernames = wolf_usernames
+
+            print(f"[DEBUG] Updated wolf info - is_wolf: {is_wolf}, wolf_usernames: {wolf_usernames}")
+            print(f"[DEBUG] All players in room: {[p.get('username', 'unknown') if isinstance(p, dict) else str(p) for p in night_ctrl.players]}")
+
+            # Update wolf duration if needed
+            # Update wolf duration và deadline
+            night_ctrl.wolf_duration = wolf_duration
+            night_ctrl.wolf_deadline = wolf_deadline
+            # Chuyển sang wolf phase - wolf sẽ thấy WolfSelectWindow/WolfChatWindow, còn lại thấy wait window
+            night_ctrl.start_wolf_phase()
+        else:
+            print("[ERROR] Night phase controller not found when receiving PHASE_WOLF_START")
+            self.toast_manager.warning("Error: Night phase controller not initialized")
+
+    def _handle_phase_day(self, payload):
+        """PHASE_DAY"""
+        self._mark_phase("PHASE_DAY")
+        # Server báo bắt đầu day phase sau khi night phase kết thúc
+        print("[DEBUG] Received PHASE_DAY from server, starting day phase")
+
+        # Payload compact (mới): { result: "killed"|"no_kill", targetId? }
+        # Payload legacy (cũ): { dead_players: [...] }
+        dead_players = []
+        if isinstance(payload, dict) and "result" in payload:
+            result = payload.get("result")
+            target = payload.get("targetId") or payload.get("target_username")
+            if result == "killed" and target:
+                dead_players = [target]
+            print(f"[DEBUG] PHASE_DAY compact result: {result}, target={target}")
+        else:
+            dead_players = payload.get("dead_players", [])
+            print(f"[DEBUG] Dead players (legacy): {dead_players}")
+
+        # Update alive status; day chat / vote subscribe alive_changed to disable dead users
+        try:
+            self.window_manager.get_shared_data("room_state").mark_dead(dead_players)
+        except Exception as e:
+            print(f"[WARNING] Failed to update room players on PHASE_DAY: {e}")
+
+        # Đóng tất cả các window của night phase
+        night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
+        if night_ctrl:
+            # Close all night phase windows - đóng đúng cách để tránh crash
+            try:
+                if hasattr(night_ctrl, 'seer_window') and night_ctrl.seer_window:
+                    if night_ctrl.seer_window.isVisible():
+                        night_ctrl.seer_window.hide()
+                        night_ctrl.seer_window.close()
             except Exception as e:
-                print(f"[WARNING] Failed to update room_players on PHASE_DAY: {e}")
-            
-            # Đóng tất cả các window của night phase
-            night_ctrl = self.window_manager.get_shared_data("night_phase_controller")
-            if night_ctrl:
-                # Close all night phase windows - đóng đúng cách để tránh crash
-                try:
-                    if hasattr(night_ctrl, 'seer_window') and night_ctrl.seer_window:
-                        if night_ctrl.seer_window.isVisible():
-                            night_ctrl.seer_window.hide()
-                            night_ctrl.seer_window.close()
-                except Exception as e:
-                    print(f"[WARNING] Error closing seer_window: {e}")
-                
-                try:
-                    if hasattr(night_ctrl, 'seer_result_window') and night_ctrl.seer_result_window:
-                        if night_ctrl.seer_result_window.isVisible():
-                            night_ctrl.seer_result_window.hide()
-                            night_ctrl.seer_result_window.close()
-                except Exception as e:
-                    print(f"[WARNING] Error closing seer_result_window: {e}")
-                
-                try:
-                    if hasattr(night_ctrl, 'guard_window') and night_ctrl.guard_window:
-                        if night_ctrl.guard_window.isVisible():
-                            night_ctrl.guard_window.hide()
-                            night_ctrl.guard_window.close()
-                except Exception as e:
-                    print(f"[WARNING] Error closing guard_window: {e}")
-                
-                try:
-                    if hasattr(night_ctrl, 'wolf_controller') and night_ctrl.wolf_controller:
-                        if night_ctrl.wolf_controller.isVisible():
-                            night_ctrl.wolf_controller.hide()
-                            night_ctrl.wolf_controller.close()
-                except Exception as e:
-                    print(f"[WARNING] Error closing wolf_controller: {e}")
-            
-            # Hiển thị death announcement window
-            if "death_announcement" in self.window_manager.windows:
-                death_window = self.window_manager.windows["death_announcement"]
-                death_window.set_dead_players(dead_players)
-                # Use WindowManager so countdown can auto-navigate to day chat and auto-hide this screen.
-                self.window_manager.navigate_to("death_announcement")
-            else:
-                print("[ERROR] Death announcement window not registered")
-                # Fallback: navigate directly to day chat
-                self.window_manager.navigate_to("day_chat")
+                print(f"[WARNING] Error closing seer_window: {e}")
 
-            # Start/refresh day-phase shared vote deadline (120s) if provided
             try:
-                import time
-                day_deadline = payload.get("day_deadline") if isinstance(payload, dict) else None
-                if day_deadline:
-                    self.window_manager.set_shared_data("day_vote_deadline", float(day_deadline))
-                    self.window_manager.set_shared_data("day_remaining_time", max(0, int(float(day_deadline) - time.time())))
-                    self.window_manager.set_shared_data("day_vote_candidates", None)
-                    self.window_manager.set_shared_data("day_vote_selected_username", None)
-                    self._start_day_timer(float(day_deadline))
-                
-                # Reset vote state in day_vote_window if it exists
-                vote_win = self.window_manager.windows.get("day_vote")
-                if vote_win and hasattr(vote_win, "has_voted"):
-                    vote_win.has_voted = False
-                    vote_win.selected_username = None
-                    if hasattr(vote_win, "skip_btn") and vote_win.my_is_alive:
-                        vote_win.skip_btn.setEnabled(True)
-                    if hasattr(vote_win, "submit_btn"):
-                        vote_win.submit_btn.setEnabled(False)
+                if hasattr(night_ctrl, 'seer_result_window') and night_ctrl.seer_result_window:
+                    if night_ctrl.seer_result_window.isVisible():
+                        night_ctrl.seer_result_window.hide()
+                        night_ctrl.seer_result_window.close()
+            except Exception as e:
+                print(f"[WARNING] Error closing seer_result_window: {e}")
+
+            try:
+                if hasattr(night_ctrl, 'guard_window') and night_ctrl.guard_window:
+                    if night_ctrl.guard_window.isVisible():
+                        night_ctrl.guard_window.hide()
+                        night_ctrl.guard_window.close()
             except Exception as e:
-                print(f"[WARNING] Failed to init day timer from PHASE_DAY: {e}")
+                print(f"[WARNING] Error closing guard_window: {e}")
+
+            try:
+                if hasattr(night_ctrl, 'wolf_controller') and night_ctrl.wolf_controller:
+                    if night_ctrl.wolf_controller.isVisible():
+                        night_ctrl.wolf_controller.hide()
+                        night_ctrl.wolf_controller.close()
+            except Exception as e:
+                print(f"[WARNING] Error closing wolf_controller: {e}")
+
+        # Hiển thị death announcement window
+        if "death_announcement" in self.window_manager.windows:
+            death_window = self.window_manager.windows["death_announcement"]
+            death_window.set_dead_players(dead_players)
+            # Use WindowManager so countdown can auto-navigate to day chat and auto-hide this screen.
+            self.window_manager.navigate_to("death_announcement")
+        else:
+            print("[ERROR] Death announcement window not registered")
+            # Fallback: navigate directly to day chat
+            self.window_manager.navigate_to("day_chat")
+
+        # Start/refresh day-phase shared vote deadline (120s) if provided
+        try:
+            # Reset vote state in day_vote_window if it exists (before day_vote_changed redraws it)
+            vote_win = self.window_manager.windows.get("day_vote")
+            if vote_win and hasattr(vote_win, "has_voted"):
+                vote_win.has_voted = False
+                vote_win.selected_username = None
+                if hasattr(vote_win, "skip_btn") and vote_win.my_is_alive:
+                    vote_win.skip_btn.setEnabled(True)
+                if hasattr(vote_win, "submit_btn"):
+                    vote_win.submit_btn.setEnabled(False)
+
+            day_deadline = self.clock.to_local(payload.get("day_deadline")) if isinstance(payload, dict) else None
+            if day_deadline:
+                self.window_manager.get_shared_data("room_state").set_day_vote(float(day_deadline), None, reset_selection=True)
+                self._start_day_timer(float(day_deadline))
+        except Exception as e:
+            print(f"[WARNING] Failed to init day timer from PHASE_DAY: {e}")
 
     def _start_day_timer(self, deadline: float):
         self._day_deadline = float(deadline) if deadline else None
         if self._day_deadline:
-            if not self.day_timer.isActive():
-                self.day_timer.start(1000)
+            self.clock.set_deadline("day", self._day_deadline)
+            self.clock.subscribe(self, {"day": self._update_day_timer})
 
     def _stop_day_timer(self):
         self._day_deadline = None
-        if self.day_timer.isActive():
-            self.day_timer.stop()
-
-    def _update_day_timer(self):
-        if not self._day_deadline:
-            self._stop_day_timer()
-            return
-
-        import time
-        remaining = max(0, int(self._day_deadline - time.time()))
-        self.window_manager.set_shared_data("day_remaining_time", remaining)
+        self.clock.unsubscribe(self, "day")
 
+    def _update_day_timer(self, remaining):
         try:
             vote_win = self.window_manager.windows.get("day_vote")
             if vote_win and vote_win.isVisible() and hasattr(vote_win, "timer_label"):
@@ -993,19 +921,8 @@ class RoomWindow(QtWidgets.QWidget):
 
         if ev_type == "tie_break_start":
             candidates = payload.get("candidates", [])
-            deadline = payload.get("deadline")
+            deadline = self.clock.to_local(payload.get("deadline"))
             try:
-                if isinstance(candidates, list):
-                    self.window_manager.set_shared_data("day_vote_candidates", candidates)
-
-                    # Clear persisted selection if it is no longer valid
-                    current_sel = self.window_manager.get_shared_data("day_vote_selected_username")
-                    if current_sel and current_sel not in candidates:
-                        self.window_manager.set_shared_data("day_vote_selected_username", None)
-                if deadline:
-                    self.window_manager.set_shared_data("day_vote_deadline", float(deadline))
-                    self._start_day_timer(float(deadline))
-
                 vote_win = self.window_manager.windows.get("day_vote")
                 if vote_win:
                     # Allow revote in tie-break round
@@ -1018,8 +935,14 @@ class RoomWindow(QtWidgets.QWidget):
                             vote_win.skip_btn.setEnabled(True)
                     except Exception:
                         pass
-                    if hasattr(vote_win, "rebuild_player_cards"):
-                        vote_win.rebuild_player_cards()
+
+                # Vote window redraws its cards on day_vote_changed; invalid selection is cleared
+                self.window_manager.get_shared_data("room_state").set_day_vote(
+                    float(deadline) if deadline else None,
+                    candidates if isinstance(candidates, list) else None,
+                )
+                if deadline:
+                    self._start_day_timer(float(deadline))
             except Exception as e:
                 print(f"[WARNING] Failed to apply tie_break_start: {e}")
             return
@@ -1052,30 +975,10 @@ class RoomWindow(QtWidgets.QWidget):
                 except Exception:
                     pass
                 
-                # Update shared alive state
+                # Update shared alive state; day chat permissions and vote cards
+                # refresh themselves via RoomState.alive_changed
                 try:
-                    players = self.window_manager.get_shared_data("room_players", [])
-                    if isinstance(players, list):
-                        for p in players:
-                            if isinstance(p, dict) and p.get("username") == player_id:
-                                p["is_alive"] = 0
-                        self.window_manager.set_shared_data("room_players", players)
-                except Exception:
-                    pass
-
-                # Refresh day chat send permissions if visible
-                try:
-                    day_chat = self.window_manager.windows.get("day_chat")
-                    if day_chat and hasattr(day_chat, "refresh_chat_permissions"):
-                        day_chat.refresh_chat_permissions()
-                except Exception:
-                    pass
-
-                # Refresh vote panel list if visible
-                try:
-                    vote_win = self.window_manager.windows.get("day_vote")
-                    if vote_win and hasattr(vote_win, "rebuild_player_cards"):
-                        vote_win.rebuild_player_cards()
+                    self.window_manager.get_shared_data("room_state").mark_dead([player_id])
                 except Exception:
                     pass
 
@@ -1103,7 +1006,7 @@ class RoomWindow(QtWidgets.QWidget):
         self.window_manager.set_shared_data("current_room_id", None)
         self.window_manager.set_shared_data("current_room_name", None)
         self.window_manager.set_shared_data("is_host", False)
-        self.window_manager.set_shared_data("role_info", {})
+        self.window_manager.get_shared_data("room_state").clear()
 
         # Map numeric role -> string expected by GameResultWindow
         role_map = {0: "villager", 1: "werewolf", 2: "seer", 3: "guard"}
@@ -1149,8 +1052,8 @@ class RoomWindow(QtWidgets.QWidget):
             if night_begin_win.isVisible():
                 print(f"[DEBUG] Force closing night_begin_window before starting night phase")
                 night_begin_win.hide()
-                if hasattr(night_begin_win, 'timer') and night_begin_win.timer:
-                    night_begin_win.timer.stop()
+                if hasattr(night_begin_win, 'stop_timer'):
+                    night_begin_win.stop_timer()
         
         if "role_card" in self.window_manager.windows:
             role_card_win = self.window_manager.windows["role_card"]
@@ -1159,52 +1062,27 @@ class RoomWindow(QtWidgets.QWidget):
                 role_card_win.hide()
         
         # Lấy lại các thông tin cần thiết
-        role_info = self.window_manager.get_shared_data("role_info", {})
+        room_state = self.window_manager.get_shared_data("room_state")
         # Server sends role as number: 0=VILLAGER, 1=WEREWOLF, 2=SEER, 3=GUARD
-        role_num = role_info.get("role", 0)
+        role_num = room_state.my_role()
         is_seer = (role_num == 2)
         is_guard = (role_num == 3)
         is_wolf = (role_num == 1)
         
-        # Lấy players list từ shared_data (đã được update từ PHASE_NIGHT packet)
-        players_raw = self.window_manager.get_shared_data("room_players", [])
+        # Lấy players list từ RoomState (đã được update từ PHASE_NIGHT packet)
         my_username = self.window_manager.get_shared_data("username")
         room_id = self.window_manager.get_shared_data("current_room_id")
 
         spectator_mode = bool(self.window_manager.get_shared_data("spectator_mode", False))
-        my_is_alive = True
-        try:
-            for p in players_raw:
-                if isinstance(p, dict) and p.get("username") == my_username:
-                    my_is_alive = int(p.get("is_alive", 1)) != 0
-                    break
-        except Exception:
-            my_is_alive = True
+        my_is_alive = room_state.is_alive(my_username)
 
         if spectator_mode or not my_is_alive:
             is_seer = False
             is_guard = False
             is_wolf = False
         
-        # Đảm bảo players có đầy đủ thông tin: username, is_alive, và role
-        # Players list từ server đã có is_alive và role, chỉ cần normalize format
-        players = []
-        for p in players_raw:
-            if isinstance(p, dict):
-                # Đảm bảo có username, is_alive, và role
-                player_info = {
-                    "username": p.get("username", ""),
-                    "is_alive": p.get("is_alive", 1),  # Server gửi is_alive, mặc định 1 nếu không có
-                    "role": p.get("role", None)  # Server gửi role trong PHASE_NIGHT
-                }
-            else:
-                # Nếu p là string (username) - fallback
-                player_info = {
-                    "username": str(p),
-                    "is_alive": 1,  # Mặc định là alive
-                    "role": None
-                }
-            players.append(player_info)
+        # Players đã được normalize (username, is_alive, role) trong RoomState
+        players = room_state.player_dicts()
         
         # Debug: Print players with roles
         print(f"[DEBUG] start_night_phase - players with roles: {[(p.get('username'), p.get('role'), p.get('is_alive')) for p in players]}")
@@ -1215,15 +1093,13 @@ class RoomWindow(QtWidgets.QWidget):
         print(f"[DEBUG] start_night_phase - all players usernames: {[p.get('username', 'unknown') for p in players]}")
         
         # Get wolf usernames from werewolf team if available, otherwise check role
-        wolf_usernames = role_info.get("werewolf_team", [])
-        if not wolf_usernames:
-            # Fallback: check role in players list (though this might not work if role not exposed)
-            wolf_usernames = [p["username"] for p in players if p.get("role") == 1]
+        # (fallback: role trong players list, có thể không có nếu server không expose role)
+        wolf_usernames = room_state.werewolf_team()
         
         print(f"[DEBUG] Player role - is_seer: {is_seer}, is_guard: {is_guard}, is_wolf: {is_wolf}")
         
         # Lấy deadline từ pending_night_phase (đã được lưu khi nhận PHASE_NIGHT)
-        pending_night_phase = self.window_manager.get_shared_data("pending_night_phase", {})
+        pending_night_phase = room_state.pending_night_phase
         seer_deadline = pending_night_phase.get("seer_deadline")
         guard_deadline = pending_night_phase.get("guard_deadline")
         wolf_deadline = pending_night_phase.get("wolf_deadline")
@@ -1248,13 +1124,13 @@ class RoomWindow(QtWidgets.QWidget):
     
     def on_connection_lost(self):
         """Handle connection lost"""
-        self.recv_timer.stop()
+        self.dispatcher.unsubscribe(self)
 
     def on_connection_restored(self):
         """Handle connection restored after reconnect"""
         print("[DEBUG] Room: Connection restored, navigating to login")
-        # Stop timer
-        self.recv_timer.stop()
+        # Dừng nhận packet
+        self.dispatcher.unsubscribe(self)
 
         # Remember last room so Login can attempt resume.
         try:
@@ -1273,7 +1149,7 @@ class RoomWindow(QtWidgets.QWidget):
         self.window_manager.set_shared_data("current_room_id", None)
         self.window_manager.set_shared_data("current_room_name", None)
         self.window_manager.set_shared_data("is_host", False)
-        self.window_manager.set_shared_data("role_info", {})
+        self.window_manager.get_shared_data("room_state").clear()
 
         # Hide any leftover gameplay windows opened via open_window() before showing login
         try:
@@ -1304,8 +1180,8 @@ class RoomWindow(QtWidgets.QWidget):
                 self.network_client.send_packet(105, {})  # LOGOUT_REQ
                 self.toast_manager.info("Logging out...")
                 
-                # Stop timer
-                self.recv_timer.stop()
+                # Dừng nhận packet
+                self.dispatcher.unsubscribe(self)
                 
                 # Clear shared data
                 self.window_manager.set_shared_data("user_id", None)
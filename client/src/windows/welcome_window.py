@@ -38,21 +38,7 @@ class WelcomeWindow(QtWidgets.QWidget):
         
         # Disable navigation buttons
         self.register_button.setEnabled(False)
-        self.register_button.setStyleSheet("""
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-                border: 1px solid #444444;
-            }
-        """)
         self.login_button.setEnabled(False)
-        self.login_button.setStyleSheet("""
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-                border: 1px solid #444444;
-            }
-        """)
         self.is_connected = False
         self.window_manager.set_shared_data("connected", False)
         
@@ -94,7 +80,7 @@ class WelcomeWindow(QtWidgets.QWidget):
             "💡 For LAN: Use server's IP (e.g., 192.168.1.100)\n"
             "💡 Server must be running and port 5000 open"
         )
-        help_label.setStyleSheet("color: #888; font-size: 10px;")
+        help_label.setObjectName("connection_help_label")
         
         self.host_input = QtWidgets.QLineEdit("127.0.0.1")
         self.host_input.setObjectName("host_input")
@@ -122,25 +108,11 @@ class WelcomeWindow(QtWidgets.QWidget):
         self.register_button.setObjectName("register_button")
         self.register_button.setMinimumHeight(50)
         self.register_button.setEnabled(False)
-        self.register_button.setStyleSheet("""
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-                border: 1px solid #444444;
-            }
-        """)
         
         self.login_button = QtWidgets.QPushButton("Login")
         self.login_button.setObjectName("login_button")
         self.login_button.setMinimumHeight(50)
         self.login_button.setEnabled(False)
-        self.login_button.setStyleSheet("""
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-                border: 1px solid #444444;
-            }
-        """)
         
         nav_layout.addWidget(self.register_button)
         nav_layout.addWidget(self.login_button)
@@ -179,9 +151,7 @@ class WelcomeWindow(QtWidgets.QWidget):
             
             # Enable navigation buttons
             self.register_button.setEnabled(True)
-            self.register_button.setStyleSheet("")  # Reset to default style
             self.login_button.setEnabled(True)
-            self.login_button.setStyleSheet("")  # Reset to default style
             
             # Store connection info
             self.window_manager.set_shared_data("network_client", self.network_client)
@@ -54,7 +54,11 @@ typedef enum {
     // System (500+)
     ERROR_MSG = 500,
     PING = 501,
-    PONG = 502
+    PONG = 502,
+    // Thương lượng encoding payload (client/src/payload_codec.py). Server C chưa xử lý:
+    // HELLO_REQ rơi vào nhánh "Unknown packet header" và connection giữ JSON.
+    HELLO_REQ = 503,
+    HELLO_RES = 504
 } PacketType;
 
 #endif // PROTOCOL_H
\ No newline at end of file
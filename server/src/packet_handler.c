@@ -4,6 +4,7 @@
 #include <unistd.h>
 #include <arpa/inet.h>
 #include <time.h>
+#include <sys/time.h>
 #include <errno.h>
 
 #include "packet_handler.h"
@@ -79,9 +80,17 @@ void send_packet(int client_fd, uint16_t header, const char *payload) {
     free(buffer);
 }
 
+// Epoch seconds có phần lẻ (độ phân giải micro giây) cho timestamp PING/PONG
+static double epoch_now(void) {
+    struct timeval tv;
+    gettimeofday(&tv, NULL);
+    return (double)tv.tv_sec + (double)tv.tv_usec / 1e6;
+}
+
 void handle_ping(int client_fd, cJSON *json) {
     // Client gửi PING (để ping server), server trả về PONG
     // Trong game này server gửi PING để check client, nên hàm này ít dùng
+    double t1 = epoch_now();  // Thời điểm nhận PING
     Session *session = find_session(client_fd);
     if (session) {
         // Cập nhật last_ping khi nhận được ping từ client (client đang active)
@@ -92,6 +101,14 @@ void handle_ping(int client_fd, cJSON *json) {
     // Client-initiated PING: always respond with PONG.
     cJSON *pong = cJSON_CreateObject();
     cJSON_AddStringToObject(pong, "type", "pong");
+    // Client gửi kèm t0: echo lại cùng t1 (nhận) / t2 (gửi) để client ước lượng RTT và
+    // độ lệch đồng hồ server (kiểu NTP), dùng để hiệu chỉnh các deadline gửi xuống
+    cJSON *t0 = json ? cJSON_GetObjectItem(json, "t0") : NULL;
+    if (cJSON_IsNumber(t0)) {
+        cJSON_AddNumberToObject(pong, "t0", t0->valuedouble);
+        cJSON_AddNumberToObject(pong, "t1", t1);
+        cJSON_AddNumberToObject(pong, "t2", epoch_now());
+    }
     char *pong_str = cJSON_PrintUnformatted(pong);
 
     send_packet(client_fd, PONG, pong_str);  // Gửi PONG với header PONG